@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Benchmark of the serialization of comm messages with large payloads.
+
+Compares sending NumPy arrays and DataFrames pickled in a single buffer
+with sending them with out-of-band buffers, as done by
+`spyder_kernels.comms.commbase` when both sides support it.
+
+It also measures sending those buffers through the IOPub thread of the
+kernel, as replies to `get_value` are: either copying them or sharing them
+with the variable and waiting until zmq is done with them.
+
+Usage:
+
+    python benchmarks/bench_comm_buffers.py [--size-mb 200] [--repeat 3]
+                                            [--json]
+"""
+
+# Standard library imports
+import argparse
+import gc
+import json
+import threading
+import time
+import tracemalloc
+
+# Third party imports
+from ipykernel.iostream import IOPubThread
+from jupyter_client.session import Session
+import numpy as np
+import pandas as pd
+from spyder_kernels.comms.commbase import (
+    dumps_to_buffers, loads_from_buffers)
+from spyder_kernels.comms.frontendcomm import TrackedIOPubSocket
+import zmq
+
+
+def get_payloads(size_mb):
+    """Return the payloads to benchmark, with about `size_mb` of data."""
+    nitems = size_mb * 1024 * 1024 // 8
+    return {
+        'ndarray': np.random.rand(nitems),
+        'dataframe': pd.DataFrame(np.random.rand(nitems // 10, 10)),
+    }
+
+
+def measure(func, repeat):
+    """Return the best time and the peak of memory allocated by `func`."""
+    best_time = None
+    peak = 0
+    for __ in range(repeat):
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        del result
+        best_time = elapsed if best_time is None else min(best_time, elapsed)
+    return best_time, peak
+
+
+def send_iopub(session, iopub_thread, payload, copy):
+    """Send payload from the IOPub thread and wait until it's sent."""
+    buffers = dumps_to_buffers(payload, 5, out_of_band=True, copy=copy)
+    socket = TrackedIOPubSocket(iopub_thread)
+    session.send(socket, 'comm_msg', {}, buffers=buffers)
+    socket.wait()
+
+
+def run_iopub(payloads, repeat):
+    """Send payloads through an IOPub thread to a subscriber."""
+    context = zmq.Context()
+    pub = context.socket(zmq.PUB)
+    port = pub.bind_to_random_port('tcp://127.0.0.1')
+    sub = context.socket(zmq.SUB)
+    sub.subscribe(b'')
+    sub.connect('tcp://127.0.0.1:{}'.format(port))
+    while not sub.poll(10):
+        pub.send(b'')
+    sub.recv()
+
+    # Receive everything, like the frontend
+    stop = threading.Event()
+
+    def receive():
+        while not stop.is_set():
+            if sub.poll(10):
+                sub.recv_multipart(copy=False)
+
+    receiver = threading.Thread(target=receive)
+    receiver.start()
+    iopub_thread = IOPubThread(pub)
+    iopub_thread.start()
+    session = Session()
+
+    results = []
+    try:
+        for name, payload in payloads.items():
+            for copy in (True, False):
+                send_time, send_peak = measure(
+                    lambda: send_iopub(session, iopub_thread, payload, copy),
+                    repeat)
+                results.append({
+                    'payload': name,
+                    'copy': copy,
+                    'send_time': send_time,
+                    'send_peak_mb': send_peak / 1024 ** 2,
+                })
+    finally:
+        iopub_thread.stop()
+        iopub_thread.close()
+        stop.set()
+        receiver.join()
+        sub.close()
+        context.term()
+    return results
+
+
+def run(size_mb, repeat):
+    """Run the benchmark and return its results as a list of dicts."""
+    results = []
+    payloads = get_payloads(size_mb)
+    for name, payload in payloads.items():
+        # Out-of-band buffers are copied unless the payload is not
+        # referenced anywhere else or the send is tracked
+        for out_of_band, copy in ((False, True), (True, True),
+                                  (True, False)):
+            send_time, send_peak = measure(
+                lambda: dumps_to_buffers(payload, 5, out_of_band, copy),
+                repeat)
+
+            # Received buffers are read only bytes, as zmq frames
+            frames = [bytes(buffer) for buffer in
+                      dumps_to_buffers(payload, 5, out_of_band, copy)]
+            recv_time, recv_peak = measure(
+                lambda: loads_from_buffers(frames), repeat)
+            del frames[:]
+
+            results.append({
+                'payload': name,
+                'out_of_band': out_of_band,
+                'copy': copy,
+                'size_mb': size_mb,
+                'send_time': send_time,
+                'send_peak_mb': send_peak / 1024 ** 2,
+                'recv_time': recv_time,
+                'recv_peak_mb': recv_peak / 1024 ** 2,
+            })
+    return results, run_iopub(payloads, repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--size-mb', type=int, default=200,
+                        help="Size of each payload in MB")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="Number of repetitions of each measure")
+    parser.add_argument('--json', action='store_true',
+                        help="Print results as JSON")
+    args = parser.parse_args()
+
+    results, iopub_results = run(args.size_mb, args.repeat)
+    if args.json:
+        print(json.dumps({'serialization': results, 'iopub': iopub_results},
+                         indent=2))
+        return
+
+    print("{:<10} {:<12} {:<6} {:>10} {:>12} {:>10} {:>12}".format(
+        'payload', 'out-of-band', 'copy', 'send (s)', 'send (MB)',
+        'recv (s)', 'recv (MB)'))
+    for result in results:
+        print("{payload:<10} {out_of_band!s:<12} {copy!s:<6} "
+              "{send_time:>10.3f} "
+              "{send_peak_mb:>12.1f} {recv_time:>10.3f} "
+              "{recv_peak_mb:>12.1f}".format(**result))
+
+    print()
+    print("Send through the IOPub thread")
+    print("{:<10} {:<6} {:>10} {:>12}".format(
+        'payload', 'copy', 'send (s)', 'send (MB)'))
+    for result in iopub_results:
+        print("{payload:<10} {copy!s:<6} {send_time:>10.3f} "
+              "{send_peak_mb:>12.1f}".format(**result))
+
+
+if __name__ == '__main__':
+    main()
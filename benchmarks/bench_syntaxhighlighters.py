@@ -0,0 +1,364 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Benchmark of the syntax highlighters of the editor.
+
+Times highlighting a whole document, the rehighlight after typing a
+character in the middle of it and the rehighlight after changing the color
+scheme, for generated documents of several sizes. It runs with an offscreen
+Qt platform, so it doesn't need a display.
+
+Results can be saved as JSON and compared with the ones of another commit,
+in which case the exit status is 1 if any measure got slower than allowed
+by the tolerance.
+
+Usage:
+
+    python benchmarks/bench_syntaxhighlighters.py [--lines 1000 10000 100000]
+                                                  [--highlighters python ...]
+                                                  [--repeat 3]
+                                                  [--output results.json]
+                                                  [--compare baseline.json]
+                                                  [--tolerance 0.2]
+"""
+
+# Standard library imports
+import argparse
+import json
+import os
+import os.path as osp
+import platform
+import subprocess
+import sys
+import time
+
+# Highlighters must be created without a display
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+# Third party imports
+import pygments
+from qtpy import API_NAME, QT_VERSION
+from qtpy.QtGui import QTextCursor, QTextDocument
+from qtpy.QtWidgets import QApplication, QPlainTextDocumentLayout
+
+# Local imports
+from spyder.utils import syntaxhighlighters as sh
+
+
+# Code repeated to generate the documents of each highlighter, with `{i}`
+# replaced by the number of the repetition
+PYTHON_CODE = '''\
+# %% Cell {i}
+import os.path as osp
+from collections import OrderedDict
+
+
+@property
+def function_{i}(arg, *args, flag=True, **kwargs):
+    """
+    Docstring of function {i}, with 'quotes' and "double quotes".
+    """
+    value = arg + {i} * 2.5 - 0x1F + 1e-3j
+    text = f"item {{value}}" + 'single' + r'\\d+' + b"bytes"
+    if value is not None and flag:  # Comment
+        return [x ** 2 for x in range(int(value)) if x % 2]
+    raise ValueError("Invalid value: %s" % value)
+
+
+class Class{i}(object):
+    attribute = {{'key': [1, 2, 3], "other": None, 3: True}}
+
+    def method(self, other):
+        return self.attribute.get(other, False) or len(other)
+
+'''
+
+CPP_CODE = '''\
+#include <vector>
+#define SIZE_{i} {i}
+
+/* Multiline comment of the
+   block number {i} */
+template <typename T>
+class Class{i} : public Base {{
+public:
+    int method(const std::vector<T>& items) const {{
+        int total = 0x{i}; // Comment
+        for (size_t i = 0; i < items.size(); ++i) {{
+            total += items[i] * 2.5f;
+        }}
+        printf("%d items\\n", total);
+        return total > 0 ? total : -1;
+    }}
+}};
+
+'''
+
+FORTRAN_CODE = '''\
+! Module number {i}
+module module_{i}
+  implicit none
+  integer, parameter :: size_{i} = {i}
+contains
+  subroutine compute_{i}(values, total)
+    real(kind=8), intent(in) :: values(:)
+    real(kind=8), intent(out) :: total
+    integer :: i
+    total = 0.0d0
+    do i = 1, size(values)
+      if (values(i) > 0.5d0 .and. i /= {i}) then
+        total = total + values(i) ** 2
+      end if
+    end do
+    write(*, '(A, F10.3)') "Total: ", total
+  end subroutine compute_{i}
+end module module_{i}
+
+'''
+
+MARKDOWN_CODE = '''\
+# Section {i}
+
+Some *emphasized* and **strong** text with `inline code`, a
+[link](https://www.spyder-ide.org/{i}) and ~~struck~~ words.
+
+- First item of list {i}
+- Second item with __underscores__
+  1. Nested numbered item
+
+> Quoted text in block {i}
+
+```python
+def function_{i}():
+    return {i}
+```
+
+'''
+
+JAVASCRIPT_CODE = '''\
+// Module number {i}
+import {{ helper }} from './helper_{i}.js';
+
+/* Multiline comment
+   of block {i} */
+export class Class{i} extends Base {{
+    constructor(items = []) {{
+        super();
+        this.items = items.map((x) => x * {i} + 0.5);
+        this.name = `class ${{this.items.length}}` + 'single' + "double";
+    }}
+
+    get total() {{
+        return this.items.reduce((a, b) => a + b, 0) || null;
+    }}
+}}
+
+'''
+
+HIGHLIGHTERS = {
+    'python': (sh.PythonSH, PYTHON_CODE),
+    'cpp': (sh.CppSH, CPP_CODE),
+    'fortran': (sh.FortranSH, FORTRAN_CODE),
+    'markdown': (sh.MarkdownSH, MARKDOWN_CODE),
+    'pygments': (sh.guess_pygments_highlighter('bench.js'), JAVASCRIPT_CODE),
+}
+
+# Measures of each highlighter and document size
+MEASURES = ('full', 'keystroke', 'color_scheme')
+
+# Differences below this are ignored when comparing results, since they are
+# mostly noise
+MIN_DIFFERENCE = 1e-3
+
+
+def generate_text(code, lines):
+    """Return a document of `lines` lines made by repeating `code`."""
+    code_lines = code.splitlines()
+    repetitions = lines // len(code_lines) + 1
+    text_lines = []
+    for i in range(repetitions):
+        text_lines.extend(code.format(i=i).splitlines())
+    return '\n'.join(text_lines[:lines])
+
+
+def finish_highlighting(highlighter):
+    """Process events until the highlighter finished its pending work."""
+    app = QApplication.instance()
+    if isinstance(highlighter, sh.PygmentsSH):
+        # The editor asks for the document to be lexed after typing
+        highlighter.make_charlist()
+        while highlighter._lex_timer.isActive():
+            app.processEvents()
+    app.processEvents()
+
+
+def create_document(text):
+    """Create a document like the ones of the editor."""
+    document = QTextDocument()
+    document.setDocumentLayout(QPlainTextDocumentLayout(document))
+    document.setPlainText(text)
+    return document
+
+
+def measure_full(highlighter_class, text):
+    """Return the time to highlight a new document."""
+    document = create_document(text)
+    start = time.perf_counter()
+    highlighter = highlighter_class(document, color_scheme='Spyder')
+    highlighter.rehighlight()
+    finish_highlighting(highlighter)
+    return time.perf_counter() - start, document, highlighter
+
+
+def measure_keystroke(highlighter, document):
+    """Return the time to rehighlight after typing in the middle."""
+    block = document.findBlockByNumber(document.blockCount() // 2)
+    cursor = QTextCursor(block)
+    cursor.movePosition(QTextCursor.EndOfBlock)
+
+    start = time.perf_counter()
+    cursor.insertText('x')
+    finish_highlighting(highlighter)
+    elapsed = time.perf_counter() - start
+
+    cursor.deletePreviousChar()
+    finish_highlighting(highlighter)
+    return elapsed
+
+
+def measure_color_scheme(highlighter, color_scheme):
+    """Return the time to rehighlight after changing the color scheme."""
+    start = time.perf_counter()
+    highlighter.set_color_scheme(color_scheme)
+    finish_highlighting(highlighter)
+    return time.perf_counter() - start
+
+
+def run(names, sizes, repeat):
+    """Run the benchmark and return its results as a list of dicts."""
+    results = []
+    for name in names:
+        highlighter_class, code = HIGHLIGHTERS[name]
+        for lines in sizes:
+            text = generate_text(code, lines)
+            times = {measure: [] for measure in MEASURES}
+            for __ in range(repeat):
+                elapsed, document, highlighter = measure_full(
+                    highlighter_class, text)
+                times['full'].append(elapsed)
+                times['keystroke'].append(
+                    measure_keystroke(highlighter, document))
+                times['color_scheme'].append(
+                    measure_color_scheme(highlighter, 'Monokai'))
+                highlighter.setDocument(None)
+
+            for measure in MEASURES:
+                results.append({
+                    'highlighter': name,
+                    'class': highlighter_class.__name__,
+                    'lines': lines,
+                    'measure': measure,
+                    'time': min(times[measure]),
+                })
+    return results
+
+
+def get_metadata():
+    """Return information about where the benchmark was run."""
+    try:
+        commit = subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], cwd=osp.dirname(__file__),
+            stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'qt_api': API_NAME,
+        'qt': QT_VERSION,
+        'pygments': pygments.__version__,
+        'platform': platform.platform(),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """
+    Print the ratio of each result to the same one in `baseline`.
+
+    Return the results that are slower than allowed by `tolerance`.
+    """
+    def key(result):
+        return result['highlighter'], result['lines'], result['measure']
+
+    baseline_times = {key(result): result['time'] for result in baseline}
+    regressions = []
+
+    print("{:<11} {:>8} {:<13} {:>10} {:>10} {:>7}".format(
+        'highlighter', 'lines', 'measure', 'base (s)', 'new (s)', 'ratio'))
+    for result in results:
+        base_time = baseline_times.get(key(result))
+        if base_time is None:
+            continue
+        ratio = result['time'] / base_time if base_time else float('inf')
+        regressed = (result['time'] > base_time * (1 + tolerance) and
+                     result['time'] - base_time > MIN_DIFFERENCE)
+        if regressed:
+            regressions.append(result)
+        print("{:<11} {:>8} {:<13} {:>10.4f} {:>10.4f} {:>7.2f}{}".format(
+            result['highlighter'], result['lines'], result['measure'],
+            base_time, result['time'], ratio, ' *' if regressed else ''))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--lines', type=int, nargs='+',
+                        default=[1000, 10000, 100000],
+                        help="Number of lines of the documents")
+    parser.add_argument('--highlighters', nargs='+',
+                        choices=sorted(HIGHLIGHTERS),
+                        default=list(HIGHLIGHTERS),
+                        help="Highlighters to benchmark")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="Number of repetitions of each measure")
+    parser.add_argument('--output',
+                        help="Save results as JSON to this file")
+    parser.add_argument('--compare',
+                        help="Compare results with the ones saved in this "
+                             "file")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Allowed slowdown when comparing results, as a "
+                             "fraction of the previous time")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    results = run(args.highlighters, args.lines, args.repeat)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'metadata': get_metadata(), 'results': results}, f,
+                      indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\n{} measures are slower than allowed".format(
+                len(regressions)))
+            sys.exit(1)
+        return
+
+    print("{:<11} {:<18} {:>8} {:<13} {:>10}".format(
+        'highlighter', 'class', 'lines', 'measure', 'time (s)'))
+    for result in results:
+        print("{highlighter:<11} {class:<18} {lines:>8} {measure:<13} "
+              "{time:>10.4f}".format(**result))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+# Copyright 2021- Python Language Server Contributors.
+
+"""Long-lived process that runs a linter on documents sent by pylsp.
+
+This file is run as a script with the interpreter of the linter, which may
+not have pylsp installed, so it must only import the standard library and
+the linter.
+
+The linter is imported once when the process starts. Then each line of
+stdin is a JSON request with the arguments of the linter and the text of a
+document, and a JSON response with the output of the linter is written to
+stdout for each of them.
+"""
+import io
+import json
+import os
+import sys
+import traceback
+
+# Files of the modules cached by astroid and their mtime and size, to drop
+# the ones that changed before running pylint again
+_astroid_files = {}
+
+
+def _redirect_std(source):
+    """Replace the standard streams by in-memory ones."""
+    streams = (sys.stdin, sys.stdout, sys.stderr)
+    sys.stdin = io.TextIOWrapper(io.BytesIO((source or '').encode('utf-8')), encoding='utf-8')
+    sys.stdout = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+    sys.stderr = io.StringIO()
+    return streams
+
+
+def _restore_std(streams):
+    """Restore the standard streams and return what was written to them."""
+    sys.stdout.flush()
+    stdout = sys.stdout.buffer.getvalue().decode('utf-8', 'replace')
+    stderr = sys.stderr.getvalue()
+    sys.stdin, sys.stdout, sys.stderr = streams
+    return stdout, stderr
+
+
+def _file_state(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime, stat.st_size
+
+
+def _forget_changed_modules():
+    """Remove the modules whose files changed from the cache of astroid."""
+    from astroid import MANAGER  # pylint: disable=import-outside-toplevel
+
+    for modname, module in list(MANAGER.astroid_cache.items()):
+        path = getattr(module, 'file', None)
+        if not path:
+            continue
+        state = _file_state(path)
+        if path not in _astroid_files:
+            _astroid_files[path] = state
+        elif _astroid_files[path] != state:
+            del MANAGER.astroid_cache[modname]
+            del _astroid_files[path]
+
+
+def run_flake8(args):
+    # pylint: disable=import-outside-toplevel
+    from flake8 import utils
+    from flake8.main import application
+
+    # flake8 caches the text read from stdin
+    cache_clear = getattr(utils.stdin_get_value, 'cache_clear', None)
+    if cache_clear is not None:
+        cache_clear()
+    application.Application().run(args)
+
+
+def run_pylint(args):
+    from pylint.lint import Run  # pylint: disable=import-outside-toplevel
+
+    _forget_changed_modules()
+    try:
+        Run(args, exit=False)
+    except SystemExit:
+        pass
+    _forget_changed_modules()
+
+
+LINTERS = {
+    'flake8': ('flake8.main.application', run_flake8),
+    'pylint': ('pylint.lint', run_pylint),
+}
+
+
+def main():
+    linter = sys.argv[1]
+    module, run = LINTERS[linter]
+
+    # Linters could write to stdout outside of runs (e.g. when importing
+    # plugins), so responses are written to a copy of it and stdout is sent
+    # to stderr.
+    responses = os.fdopen(os.dup(sys.stdout.fileno()), 'w', encoding='utf-8')
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    try:
+        __import__(module)
+    except Exception:  # pylint: disable=broad-except
+        responses.write(json.dumps({'error': traceback.format_exc()}) + '\n')
+        responses.flush()
+        return
+    responses.write(json.dumps({'ready': True}) + '\n')
+    responses.flush()
+
+    for line in sys.stdin.buffer:
+        request = json.loads(line.decode('utf-8'))
+        streams = _redirect_std(request.get('source'))
+        try:
+            run(request['args'])
+            error = None
+        except Exception:  # pylint: disable=broad-except
+            error = traceback.format_exc()
+        finally:
+            stdout, stderr = _restore_std(streams)
+
+        response = {'stdout': stdout, 'stderr': stderr}
+        if error is not None:
+            response['error'] = error
+        responses.write(json.dumps(response) + '\n')
+        responses.flush()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,268 @@
+# Copyright 2021- Python Language Server Contributors.
+
+"""Pool of long-lived processes that run linters on documents.
+
+Starting a linter for every lint of a document means paying for the start
+of an interpreter and the import of the linter and its plugins each time.
+Instead, documents are sent to processes that run ``_lint_worker.py`` with
+the interpreter of the linter, which keep it loaded between lints.
+
+Lints of different documents run in parallel in different workers. When a
+newer lint of a document is requested, the older ones that are still waiting
+for a worker are cancelled and the results of the ones that are running are
+discarded, by raising ``JobCancelled``.
+"""
+import atexit
+import functools
+import json
+import logging
+import os
+import shlex
+import shutil
+import subprocess
+import threading
+
+log = logging.getLogger(__name__)
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(__file__), '_lint_worker.py')
+
+# Maximum number of workers, for all the linters
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+# Workers are restarted after this number of lints, to release the memory
+# the linters keep between runs
+MAX_JOBS_PER_WORKER = 500
+
+
+class JobCancelled(Exception):
+    """A newer lint of the same document was requested."""
+
+
+@functools.lru_cache(maxsize=None)
+def find_interpreter(executable):  # pylint: disable=too-many-return-statements
+    """Return the Python interpreter that runs the script ``executable``.
+
+    Returns None if it can't be found, e.g. because ``executable`` is not a
+    Python script.
+    """
+    path = shutil.which(executable)
+    if path is None:
+        return None
+    path = os.path.realpath(path)
+
+    if os.name == 'nt':
+        # Scripts are launchers next to the interpreter, or in the Scripts
+        # directory of the environment
+        directory = os.path.dirname(path)
+        for candidate in (directory, os.path.dirname(directory)):
+            interpreter = os.path.join(candidate, 'python.exe')
+            if os.path.isfile(interpreter):
+                return interpreter
+        return None
+
+    try:
+        with open(path, 'rb') as script:
+            first_line = script.readline(1024).decode('utf-8', 'replace')
+    except OSError:
+        return None
+    if not first_line.startswith('#!'):
+        return None
+    command = shlex.split(first_line[2:].strip())
+    if command and os.path.basename(command[0]) == 'env':
+        command = [shutil.which(arg) for arg in command[1:]
+                   if not arg.startswith('-')]
+    if not command or not command[0] or not os.path.isfile(command[0]):
+        return None
+    return command[0]
+
+
+class LintWorker:
+    """Process running ``_lint_worker.py`` for a linter."""
+
+    def __init__(self, interpreter, linter):
+        self.interpreter = interpreter
+        self.linter = linter
+        self.jobs = 0
+        # stderr is inherited, so that errors of the linter outside of lints
+        # end up in the log of pylsp
+        self.process = subprocess.Popen(  # pylint: disable=consider-using-with
+            [interpreter, WORKER_SCRIPT, linter],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE
+        )
+        ready = self._read()
+        if ready is None or 'error' in ready:
+            self.close()
+            raise RuntimeError(
+                "Can't start {} with {}: {}".format(
+                    linter, interpreter, ready and ready['error']))
+
+    def _read(self):
+        line = self.process.stdout.readline()
+        if not line:
+            return None
+        return json.loads(line.decode('utf-8'))
+
+    def run(self, args, source):
+        """Run the linter and return its output, or None if the worker died."""
+        self.jobs += 1
+        request = json.dumps({'args': args, 'source': source}) + '\n'
+        try:
+            self.process.stdin.write(request.encode('utf-8'))
+            self.process.stdin.flush()
+            return self._read()
+        except (OSError, ValueError):
+            return None
+
+    def close(self):
+        if self.process.poll() is None:
+            try:
+                self.process.stdin.close()
+                self.process.wait(timeout=1)
+            except (OSError, subprocess.TimeoutExpired):
+                self.process.kill()
+        self.process.stdout.close()
+
+
+class LintWorkerPool:
+    """Workers for the linters, shared by all the lints."""
+
+    def __init__(self, max_workers=MAX_WORKERS):
+        self.max_workers = max_workers
+        self._condition = threading.Condition()
+        # Idle workers by (interpreter, linter)
+        self._idle = {}
+        self._busy = 0
+        # Id of the last job requested for each (linter, path)
+        self._latest = {}
+        self._last_id = 0
+        # Interpreters whose workers couldn't be started, by linter
+        self._unavailable = set()
+
+    def _count(self):
+        return self._busy + sum(len(workers) for workers in self._idle.values())
+
+    def _acquire(self, key, job_key, job_id):
+        """Wait until there is a worker for ``key`` or the job is cancelled."""
+        with self._condition:
+            while True:
+                if self._latest.get(job_key) != job_id:
+                    raise JobCancelled()
+                if self._idle.get(key):
+                    self._busy += 1
+                    return self._idle[key].pop()
+                if self._count() < self.max_workers:
+                    break
+                # Make room by closing an idle worker of another linter
+                other = next((k for k, workers in self._idle.items() if workers),
+                             None)
+                if other is not None:
+                    self._idle[other].pop().close()
+                    break
+                self._condition.wait()
+            self._busy += 1
+
+        try:
+            return LintWorker(*key)
+        except (OSError, RuntimeError) as error:
+            log.warning("Running %s in a subprocess for each lint: %s", key[1], error)
+            with self._condition:
+                self._unavailable.add(key)
+                self._busy -= 1
+                self._condition.notify_all()
+            return None
+
+    def _release(self, key, worker, healthy):
+        with self._condition:
+            self._busy -= 1
+            if healthy and worker.jobs < MAX_JOBS_PER_WORKER:
+                self._idle.setdefault(key, []).append(worker)
+            else:
+                worker.close()
+            self._condition.notify_all()
+
+    def run(self, interpreter, linter, args, path, source=None):
+        """Run ``linter`` on the document at ``path`` and return its output.
+
+        Returns None if the linter can't be run in a worker.
+        """
+        key = (interpreter, linter)
+        job_key = (linter, path)
+        with self._condition:
+            if key in self._unavailable:
+                return None
+            self._last_id += 1
+            job_id = self._last_id
+            self._latest[job_key] = job_id
+            # Wake up older jobs of the document so that they are cancelled
+            self._condition.notify_all()
+
+        try:
+            worker = self._acquire(key, job_key, job_id)
+            if worker is None:
+                return None
+            response = worker.run(args, source)
+            self._release(key, worker, response is not None)
+        finally:
+            with self._condition:
+                if self._latest.get(job_key) == job_id:
+                    del self._latest[job_key]
+                    cancelled = False
+                else:
+                    cancelled = True
+
+        if response is None:
+            log.warning("The %s worker exited while linting %s", linter, path)
+            return None
+        if response['stderr']:
+            log.error("Error while running %s '%s'", linter, response['stderr'])
+        if 'error' in response:
+            log.error("Error while running %s '%s'", linter, response['error'])
+        if cancelled:
+            raise JobCancelled()
+        return response['stdout']
+
+    def close(self):
+        with self._condition:
+            for workers in self._idle.values():
+                for worker in workers:
+                    worker.close()
+            self._idle.clear()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the pool of workers, creating it on first use."""
+    global _pool  # pylint: disable=global-statement
+    with _pool_lock:
+        if _pool is None:
+            _pool = LintWorkerPool()
+            atexit.register(_pool.close)
+        return _pool
+
+
+def run_linter(linter, executable, args, path, source=None):
+    """Run a linter in a worker with the interpreter of ``executable``.
+
+    Args:
+        linter: 'flake8' or 'pylint'.
+        executable: the script of the linter, or a Python interpreter
+            where it's installed.
+        args: command line arguments of the linter.
+        path: path of the linted document, used to cancel older lints.
+        source: text sent to the stdin of the linter.
+
+    Returns:
+        The output of the linter, or None if it can't be run in a worker and
+        has to be run in a subprocess instead.
+    """
+    if os.path.basename(executable).lower().startswith('python'):
+        interpreter = shutil.which(executable)
+    else:
+        interpreter = find_interpreter(executable)
+    if interpreter is None:
+        return None
+    log.debug("Calling %s in a worker with args: '%s'", linter, args)
+    return get_pool().run(interpreter, linter, args, path, source)
@@ -0,0 +1,132 @@
+# Copyright 2017-2020 Palantir Technologies, Inc.
+# Copyright 2021- Python Language Server Contributors.
+
+"""Line-indexed text buffer backing open documents.
+
+Documents are kept as a list of chunks of lines, so an edit only has to
+re-split the lines it touches and rebuild the chunk it falls in, instead of
+the whole document. Line and offset lookups go through cumulative line and
+character counts per chunk, which are bisected.
+"""
+import bisect
+import itertools
+
+# Number of lines of a chunk. Chunks are split when they get twice as big.
+CHUNK_SIZE = 512
+
+
+class TextBuffer:
+    """Text split in lines with the same semantics as ``str.splitlines(True)``."""
+
+    def __init__(self, text=''):
+        lines = text.splitlines(True)
+        self._chunks = []
+        self._chunk_chars = []
+        self._line_starts = None
+        self._char_starts = None
+        self._set_chunks(0, 0, list(lines))
+        self._text = text
+        self._lines = lines
+
+    def __len__(self):
+        """Return the number of lines."""
+        self._build_index()
+        return self._line_starts[-1]
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = ''.join(itertools.chain.from_iterable(self._chunks))
+        return self._text
+
+    @property
+    def lines(self):
+        if self._lines is None:
+            self._lines = list(itertools.chain.from_iterable(self._chunks))
+        return self._lines
+
+    def line(self, line):
+        """Return a line, including its line break."""
+        chunk, index = self._locate(line)
+        return self._chunks[chunk][index]
+
+    def offset_at(self, line, character):
+        """Return the offset of a line and character in the text."""
+        self._build_index()
+        if line >= len(self):
+            return self._char_starts[-1] + character
+        chunk, index = self._locate(line)
+        lines = self._chunks[chunk]
+        return self._char_starts[chunk] + sum(map(len, lines[:index])) + character
+
+    def replace(self, start_line, start_col, end_line, end_col, text):
+        """Replace the text between two positions."""
+        num_lines = len(self)
+        if start_line >= num_lines:
+            # Edit at the very end of the file
+            start_line = end_line = max(num_lines - 1, 0)
+            start_col = end_col = len(self.line(start_line)) if num_lines else 0
+        elif end_line >= num_lines:
+            end_line = num_lines - 1
+            end_col = len(self.line(end_line))
+
+        # Re-split the edited lines together with their neighbours, since
+        # the edit can join them (e.g. by removing a line break or adding a
+        # '\n' right after a '\r').
+        first = max(start_line - 1, 0)
+        last = min(end_line + 1, num_lines - 1)
+        parts = [self.line(i) for i in range(first, start_line)]
+        if num_lines:
+            parts.append(self.line(start_line)[:start_col])
+        parts.append(text)
+        if num_lines:
+            parts.append(self.line(end_line)[end_col:])
+        parts.extend(self.line(i) for i in range(end_line + 1, last + 1))
+
+        self._splice(first, last + 1 if num_lines else 0, ''.join(parts).splitlines(True))
+
+    def _locate(self, line):
+        """Return the chunk of a line and its index in the chunk."""
+        self._build_index()
+        if not 0 <= line < len(self):
+            raise IndexError('line out of range')
+        chunk = bisect.bisect_right(self._line_starts, line) - 1
+        return chunk, line - self._line_starts[chunk]
+
+    def _build_index(self):
+        if self._line_starts is None:
+            self._line_starts = [0]
+            self._line_starts.extend(itertools.accumulate(len(c) for c in self._chunks))
+            self._char_starts = [0]
+            self._char_starts.extend(itertools.accumulate(self._chunk_chars))
+
+    def _splice(self, start, end, lines):
+        """Replace lines ``start`` to ``end`` (exclusive) by ``lines``."""
+        self._text = None
+        self._lines = None
+
+        if not self._chunks:
+            self._set_chunks(0, 0, lines)
+            return
+
+        # Merge the chunks spanned by the edited lines and split them again
+        # if they got too big.
+        first_chunk, start_index = self._locate(start)
+        last_chunk = first_chunk if end == start else self._locate(end - 1)[0]
+        offset = self._line_starts[first_chunk]
+        merged = list(itertools.chain.from_iterable(self._chunks[first_chunk:last_chunk + 1]))
+        merged[start_index:end - offset] = lines
+
+        self._set_chunks(first_chunk, last_chunk + 1, merged)
+
+    def _set_chunks(self, start, end, lines):
+        """Replace chunks ``start`` to ``end`` (exclusive) by chunks of ``lines``."""
+        if len(lines) >= 2 * CHUNK_SIZE:
+            chunks = [lines[i:i + CHUNK_SIZE] for i in range(0, len(lines), CHUNK_SIZE)]
+        elif lines:
+            chunks = [lines]
+        else:
+            chunks = []
+        self._chunks[start:end] = chunks
+        self._chunk_chars[start:end] = [sum(map(len, chunk)) for chunk in chunks]
+        self._line_starts = None
@@ -100,7 +100,7 @@ def pylsp_initialize(config, workspace):
 
 
 @hookspec
-def pylsp_initialized():
+def pylsp_initialized(config, workspace):
     pass
 
 
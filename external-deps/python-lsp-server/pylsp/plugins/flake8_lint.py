@@ -5,11 +5,12 @@
 import logging
 import os.path
 import re
+import shutil
 import sys
 from pathlib import PurePath
 from subprocess import PIPE, Popen
 
-from pylsp import hookimpl, lsp
+from pylsp import _lint_workers, hookimpl, lsp
 
 log = logging.getLogger(__name__)
 FIX_IGNORES_RE = re.compile(r'([^a-zA-Z0-9_,]*;.*(\W+||$))')
@@ -77,6 +78,16 @@ def run_flake8(flake8_executable, args, document):
             os.path.expanduser(os.path.expandvars(flake8_executable))
         )
 
+    # Run flake8 in a worker that keeps it loaded if possible
+    if shutil.which(flake8_executable) is None and os.sep not in flake8_executable:
+        worker_executable = sys.executable
+    else:
+        worker_executable = flake8_executable
+    stdout = _lint_workers.run_linter(
+        'flake8', worker_executable, args, document.path, document.source)
+    if stdout is not None:
+        return stdout
+
     log.debug("Calling %s with args: '%s'", flake8_executable, args)
     try:
         cmd = [flake8_executable]
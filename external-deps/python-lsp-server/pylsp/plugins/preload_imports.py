@@ -2,6 +2,11 @@
 # Copyright 2021- Python Language Server Contributors.
 
 import logging
+import sys
+import time
+
+import jedi
+
 from pylsp import hookimpl
 
 log = logging.getLogger(__name__)
@@ -37,3 +42,25 @@ def pylsp_initialize(config):
             # For example, old versions of NumPy can cause a ValueError.
             # See spyder-ide/spyder#13985
             pass
+
+
+@hookimpl
+def pylsp_initialized(config):
+    # Parse the preloaded modules with Jedi, so the first completions on
+    # them don't have to do it. That takes seconds for large libraries and
+    # blocks the server, so it's opt-in and done after the initialize reply.
+    settings = config.plugin_settings('preload')
+    if not settings.get('warmJedi', False):
+        return
+
+    for mod_name in settings.get('modules', []):
+        if mod_name not in sys.modules:
+            # It couldn't be preloaded
+            continue
+        start = time.perf_counter()
+        try:
+            jedi.preload_module(mod_name)
+        except Exception:  # pylint: disable=broad-except
+            log.debug("Failed to warm up Jedi for module %s", mod_name)
+            continue
+        log.debug("Warmed up Jedi for module %s in %.1f ms", mod_name, (time.perf_counter() - start) * 1000)
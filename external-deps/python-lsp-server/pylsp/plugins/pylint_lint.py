@@ -7,11 +7,12 @@
 import logging
 import sys
 import re
+import shlex
 from subprocess import Popen, PIPE
 import os
 
 from pylint.epylint import py_run
-from pylsp import hookimpl, lsp
+from pylsp import _lint_workers, hookimpl, lsp
 
 try:
     import ujson as json
@@ -79,15 +80,23 @@ def lint(cls, document, is_saved, flags=''):
             path = path.replace('\\', '/')
 
         pylint_call = '{} -f json {}'.format(path, flags)
-        log.debug("Calling pylint with '%s'", pylint_call)
-        json_out, err = py_run(pylint_call, return_std=True)
 
-        # Get strings
-        json_out = json_out.getvalue()
-        err = err.getvalue()
+        # Run pylint in a worker that keeps it loaded if possible
+        json_out = _lint_workers.run_linter(
+            'pylint', sys.executable,
+            shlex.split(pylint_call, posix=not sys.platform.startswith('win')),
+            document.path)
 
-        if err != '':
-            log.error("Error calling pylint: '%s'", err)
+        if json_out is None:
+            log.debug("Calling pylint with '%s'", pylint_call)
+            json_out, err = py_run(pylint_call, return_std=True)
+
+            # Get strings
+            json_out = json_out.getvalue()
+            err = err.getvalue()
+
+            if err != '':
+                log.error("Error calling pylint: '%s'", err)
 
         # pylint prints nothing rather than [] when there are no diagnostics.
         # json.loads will not parse an empty string, so just return.
@@ -229,7 +238,7 @@ def pylint_lint_stdin(pylint_executable, document, flags):
 
 
 def _run_pylint_stdio(pylint_executable, document, flags):
-    """Run pylint in popen.
+    """Run pylint in a worker, or in popen if that's not possible.
 
     :param pylint_executable: path to pylint executable
     :type pylint_executable: string
@@ -241,6 +250,13 @@ def _run_pylint_stdio(pylint_executable, document, flags):
     :return: result of calling pylint
     :rtype: string
     """
+    # Run pylint in a worker that keeps it loaded if possible
+    stdout = _lint_workers.run_linter(
+        'pylint', pylint_executable, flags + ['--from-stdin', document.path],
+        document.path, document.source)
+    if stdout is not None:
+        return stdout
+
     log.debug("Calling %s with args: '%s'", pylint_executable, flags)
     try:
         cmd = [pylint_executable]
@@ -12,6 +12,7 @@
 from pylsp_jsonrpc.streams import JsonRpcStreamReader, JsonRpcStreamWriter
 
 from . import lsp, _utils, uris
+from ._lint_workers import JobCancelled
 from .config import config
 from .workspace import Workspace
 from ._version import __version__
@@ -294,10 +295,13 @@ def lint(self, doc_uri, is_saved):
         # Since we're debounced, the document may no longer be open
         workspace = self._match_uri_to_workspace(doc_uri)
         if doc_uri in workspace.documents:
-            workspace.publish_diagnostics(
-                doc_uri,
-                flatten(self._hook('pylsp_lint', doc_uri, is_saved=is_saved))
-            )
+            try:
+                diagnostics = flatten(self._hook('pylsp_lint', doc_uri, is_saved=is_saved))
+            except JobCancelled:
+                # A newer lint of the document will publish its diagnostics
+                log.debug("Lint of %s cancelled by a newer one", doc_uri)
+                return
+            workspace.publish_diagnostics(doc_uri, diagnostics)
 
     def references(self, doc_uri, position, exclude_declaration):
         return flatten(self._hook(
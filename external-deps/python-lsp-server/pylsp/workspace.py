@@ -6,11 +6,14 @@
 import os
 import re
 import functools
+import time
+from collections import Counter
 from threading import RLock
 
 import jedi
 
 from . import lsp, uris, _utils
+from ._text_buffer import TextBuffer
 
 log = logging.getLogger(__name__)
 
@@ -45,6 +48,12 @@ def __init__(self, root_uri, endpoint, config=None):
         # Cache jedi environments
         self._environments = {}
 
+        # Cache jedi environments and projects by the settings used to create them
+        self._jedi_projects = {}
+
+        # Number of jedi scripts reused or created, and the time spent getting them
+        self._jedi_script_stats = Counter()
+
         # Whilst incubating, keep rope private
         self.__rope = None
         self.__rope_config = None
@@ -67,6 +76,15 @@ def _rope_project_builder(self, rope_config):
     def documents(self):
         return self._docs
 
+    @property
+    def jedi_script_stats(self):
+        """Return the counters of the jedi scripts requested by documents.
+
+        ``hits`` and ``misses`` count the scripts that were reused or had to be
+        created, and ``hit_time`` and ``miss_time`` the seconds spent on them.
+        """
+        return dict(self._jedi_script_stats)
+
     @property
     def root_path(self):
         return self._root_path
@@ -144,10 +162,14 @@ def __init__(self, uri, workspace, source=None, version=None, local=True, extra_
         self._workspace = workspace
         self._local = local
         self._source = source
+        self._buffer = TextBuffer(source) if source is not None else None
         self._extra_sys_path = extra_sys_path or []
         self._rope_project_builder = rope_project_builder
         self._lock = RLock()
 
+        # Jedi scripts of the current version, by the arguments of jedi_script
+        self._jedi_scripts = {}
+
     def __str__(self):
         return str(self.uri)
 
@@ -159,73 +181,70 @@ def _rope_resource(self, rope_config):
     @property
     @lock
     def lines(self):
-        return self.source.splitlines(True)
+        if self._buffer is None:
+            return self.source.splitlines(True)
+        return self._buffer.lines
 
     @property
     @lock
     def source(self):
-        if self._source is None:
+        if self._buffer is None:
             with io.open(self.path, 'r', encoding='utf-8') as f:
                 return f.read()
+        if self._source is None:
+            self._source = self._buffer.text
         return self._source
 
     def update_config(self, settings):
         self._config.update((settings or {}).get('pylsp', {}))
+        self._jedi_scripts.clear()
 
     @lock
     def apply_change(self, change):
         """Apply a change to the document."""
         text = change['text']
         change_range = change.get('range')
+        self._jedi_scripts.clear()
 
         if not change_range:
             # The whole file has changed
             self._source = text
+            self._buffer = TextBuffer(text)
             return
 
-        start_line = change_range['start']['line']
-        start_col = change_range['start']['character']
-        end_line = change_range['end']['line']
-        end_col = change_range['end']['character']
-
-        # Check for an edit occuring at the very end of the file
-        if start_line == len(self.lines):
-            self._source = self.source + text
-            return
-
-        new = io.StringIO()
-
-        # Iterate over the existing document until we hit the edit range,
-        # at which point we write the new text, then loop until we hit
-        # the end of the range and continue writing.
-        for i, line in enumerate(self.lines):
-            if i < start_line:
-                new.write(line)
-                continue
+        if self._buffer is None:
+            self._buffer = TextBuffer(self.source)
 
-            if i > end_line:
-                new.write(line)
-                continue
-
-            if i == start_line:
-                new.write(line[:start_col])
-                new.write(text)
-
-            if i == end_line:
-                new.write(line[end_col:])
-
-        self._source = new.getvalue()
+        self._buffer.replace(
+            change_range['start']['line'],
+            change_range['start']['character'],
+            change_range['end']['line'],
+            change_range['end']['character'],
+            text
+        )
+        # The source is joined again from the buffer when it's needed
+        self._source = None
 
+    @lock
     def offset_at_position(self, position):
         """Return the byte-offset pointed at by the given position."""
-        return position['character'] + len(''.join(self.lines[:position['line']]))
+        if self._buffer is None:
+            return position['character'] + len(''.join(self.lines[:position['line']]))
+        return self._buffer.offset_at(position['line'], position['character'])
 
+    @lock
     def word_at_position(self, position):
         """Get the word under the cursor returning the start and end positions."""
-        if position['line'] >= len(self.lines):
-            return ''
+        if self._buffer is None:
+            lines = self.lines
+            if position['line'] >= len(lines):
+                return ''
+            line = lines[position['line']]
+        else:
+            if position['line'] >= len(self._buffer):
+                return ''
+            line = self._buffer.line(position['line'])
 
-        line = self.lines[position['line']]
         i = position['character']
         # Split word in two
         start = line[:i]
@@ -246,8 +265,47 @@ def jedi_names(self, all_scopes=False, definitions=True, references=False):
 
     @lock
     def jedi_script(self, position=None, use_document_path=False):
-        extra_paths = []
+        start = time.perf_counter()
+        stats = self._workspace._jedi_script_stats
+
+        if position is None:
+            key = (self.version, use_document_path)
+            script = self._jedi_scripts.get(key)
+            if script is not None:
+                elapsed = time.perf_counter() - start
+                stats['hits'] += 1
+                stats['hit_time'] += elapsed
+                return script
+
+        environment, project = self._jedi_project(use_document_path)
+        kwargs = {
+            'code': self.source,
+            'path': self.path,
+            'environment': environment,
+            'project': project,
+        }
+
+        if position:
+            # Deprecated by Jedi to use in Script() constructor
+            kwargs += _utils.position_to_jedi_linecolumn(self, position)
+
+        script = jedi.Script(**kwargs)
+        if position is None:
+            self._jedi_scripts[key] = script
+
+        elapsed = time.perf_counter() - start
+        stats['misses'] += 1
+        stats['miss_time'] += elapsed
+        log.debug("Created jedi script for %s in %.1f ms", self.uri, elapsed * 1000)
+        return script
+
+    def _jedi_project(self, use_document_path=False):
+        """Return the jedi environment and project to use for this document.
+
+        They are cached in the workspace by the settings they depend on.
+        """
         environment_path = None
+        extra_paths = []
         env_vars = None
 
         if self._config:
@@ -256,10 +314,23 @@ def jedi_script(self, position=None, use_document_path=False):
             extra_paths = jedi_settings.get('extra_paths') or []
             env_vars = jedi_settings.get('env_vars')
 
+        key = (
+            environment_path,
+            tuple(extra_paths),
+            tuple(sorted(env_vars.items())) if env_vars is not None else None,
+            tuple(self._extra_sys_path),
+            os.path.dirname(self.path) if use_document_path else None,
+            self._workspace.root_path,
+        )
+        if key in self._workspace._jedi_projects:
+            return self._workspace._jedi_projects[key]
+
         # Drop PYTHONPATH from env_vars before creating the environment because that makes
         # Jedi throw an error.
         if env_vars is None:
             env_vars = os.environ.copy()
+        else:
+            env_vars = dict(env_vars)
         env_vars.pop('PYTHONPATH', None)
 
         environment = self.get_enviroment(environment_path, env_vars=env_vars) if environment_path else None
@@ -270,18 +341,9 @@ def jedi_script(self, position=None, use_document_path=False):
         if use_document_path:
             sys_path += [os.path.normpath(os.path.dirname(self.path))]
 
-        kwargs = {
-            'code': self.source,
-            'path': self.path,
-            'environment': environment,
-            'project': jedi.Project(path=project_path, sys_path=sys_path),
-        }
-
-        if position:
-            # Deprecated by Jedi to use in Script() constructor
-            kwargs += _utils.position_to_jedi_linecolumn(self, position)
-
-        return jedi.Script(**kwargs)
+        project = jedi.Project(path=project_path, sys_path=sys_path)
+        self._workspace._jedi_projects[key] = (environment, project)
+        return environment, project
 
     def get_enviroment(self, environment_path=None, env_vars=None):
         # TODO(gatesn): #339 - make better use of jedi environments, they seem pretty powerful
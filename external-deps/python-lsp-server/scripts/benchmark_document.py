@@ -0,0 +1,31 @@
+"""Measure the cost of applying a keystroke to documents of several sizes.
+
+Usage: python scripts/benchmark_document.py
+"""
+import timeit
+from types import SimpleNamespace
+
+from pylsp.workspace import Document
+
+
+def keystroke(doc, line):
+    doc.apply_change({'text': 'x', 'range': {
+        'start': {'line': line, 'character': 4},
+        'end': {'line': line, 'character': 4}
+    }})
+    doc.offset_at_position({'line': line, 'character': 5})
+    doc.word_at_position({'line': line, 'character': 5})
+
+
+def main():
+    workspace = SimpleNamespace(_config=None)
+    for num_lines in (1000, 10000, 100000):
+        source = ''.join('value_{0} = {0}\n'.format(i) for i in range(num_lines))
+        doc = Document('file:///benchmark.py', workspace, source)
+        number = 1000
+        total = timeit.timeit(lambda: keystroke(doc, num_lines // 2), number=number)
+        print('{:>7} lines: {:8.1f} us per keystroke'.format(num_lines, total / number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
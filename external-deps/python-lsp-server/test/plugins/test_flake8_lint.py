@@ -59,7 +59,8 @@ def test_flake8_lint(workspace):
 
 
 def test_flake8_config_param(workspace):
-    with patch('pylsp.plugins.flake8_lint.Popen') as popen_mock:
+    with patch('pylsp.plugins.flake8_lint.Popen') as popen_mock, \
+            patch('pylsp._lint_workers.run_linter', return_value=None):
         mock_instance = popen_mock.return_value
         mock_instance.communicate.return_value = [bytes(), bytes()]
         flake8_conf = '/tmp/some.cfg'
@@ -72,7 +73,8 @@ def test_flake8_config_param(workspace):
 
 
 def test_flake8_executable_param(workspace):
-    with patch('pylsp.plugins.flake8_lint.Popen') as popen_mock:
+    with patch('pylsp.plugins.flake8_lint.Popen') as popen_mock, \
+            patch('pylsp._lint_workers.run_linter', return_value=None):
         mock_instance = popen_mock.return_value
         mock_instance.communicate.return_value = [bytes(), bytes()]
 
@@ -117,7 +119,8 @@ def test_flake8_multiline(workspace):
     assert "exclude" in flake8_settings
     assert len(flake8_settings["exclude"]) == 2
 
-    with patch('pylsp.plugins.flake8_lint.Popen') as popen_mock:
+    with patch('pylsp.plugins.flake8_lint.Popen') as popen_mock, \
+            patch('pylsp._lint_workers.run_linter', return_value=None):
         mock_instance = popen_mock.return_value
         mock_instance.communicate.return_value = [bytes(), bytes()]
 
@@ -99,3 +99,59 @@ def test_document_end_of_file_edit(workspace):
         "print 'b'\n",
         "o",
     ]
+
+
+def test_document_edit_joins_lines(workspace):
+    doc = Document('file:///uri', workspace, 'a = 1\r\nb = 2\r')
+    # Removing a line break joins two lines
+    doc.apply_change({'text': '', 'range': {
+        'start': {'line': 0, 'character': 5},
+        'end': {'line': 1, 'character': 0}
+    }})
+    assert doc.lines == ['a = 1b = 2\r']
+    # Inserting '\n' after '\r' makes a single line break
+    doc.apply_change({'text': '\nc', 'range': {
+        'start': {'line': 1, 'character': 0},
+        'end': {'line': 1, 'character': 0}
+    }})
+    assert doc.lines == ['a = 1b = 2\r\n', 'c']
+    assert doc.source == 'a = 1b = 2\r\nc'
+
+
+def test_document_large_edits(workspace):
+    lines = ['line {}\n'.format(i) for i in range(5000)]
+    doc = Document('file:///uri', workspace, ''.join(lines))
+
+    # Remove lines spanning several chunks of the buffer
+    doc.apply_change({'text': 'new\n', 'range': {
+        'start': {'line': 100, 'character': 0},
+        'end': {'line': 3000, 'character': 0}
+    }})
+    lines[100:3000] = ['new\n']
+    assert doc.lines == lines
+    assert doc.source == ''.join(lines)
+
+    for line in (0, 100, 101, 2000, len(lines)):
+        assert doc.offset_at_position({'line': line, 'character': 2}) == (
+            len(''.join(lines[:line])) + 2)
+    assert doc.word_at_position({'line': 100, 'character': 1}) == 'new'
+    assert doc.word_at_position({'line': len(lines), 'character': 0}) == ''
+
+
+def test_jedi_script_cache(workspace):
+    doc = Document(DOC_URI, workspace, DOC, version=1)
+    script = doc.jedi_script()
+    assert doc.jedi_script() is script
+    assert doc.jedi_script(use_document_path=True) is not script
+
+    doc.apply_change({'text': 'import os\n'})
+    doc.version = 2
+    new_script = doc.jedi_script()
+    assert new_script is not script
+    assert new_script.get_names()[0].name == 'os'
+
+    # The jedi environment and project are reused for the new script
+    assert len(workspace._jedi_projects) == 2
+    stats = workspace.jedi_script_stats
+    assert stats['hits'] == 1
+    assert stats['misses'] == 3
@@ -0,0 +1,107 @@
+# Copyright 2021- Python Language Server Contributors.
+
+import os
+import sys
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from test import unix_only
+from pylsp import _lint_workers
+
+
+@unix_only
+def test_find_interpreter(tmpdir):
+    script = tmpdir.join('linter')
+    script.write('#!{}\nprint("linter")\n'.format(sys.executable))
+    os.chmod(str(script), 0o755)
+    assert _lint_workers.find_interpreter(str(script)) == sys.executable
+
+    not_python = tmpdir.join('not_python')
+    not_python.write('binary')
+    os.chmod(str(not_python), 0o755)
+    assert _lint_workers.find_interpreter(str(not_python)) is None
+    assert _lint_workers.find_interpreter('/not/a/linter') is None
+
+
+def test_run_flake8_in_worker():
+    pool = _lint_workers.LintWorkerPool()
+    try:
+        for source in ('import os\n', 'import sys\n'):
+            stdout = pool.run(sys.executable, 'flake8', ['-'], 'file.py', source)
+            assert "F401 '{}' imported but unused".format(source.split()[1]) in stdout
+
+        # The worker is kept for the next lints
+        assert len(pool._idle[(sys.executable, 'flake8')]) == 1
+    finally:
+        pool.close()
+
+
+def test_unavailable_linter():
+    pool = _lint_workers.LintWorkerPool()
+    assert pool.run(sys.executable, 'flake8', ['-'], 'file.py', '') is not None
+    pool.close()
+
+    with mock.patch.object(_lint_workers, 'WORKER_SCRIPT', 'not_a_script.py'):
+        assert pool.run(sys.executable, 'pylint', [], 'file.py') is None
+    assert (sys.executable, 'pylint') in pool._unavailable
+
+
+class BlockingWorker:
+    """Worker whose lints finish when ``release`` is set."""
+
+    release = None
+
+    def __init__(self, interpreter, linter):
+        self.jobs = 0
+
+    def run(self, args, source):
+        self.release.wait()
+        return {'stdout': source, 'stderr': ''}
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def blocking_pool():
+    BlockingWorker.release = threading.Event()
+    with mock.patch.object(_lint_workers, 'LintWorker', BlockingWorker):
+        yield _lint_workers.LintWorkerPool(max_workers=2)
+    BlockingWorker.release.set()
+
+
+def run_in_thread(pool, path, source, results):
+    def run():
+        try:
+            results[source] = pool.run('python', 'flake8', ['-'], path, source)
+        except _lint_workers.JobCancelled:
+            results[source] = 'cancelled'
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    # Give the job time to take a worker or start waiting for one
+    time.sleep(0.1)
+    return thread
+
+
+def test_cancel_stale_jobs(blocking_pool):
+    results = {}
+    threads = [
+        run_in_thread(blocking_pool, 'a.py', 'a1', results),
+        run_in_thread(blocking_pool, 'b.py', 'b1', results),
+        # Waits for a worker and is cancelled by the next one
+        run_in_thread(blocking_pool, 'c.py', 'c1', results),
+        run_in_thread(blocking_pool, 'c.py', 'c2', results),
+    ]
+    assert results == {'c1': 'cancelled'}
+
+    # The running lint of a.py is discarded when it finishes
+    threads.append(run_in_thread(blocking_pool, 'a.py', 'a2', results))
+    BlockingWorker.release.set()
+    for thread in threads:
+        thread.join()
+    assert results == {'a1': 'cancelled', 'a2': 'a2', 'b1': 'b1',
+                       'c1': 'cancelled', 'c2': 'c2'}
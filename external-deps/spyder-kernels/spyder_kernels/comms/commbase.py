@@ -21,6 +21,15 @@
 
 The buffer is generated by cloudpickle using `PICKLE_PROTOCOL = 2`.
 
+If both sides support pickle protocol 5 and announce it with the
+`out_of_band_buffers` key of their calls, large contiguous buffers (e.g. the
+data of NumPy arrays and DataFrame columns) are sent out-of-band, as
+additional buffers of the message. This avoids copying them into the pickled
+data. Messages are sent later by another thread, so those buffers are copied
+unless they belong to data that is not referenced anywhere else, e.g. the
+return value of call handlers registered with `returns_copy=True`, or the
+subclass can wait until they are sent, as `FrontendComm` does in the kernel.
+
 To simplify the usage of messaging, we use a higher level function calling
 mechanism:
     - The `remote_call` method returns a RemoteCallHandler object
@@ -70,6 +79,69 @@
 # Max timeout (in secs) for blocking calls
 TIMEOUT = 3
 
+# Pickle protocol that supports out-of-band buffers
+OUT_OF_BAND_PROTOCOL = 5
+
+# Smaller buffers are not worth sending out-of-band
+OUT_OF_BAND_MIN_SIZE = 64 * 1024
+
+
+def dumps_to_buffers(data, protocol, out_of_band=False, copy=True):
+    """
+    Pickle data into a list of buffers.
+
+    The first buffer is the pickled data. If `out_of_band` is True and
+    `protocol` supports it, the next ones are the large buffers of data
+    (e.g. the memory of NumPy arrays). They are only shared with `data`
+    instead of copied if `copy` is False, so `data` must not be modified
+    until they are sent in that case.
+    """
+    if not out_of_band or protocol < OUT_OF_BAND_PROTOCOL:
+        return [cloudpickle.dumps(data, protocol=protocol)]
+
+    buffers = []
+
+    def buffer_callback(pickle_buffer):
+        try:
+            raw = pickle_buffer.raw()
+        except BufferError:
+            # Non-contiguous buffer
+            return True
+        if raw.nbytes < OUT_OF_BAND_MIN_SIZE:
+            # Serialize in-band
+            return True
+        buffers.append(raw.tobytes() if copy else raw)
+        return False
+
+    try:
+        pickled = cloudpickle.dumps(data, protocol=protocol,
+                                    buffer_callback=buffer_callback)
+    except TypeError:
+        # Old cloudpickle versions don't support buffer_callback
+        return [cloudpickle.dumps(data, protocol=protocol)]
+
+    return [pickled] + buffers
+
+
+def loads_from_buffers(buffers):
+    """Unpickle data pickled by `dumps_to_buffers`."""
+    kwargs = {}
+    if PY3:
+        # https://docs.python.org/3/library/pickle.html#pickle.loads
+        # Using encoding='latin1' is required for unpickling
+        # NumPy arrays and instances of datetime, date and time
+        # pickled by Python 2.
+        kwargs['encoding'] = 'latin-1'
+
+    if len(buffers) > 1:
+        # Objects built on top of out-of-band buffers use their memory
+        # directly, so it has to be writable (e.g. to edit arrays).
+        kwargs['buffers'] = [
+            buffer if not memoryview(buffer).readonly else bytearray(buffer)
+            for buffer in buffers[1:]]
+
+    return cloudpickle.loads(buffers[0], **kwargs)
+
 
 class CommError(RuntimeError):
     pass
@@ -146,6 +218,8 @@ def __init__(self):
         # Handlers
         self._message_handlers = {}
         self._remote_call_handlers = {}
+        # Calls whose handlers return data that is not referenced elsewhere
+        self._returns_copy_calls = set()
         # Lists of reply numbers
         self._reply_inbox = {}
         self._reply_waitlist = {}
@@ -194,7 +268,7 @@ def is_ready(self, comm_id=None):
             return False
         return all([self._comms[cid]['status'] == 'ready' for cid in id_list])
 
-    def register_call_handler(self, call_name, handler):
+    def register_call_handler(self, call_name, handler, returns_copy=False):
         """
         Register a remote call handler.
 
@@ -205,12 +279,19 @@ def register_call_handler(self, call_name, handler):
         handler : callback
             A function to handle the request, or `None` to unregister
             `call_name`.
+        returns_copy : bool, optional
+            Whether `handler` returns new data that is not referenced
+            anywhere else (e.g. a copy of a variable), so its buffers can be
+            sent out-of-band without copying them.
         """
+        self._returns_copy_calls.discard(call_name)
         if not handler:
             self._remote_call_handlers.pop(call_name, None)
             return
 
         self._remote_call_handlers[call_name] = handler
+        if returns_copy:
+            self._returns_copy_calls.add(call_name)
 
     def remote_call(self, comm_id=None, callback=None, **settings):
         """Get a handler for remote calls."""
@@ -218,7 +299,7 @@ def remote_call(self, comm_id=None, callback=None, **settings):
 
     # ---- Private -----
     def _send_message(self, spyder_msg_type, content=None, data=None,
-                      comm_id=None):
+                      comm_id=None, copy_buffers=True):
         """
         Publish custom messages to the other side.
 
@@ -230,9 +311,13 @@ def _send_message(self, spyder_msg_type, content=None, data=None,
             The (JSONable) content of the message
         data: any
             Any object that is serializable by cloudpickle (should be most
-            things). Will arrive as cloudpickled bytes in `.buffers[0]`.
+            things). Will arrive as cloudpickled bytes in `.buffers[0]`,
+            followed by its out-of-band buffers, if any.
         comm_id: int
             the comm to send to. If None sends to all comms.
+        copy_buffers: bool
+            Whether the out-of-band buffers of data must not be shared with
+            it once this returns, because data can be modified afterwards.
         """
         if not self.is_open(comm_id):
             raise CommError("The comm is not connected.")
@@ -244,9 +329,25 @@ def _send_message(self, spyder_msg_type, content=None, data=None,
                 'pickle_protocol': self._comms[comm_id]['pickle_protocol'],
                 'python_version': sys.version,
                 }
-            buffers = [cloudpickle.dumps(
-                data, protocol=self._comms[comm_id]['pickle_protocol'])]
-            self._comms[comm_id]['comm'].send(msg_dict, buffers=buffers)
+            buffers = dumps_to_buffers(
+                data,
+                self._comms[comm_id]['pickle_protocol'],
+                out_of_band=self._comms[comm_id]['out_of_band_buffers'],
+                copy=False)
+            self._send_buffers(comm_id, msg_dict, buffers,
+                               shared=copy_buffers and len(buffers) > 1)
+
+    def _send_buffers(self, comm_id, msg_dict, buffers, shared=False):
+        """
+        Send msg_dict and buffers through the comm comm_id.
+
+        If `shared` is True, the out-of-band buffers share memory with data
+        that can be modified once this returns. Messages are sent later by
+        another thread, so they are copied before sending them.
+        """
+        if shared:
+            buffers = buffers[:1] + [bytes(buffer) for buffer in buffers[1:]]
+        self._comms[comm_id]['comm'].send(msg_dict, buffers=buffers)
 
     def _set_pickle_protocol(self, protocol):
         """Set the pickle protocol used to send data."""
@@ -290,6 +391,7 @@ def _register_comm(self, comm):
         self._comms[comm.comm_id] = {
             'comm': comm,
             'pickle_protocol': DEFAULT_PICKLE_PROTOCOL,
+            'out_of_band_buffers': False,
             'status': 'opening',
             }
 
@@ -307,17 +409,9 @@ def _comm_message(self, msg):
         # Get message dict
         msg_dict = msg['content']['data']
 
-        # Load the buffer. Only one is supported.
+        # Load the buffers
         try:
-            if PY3:
-                # https://docs.python.org/3/library/pickle.html#pickle.loads
-                # Using encoding='latin1' is required for unpickling
-                # NumPy arrays and instances of datetime, date and time
-                # pickled by Python 2.
-                buffer = cloudpickle.loads(msg['buffers'][0],
-                                           encoding='latin-1')
-            else:
-                buffer = cloudpickle.loads(msg['buffers'][0])
+            buffer = loads_from_buffers(msg['buffers'])
         except Exception as e:
             logger.debug(
                 "Exception in cloudpickle.loads : %s" % str(e))
@@ -381,8 +475,11 @@ def _set_call_return_value(self, call_dict, data, is_error=False):
             'call_name': call_dict['call_name']
         }
 
+        copy_buffers = (is_error or
+                        call_dict['call_name'] not in self._returns_copy_calls)
         self._send_message('remote_call_reply', content=content, data=data,
-                           comm_id=self.calling_comm_id)
+                           comm_id=self.calling_comm_id,
+                           copy_buffers=copy_buffers)
 
     def _register_call(self, call_dict, callback=None):
         """
@@ -397,12 +494,16 @@ def _register_call(self, call_dict, callback=None):
     def on_outgoing_call(self, call_dict):
         """A message is about to be sent"""
         call_dict["pickle_highest_protocol"] = pickle.HIGHEST_PROTOCOL
+        call_dict["out_of_band_buffers"] = True
         return call_dict
 
     def on_incoming_call(self, call_dict):
         """A call was received"""
         if "pickle_highest_protocol" in call_dict:
             self._set_pickle_protocol(call_dict["pickle_highest_protocol"])
+        if self.calling_comm_id in self._comms:
+            self._comms[self.calling_comm_id]['out_of_band_buffers'] = (
+                call_dict.get("out_of_band_buffers", False))
 
     def _get_call_return_value(self, call_dict, call_data, comm_id):
         """
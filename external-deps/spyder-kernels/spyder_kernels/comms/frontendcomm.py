@@ -16,6 +16,7 @@
 import time
 
 from IPython.core.getipython import get_ipython
+from ipykernel.jsonutil import json_clean
 from jupyter_client.localinterfaces import localhost
 from tornado import ioloop
 import zmq
@@ -108,6 +109,31 @@ def _send_message(self, *args, **kwargs):
         with self.comm_lock:
             return super(FrontendComm, self)._send_message(*args, **kwargs)
 
+    def _send_buffers(self, comm_id, msg_dict, buffers, shared=False):
+        """
+        Send msg_dict and buffers through the comm comm_id.
+
+        Shared out-of-band buffers are not copied if the message can be sent
+        by the IOPub thread with a tracked send, waiting until zmq is done
+        with them.
+        """
+        iopub_thread = getattr(self.kernel, 'iopub_thread', None)
+        if not shared or iopub_thread is None:
+            return super(FrontendComm, self)._send_buffers(
+                comm_id, msg_dict, buffers, shared)
+
+        # This does the same as comm.send, but waits until the message is sent
+        comm = self._comms[comm_id]['comm']
+        socket = TrackedIOPubSocket(iopub_thread)
+        self.kernel.session.send(
+            socket,
+            'comm_msg',
+            json_clean(dict(data=msg_dict, comm_id=comm.comm_id)),
+            parent=self.kernel.get_parent(),
+            ident=comm.topic,
+            buffers=buffers)
+        socket.wait()
+
     def close_thread(self):
         """Close comm."""
         self.comm_thread_close.set()
@@ -221,6 +247,8 @@ def _comm_open(self, comm, msg):
         self.calling_comm_id = comm.comm_id
         self._register_comm(comm)
         self._set_pickle_protocol(msg['content']['data']['pickle_protocol'])
+        self._comms[comm.comm_id]['out_of_band_buffers'] = (
+            msg['content']['data'].get('out_of_band_buffers', False))
         self._send_comm_config()
 
     def on_outgoing_call(self, call_dict):
@@ -274,6 +302,43 @@ def _remote_callback(self, call_name, call_args, call_kwargs):
             sys.stderr.write = saved_stderr_write
 
 
+class TrackedIOPubSocket(object):
+    """
+    Socket to send a message from the IOPub thread and wait until it's sent.
+
+    The IOPub socket can only be used by its thread, and the tracker of
+    a zero-copy send is lost when it's scheduled with the iopub_socket of
+    the kernel. Session.send doesn't track sends to other objects than zmq
+    sockets, so all zero-copy sends are tracked here.
+    """
+
+    def __init__(self, iopub_thread):
+        self._iopub_thread = iopub_thread
+        self._scheduled = threading.Event()
+        self._tracker = None
+
+    def send_multipart(self, msg, copy=True):
+        """Schedule the send in the IOPub thread."""
+        def send():
+            try:
+                if not self._iopub_thread.closed:
+                    self._tracker = self._iopub_thread.socket.send_multipart(
+                        msg, copy=copy, track=not copy)
+            finally:
+                self._scheduled.set()
+
+        self._iopub_thread.schedule(send)
+
+    def wait(self):
+        """Wait until zmq is done with the frames of the message."""
+        while not self._scheduled.wait(0.1):
+            if not self._iopub_thread.thread.is_alive():
+                # The send will never happen
+                return
+        if self._tracker is not None:
+            self._tracker.wait()
+
+
 class WriteWrapper(object):
     """Wrapper to warn user when text is printed."""
 
@@ -29,7 +29,8 @@
 from spyder_kernels.utils.iofuncs import iofunctions
 from spyder_kernels.utils.mpl import (
     MPL_BACKENDS_FROM_SPYDER, MPL_BACKENDS_TO_SPYDER, INLINE_FIGURE_FORMATS)
-from spyder_kernels.utils.nsview import get_remote_data, make_remote_view
+from spyder_kernels.utils.nsview import (
+    get_remote_data, get_window, get_window_info, make_remote_view)
 from spyder_kernels.console.shell import SpyderShell
 
 if PY3:
@@ -62,6 +63,8 @@ def __init__(self, *args, **kwargs):
             'set_pdb_execute_events': self.set_pdb_execute_events,
             'set_pdb_use_exclamation_mark': self.set_pdb_use_exclamation_mark,
             'get_value': self.get_value,
+            'get_value_window_info': self.get_value_window_info,
+            'get_value_window': self.get_value_window,
             'load_data': self.load_data,
             'save_namespace': self.save_namespace,
             'is_defined': self.is_defined,
@@ -77,6 +80,7 @@ def __init__(self, *args, **kwargs):
             'close_all_mpl_figures': self.close_all_mpl_figures,
             'show_mpl_backend_errors': self.show_mpl_backend_errors,
             'get_namespace_view': self.get_namespace_view,
+            'get_namespace_view_changes': self.get_namespace_view_changes,
             'set_namespace_view_settings': self.set_namespace_view_settings,
             'get_var_properties': self.get_var_properties,
             'set_sympy_forecolor': self.set_sympy_forecolor,
@@ -89,11 +93,18 @@ def __init__(self, *args, **kwargs):
             'enable_faulthandler': self.enable_faulthandler,
             "flush_std": self.flush_std,
             }
+        # Functions that return copies of variables, which can be sent
+        # without copying them again
+        returns_copy = {'get_value_window'}
+
         for call_id in handlers:
             self.frontend_comm.register_call_handler(
-                call_id, handlers[call_id])
+                call_id, handlers[call_id],
+                returns_copy=call_id in returns_copy)
 
         self.namespace_view_settings = {}
+        self._namespace_view = None
+        self._namespace_view_cache = {}
         self._mpl_backend_error = None
         self._running_namespace = None
         self._pdb_input_line = None
@@ -161,6 +172,10 @@ def set_namespace_view_settings(self, settings):
         """Set namespace_view_settings."""
         self.namespace_view_settings = settings
 
+        # Views have to be computed again with the new settings
+        self._namespace_view = None
+        self._namespace_view_cache = {}
+
     def get_namespace_view(self):
         """
         Return the namespace view
@@ -191,11 +206,51 @@ def get_namespace_view(self):
         settings = self.namespace_view_settings
         if settings:
             ns = self._get_current_namespace()
-            view = make_remote_view(ns, settings, EXCLUDED_NAMES)
+            view = make_remote_view(ns, settings, EXCLUDED_NAMES,
+                                    cache=self._namespace_view_cache)
+            self._namespace_view = view
             return view
         else:
             return None
 
+    def get_namespace_view_changes(self):
+        """
+        Return the changes in the namespace view since it was last returned.
+
+        This is a dictionary with the following structure
+
+        {
+            'reset': False,
+            'changed': {'a': {'type': 'int', ...}},
+            'removed': ['b']
+        }
+
+        Here:
+        * 'changed' contains the views of the added and changed variables,
+          with the same structure as the one returned by
+          `get_namespace_view`.
+        * 'removed' is the list of removed variables.
+        * 'reset' is True if 'changed' is the whole namespace view (e.g.
+          because it was never returned before or its settings changed).
+        """
+        previous_view = self._namespace_view
+        view = self.get_namespace_view()
+        if view is None:
+            return None
+
+        if previous_view is None:
+            return {'reset': True, 'changed': view, 'removed': []}
+
+        # Entries reused from the cache are the same objects, so they don't
+        # need to be compared
+        changed = {}
+        for name, entry in view.items():
+            previous_entry = previous_view.get(name)
+            if previous_entry is not entry and previous_entry != entry:
+                changed[name] = entry
+        removed = [name for name in previous_view if name not in view]
+        return {'reset': False, 'changed': changed, 'removed': removed}
+
     def get_var_properties(self):
         """
         Get some properties of the variables in the current
@@ -231,6 +286,27 @@ def get_value(self, name):
         ns = self._get_current_namespace()
         return ns[name]
 
+    def get_value_window_info(self, name):
+        """
+        Get the information needed to display a variable by windows.
+
+        Return None if the variable is not an array, DataFrame, Series or
+        Index that can be displayed that way.
+        """
+        ns = self._get_current_namespace()
+        return get_window_info(ns[name])
+
+    def get_value_window(self, name, row_start, row_stop, col_start=0,
+                         col_stop=1):
+        """
+        Get a window of the rows and columns of a variable.
+
+        This avoids transferring huge arrays and dataframes at once.
+        """
+        ns = self._get_current_namespace()
+        return get_window(ns[name], row_start, row_stop, col_start,
+                          col_stop)
+
     def set_value(self, name, value):
         """Set the value of a variable"""
         ns = self._get_reference_namespace(name)
@@ -247,10 +323,13 @@ def copy_value(self, orig_name, new_name):
         ns = self._get_reference_namespace(orig_name)
         ns[new_name] = ns[orig_name]
 
-    def load_data(self, filename, ext, overwrite=False):
+    def load_data(self, filename, ext, overwrite=False, names=None):
         """
         Load data from filename.
 
+        Use 'names' to load only the variables in that list (only supported
+        for .spydata files).
+
         Use 'overwrite' to determine if conflicts between variable names need
         to be handle or not.
 
@@ -264,7 +343,10 @@ def load_data(self, filename, ext, overwrite=False):
 
         glbs = self.shell.user_ns
         load_func = iofunctions.load_funcs[ext]
-        data, error_message = load_func(filename)
+        if names is None:
+            data, error_message = load_func(filename)
+        else:
+            data, error_message = load_func(filename, names=names)
 
         if error_message:
             return error_message
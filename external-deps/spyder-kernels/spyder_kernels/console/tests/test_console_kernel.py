@@ -206,6 +206,64 @@ def test_get_namespace_view(kernel):
         assert "'python_type': u'int'" in nsview
 
 
+def test_get_namespace_view_changes(kernel):
+    """
+    Test that only the changes of the namespace view are returned.
+    """
+    def execute(code):
+        if IPYKERNEL_6:
+            asyncio.run(kernel.do_execute(code, True))
+        else:
+            kernel.do_execute(code, True)
+
+    execute('a = 1; b = 2; c = [1]')
+
+    # The first call returns the whole view
+    changes = kernel.get_namespace_view_changes()
+    assert changes['reset']
+    assert set(changes['changed']) == {'a', 'b', 'c'}
+    assert changes['removed'] == []
+
+    # Nothing changed
+    changes = kernel.get_namespace_view_changes()
+    assert not changes['reset']
+    assert changes['changed'] == {}
+    assert changes['removed'] == []
+
+    # Add, change and remove variables
+    execute('a = 10; del b; c.append(2); d = 3')
+    changes = kernel.get_namespace_view_changes()
+    assert not changes['reset']
+    assert set(changes['changed']) == {'a', 'c', 'd'}
+    assert changes['changed']['a']['view'] == '10'
+    assert changes['changed']['c']['size'] == 2
+    assert changes['removed'] == ['b']
+
+    # Views of dataframes are reused until their shape or columns change,
+    # but in-place changes of lists are always found
+    execute('import pandas as pd; df = pd.DataFrame({"x": [1, 2]})')
+    changes = kernel.get_namespace_view_changes()
+    assert set(changes['changed']) == {'df'}
+    df_entry = changes['changed']['df']
+
+    execute('df.iloc[0, 0] = 5; c[0] = 0')
+    changes = kernel.get_namespace_view_changes()
+    assert set(changes['changed']) == {'c'}
+    assert changes['changed']['c']['view'] == '[0, 2]'
+    assert kernel._namespace_view['df'] is df_entry
+
+    execute('df["y"] = 0')
+    changes = kernel.get_namespace_view_changes()
+    assert set(changes['changed']) == {'df'}
+    assert changes['changed']['df']['view'] == 'Column names: x, y'
+
+    # Changing the settings resets the view
+    kernel.set_namespace_view_settings(kernel.namespace_view_settings)
+    changes = kernel.get_namespace_view_changes()
+    assert changes['reset']
+    assert set(changes['changed']) == {'a', 'c', 'd', 'df'}
+
+
 def test_get_var_properties(kernel):
     """
     Test the properties fo the variables in the namespace.
@@ -240,6 +298,30 @@ def test_get_value(kernel):
     assert kernel.get_value(name) == 124
 
 
+def test_get_value_window(kernel):
+    """Test getting windows of the value of a variable."""
+    code = ("import numpy as np; import pandas as pd; "
+            "arr = np.arange(20).reshape(4, 5); "
+            "df = pd.DataFrame(arr, columns=list('abcde'))")
+    if IPYKERNEL_6:
+        asyncio.run(kernel.do_execute(code, True))
+    else:
+        kernel.do_execute(code, True)
+
+    info = kernel.get_value_window_info('arr')
+    assert info['shape'] == (4, 5)
+    assert info['dtype'] == np.dtype(int).str
+    window = kernel.get_value_window('arr', 1, 3, 2, 4)
+    assert (window == [[7, 8], [12, 13]]).all()
+
+    info = kernel.get_value_window_info('df')
+    assert info['type'] == 'DataFrame'
+    assert info['column_levels'] == 1
+    window = kernel.get_value_window('df', 2, 4, 3, 5)
+    assert list(window.columns) == ['d', 'e']
+    assert list(window.index) == [2, 3]
+
+
 def test_set_value(kernel):
     """Test setting the value of a variable."""
     name = 'a'
@@ -0,0 +1,73 @@
+#
+# Copyright (c) 2009- Spyder Kernels Contributors
+#
+# Licensed under the terms of the MIT License
+# (see spyder_kernels/__init__.py for details)
+
+"""Cache of the code executed with runfile and runcell."""
+
+from collections import OrderedDict
+
+from spyder_kernels.utils.misc import code_hash
+
+
+class CodeCache(object):
+    """
+    Least recently used cache of code texts and compiled code objects.
+
+    Texts are stored by their hash, so that the frontend only has to send
+    the hash of code the kernel already has. Compiled code objects are
+    stored by filename and hash of their text, so that unchanged code can
+    be executed again without parsing and compiling it.
+    """
+
+    def __init__(self, max_texts=20, max_codes=100):
+        self.max_texts = max_texts
+        self.max_codes = max_codes
+        self._texts = OrderedDict()
+        self._codes = OrderedDict()
+
+    def _get(self, cache, key):
+        """Get a value and mark it as the most recently used."""
+        value = cache.pop(key)
+        cache[key] = value
+        return value
+
+    def _set(self, cache, key, value, max_items):
+        """Set a value, removing the least recently used ones if needed."""
+        cache.pop(key, None)
+        cache[key] = value
+        while len(cache) > max_items:
+            cache.popitem(last=False)
+
+    def text_hashes(self):
+        """Return the hashes of the texts in the cache."""
+        return list(self._texts)
+
+    def add_text(self, text):
+        """Add a text to the cache and return its hash."""
+        text_hash = code_hash(text)
+        self._set(self._texts, text_hash, text, self.max_texts)
+        return text_hash
+
+    def get_text(self, text_hash):
+        """Return the text with a hash. Raises KeyError if it's missing."""
+        return self._get(self._texts, text_hash)
+
+    def get_code(self, key):
+        """
+        Return the compiled code stored for a key, or None if it's missing.
+        """
+        try:
+            return self._get(self._codes, key)
+        except KeyError:
+            return None
+
+    def set_code(self, key, code):
+        """Store compiled code for a key."""
+        self._set(self._codes, key, code, self.max_codes)
+
+    def clear(self):
+        """Remove all texts and code objects."""
+        self._texts.clear()
+        self._codes.clear()
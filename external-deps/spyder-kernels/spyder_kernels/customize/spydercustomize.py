@@ -27,6 +27,7 @@
 from IPython.core.getipython import get_ipython
 
 from spyder_kernels.comms.frontendcomm import CommError, frontend_request
+from spyder_kernels.customize.code_cache import CodeCache
 from spyder_kernels.customize.namespace_manager import NamespaceManager
 from spyder_kernels.customize.spyderpdb import SpyderPdb, get_new_debugger
 from spyder_kernels.customize.umr import UserModuleReloader
@@ -34,6 +35,7 @@
     TimeoutError, PY2, _print, encode, compat_exec, FileNotFoundError)
 from spyder_kernels.customize.utils import (
     capture_last_Expr, normalise_filename)
+from spyder_kernels.utils.misc import code_hash
 
 if not PY2:
     from IPython.core.inputtransformer2 import (
@@ -348,6 +350,16 @@ def cmd_input(prompt=''):
 __umr__ = UserModuleReloader(namelist=os.environ.get("SPY_UMR_NAMELIST", None))
 
 
+# =============================================================================
+# Cache of the code executed with runfile and runcell
+# =============================================================================
+__code_cache__ = CodeCache()
+
+# Whether the frontend accepts the hashes of the texts in the cache, which
+# older versions don't
+FRONTEND_ACCEPTS_HASHES = True
+
+
 # =============================================================================
 # Handle Post Mortem Debugging and Traceback Linkage to Spyder
 # =============================================================================
@@ -426,12 +438,60 @@ def transform_cell(code, indent_only=False):
     return '\n' * number_empty_lines + code
 
 
+def compile_code(code, filename, capture_last_expression=False):
+    """
+    Compile code to execute it with exec_code.
+
+    Returns the code object and whether it captures the last expression.
+    """
+    # Tell IPython to hide this frame (>7.16)
+    __tracebackhide__ = True
+    global SHOW_INVALID_SYNTAX_MSG
+
+    is_ipython = os.path.splitext(filename)[1] == '.ipy'
+    if not is_ipython:
+        # TODO: remove the try-except and let the SyntaxError raise
+        # Because there should not be ipython code in a python file
+        try:
+            ast_code = ast.parse(transform_cell(code, indent_only=True))
+        except SyntaxError as e:
+            try:
+                ast_code = ast.parse(transform_cell(code))
+            except SyntaxError:
+                if PY2:
+                    raise e
+                else:
+                    # Need to call exec to avoid Syntax Error in Python 2.
+                    # TODO: remove exec when dropping Python 2 support.
+                    exec("raise e from None")
+            else:
+                if SHOW_INVALID_SYNTAX_MSG:
+                    _print(
+                        "\nWARNING: This is not valid Python code. "
+                        "If you want to use IPython magics, "
+                        "flexible indentation, and prompt removal, "
+                        "we recommend that you save this file with the "
+                        ".ipy extension.\n")
+                    SHOW_INVALID_SYNTAX_MSG = False
+    else:
+        ast_code = ast.parse(transform_cell(code))
+
+    if code.rstrip()[-1] == ";":
+        # Supress output with ;
+        capture_last_expression = False
+
+    if capture_last_expression:
+        ast_code, capture_last_expression = capture_last_Expr(
+            ast_code, "_spyder_out")
+
+    return compile(ast_code, filename, 'exec'), capture_last_expression
+
+
 def exec_code(code, filename, ns_globals, ns_locals=None, post_mortem=False,
               exec_fun=None, capture_last_expression=False):
     """Execute code and display any exception."""
     # Tell IPython to hide this frame (>7.16)
     __tracebackhide__ = True
-    global SHOW_INVALID_SYNTAX_MSG
 
     if PY2:
         filename = encode(filename)
@@ -442,44 +502,16 @@ def exec_code(code, filename, ns_globals, ns_locals=None, post_mortem=False,
         exec_fun = compat_exec
 
     ipython_shell = get_ipython()
-    is_ipython = os.path.splitext(filename)[1] == '.ipy'
     try:
-        if not is_ipython:
-            # TODO: remove the try-except and let the SyntaxError raise
-            # Because there should not be ipython code in a python file
-            try:
-                ast_code = ast.parse(transform_cell(code, indent_only=True))
-            except SyntaxError as e:
-                try:
-                    ast_code = ast.parse(transform_cell(code))
-                except SyntaxError:
-                    if PY2:
-                        raise e
-                    else:
-                        # Need to call exec to avoid Syntax Error in Python 2.
-                        # TODO: remove exec when dropping Python 2 support.
-                        exec("raise e from None")
-                else:
-                    if SHOW_INVALID_SYNTAX_MSG:
-                        _print(
-                            "\nWARNING: This is not valid Python code. "
-                            "If you want to use IPython magics, "
-                            "flexible indentation, and prompt removal, "
-                            "we recommend that you save this file with the "
-                            ".ipy extension.\n")
-                        SHOW_INVALID_SYNTAX_MSG = False
-        else:
-            ast_code = ast.parse(transform_cell(code))
-
-        if code.rstrip()[-1] == ";":
-            # Supress output with ;
-            capture_last_expression = False
-
-        if capture_last_expression:
-            ast_code, capture_last_expression = capture_last_Expr(
-                ast_code, "_spyder_out")
+        # Unchanged code is not parsed and compiled again
+        key = (filename, code_hash(code), capture_last_expression)
+        cached = __code_cache__.get_code(key)
+        if cached is None:
+            cached = compile_code(code, filename, capture_last_expression)
+            __code_cache__.set_code(key, cached)
+        compiled_code, capture_last_expression = cached
 
-        exec_fun(compile(ast_code, filename, 'exec'), ns_globals, ns_locals)
+        exec_fun(compiled_code, ns_globals, ns_locals)
 
         if capture_last_expression:
             out = ns_globals.pop("_spyder_out", None)
@@ -505,11 +537,45 @@ def exec_code(code, filename, ns_globals, ns_locals=None, post_mortem=False,
         __tracebackhide__ = "__pdb_exit__"
 
 
+def get_code_from_frontend(method, *args, **kwargs):
+    """
+    Get code from the frontend.
+
+    The frontend only sends the hash of the code if it's already in the code
+    cache.
+    """
+    global FRONTEND_ACCEPTS_HASHES
+
+    if FRONTEND_ACCEPTS_HASHES:
+        try:
+            code = method(
+                *args, known_hashes=__code_cache__.text_hashes(), **kwargs)
+        except TypeError as error:
+            # Older frontends don't have the known_hashes argument
+            if "'known_hashes'" not in str(error):
+                raise
+            FRONTEND_ACCEPTS_HASHES = False
+            code = method(*args, **kwargs)
+    else:
+        code = method(*args, **kwargs)
+
+    if isinstance(code, dict):
+        try:
+            return __code_cache__.get_text(code['hash'])
+        except KeyError:
+            # This shouldn't happen, but ask for the text just in case
+            code = method(*args, **kwargs)
+    if isinstance(code, basestring):
+        __code_cache__.add_text(code)
+    return code
+
+
 def get_file_code(filename, save_all=True):
     """Retrive the content of a file."""
     # Get code from spyder
     try:
-        file_code = frontend_request(blocking=True).get_file_code(
+        file_code = get_code_from_frontend(
+            frontend_request(blocking=True).get_file_code,
             filename, save_all=save_all)
     except (CommError, TimeoutError, RuntimeError, FileNotFoundError):
         file_code = None
@@ -720,8 +786,8 @@ def _exec_cell(cellname, filename=None, post_mortem=False, stack_depth=0,
     ipython_shell = get_ipython()
     try:
         # Get code from spyder
-        cell_code = frontend_request(
-            blocking=True).run_cell(cellname, filename)
+        cell_code = get_code_from_frontend(
+            frontend_request(blocking=True).run_cell, cellname, filename)
     except Exception:
         _print("This command failed to be executed because an error occurred"
                " while trying to get the cell code from Spyder's"
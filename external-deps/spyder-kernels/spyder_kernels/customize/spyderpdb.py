@@ -11,6 +11,7 @@
 import logging
 import os
 import sys
+import threading
 import traceback
 from collections import namedtuple
 
@@ -71,6 +72,7 @@ class SpyderPdb(ipyPdb, object):  # Inherits `object` to call super() in PY2
      - Better interrupt signal handling.
      - Option to skip libraries while stepping.
      - Add completion to non-command code.
+     - Only trace code with breakpoints when continuing.
     """
 
     send_initial_notification = True
@@ -92,6 +94,15 @@ def __init__(self, completekey='tab', stdin=None, stdout=None,
         self._pdb_breaking = False
         self._frontend_notified = False
 
+        # Only trace code in files with breakpoints when continuing
+        self.pdb_fast_breakpoints = True
+        self._fast_continue = False
+        # Whether files have breakpoints, by co_filename
+        self._breakpoint_files = {}
+        # Code objects with line events, when using sys.monitoring
+        self._monitored_codes = None
+        self._fast_continue_thread = None
+
         # Don't report hidden frames for IPython 7.24+. This attribute
         # has no effect in previous versions.
         self.report_skipped = False
@@ -285,6 +296,7 @@ def sigint_handler(self, signum, frame):
         self.message("\nProgram interrupted. (Use 'cont' to resume).")
         # avoid stopping in set_trace
         sys.settrace(None)
+        self._stop_fast_continue()
         self._pdb_breaking = True
         self.set_step()
         self.set_trace(sys._getframe())
@@ -303,6 +315,7 @@ def interaction(self, frame, traceback):
             if frame and frame.f_back:
                 return self.interaction(frame.f_back, traceback)
 
+        self._stop_fast_continue(frame)
         self.setup(frame, traceback)
         self.print_stack_entry(self.stack[self.curindex])
         if self._frontend_notified:
@@ -324,7 +337,9 @@ def print_stack_entry(self, frame_lineno, prompt_prefix='\n-> ',
     # --- Methods overriden for skipping libraries
     def stop_here(self, frame):
         """Check if pdb should stop here."""
+        # Check co_varnames first to avoid creating f_locals for every frame
         if (frame is not None
+                and "__tracebackhide__" in frame.f_code.co_varnames
                 and "__tracebackhide__" in frame.f_locals
                 and frame.f_locals["__tracebackhide__"] == "__pdb_exit__"):
             self.onecmd('exit')
@@ -568,6 +583,8 @@ def set_continue(self):
         """
         # Don't stop except at breakpoints or when finished
         self._set_stopinfo(self.botframe, None, -1)
+        if self.pdb_fast_breakpoints:
+            self._start_fast_continue()
 
     def reset(self):
         """
@@ -704,6 +721,12 @@ def set_spyder_breakpoints(self, breakpoints):
                     # The file is not readable
                     pass
 
+        if self._fast_continue:
+            # Start tracing the code of files with new breakpoints
+            self._breakpoint_files = {}
+            if self._monitored_codes is not None:
+                sys.monitoring.restart_events()
+
         # Jump to first breakpoint.
         # Fixes issue 2034
         if self.starting:
@@ -766,14 +789,148 @@ def notify_spyder(self):
 
         get_ipython().kernel.publish_pdb_state(step)
 
+    # --- Methods defined by us for fast breakpoints
+    def _file_has_breakpoints(self, filename):
+        """Check if there are breakpoints in the file of a code object."""
+        try:
+            return self._breakpoint_files[filename]
+        except KeyError:
+            has_breakpoints = self.canonic(filename) in self.breaks
+            self._breakpoint_files[filename] = has_breakpoints
+            return has_breakpoints
+
+    def _start_fast_continue(self):
+        """
+        Only trace the code of files with breakpoints until one is hit.
+
+        Tracing every line of every frame makes code run much slower under
+        the debugger. Instead, the frames currently in the stack are still
+        traced, but new frames are only traced if there are breakpoints in
+        their files. This uses sys.monitoring when available, which doesn't
+        call any Python function for code without breakpoints.
+        """
+        if self._fast_continue:
+            return
+        self._fast_continue = True
+        self._breakpoint_files = {}
+
+        if hasattr(sys, 'monitoring'):
+            monitoring = sys.monitoring
+            try:
+                monitoring.use_tool_id(monitoring.DEBUGGER_ID, 'spyder-pdb')
+            except ValueError:
+                # Another debugger is using sys.monitoring
+                pass
+            else:
+                events = monitoring.events
+                monitoring.register_callback(
+                    monitoring.DEBUGGER_ID, events.PY_START,
+                    self._monitor_code_start)
+                monitoring.register_callback(
+                    monitoring.DEBUGGER_ID, events.PY_RESUME,
+                    self._monitor_code_start)
+                monitoring.register_callback(
+                    monitoring.DEBUGGER_ID, events.LINE, self._monitor_line)
+                self._monitored_codes = set()
+                self._fast_continue_thread = threading.get_ident()
+
+                # Frames in the stack keep being traced
+                frame = sys._getframe().f_back
+                while frame is not None and frame is not self.botframe:
+                    self._monitor_lines(frame.f_code)
+                    frame = frame.f_back
+
+                monitoring.set_events(
+                    monitoring.DEBUGGER_ID, events.PY_START | events.PY_RESUME)
+                monitoring.restart_events()
+                sys.settrace(None)
+                return
+
+        sys.settrace(self._fast_trace_dispatch)
+
+    def _stop_fast_continue(self, frame=None):
+        """
+        Trace all code again.
+
+        If frame is given, trace it and the frames below it in the stack.
+        """
+        if not self._fast_continue:
+            return
+        self._fast_continue = False
+        self._breakpoint_files = {}
+
+        if self._monitored_codes is not None:
+            monitoring = sys.monitoring
+            monitoring.set_events(monitoring.DEBUGGER_ID, 0)
+            for code in self._monitored_codes:
+                monitoring.set_local_events(monitoring.DEBUGGER_ID, code, 0)
+            for event in (monitoring.events.PY_START,
+                          monitoring.events.PY_RESUME,
+                          monitoring.events.LINE):
+                monitoring.register_callback(
+                    monitoring.DEBUGGER_ID, event, None)
+            monitoring.free_tool_id(monitoring.DEBUGGER_ID)
+            self._monitored_codes = None
+            self._fast_continue_thread = None
+
+        if frame is not None:
+            while frame is not None and frame is not self.botframe:
+                frame.f_trace = self.trace_dispatch
+                frame = frame.f_back
+            sys.settrace(self.trace_dispatch)
+
+    def _fast_trace_dispatch(self, frame, event, arg):
+        """
+        Global trace function used when continuing.
+
+        Only frames of files with breakpoints are passed to bdb.
+        """
+        if self._file_has_breakpoints(frame.f_code.co_filename):
+            return self.trace_dispatch(frame, event, arg)
+        return None
+
+    def _monitor_lines(self, code):
+        """Get line events of a code object from sys.monitoring."""
+        sys.monitoring.set_local_events(
+            sys.monitoring.DEBUGGER_ID, code, sys.monitoring.events.LINE)
+        self._monitored_codes.add(code)
+
+    def _monitor_code_start(self, code, instruction_offset):
+        """Start tracing the lines of code with breakpoints."""
+        if self._file_has_breakpoints(code.co_filename):
+            self._monitor_lines(code)
+        return sys.monitoring.DISABLE
+
+    def _monitor_line(self, code, line_number):
+        """Stop at breakpoints when using sys.monitoring."""
+        breaks = self.breaks.get(self.canonic(code.co_filename))
+        if (not breaks or (line_number not in breaks
+                           and code.co_firstlineno not in breaks)):
+            # Don't get events for this line until breakpoints change
+            return sys.monitoring.DISABLE
+        if threading.get_ident() != self._fast_continue_thread:
+            return None
+
+        frame = sys._getframe(1)
+        if not self.break_here(frame):
+            return None
+        self._stop_fast_continue(frame)
+        self.user_line(frame)
+        if self.quitting:
+            raise bdb.BdbQuit
+        return None
+
     def run(self, cmd, globals=None, locals=None):
         """Debug a statement executed via the exec() function.
 
         globals defaults to __main__.dict; locals defaults to globals.
         """
         self.starting = True
-        with DebugWrapper(self):
-            super(SpyderPdb, self).run(cmd, globals, locals)
+        try:
+            with DebugWrapper(self):
+                super(SpyderPdb, self).run(cmd, globals, locals)
+        finally:
+            self._stop_fast_continue()
 
     def runeval(self, expr, globals=None, locals=None):
         """Debug an expression executed via the eval() function.
@@ -781,8 +938,11 @@ def runeval(self, expr, globals=None, locals=None):
         globals defaults to __main__.dict; locals defaults to globals.
         """
         self.starting = True
-        with DebugWrapper(self):
-            super(SpyderPdb, self).runeval(expr, globals, locals)
+        try:
+            with DebugWrapper(self):
+                super(SpyderPdb, self).runeval(expr, globals, locals)
+        finally:
+            self._stop_fast_continue()
 
     def runcall(self, *args, **kwds):
         """Debug a single function call.
@@ -790,8 +950,11 @@ def runcall(self, *args, **kwds):
         Return the result of the function call.
         """
         self.starting = True
-        with DebugWrapper(self):
-            super(SpyderPdb, self).runcall(*args, **kwds)
+        try:
+            with DebugWrapper(self):
+                super(SpyderPdb, self).runcall(*args, **kwds)
+        finally:
+            self._stop_fast_continue()
 
     def enter_recursive_debugger(self, code, filename,
                                  continue_if_has_breakpoints):
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2009- Spyder Kernels Contributors
+#
+# Licensed under the terms of the MIT License
+# (see spyder_kernels/__init__.py for details)
+# -----------------------------------------------------------------------------
+
+"""Tests for the cache of code executed with runfile and runcell."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from spyder_kernels.customize import spydercustomize
+from spyder_kernels.customize.code_cache import CodeCache
+from spyder_kernels.utils.misc import code_hash
+
+
+def test_code_cache_texts():
+    """Test that texts are stored by hash, up to a maximum."""
+    cache = CodeCache(max_texts=2)
+    hashes = [cache.add_text(text) for text in ('a = 1', 'b = 2')]
+    assert hashes == [code_hash('a = 1'), code_hash('b = 2')]
+    assert cache.text_hashes() == hashes
+
+    # Getting a text makes it the most recently used
+    assert cache.get_text(hashes[0]) == 'a = 1'
+    cache.add_text('c = 3')
+    assert cache.text_hashes() == [hashes[0], code_hash('c = 3')]
+    with pytest.raises(KeyError):
+        cache.get_text(hashes[1])
+
+
+def test_code_cache_codes():
+    """Test that compiled code is stored up to a maximum."""
+    cache = CodeCache(max_codes=1)
+    code = compile('a = 1', 'test.py', 'exec')
+    key = ('test.py', code_hash('a = 1'), False)
+    cache.set_code(key, (code, False))
+    assert cache.get_code(key) == (code, False)
+
+    cache.set_code(('other.py', code_hash('a = 1'), False), (code, False))
+    assert cache.get_code(key) is None
+
+    cache.clear()
+    assert cache.text_hashes() == []
+
+
+@pytest.fixture
+def code_cache(monkeypatch):
+    """Use an empty code cache and spy on the code compilation."""
+    cache = CodeCache()
+    monkeypatch.setattr(spydercustomize, '__code_cache__', cache)
+    monkeypatch.setattr(spydercustomize, 'compile_code',
+                        MagicMock(wraps=spydercustomize.compile_code))
+    monkeypatch.setattr(spydercustomize, 'FRONTEND_ACCEPTS_HASHES', True)
+    return cache
+
+
+def test_exec_code_reuses_code(code_cache):
+    """Test that unchanged code is compiled only once."""
+    code = 'a = a + 1'
+    namespace = {'a': 0}
+    for __ in range(2):
+        spydercustomize.exec_code(code, 'test.py', namespace)
+    assert namespace['a'] == 2
+    assert spydercustomize.compile_code.call_count == 1
+
+    # Changed code is compiled again
+    spydercustomize.exec_code(code + '\n', 'test.py', namespace)
+    assert namespace['a'] == 3
+    assert spydercustomize.compile_code.call_count == 2
+
+
+def test_get_code_from_frontend(code_cache):
+    """Test that the texts known by the frontend are taken from the cache."""
+    method = MagicMock(return_value='a = 1')
+    assert spydercustomize.get_code_from_frontend(
+        method, 'test.py') == 'a = 1'
+    method.assert_called_once_with('test.py', known_hashes=[])
+
+    method = MagicMock(return_value={'hash': code_hash('a = 1')})
+    assert spydercustomize.get_code_from_frontend(
+        method, 'test.py') == 'a = 1'
+    method.assert_called_once_with(
+        'test.py', known_hashes=[code_hash('a = 1')])
+
+
+def test_get_code_from_old_frontend(code_cache):
+    """Test that old frontends are asked for the code without hashes."""
+    def old_method(filename):
+        return 'a = 1'
+
+    assert spydercustomize.get_code_from_frontend(
+        old_method, 'test.py') == 'a = 1'
+    assert not spydercustomize.FRONTEND_ACCEPTS_HASHES
+
+    # Other errors are not taken as an old frontend
+    spydercustomize.FRONTEND_ACCEPTS_HASHES = True
+    method = MagicMock(side_effect=TypeError('unsupported operand'))
+    with pytest.raises(TypeError):
+        spydercustomize.get_code_from_frontend(method, 'test.py')
+    assert spydercustomize.FRONTEND_ACCEPTS_HASHES
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2009- Spyder Kernels Contributors
+#
+# Licensed under the terms of the MIT License
+# (see spyder_kernels/__init__.py for details)
+# -----------------------------------------------------------------------------
+
+"""Tests for the Spyder debugger."""
+
+import io
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+from spyder_kernels.customize import spyderpdb
+from spyder_kernels.customize.spyderpdb import SpyderPdb
+
+
+LIBRARY_CODE = """
+def call(func):
+    result = func()
+    caller_line = True
+    return result
+"""
+
+MAIN_CODE = """
+import spyderpdb_library
+
+def target():
+    x = 1
+    return x
+
+spyderpdb_library.call(target)
+"""
+
+
+@pytest.fixture
+def debug_code(tmpdir, monkeypatch):
+    """Run code with a debugger that reads commands from a list."""
+    monkeypatch.setattr(spyderpdb, 'get_ipython', MagicMock)
+    monkeypatch.setattr(
+        spyderpdb, 'frontend_request',
+        MagicMock(side_effect=spyderpdb.CommError))
+    monkeypatch.setattr(
+        SpyderPdb, 'print_stack_entry', lambda self, *args, **kwargs: None)
+
+    tmpdir.join('spyderpdb_library.py').write(LIBRARY_CODE)
+    monkeypatch.syspath_prepend(str(tmpdir))
+    filename = str(tmpdir.join('main.py'))
+    tmpdir.join('main.py').write(MAIN_CODE)
+
+    def debug_code(commands):
+        stdin = io.StringIO('\n'.join(commands) + '\n')
+        stdout = io.StringIO()
+        debugger = SpyderPdb()
+        debugger.stdin = stdin
+        debugger.stdout = stdout
+        debugger.use_rawinput = False
+        debugger.set_break(filename, 5)
+        debugger.run(compile(MAIN_CODE, filename, 'exec'),
+                     {'__name__': '__main__'})
+        return stdout.getvalue()
+
+    yield debug_code
+    sys.modules.pop('spyderpdb_library', None)
+
+
+def test_continue_to_breakpoint(debug_code):
+    """Test that we stop at breakpoints and can step out of them."""
+    output = debug_code(
+        ['continue', 'next', 'p x', 'return', 'next', 'p func.__name__',
+         'continue'])
+
+    # Stop at the breakpoint and in the frame that called it, although it
+    # was not traced when continuing
+    assert output.split('ipdb> ') == [
+        '', '', '', '1\n', '--Return--\n', '', "'target'\n", '']
+    assert sys.gettrace() is None
@@ -11,6 +11,7 @@
 # Stdlib imports
 import os
 import sys
+import time
 
 # Third party imports
 import pytest
@@ -119,3 +120,65 @@ def test_umr_reload_modules(user_module):
     # Reload user modules
     import foo3
     assert umr.is_module_reloadable(foo3, 'foo3')
+
+
+def test_umr_reload_changed_modules(tmpdir):
+    """
+    Test that the UMR only reloads the modules whose files changed and the
+    modules that import them.
+    """
+    if to_text_string(tmpdir) not in sys.path:
+        sys.path.append(to_text_string(tmpdir))
+
+    package = tmpdir.mkdir('umrpkg')
+    files = {
+        '__init__.py': '#',
+        'base.py': 'VALUE = 1',
+        'user.py': 'from .base import VALUE',
+        'other.py': 'import umrpkg.user',
+        'alone.py': 'import os',
+    }
+    for name, code in files.items():
+        package.join(name).write(code)
+
+    def backdate(name):
+        # Make files look older than the last run of the UMR
+        past = time.time() - 10
+        os.utime(to_text_string(package.join(name)), (past, past))
+
+    for name in files:
+        backdate(name)
+
+    umr = UserModuleReloader()
+    import umrpkg.base
+    import umrpkg.other
+    import umrpkg.alone
+
+    # Nothing changed
+    umr.run()
+    assert umr.modnames_to_reload == []
+
+    # Save a file without changing its contents
+    package.join('alone.py').write('import os')
+    umr.run()
+    assert umr.modnames_to_reload == []
+
+    # Change a module
+    package.join('base.py').write('VALUE = 2')
+    umr.run()
+    assert umr.modnames_to_reload == [
+        'umrpkg.base', 'umrpkg.other', 'umrpkg.user']
+    assert 'umrpkg.alone' in sys.modules
+
+    backdate('base.py')
+    import umrpkg.other
+    assert umrpkg.user.VALUE == 2
+    umr.run()
+    assert umr.modnames_to_reload == []
+
+    # Change a package, which reloads all its submodules
+    package.join('__init__.py').write('# Package')
+    umr.run()
+    assert umr.modnames_to_reload == [
+        'umrpkg', 'umrpkg.alone', 'umrpkg.base', 'umrpkg.other',
+        'umrpkg.user']
@@ -9,6 +9,7 @@
 import os
 import sys
 
+from spyder_kernels.customize import utils
 from spyder_kernels.customize.utils import create_pathlist
 
 
@@ -22,3 +23,29 @@ def test_user_sitepackages_in_pathlist():
         user_path = 'Roaming'
 
     assert any([user_path in path for path in create_pathlist()])
+
+
+def test_path_is_library_memoized(monkeypatch):
+    """Test that paths are only classified once."""
+    calls = []
+
+    def _path_is_library(path, initial_pathlist=None):
+        calls.append(path)
+        return path.startswith('/lib')
+
+    monkeypatch.setattr(utils, '_path_is_library', _path_is_library)
+    monkeypatch.setattr(utils, '_LIBRARY_PATHS', {})
+    monkeypatch.setattr(utils, '_LIBRARY_PATHLIST', None)
+
+    for __ in range(3):
+        assert utils.path_is_library('/lib/module.py')
+        assert not utils.path_is_library('/home/user/script.py')
+    assert calls == ['/lib/module.py', '/home/user/script.py']
+
+    # Results are computed again for a different initial path list
+    pathlist = ['/home']
+    for __ in range(3):
+        assert utils.path_is_library('/lib/module.py', pathlist)
+    assert len(calls) == 3
+    assert utils.path_is_library('/lib/module.py')
+    assert len(calls) == 4
@@ -5,13 +5,21 @@
 
 """User module reloader."""
 
+import ast
+import hashlib
 import os
 import sys
+import time
 
 from spyder_kernels.customize.utils import path_is_library
 from spyder_kernels.py3compat import PY2, _print
 
 
+# Files modified less than this before the last run are taken as modified
+# after it, because some file systems only save mtimes with this precision.
+MTIME_RESOLUTION = 2  # seconds
+
+
 class UserModuleReloader(object):
     """
     User Module Reloader (UMR) aims at deleting user modules
@@ -56,6 +64,14 @@ def __init__(self, namelist=None, pathlist=None):
         # List of module names to reload
         self.modnames_to_reload = []
 
+        # Source files of the user modules, with their mtime, size, hash and
+        # the modules they import, to only reload the ones that changed
+        self.modules_info = {}
+
+        # Modules imported after this time are up to date if their files
+        # were not modified after it
+        self.last_run = time.time()
+
         # Activate Cython support
         self.has_cython = False
         self.activate_cython()
@@ -118,6 +134,91 @@ def activate_cython(self):
                 pyximport.install(setup_args=pyx_setup_args,
                                   reload_support=True)
 
+    def get_module_info(self, module, modname):
+        """
+        Get the source file of a module, with its mtime, size, hash and the
+        names of the modules it imports.
+
+        Return None if that can't be done, e.g. for C modules.
+        """
+        filename = get_source_file(module)
+        if filename is None:
+            return None
+        try:
+            stat = os.stat(filename)
+            with open(filename, 'rb') as f:
+                source = f.read()
+            tree = ast.parse(source)
+        except Exception:
+            return None
+
+        package = getattr(module, '__package__', None)
+        if package is None:
+            if hasattr(module, '__path__'):
+                package = modname
+            else:
+                package = modname.rpartition('.')[0]
+
+        return ModuleInfo(filename, stat.st_mtime, stat.st_size,
+                          hashlib.sha256(source).hexdigest(),
+                          get_imported_modnames(tree, package))
+
+    def is_module_changed(self, module, modname):
+        """
+        Decide if the source file of a module changed since it was
+        imported.
+        """
+        info = self.modules_info.get(modname)
+        if info is None or info.filename != get_source_file(module):
+            # The module was imported after the last run, so it's up to date
+            # if its file was not modified after it
+            info = self.get_module_info(module, modname)
+            if (info is None or
+                    info.mtime >= self.last_run - MTIME_RESOLUTION):
+                return True
+            self.modules_info[modname] = info
+            return False
+
+        try:
+            stat = os.stat(info.filename)
+        except OSError:
+            return True
+        if stat.st_mtime == info.mtime and stat.st_size == info.size:
+            return False
+
+        # The file was saved again, but its contents could be the same
+        new_info = self.get_module_info(module, modname)
+        if new_info is None or new_info.digest != info.digest:
+            return True
+        self.modules_info[modname] = new_info
+        return False
+
+    def get_modules_to_reload(self, modules, changed):
+        """
+        Get the names of the modules that changed, of the ones that import
+        them and of their submodules, all of which have to be reloaded.
+        """
+        # Reverse import graph of the user modules. Submodules are taken as
+        # importers of their packages because a new package doesn't have
+        # the old submodules as attributes.
+        importers = {}
+        for modname in modules:
+            info = self.modules_info.get(modname)
+            imported = set(info.imports) if info is not None else set()
+            imported.add(modname.rpartition('.')[0])
+            for imported_modname in imported:
+                if imported_modname in modules:
+                    importers.setdefault(imported_modname, []).append(modname)
+
+        to_reload = set(changed)
+        pending = list(changed)
+        while pending:
+            for modname in importers.get(pending.pop(), []):
+                if modname not in to_reload:
+                    to_reload.add(modname)
+                    pending.append(modname)
+        return to_reload
+
     def run(self):
         """
         Delete user modules to force Python to deeply reload them
@@ -125,19 +226,95 @@ def run(self):
         Do not del modules which are considered as system modules, i.e.
         modules installed in subdirectories of Python interpreter's binary
         Do not del C modules
+
+        Only delete modules whose source files changed since they were
+        imported, together with the modules that import them.
         """
-        self.modnames_to_reload = []
+        start = time.time()
+        previous_modules = set(self.previous_modules)
+        modules = {}
         for modname, module in list(sys.modules.items()):
-            if modname not in self.previous_modules:
+            if modname not in previous_modules:
                 # Decide if a module can be reloaded or not
                 if self.is_module_reloadable(module, modname):
-                    self.modnames_to_reload.append(modname)
-                    del sys.modules[modname]
-                else:
-                    continue
+                    modules[modname] = module
+
+        # Forget modules that were removed by users
+        for modname in set(self.modules_info) - set(modules):
+            del self.modules_info[modname]
+
+        changed = [modname for modname, module in modules.items()
+                   if self.is_module_changed(module, modname)]
+        to_reload = self.get_modules_to_reload(modules, changed)
+
+        self.modnames_to_reload = sorted(to_reload)
+        for modname in self.modnames_to_reload:
+            del sys.modules[modname]
+            self.modules_info.pop(modname, None)
+        self.last_run = start
 
         # Report reloaded modules
         if self.verbose and self.modnames_to_reload:
             modnames = self.modnames_to_reload
             _print("\x1b[4;33m%s\x1b[24m%s\x1b[0m"
-                   % ("Reloaded modules", ": "+", ".join(modnames)))
\ No newline at end of file
+                   % ("Reloaded modules", ": "+", ".join(modnames)))
+            _print("\x1b[33m%s\x1b[0m"
+                   % ("Changed: %s (checked %d modules in %.1f ms)"
+                      % (", ".join(sorted(changed)), len(modules),
+                         (time.time() - start) * 1000)))
+
+
+class ModuleInfo(object):
+    """Source file of a user module and names of the modules it imports."""
+
+    def __init__(self, filename, mtime, size, digest, imports):
+        self.filename = filename
+        self.mtime = mtime
+        self.size = size
+        self.digest = digest
+        self.imports = imports
+
+
+def get_source_file(module):
+    """Get the Python source file of a module or None if it has none."""
+    filename = getattr(module, '__file__', None)
+    if not filename:
+        return None
+    if filename.endswith(('.pyc', '.pyo')):
+        filename = filename[:-1]
+    if not filename.endswith('.py'):
+        return None
+    return filename
+
+
+def get_imported_modnames(tree, package):
+    """
+    Get the names of the modules that could be imported by the code of
+    `tree`, which is in `package`.
+
+    Names imported with `from module import name` are included, since they
+    can be submodules. Imports done in other ways, e.g. with
+    `importlib.import_module`, are not found.
+    """
+    modnames = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ''
+            if node.level:
+                parts = package.split('.')
+                if node.level > 1:
+                    parts = parts[:-(node.level - 1)]
+                base = '.'.join(parts + ([base] if base else []))
+            names = [base] + ['%s.%s' % (base, alias.name) if base
+                              else alias.name for alias in node.names]
+        else:
+            continue
+
+        # Importing a submodule also imports its packages
+        for name in names:
+            parts = name.split('.')
+            for i in range(1, len(parts) + 1):
+                modnames.add('.'.join(parts[:i]))
+    return modnames
@@ -46,7 +46,34 @@ def create_pathlist():
     return standard_paths + user_path
 
 
+# Results of path_is_library by path, for the initial path list in
+# _LIBRARY_PATHLIST
+_LIBRARY_PATHS = {}
+_LIBRARY_PATHLIST = None
+
+
 def path_is_library(path, initial_pathlist=None):
+    """Decide if a path is in user code or a library according to its path."""
+    global _LIBRARY_PATHLIST
+
+    # This is called for every frame while debugging, so results are
+    # memoized. Callers pass the same initial path list every time, so
+    # only compare it by identity.
+    if initial_pathlist is not _LIBRARY_PATHLIST:
+        _LIBRARY_PATHS.clear()
+        _LIBRARY_PATHLIST = initial_pathlist
+
+    try:
+        return _LIBRARY_PATHS[path]
+    except KeyError:
+        pass
+
+    is_library = _path_is_library(path, initial_pathlist)
+    _LIBRARY_PATHS[path] = is_library
+    return is_library
+
+
+def _path_is_library(path, initial_pathlist=None):
     """Decide if a path is in user code or a library according to its path."""
     # Compute DEFAULT_PATHLIST only once and make it global to reuse it
     # in any future call of this function.
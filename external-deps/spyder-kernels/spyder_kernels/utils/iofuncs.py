@@ -17,6 +17,7 @@
 
 # Standard library imports
 import sys
+import io
 import os
 import os.path as osp
 import tarfile
@@ -27,8 +28,8 @@
 import json
 import inspect
 import dis
-import copy
 import glob
+import time
 
 # Local imports
 from spyder_kernels.py3compat import getcwd, pickle, PY2, to_text_string
@@ -265,100 +266,148 @@ def load_json(filename):
         return None, str(err)
 
 
+# Version of the .spydata format written by save_dictionary.
+# Version 1 files have no table of contents and contain a single pickle with
+# all variables, plus a .npy file per array.
+SPYDATA_VERSION = 2
+
+# Name of the table of contents of a .spydata file
+SPYDATA_TOC = 'spydata.json'
+
+# Protocol used to pickle variables in .spydata files. Protocol 4 is needed
+# to save objects larger than 4 GB.
+PICKLE_PROTOCOL = min(4, pickle.HIGHEST_PROTOCOL)
+
+
+class BuffersReader(object):
+    """
+    File-like object to read a sequence of buffers without joining them.
+
+    This is used to add arrays to tar files without copying their data.
+    """
+    def __init__(self, buffers):
+        self._buffers = [memoryview(buf) for buf in buffers]
+        self.size = sum(len(buf) for buf in self._buffers)
+
+    def read(self, size=-1):
+        chunks = []
+        while self._buffers and size != 0:
+            buf = self._buffers[0]
+            if size < 0 or size >= len(buf):
+                chunks.append(buf.tobytes())
+                self._buffers.pop(0)
+                size -= len(buf)
+            else:
+                chunks.append(buf[:size].tobytes())
+                self._buffers[0] = buf[size:]
+                size = 0
+        return b''.join(chunks)
+
+
+def __array_to_fileobj(arr):
+    """Return a file object to read arr in .npy format"""
+    if not (arr.flags.c_contiguous or arr.flags.f_contiguous):
+        arr = np.ascontiguousarray(arr)
+    header = io.BytesIO()
+    np.lib.format.write_array_header_1_0(
+        header, np.lib.format.header_data_from_array_1_0(arr))
+    reader = BuffersReader([header.getvalue(),
+                            arr.ravel(order='A').view(np.uint8)])
+    return reader, reader.size
+
+
+def __value_to_fileobj(value):
+    """
+    Return a file object to read value from, its size and the format in
+    which it's saved ('npy' or 'pickle').
+    """
+    if (np.ndarray is not FakeObject and
+            type(value) in (np.ndarray, np.memmap) and
+            not value.dtype.hasobject):
+        try:
+            fileobj, size = __array_to_fileobj(value)
+            return fileobj, size, 'npy'
+        except ValueError:
+            # The array header is too large for the .npy format we use,
+            # so it has to be pickled.
+            pass
+
+    fileobj = tempfile.TemporaryFile()
+    try:
+        pickle.dump(value, fileobj, protocol=PICKLE_PROTOCOL)
+    except Exception:
+        fileobj.close()
+        raise
+    size = fileobj.tell()
+    fileobj.seek(0)
+    return fileobj, size, 'pickle'
+
+
 def save_dictionary(data, filename):
-    """Save dictionary in a single file .spydata file"""
+    """
+    Save dictionary in a single file .spydata file
+
+    Each variable is saved in its own member of the file, which is an
+    uncompressed tar file with a table of contents, so that it can be read
+    independently of the others.
+    """
     filename = osp.abspath(filename)
-    old_cwd = getcwd()
-    os.chdir(osp.dirname(filename))
+    tmp_filename = filename + '.tmp'
     error_message = None
     skipped_keys = []
-    data_copy = {}
+    toc = []
 
     try:
-        # Copy dictionary before modifying it to fix #6689
-        for obj_name, obj_value in data.items():
-            # Skip modules, since they can't be pickled, users virtually never
-            # would want them to be and so they don't show up in the skip list.
-            # Skip callables, since they are only pickled by reference and thus
-            # must already be present in the user's environment anyway.
-            if not (callable(obj_value) or isinstance(obj_value,
-                                                      types.ModuleType)):
-                # If an object cannot be deepcopied, then it cannot be pickled.
-                # Ergo, we skip it and list it later.
+        # Use PAX (POSIX.1-2001) format instead of default GNU.
+        # This improves interoperability and UTF-8/long variable name support.
+        with tarfile.open(tmp_filename, "w",
+                          format=tarfile.PAX_FORMAT) as tar:
+            for obj_name, obj_value in data.items():
+                # Skip modules, since they can't be pickled, users virtually
+                # never would want them to be and so they don't show up in the
+                # skip list. Skip callables, since they are only pickled by
+                # reference and thus must already be present in the user's
+                # environment anyway.
+                if (callable(obj_value) or
+                        isinstance(obj_value, types.ModuleType)):
+                    continue
+
                 try:
-                    data_copy[obj_name] = copy.deepcopy(obj_value)
+                    fileobj, size, fmt = __value_to_fileobj(obj_value)
                 except Exception:
                     skipped_keys.append(obj_name)
-        data = data_copy
-        if not data:
-            raise RuntimeError('No supported objects to save')
+                    continue
 
-        saved_arrays = {}
-        if np.ndarray is not FakeObject:
-            # Saving numpy arrays with np.save
-            arr_fname = osp.splitext(filename)[0]
-            for name in list(data.keys()):
+                tarinfo = tarfile.TarInfo('%04d.%s' % (len(toc), fmt))
+                tarinfo.size = size
+                tarinfo.mtime = time.time()
                 try:
-                    if (isinstance(data[name], np.ndarray) and
-                            data[name].size > 0):
-                        # Save arrays at data root
-                        fname = __save_array(data[name], arr_fname,
-                                             len(saved_arrays))
-                        saved_arrays[(name, None)] = osp.basename(fname)
-                        data.pop(name)
-                    elif isinstance(data[name], (list, dict)):
-                        # Save arrays nested in lists or dictionaries
-                        if isinstance(data[name], list):
-                            iterator = enumerate(data[name])
-                        else:
-                            iterator = iter(list(data[name].items()))
-                        to_remove = []
-                        for index, value in iterator:
-                            if (isinstance(value, np.ndarray) and
-                                    value.size > 0):
-                                fname = __save_array(value, arr_fname,
-                                                     len(saved_arrays))
-                                saved_arrays[(name, index)] = (
-                                    osp.basename(fname))
-                                to_remove.append(index)
-                        for index in sorted(to_remove, reverse=True):
-                            data[name].pop(index)
-                except (RuntimeError, pickle.PicklingError, TypeError,
-                        AttributeError, IndexError):
-                    # If an array can't be saved with numpy for some reason,
-                    # leave the object intact and try to save it normally.
-                    pass
-            if saved_arrays:
-                data['__saved_arrays__'] = saved_arrays
-
-        pickle_filename = osp.splitext(filename)[0] + '.pickle'
-        # Attempt to pickle everything.
-        # If pickling fails, iterate through to eliminate problem objs & retry.
-        with open(pickle_filename, 'w+b') as fdesc:
-            try:
-                pickle.dump(data, fdesc, protocol=2)
-            except (pickle.PicklingError, AttributeError, TypeError,
-                    ImportError, IndexError, RuntimeError):
-                data_filtered = {}
-                for obj_name, obj_value in data.items():
-                    try:
-                        pickle.dumps(obj_value, protocol=2)
-                    except Exception:
-                        skipped_keys.append(obj_name)
-                    else:
-                        data_filtered[obj_name] = obj_value
-                if not data_filtered:
-                    raise RuntimeError('No supported objects to save')
-                pickle.dump(data_filtered, fdesc, protocol=2)
-
-        # Use PAX (POSIX.1-2001) format instead of default GNU.
-        # This improves interoperability and UTF-8/long variable name support.
-        with tarfile.open(filename, "w", format=tarfile.PAX_FORMAT) as tar:
-            for fname in ([pickle_filename]
-                          + [fn for fn in list(saved_arrays.values())]):
-                tar.add(osp.basename(fname))
-                os.remove(fname)
-    except (RuntimeError, pickle.PicklingError, TypeError) as error:
+                    tar.addfile(tarinfo, fileobj)
+                finally:
+                    if fmt == 'pickle':
+                        fileobj.close()
+                toc.append({'name': obj_name, 'file': tarinfo.name,
+                            'format': fmt})
+
+            if not toc:
+                raise RuntimeError('No supported objects to save')
+
+            toc_data = json.dumps(
+                {'version': SPYDATA_VERSION, 'variables': toc}
+            ).encode('utf-8')
+            tarinfo = tarfile.TarInfo(SPYDATA_TOC)
+            tarinfo.size = len(toc_data)
+            tarinfo.mtime = time.time()
+            tar.addfile(tarinfo, io.BytesIO(toc_data))
+
+        # Replace the file only after it was completely written, which also
+        # keeps arrays memory-mapped from it valid on Posix systems.
+        if PY2:
+            shutil.move(tmp_filename, filename)
+        else:
+            os.replace(tmp_filename, filename)
+    except (RuntimeError, pickle.PicklingError, TypeError, IOError,
+            OSError) as error:
         error_message = to_text_string(error)
     else:
         if skipped_keys:
@@ -366,13 +415,102 @@ def save_dictionary(data, filename):
             error_message = ('Some objects could not be saved: '
                              + ', '.join(skipped_keys))
     finally:
-        os.chdir(old_cwd)
+        if osp.isfile(tmp_filename):
+            os.remove(tmp_filename)
     return error_message
 
 
-def load_dictionary(filename):
-    """Load dictionary from .spydata file"""
+def __read_toc(tar):
+    """
+    Read the table of contents of a .spydata file.
+
+    Return None for files saved with version 1 of the format.
+    """
+    try:
+        member = tar.getmember(SPYDATA_TOC)
+    except KeyError:
+        return None
+    return json.loads(tar.extractfile(member).read().decode('utf-8'))
+
+
+def get_dictionary_names(filename):
+    """
+    Return the names of the variables saved in a .spydata file.
+
+    Return None if they can't be known without loading the whole file
+    (i.e. for files saved with version 1 of the format).
+    """
+    with tarfile.open(osp.abspath(filename), "r") as tar:
+        toc = __read_toc(tar)
+    if toc is None:
+        return None
+    return [entry['name'] for entry in toc['variables']]
+
+
+def __load_array_member(filename, tarinfo, fileobj, mmap_mode):
+    """Load array saved in tarinfo, a member of the tar file filename"""
+    version = np.lib.format.read_magic(fileobj)
+    if version != (1, 0):
+        raise ValueError('Unsupported .npy format version: %s.%s' % version)
+    shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(fileobj)
+    order = 'F' if fortran_order else 'C'
+
+    # Read the array directly from the file, since the file object returned
+    # by tarfile can't be used with numpy.fromfile
+    offset = tarinfo.offset_data + fileobj.tell()
+    if mmap_mode is not None and all(shape):
+        return np.memmap(filename, dtype=dtype, mode=mmap_mode, shape=shape,
+                         order=order, offset=offset)
+    with open(filename, 'rb') as fid:
+        fid.seek(offset)
+        arr = np.fromfile(fid, dtype=dtype, count=int(np.prod(shape)))
+    return arr.reshape(shape, order=order)
+
+
+def load_dictionary(filename, names=None, mmap_mode=None):
+    """
+    Load dictionary from .spydata file
+
+    Use names to load only the variables in that list. If mmap_mode is
+    given ('r', 'r+' or 'c', as in numpy.load), arrays are memory-mapped
+    from the file instead of being read into memory.
+    """
     filename = osp.abspath(filename)
+    data = {}
+    error_message = None
+    with tarfile.open(filename, "r") as tar:
+        try:
+            toc = __read_toc(tar)
+            if toc is None:
+                return __load_legacy_dictionary(filename, names)
+
+            if toc['version'] > SPYDATA_VERSION:
+                return None, ('This file was saved with a newer version of '
+                              'Spyder and can\'t be loaded')
+
+            for entry in toc['variables']:
+                name = entry['name']
+                if names is not None and name not in names:
+                    continue
+                tarinfo = tar.getmember(entry['file'])
+                fileobj = tar.extractfile(tarinfo)
+                if entry['format'] == 'npy':
+                    data[name] = __load_array_member(
+                        filename, tarinfo, fileobj, mmap_mode)
+                else:
+                    data[name] = pickle.load(fileobj)
+        # Except AttributeError from e.g. trying to load function no longer
+        # present, ImportError from its module no longer being available and
+        # the rest from corrupted or truncated files
+        except (AttributeError, EOFError, ValueError, KeyError, ImportError,
+                OSError, pickle.UnpicklingError, tarfile.TarError) as error:
+            data = None
+            error_message = to_text_string(error)
+    return data, error_message
+
+
+def __load_legacy_dictionary(filename, names=None):
+    """Load dictionary from a .spydata file saved with version 1"""
     old_cwd = getcwd()
     tmp_folder = tempfile.mkdtemp()
     os.chdir(tmp_folder)
@@ -391,6 +529,8 @@ def load_dictionary(filename):
             try:
                 saved_arrays = data.pop('__saved_arrays__')
                 for (name, index), fname in list(saved_arrays.items()):
+                    if names is not None and name not in names:
+                        continue
                     arr = np.load(osp.join(tmp_folder, fname))
                     if index is None:
                         data[name] = arr
@@ -400,6 +540,9 @@ def load_dictionary(filename):
                         data[name].insert(index, arr)
             except KeyError:
                 pass
+        if names is not None:
+            data = {name: value for name, value in data.items()
+                    if name in names}
     # Except AttributeError from e.g. trying to load function no longer present
     except (AttributeError, EOFError, ValueError) as error:
         error_message = to_text_string(error)
@@ -522,7 +665,6 @@ def save_auto(data, filename):
                'date': testdate,
                'datetime': datetime.datetime(1945, 5, 8),
                }
-    import time
     t0 = time.time()
     save_dictionary(example, "test.spydata")
     print(" Data saved in %.3f seconds" % (time.time()-t0))  # spyder: test-skip
@@ -8,6 +8,7 @@
 
 """Miscellaneous utilities"""
 
+import hashlib
 import re
 
 from spyder_kernels.py3compat import lru_cache
@@ -48,3 +49,15 @@ def fix_reference_name(name, blacklist=None):
             index += 1
         name = get_new_name(index)
     return name
+
+
+def code_hash(code):
+    """
+    Return the hash of a code text.
+
+    This is used by the kernel and the frontend to identify code that was
+    already sent, so it must give the same result in both.
+    """
+    if not isinstance(code, bytes):
+        code = code.encode('utf-8', 'surrogatepass')
+    return hashlib.sha1(code).hexdigest()
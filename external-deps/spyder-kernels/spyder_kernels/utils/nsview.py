@@ -674,22 +674,258 @@ def get_remote_data(data, settings, mode, more_excluded_names=None):
         excluded_names=excluded_names)
 
 
-def make_remote_view(data, settings, more_excluded_names=None):
+def is_immutable(value):
+    """
+    Return True if value is of a type whose instances can't change, so its
+    view can be reused while it's bound to the same name.
+    """
+    immutable_types = (NUMERIC_TYPES + TEXT_TYPES +
+                       (bytes, bool, type(None), datetime.date,
+                        datetime.timedelta))
+    if isinstance(value, immutable_types):
+        return True
+    if isinstance(value, pd.Index):
+        return True
+    return np.generic is not FakeObject and isinstance(value, np.generic)
+
+
+def get_view_key(value, settings):
+    """
+    Return a key that changes whenever the view of value changes, or None
+    if there's no cheap way to know that.
+
+    Values whose view shows their elements (e.g. lists, dicts or numeric
+    arrays) don't have a key, because it would have to check all of them.
+    Keys must be compared with `is_same_view_key`.
+    """
+    if is_immutable(value):
+        return ()
+    if isinstance(value, pd.DataFrame):
+        # Its view only shows the column names, which are in an immutable
+        # index that is replaced when they change. The key keeps that index
+        # alive, so it can't be mistaken for a new one with the same id.
+        return (value.shape, value.columns)
+    if isinstance(value, pd.Series):
+        return (value.shape, value.dtype)
+    if isinstance(value, (np.ma.MaskedArray, np.recarray)):
+        # Their views only show their field names, if any
+        return (value.shape, value.dtype)
+    if isinstance(value, np.ndarray) and not settings['minmax']:
+        if value.dtype.type not in get_numeric_numpy_types():
+            return (value.shape, value.dtype)
+    return None
+
+
+def is_same_view_key(key, other_key):
+    """
+    Return True if the view keys given by `get_view_key` are the same.
+
+    Indexes in them are compared by identity.
+    """
+    if key is None or other_key is None or len(key) != len(other_key):
+        return False
+    for item, other_item in zip(key, other_key):
+        if isinstance(item, pd.Index):
+            if item is not other_item:
+                return False
+        elif item != other_item:
+            return False
+    return True
+
+
+def make_remote_view_entry(value, settings):
+    """Make the remote view of a single value."""
+    return {
+        'type':  get_human_readable_type(value),
+        'size':  get_size(value),
+        'view':  value_to_display(value, minmax=settings['minmax']),
+        'python_type': get_type_string(value),
+        'numpy_type': get_numpy_type_string(value)
+    }
+
+
+def make_remote_view(data, settings, more_excluded_names=None, cache=None):
     """
     Make a remote view of dictionary *data*
     -> globals explorer
+
+    If a *cache* dictionary is passed, the views of values with a key
+    given by `get_view_key` are saved in it. They are reused in later calls
+    while the same object is bound to the same name and its key doesn't
+    change. The cache must be cleared when *settings* change.
     """
     data = get_remote_data(data, settings, mode='editable',
                            more_excluded_names=more_excluded_names)
     remote = {}
     for key, value in list(data.items()):
-        view = value_to_display(value, minmax=settings['minmax'])
-        remote[key] = {
-            'type':  get_human_readable_type(value),
-            'size':  get_size(value),
-            'view':  view,
-            'python_type': get_type_string(value),
-            'numpy_type': get_numpy_type_string(value)
-        }
+        view_key = None
+        if cache is not None:
+            view_key = get_view_key(value, settings)
+            cached = cache.get(key)
+            if (cached is not None and cached[0] is value and
+                    is_same_view_key(view_key, cached[1])):
+                remote[key] = cached[2]
+                continue
+
+        remote[key] = make_remote_view_entry(value, settings)
+
+        if view_key is not None:
+            cache[key] = (value, view_key, remote[key])
+
+    if cache is not None:
+        # Don't keep values that are no longer in the namespace alive
+        for key in list(cache):
+            if key not in remote or cache[key][2] is not remote[key]:
+                del cache[key]
 
     return remote
+
+
+#==============================================================================
+# Windowed access to arrays and dataframes (to be displayed by the
+# ArrayEditor and DataFrameEditor without transferring the whole object)
+#==============================================================================
+def is_windowable(value):
+    """
+    Return True if value can be displayed by requesting windows of its
+    data instead of transferring it at once.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        return not isinstance(value, pd.MultiIndex)
+    elif isinstance(value, np.ndarray):
+        # Masked, record, object and 3d arrays need the whole array to be
+        # displayed by the ArrayEditor
+        return (type(value) is np.ndarray and
+                value.dtype.names is None and
+                value.dtype.name != 'object' and
+                value.ndim in (1, 2))
+    return False
+
+
+def _get_axis_info(axis):
+    """Return the number of levels and the names of a pandas axis."""
+    names = [name if name is None else to_text_string(name)
+             for name in axis.names]
+    return axis.nlevels, names
+
+
+def get_nbytes(value):
+    """Return the (shallow) memory size of an array or dataframe."""
+    try:
+        if isinstance(value, np.ndarray):
+            return value.nbytes
+        memory = value.memory_usage(index=True, deep=False)
+        return memory.sum() if hasattr(memory, 'sum') else memory
+    except Exception:
+        return 0
+
+
+def _to_frame(value):
+    """Convert a series or index to a dataframe."""
+    if isinstance(value, pd.Series):
+        return value.to_frame()
+    elif isinstance(value, pd.Index):
+        return pd.DataFrame(value)
+    return value
+
+
+def get_array_minmax(value):
+    """
+    Return the min and max of a numeric array, as used by the ArrayEditor
+    to color its background, or None if it isn't numeric.
+
+    The absolute values of complex arrays are used.
+    """
+    if value.dtype.kind not in 'biufc' or value.size == 0:
+        return None
+    if value.dtype.kind == 'c':
+        value = np.abs(value)
+    try:
+        return [float(np.nanmin(value)), float(np.nanmax(value))]
+    except (TypeError, ValueError):
+        return None
+
+
+def get_columns_minmax(frame):
+    """
+    Return the max and min of each column of a dataframe, as used by the
+    DataFrameEditor to color its background.
+
+    Each entry is [vmax, vmin], or None for non-numeric columns. The
+    absolute values of complex columns are used and vmin is decreased by
+    one if it's equal to vmax. Return None if there are no rows.
+    """
+    if frame.shape[0] == 0:
+        return None
+
+    real_types = (float, int, np.int64, np.int32)
+    complex_types = (complex, np.complex64, np.complex128)
+    minmax = []
+    for __, column in frame.items():
+        try:
+            if column.dtype in real_types:
+                vmax = column.max(skipna=True)
+                vmin = column.min(skipna=True)
+            elif column.dtype in complex_types:
+                vmax = column.abs().max(skipna=True)
+                vmin = column.abs().min(skipna=True)
+            else:
+                minmax.append(None)
+                continue
+            vmax, vmin = float(vmax), float(vmin)
+        except (TypeError, ValueError):
+            minmax.append(None)
+            continue
+        minmax.append([vmax, vmin] if vmax != vmin else [vmax, vmin - 1])
+    return minmax
+
+
+def get_window_info(value):
+    """
+    Return the information needed to display value by windows.
+
+    This includes its type, shape, dtype (for arrays), levels and names of
+    its headers (for dataframes and series), its size in memory and the
+    min and max of its data (or of each column, for dataframes and series).
+    Those can't be computed from windows. Return None if value can't be
+    displayed by windows.
+    """
+    if not is_windowable(value):
+        return None
+
+    info = {
+        'type': get_type_string(value),
+        'shape': tuple(int(s) for s in value.shape),
+        'ndim': value.ndim,
+        'nbytes': int(get_nbytes(value)),
+    }
+    if isinstance(value, np.ndarray):
+        info['dtype'] = value.dtype.str
+        info['minmax'] = get_array_minmax(value)
+        info['has_inf'] = (value.dtype.kind in 'fc' and
+                           bool(np.isinf(value).any()))
+    else:
+        frame = _to_frame(value)
+        info['shape'] = tuple(int(s) for s in frame.shape)
+        info['column_levels'], info['column_names'] = (
+            _get_axis_info(frame.columns))
+        info['index_levels'], info['index_names'] = (
+            _get_axis_info(frame.index))
+        info['columns_minmax'] = get_columns_minmax(frame)
+    return info
+
+
+def get_window(value, row_start, row_stop, col_start=0, col_stop=1):
+    """
+    Return a copy of the window of value given by its rows and columns.
+
+    Series and indexes are converted to dataframes and 1d arrays are
+    returned as 2d arrays with a single column, as they are displayed.
+    """
+    rows = slice(row_start, row_stop)
+    cols = slice(col_start, col_stop)
+    if isinstance(value, np.ndarray):
+        if value.ndim == 1:
+            return value[rows].reshape(-1, 1).copy()
+        return value[rows, cols].copy()
+    return _to_frame(value).iloc[rows, cols].copy()
@@ -14,6 +14,9 @@
 import io
 import os
 import copy
+import json
+import pickle
+import tarfile
 
 # Third party imports
 import pytest
@@ -275,6 +278,34 @@ def test_spydata_import_missing_file():
     assert os.getcwd() == original_cwd
 
 
+@pytest.mark.parametrize('member', [
+    b'garbage',
+    pickle.dumps(list(range(100)))[:-10],
+    b'cnonexistent_module_2023\nspam\n.',
+])
+def test_spydata_import_corrupted(tmpdir, member):
+    """
+    Test that import fails gracefully with corrupted variables or variables
+    whose module is no longer available.
+    """
+    path = str(tmpdir.join('corrupted.spydata'))
+    toc = json.dumps({
+        'version': iofuncs.SPYDATA_VERSION,
+        'variables': [{'name': 'a', 'file': '0000.pickle',
+                       'format': 'pickle'}],
+    }).encode('utf-8')
+    with tarfile.open(path, 'w') as tar:
+        for name, content in [('0000.pickle', member),
+                              (iofuncs.SPYDATA_TOC, toc)]:
+            tarinfo = tarfile.TarInfo(name)
+            tarinfo.size = len(content)
+            tar.addfile(tarinfo, io.BytesIO(content))
+
+    data, error = iofuncs.load_dictionary(path)
+    assert error and is_text_string(error)
+    assert data is None
+
+
 @pytest.mark.skipif(iofuncs.load_matlab is None, reason="SciPy required")
 def test_matlabstruct():
     """Test support for matlab stlye struct."""
@@ -339,5 +370,59 @@ def test_spydata_export(input_namespace, expected_namespace,
                 pass
 
 
+def test_spydata_import_selected_names(tmpdir):
+    """
+    Test that only the selected variables are loaded from spydata files.
+    """
+    path = str(tmpdir.join('selected.spydata'))
+    namespace = {'a': 1, 'b': np.arange(10), 'c': [1, np.arange(3)]}
+    assert iofuncs.save_dictionary(namespace, path) is None
+    assert iofuncs.get_dictionary_names(path) == ['a', 'b', 'c']
+
+    data, error = iofuncs.load_dictionary(path, names=['b', 'c'])
+    assert error is None
+    assert sorted(data.keys()) == ['b', 'c']
+    assert are_namespaces_equal(data, {'b': namespace['b'],
+                                       'c': namespace['c']})
+
+    # Files saved in the old format have no table of contents
+    path = os.path.join(LOCATION, 'export_data.spydata')
+    assert iofuncs.get_dictionary_names(path) is None
+    data, error = iofuncs.load_dictionary(path, names=['A', 'B'])
+    assert error is None
+    assert sorted(data.keys()) == ['A', 'B']
+
+
+@pytest.mark.parametrize('mmap_mode', [None, 'r', 'c'])
+def test_spydata_arrays(tmpdir, mmap_mode):
+    """
+    Test saving and loading arrays with different memory layouts.
+    """
+    path = str(tmpdir.join('arrays.spydata'))
+    array = np.arange(24, dtype=float).reshape(2, 3, 4)
+    namespace = {
+        'c_order': array,
+        'f_order': np.asfortranarray(array),
+        'strided': array[:, ::2, 1:],
+        'scalar': np.array(1.5),
+        'empty': np.zeros((0, 3)),
+        'objects': np.array([1, 'a', None], dtype=object),
+        'records': np.zeros(3, dtype=[('x', int), ('y', float)]),
+    }
+    assert iofuncs.save_dictionary(namespace, path) is None
+
+    data, error = iofuncs.load_dictionary(path, mmap_mode=mmap_mode)
+    assert error is None
+    for name, value in namespace.items():
+        assert data[name].dtype == value.dtype
+        assert data[name].shape == value.shape
+        assert np.array_equal(data[name], value)
+    assert data['f_order'].flags.f_contiguous
+
+    if mmap_mode is not None:
+        assert isinstance(data['c_order'], np.memmap)
+        assert not isinstance(data['objects'], np.memmap)
+
+
 if __name__ == "__main__":
     pytest.main()
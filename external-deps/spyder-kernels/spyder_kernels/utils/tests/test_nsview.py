@@ -25,7 +25,8 @@
 from spyder_kernels.utils.nsview import (
     sort_against, is_supported, value_to_display, get_size,
     get_supported_types, get_type_string, get_numpy_type_string,
-    is_editable_type)
+    is_editable_type, get_window, get_window_info, get_view_key,
+    is_same_view_key)
 
 
 def generate_complex_object():
@@ -446,5 +447,64 @@ def test_get_numpy_type():
     assert get_numpy_type_string(df) == 'Unknown'
 
 
+
+def test_get_window():
+    """Test for get_window_info and get_window."""
+    # Arrays
+    arr = np.arange(10)
+    info = get_window_info(arr)
+    assert info['shape'] == (10,)
+    assert info['nbytes'] == arr.nbytes
+    assert info['minmax'] == [0, 9]
+    assert not info['has_inf']
+    assert get_window(arr, 2, 4).tolist() == [[2], [3]]
+    assert get_window_info(np.array([1j, np.inf]))['has_inf']
+    assert get_window_info(np.array(['a']))['minmax'] is None
+    assert get_window_info(np.ma.MaskedArray(arr)) is None
+    assert get_window_info(np.zeros((2, 2, 2))) is None
+    assert get_window_info([1, 2]) is None
+
+    # Dataframes
+    columns = pd.MultiIndex.from_tuples([('a', 1), ('a', 2), ('b', 1)],
+                                        names=['x', 'y'])
+    df = pd.DataFrame(np.arange(12).reshape(4, 3), columns=columns)
+    info = get_window_info(df)
+    assert info['shape'] == (4, 3)
+    assert info['column_levels'] == 2
+    assert info['column_names'] == ['x', 'y']
+    assert info['index_levels'] == 1
+    assert info['index_names'] == [None]
+    assert info['columns_minmax'] == [[9, 0], [10, 1], [11, 2]]
+    window = get_window(df, 1, 3, 1, 3)
+    assert window.values.tolist() == [[4, 5], [7, 8]]
+    assert window.columns.tolist() == [('a', 2), ('b', 1)]
+
+    # Series
+    series = pd.Series([1, 2, 3], name='s')
+    info = get_window_info(series)
+    assert info['type'] == 'Series'
+    assert info['shape'] == (3, 1)
+    assert info['column_names'] == [None]
+    assert info['columns_minmax'] == [[3, 1]]
+    assert get_window(series, 0, 2).columns.tolist() == ['s']
+
+
+def test_view_key():
+    """Test that view keys change when the view of dataframes changes."""
+    settings = {'minmax': False}
+    df = pd.DataFrame({'x': [1, 2]})
+    key = get_view_key(df, settings)
+
+    # The key keeps the columns alive, so their id can't be reused
+    assert key[1] is df.columns
+    df.iloc[0, 0] = 5
+    assert is_same_view_key(get_view_key(df, settings), key)
+
+    # Equal columns in a new index still change the key
+    df.columns = ['x']
+    assert not is_same_view_key(get_view_key(df, settings), key)
+    assert not is_same_view_key(None, key)
+    assert not is_same_view_key(get_view_key([1], settings), None)
+
 if __name__ == "__main__":
     pytest.main()
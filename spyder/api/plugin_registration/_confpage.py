@@ -36,7 +36,8 @@ def setup_page(self):
         i = 0
         for plugin_name in self.plugin.all_internal_plugins:
             (conf_section_name,
-             PluginClass) = self.plugin.all_internal_plugins[plugin_name]
+             entry_point) = self.plugin.all_internal_plugins[plugin_name]
+            PluginClass = entry_point.load()
 
             if not getattr(PluginClass, 'CAN_BE_DISABLED', True):
                 # Do not list core plugins that can not be disabled
@@ -67,7 +68,12 @@ def setup_page(self):
         show_external_plugins_group = False
         for i, plugin_name in enumerate(self.plugin.all_external_plugins):
             (conf_section_name,
-             PluginClass) = self.plugin.all_external_plugins[plugin_name]
+             entry_point) = self.plugin.all_external_plugins[plugin_name]
+            try:
+                PluginClass = entry_point.load()
+            except Exception:
+                # Plugins that can't be imported are not registered either
+                continue
 
             if not getattr(PluginClass, 'CAN_BE_DISABLED', True):
                 # Do not list external plugins that can not be disabled
@@ -101,19 +107,11 @@ def apply_settings(self):
             cb, previous_state = self.plugins_checkboxes[plugin_name]
             if cb.isChecked() and not previous_state:
                 self.plugin.set_plugin_enabled(plugin_name)
-                PluginClass = None
-                external = False
-                if plugin_name in self.plugin.all_internal_plugins:
-                    (__,
-                     PluginClass) = self.plugin.all_internal_plugins[plugin_name]
-                elif plugin_name in self.plugin.all_external_plugins:
-                    (__,
-                     PluginClass) = self.plugin.all_external_plugins[plugin_name]
-                    external = True
 
                 # TODO: Once we can test that all plugins can be restarted
                 # without problems during runtime, we can enable the
-                # autorestart feature provided by the plugin registry:
+                # autorestart feature provided by the plugin registry,
+                # loading the class of the plugin from its entry point:
                 # self.plugin.register_plugin(self.main, PluginClass,
                 #                             external=external)
             elif not cb.isChecked() and previous_state:
@@ -8,7 +8,8 @@
 
 # Standard library imports
 import logging
-from typing import Dict, List, Union, Type, Any, Set, Optional, Tuple
+from typing import (
+    Dict, List, Union, Type, Any, Set, Optional, Tuple, TYPE_CHECKING)
 
 # Third-party library imports
 from qtpy.QtCore import QObject, Signal
@@ -25,6 +26,9 @@
     SpyderPlugin)
 from spyder.utils.icon_manager import ima
 
+if TYPE_CHECKING:
+    from spyder.app.find_plugins import PluginEntryPoint
+
 
 # TODO: Remove SpyderPlugin and SpyderPluginWidget once the migration
 # is complete.
@@ -118,11 +122,13 @@ def __init__(self):
         # Set that stores the names of the external plugins
         self.external_plugins = set({})  # type: set[str]
 
-        # Dictionary that contains all the internal plugins (enabled or not)
-        self.all_internal_plugins = {}  # type: Dict[str, Tuple[str, Type[SpyderPluginClass]]]
+        # Dictionary that contains all the internal plugins (enabled or not),
+        # as entry points whose classes are imported on demand (see
+        # spyder.app.find_plugins.PluginEntryPoint)
+        self.all_internal_plugins = {}  # type: Dict[str, Tuple[str, PluginEntryPoint]]
 
         # Dictionary that contains all the external plugins (enabled or not)
-        self.all_external_plugins = {}  # type: Dict[str, Tuple[str, Type[SpyderPluginClass]]]
+        self.all_external_plugins = {}  # type: Dict[str, Tuple[str, PluginEntryPoint]]
 
     # ------------------------- PRIVATE API -----------------------------------
     def _update_dependents(self, plugin: str, dependent_plugin: str, key: str):
@@ -699,11 +705,11 @@ def reset(self):
             pass
 
     def set_all_internal_plugins(
-            self, all_plugins: Dict[str, Type[SpyderPluginClass]]):
+            self, all_plugins: Dict[str, Tuple[str, Any]]):
         self.all_internal_plugins = all_plugins
 
     def set_all_external_plugins(
-            self, all_plugins: Dict[str, Type[SpyderPluginClass]]):
+            self, all_plugins: Dict[str, Tuple[str, Any]]):
         self.all_external_plugins = all_plugins
 
     def set_main(self, main):
@@ -8,131 +8,282 @@
 """
 
 import ast
+import hashlib
 import importlib
+import json
 import logging
 import os
-import traceback
+import sys
+import tempfile
 
-import pkg_resources
+try:
+    from importlib import metadata
+except ImportError:
+    # Python 3.7
+    metadata = None
 
 from spyder.api.exceptions import SpyderAPIError
-from spyder.api.plugins import (
-    SpyderDockablePlugin, SpyderPluginWidget, Plugins)
+from spyder.api.plugins import Plugins
 from spyder.api.utils import get_class_values
 from spyder.config.base import (
-    DEV, STDERR, running_in_ci, running_under_pytest)
+    DEV, get_conf_path, running_in_ci, running_under_pytest)
 
 
 logger = logging.getLogger(__name__)
 
+# Version of the format of the manifest of plugins, to discard manifests
+# saved by other versions of this module
+MANIFEST_VERSION = 1
 
-def find_internal_plugins():
+
+class PluginEntryPoint:
     """
-    Find internal plugins based on setup.py entry points.
+    Plugin declared in a `spyder.plugins` entry point.
 
-    In DEV mode we parse the `setup.py` file directly.
+    The module of the plugin is only imported when its class is requested
+    with `load`, so that finding plugins doesn't import all of them.
     """
-    internal_plugins = {}
 
-    # If DEV, look for entry points in setup.py file for internal plugins
-    # and then look on the system for the rest
+    def __init__(self, name, module_name, class_name, package_name=None,
+                 version=None, external=False):
+        self.name = name
+        self.module_name = module_name
+        self.class_name = class_name
+        self.package_name = package_name
+        self.version = version
+        self.external = external
+        self._plugin_class = None
+
+    def __repr__(self):
+        return '<PluginEntryPoint {} = {}:{}>'.format(
+            self.name, self.module_name, self.class_name)
+
+    def load(self):
+        """Import the module of the plugin and return its class."""
+        if self._plugin_class is None:
+            mod = importlib.import_module(self.module_name)
+            plugin_class = getattr(mod, self.class_name, None)
+
+            if self.external:
+                # To display in dependencies dialog.
+                plugin_class._spyder_module_name = self.module_name
+                plugin_class._spyder_package_name = self.package_name
+                plugin_class._spyder_version = self.version
+
+                if self.name != plugin_class.NAME:
+                    raise SpyderAPIError(
+                        "Entry point name '{0}' and plugin.NAME '{1}' "
+                        "do not match!".format(self.name, plugin_class.NAME)
+                    )
+
+            self._plugin_class = plugin_class
+
+        return self._plugin_class
+
+
+def _get_setup_path():
+    """Return the path of Spyder's setup.py file."""
     HERE = os.path.abspath(os.path.dirname(__file__))
     base_path = os.path.dirname(os.path.dirname(HERE))
-    setup_path = os.path.join(base_path, "setup.py")
+    return os.path.join(base_path, "setup.py")
 
-    if (DEV or running_under_pytest()) and not running_in_ci():
-        if not os.path.isfile(setup_path):
-            raise Exception(
-                'No "setup.py" file found and running in DEV mode!')
 
-        with open(setup_path, "r") as fh:
-            lines = fh.read().split("\n")
+def _use_setup_entry_points():
+    """Whether internal plugins are read from setup.py (in DEV mode)."""
+    return bool(DEV or running_under_pytest()) and not running_in_ci()
 
-        start = None
-        end = None
-        for idx, line in enumerate(lines):
-            if line.startswith("spyder_plugins_entry_points"):
-                start = idx + 1
-                continue
 
-            if start is not None:
-                if line.startswith("]"):
-                    end = idx + 1
-                    break
-
-        entry_points_list = "[" + "\n".join(lines[start:end])
-        spyder_plugin_entry_points = ast.literal_eval(entry_points_list)
-        for entry_point in spyder_plugin_entry_points:
-            try:
-                name, module = entry_point.split(" = ")
-                name = name.strip()
-                module = module.strip()
-                module, class_name = module.split(":")
-            except Exception:
-                logger.error(
-                    '"setup.py" entry point "{entry_point}" is malformed!'
-                    "".format(entry_point=entry_point)
-                )
-
-            try:
-                mod = importlib.import_module(module)
-                internal_plugins[name] = getattr(mod, class_name, None)
-            except (ModuleNotFoundError, ImportError) as e:
-                raise e
-    else:
-        entry_points = list(pkg_resources.iter_entry_points("spyder.plugins"))
-        internal_names = get_class_values(Plugins)
+def _get_manifest_signature():
+    """
+    Return a hash of the metadata of the distributions installed in
+    `sys.path`, which changes when a distribution is installed, updated or
+    removed.
+    """
+    items = [MANIFEST_VERSION, sys.version]
+    for path in sys.path:
+        try:
+            entries = list(os.scandir(path or '.'))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.name.endswith(('.dist-info', '.egg-info')):
+                try:
+                    mtime = entry.stat().st_mtime_ns
+                except OSError:
+                    continue
+                items.append((path, entry.name, mtime))
+
+    if _use_setup_entry_points():
+        setup_path = _get_setup_path()
+        try:
+            items.append((setup_path, os.stat(setup_path).st_mtime_ns))
+        except OSError:
+            pass
+
+    return hashlib.md5(repr(items).encode('utf-8')).hexdigest()
+
+
+def _read_setup_entry_points():
+    """Return the entry points of internal plugins declared in setup.py."""
+    setup_path = _get_setup_path()
+    if not os.path.isfile(setup_path):
+        raise Exception(
+            'No "setup.py" file found and running in DEV mode!')
+
+    with open(setup_path, "r") as fh:
+        lines = fh.read().split("\n")
+
+    start = None
+    end = None
+    for idx, line in enumerate(lines):
+        if line.startswith("spyder_plugins_entry_points"):
+            start = idx + 1
+            continue
+
+        if start is not None:
+            if line.startswith("]"):
+                end = idx + 1
+                break
+
+    entry_points_list = "[" + "\n".join(lines[start:end])
+    spyder_plugin_entry_points = ast.literal_eval(entry_points_list)
+    entry_points = []
+    for entry_point in spyder_plugin_entry_points:
+        try:
+            name, module = entry_point.split(" = ")
+            name = name.strip()
+            module = module.strip()
+            module, class_name = module.split(":")
+        except Exception:
+            logger.error(
+                '"setup.py" entry point "{entry_point}" is malformed!'
+                "".format(entry_point=entry_point)
+            )
+            continue
+
+        entry_points.append([name, module, class_name, None, None])
+
+    return entry_points
+
+
+def _read_installed_entry_points():
+    """
+    Return the `spyder.plugins` entry points of the installed distributions.
+    """
+    entry_points = []
+    names = set()
 
-        for entry_point in entry_points:
-            name = entry_point.name
-            if name not in internal_names:
+    if metadata is None:
+        import pkg_resources
+        for entry_point in pkg_resources.iter_entry_points("spyder.plugins"):
+            entry_points.append([
+                entry_point.name, entry_point.module_name,
+                entry_point.attrs[0], entry_point.dist.project_name,
+                entry_point.dist.version])
+        return entry_points
+
+    for dist in metadata.distributions():
+        for entry_point in dist.entry_points:
+            # Distributions found first in sys.path take precedence
+            if (entry_point.group != "spyder.plugins"
+                    or entry_point.name in names):
                 continue
+            names.add(entry_point.name)
+
+            module_name, __, class_name = entry_point.value.partition(":")
+            # Remove extras, e.g. "module:Class [extra]"
+            class_name = class_name.split("[")[0].strip()
+            entry_points.append([
+                entry_point.name, module_name.strip(), class_name,
+                dist.metadata["Name"], dist.version])
 
-            class_name = entry_point.attrs[0]
-            mod = importlib.import_module(entry_point.module_name)
-            plugin_class = getattr(mod, class_name, None)
-            internal_plugins[name] = plugin_class
+    return entry_points
 
+
+def _build_manifest():
+    """Find the entry points of internal and external plugins."""
+    internal_names = get_class_values(Plugins)
+    entry_points = _read_installed_entry_points()
+
+    if _use_setup_entry_points():
+        internal = _read_setup_entry_points()
+    else:
         # FIXME: This shouldn't be necessary but it's just to be sure
         # plugins are sorted in alphabetical order. We need to remove it
         # in a later version.
-        internal_plugins = {
-            key: value for key, value in sorted(internal_plugins.items())
-        }
+        internal = sorted(
+            entry_point for entry_point in entry_points
+            if entry_point[0] in internal_names)
 
-    return internal_plugins
+    external = [entry_point for entry_point in entry_points
+                if entry_point[0] not in internal_names]
 
+    return {'internal': internal, 'external': external}
 
-def find_external_plugins():
+
+def _get_manifest():
     """
-    Find available external plugins based on setuptools entry points.
+    Return the entry points of internal and external plugins.
+
+    They are saved to a manifest file, which is used until the installed
+    distributions change, because reading the metadata of all of them is
+    slow.
     """
-    internal_names = get_class_values(Plugins)
-    plugins = list(pkg_resources.iter_entry_points("spyder.plugins"))
-    external_plugins = {}
+    manifest_path = get_conf_path('plugin_manifest.json')
+    signature = _get_manifest_signature()
 
-    for entry_point in plugins:
-        name = entry_point.name
-        if name not in internal_names:
-            try:
-                class_name = entry_point.attrs[0]
-                mod = importlib.import_module(entry_point.module_name)
-                plugin_class = getattr(mod, class_name, None)
+    try:
+        with open(manifest_path, 'r') as fh:
+            manifest = json.load(fh)
+        if manifest['signature'] == signature:
+            return manifest['plugins']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
 
-                # To display in dependencies dialog.
-                plugin_class._spyder_module_name = entry_point.module_name
-                plugin_class._spyder_package_name = (
-                    entry_point.dist.project_name)
-                plugin_class._spyder_version = entry_point.dist.version
+    plugins = _build_manifest()
+    try:
+        fd, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(manifest_path), suffix='.tmp')
+        with os.fdopen(fd, 'w') as fh:
+            json.dump({'signature': signature, 'plugins': plugins}, fh)
+        os.replace(temp_path, manifest_path)
+    except OSError:
+        logger.debug("Failed to save the manifest of plugins", exc_info=True)
 
-                external_plugins[name] = plugin_class
-                if name != plugin_class.NAME:
-                    raise SpyderAPIError(
-                        "Entry point name '{0}' and plugin.NAME '{1}' "
-                        "do not match!".format(name, plugin_class.NAME)
-                    )
-            except (ModuleNotFoundError, ImportError) as error:
-                print("%s: %s" % (name, str(error)), file=STDERR)
-                traceback.print_exc(file=STDERR)
+    return plugins
+
+
+def find_internal_plugins():
+    """
+    Find internal plugins based on setup.py entry points.
 
-    return external_plugins
+    In DEV mode the entry points are read from the `setup.py` file directly.
+
+    Returns
+    -------
+    dict
+        `PluginEntryPoint`s of the plugins, by name.
+    """
+    return {
+        name: PluginEntryPoint(name, module_name, class_name)
+        for name, module_name, class_name, __, __
+        in _get_manifest()['internal']
+    }
+
+
+def find_external_plugins():
+    """
+    Find available external plugins based on setuptools entry points.
+
+    Returns
+    -------
+    dict
+        `PluginEntryPoint`s of the plugins, by name.
+    """
+    return {
+        name: PluginEntryPoint(name, module_name, class_name,
+                               package_name=package_name, version=version,
+                               external=True)
+        for name, module_name, class_name, package_name, version
+        in _get_manifest()['external']
+    }
@@ -821,12 +821,12 @@ def setup(self):
         all_plugins = external_plugins.copy()
         all_plugins.update(internal_plugins.copy())
 
-        # Determine 'enable' config for the plugins that have it
+        # Determine 'enable' config for the plugins that have it. Plugins are
+        # only imported when they are going to be registered.
         enabled_plugins = {}
         registry_internal_plugins = {}
         registry_external_plugins = {}
-        for plugin in all_plugins.values():
-            plugin_name = plugin.NAME
+        for plugin_name, plugin in all_plugins.items():
             # Disable panes that use web widgets (currently Help and Online
             # Help) if the user asks for it.
             # See spyder-ide/spyder#16518
@@ -857,7 +857,7 @@ def setup(self):
         # Instantiate internal Spyder 5 plugins
         for plugin_name in internal_plugins:
             if plugin_name in enabled_plugins:
-                PluginClass = internal_plugins[plugin_name]
+                PluginClass = internal_plugins[plugin_name].load()
                 if issubclass(PluginClass, SpyderPluginV2):
                     PLUGIN_REGISTRY.register_plugin(self, PluginClass,
                                                     external=False)
@@ -865,7 +865,7 @@ def setup(self):
         # Instantiate internal Spyder 4 plugins
         for plugin_name in internal_plugins:
             if plugin_name in enabled_plugins:
-                PluginClass = internal_plugins[plugin_name]
+                PluginClass = internal_plugins[plugin_name].load()
                 if issubclass(PluginClass, SpyderPlugin):
                     plugin_instance = PLUGIN_REGISTRY.register_plugin(
                         self, PluginClass, external=False)
@@ -875,12 +875,12 @@ def setup(self):
         # Instantiate external Spyder 5 plugins
         for plugin_name in external_plugins:
             if plugin_name in enabled_plugins:
-                PluginClass = external_plugins[plugin_name]
+                entry_point = external_plugins[plugin_name]
                 try:
                     plugin_instance = PLUGIN_REGISTRY.register_plugin(
-                        self, PluginClass, external=True)
+                        self, entry_point.load(), external=True)
                 except Exception as error:
-                    print("%s: %s" % (PluginClass, str(error)), file=STDERR)
+                    print("%s: %s" % (entry_point, str(error)), file=STDERR)
                     traceback.print_exc(file=STDERR)
 
         self.set_splash(_("Loading old third-party plugins..."))
@@ -1528,6 +1528,9 @@ def closing(self, cancelable=False, close_immediately=False):
         if CONF.get('main', 'single_instance') and self.open_files_server:
             self.open_files_server.close()
 
+        # Save the configuration changes that are waiting to be saved
+        CONF.flush()
+
         QApplication.processEvents()
 
         return True
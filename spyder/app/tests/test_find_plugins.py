@@ -14,6 +14,7 @@
 
 from spyder.api.plugins import Plugins
 from spyder.api.utils import get_class_values
+from spyder.app import find_plugins
 from spyder.app.find_plugins import (
     find_internal_plugins, find_external_plugins)
 from spyder.config.base import running_in_ci
@@ -35,6 +36,37 @@ def test_find_internal_plugins():
     # Names must be the same
     assert sorted(expected_names) == sorted(list(internal_plugins.keys()))
 
+    # Plugins are imported when they are loaded
+    plugin_class = internal_plugins[Plugins.Appearance].load()
+    assert plugin_class.NAME == Plugins.Appearance
+    assert internal_plugins[Plugins.Appearance].load() is plugin_class
+
+
+def test_plugin_manifest(monkeypatch):
+    """Test that entry points are only read when distributions change."""
+    build_manifest = find_plugins._build_manifest
+    calls = []
+
+    def _build_manifest():
+        calls.append(None)
+        return build_manifest()
+
+    monkeypatch.setattr(find_plugins, '_build_manifest', _build_manifest)
+    monkeypatch.setattr(find_plugins, '_get_manifest_signature', lambda: '1')
+
+    internal_plugins = find_internal_plugins()
+    find_external_plugins()
+    assert len(calls) <= 1
+
+    calls.clear()
+    assert sorted(find_internal_plugins()) == sorted(internal_plugins)
+    assert not calls
+
+    # A change in the installed distributions invalidates the manifest
+    monkeypatch.setattr(find_plugins, '_get_manifest_signature', lambda: '2')
+    find_internal_plugins()
+    assert len(calls) == 1
+
 
 @pytest.mark.skipif(not running_in_ci(), reason="Only works in CIs")
 def test_find_external_plugins():
@@ -64,7 +96,7 @@ def test_find_external_plugins():
 
     # Assert special attributes are present
     for name in external_plugins.keys():
-        plugin_class = external_plugins[name]
+        plugin_class = external_plugins[name].load()
         special_attrs = [
             plugin_class._spyder_module_name,
             plugin_class._spyder_package_name,
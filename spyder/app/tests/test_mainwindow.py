@@ -4416,7 +4416,7 @@ def test_print_comms(main_window, qtbot):
                     timeout=EVAL_TIMEOUT)
 
     # Make sure the warning is printed
-    assert ("Output from spyder call 'get_namespace_view':"
+    assert ("Output from spyder call 'get_namespace_view_changes':"
             in control.toPlainText())
 
 
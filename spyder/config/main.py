@@ -187,7 +187,8 @@
              {
               'mute_inline_plotting': True,
               'show_plot_outline': False,
-              'auto_fit_plotting': True
+              'auto_fit_plotting': True,
+              'memory_budget': 512
              }),
             ('editor',
              {
@@ -322,6 +323,7 @@
               'case_sensitive': False,
               'exclude_case_sensitive': False,
               'max_results': 1000,
+              'use_project_index': False,
               }),
             ('breakpoints',
              {
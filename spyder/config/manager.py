@@ -27,6 +27,10 @@
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait before saving changes to the configuration files, so that
+# several changes are saved at once
+SAVE_INTERVAL = 1
+
 EXTRA_VALID_SHORTCUT_CONTEXTS = [
     '_',
     'array_builder',
@@ -79,6 +83,7 @@ def __init__(self, parent=None, active_project_callback=None,
             backup=True,
             raw_mode=True,
             remove_obsolete=False,
+            save_interval=SAVE_INTERVAL,
         )
 
         # This is useful to know in order to execute certain operations when
@@ -139,7 +144,8 @@ def register_plugin(self, plugin_class):
                 backup=True,
                 raw_mode=True,
                 remove_obsolete=False,
-                external_plugin=True
+                external_plugin=True,
+                save_interval=SAVE_INTERVAL,
             )
 
             # Recreate external plugin configs to deal with part two
@@ -161,7 +167,8 @@ def register_plugin(self, plugin_class):
                     backup=True,
                     raw_mode=True,
                     remove_obsolete=False,
-                    external_plugin=True
+                    external_plugin=True,
+                    save_interval=SAVE_INTERVAL,
                 )
 
             self._plugin_configs[conf_section] = (plugin_class, plugin_config)
@@ -187,6 +194,12 @@ def get_active_conf(self, section=None):
 
         return config
 
+    def flush(self):
+        """Save the changes to the configuration that weren't saved yet."""
+        self._user_config.flush()
+        for __, plugin_config in self._plugin_configs.values():
+            plugin_config.flush()
+
     def get_user_config_path(self):
         """Return the user configuration path."""
         base_path = get_conf_path()
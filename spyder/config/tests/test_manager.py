@@ -109,6 +109,7 @@ def test_external_plugin_config(qtbot):
     console.set_conf('max_line_count', 600)
 
     # Read config filew directly
+    manager.flush()
     user_path = manager.get_user_config_path()
     with open(osp.join(user_path, 'spyder.ini'), 'r') as f:
         user_contents = f.read()
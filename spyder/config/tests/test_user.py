@@ -278,6 +278,30 @@ def test_userconfig_get_does_not_eval_functions(self, userconfig):
         userconfig.set('section', 'option', 'print("foo")')
         assert userconfig.get('section', 'option') == 'print("foo")'
 
+    def test_userconfig_get_cached_values(self, tmpdir):
+        defaults = [('test', {'opt': [1], 'other': 1})]
+        conf = UserConfig(name='foobar', path=str(tmpdir), defaults=defaults,
+                          load=False, version='1.0.0', backup=False,
+                          raw_mode=True)
+
+        # Changing the returned value doesn't change the config
+        value = conf.get('test', 'opt')
+        value.append(2)
+        assert conf.get('test', 'opt') == [1]
+
+        conf.set('test', 'opt', [3])
+        assert conf.get('test', 'opt') == [3]
+
+        conf.remove_option('test', 'opt')
+        with pytest.raises(cp.NoOptionError):
+            conf.get('test', 'opt')
+
+        # Values are parsed again when their default changes
+        assert conf.get('test', 'other') == 1
+        conf.set_default('test', 'other', 1.0)
+        assert conf.get('test', 'other') == 1.0
+        assert isinstance(conf.get('test', 'other'), float)
+
 
 def test_userconfig_set_default(userconfig):
     value = userconfig.get_default('section', 'option')
@@ -362,6 +386,34 @@ def test_userconfig_set_percentage_string(self, userconfig):
         assert userconfig.get('section', 'option') == '%value'
 
 
+def test_userconfig_save_interval(tmpdir):
+    conf = UserConfig(name='foobar', path=str(tmpdir),
+                      defaults=[('test', {'opt': 1})], load=False,
+                      version='1.0.0', backup=False, raw_mode=True,
+                      save_interval=60)
+    fpath = conf.get_config_fpath()
+    assert not os.path.isfile(fpath)
+
+    # Changes are saved at once when flushing
+    for value in range(5):
+        conf.set('test', 'opt', value)
+    assert not os.path.isfile(fpath)
+    conf.flush()
+    with open(fpath) as inifile:
+        assert 'opt = 4' in inifile.read()
+
+    # No temporary files are left
+    assert os.listdir(str(tmpdir)) == ['foobar.ini']
+
+    # And after the interval
+    conf._save_interval = 0.1
+    conf.set('test', 'opt', 5)
+    conf._save_timer.join()
+    with open(fpath) as inifile:
+        assert 'opt = 5' in inifile.read()
+    assert conf._save_timer is None
+
+
 def test_userconfig_remove_section(userconfig):
     assert 'section' in userconfig.sections()
     userconfig.remove_section('section')
@@ -14,13 +14,17 @@
 
 # Standard library imports
 import ast
+import atexit
 import copy
 import io
 import os
 import os.path as osp
 import re
 import shutil
+import tempfile
+import threading
 import time
+import weakref
 
 # Local imports
 from spyder.config.base import get_conf_path, get_module_source_path
@@ -36,6 +40,18 @@ class NoDefault:
     pass
 
 
+# Configurations with changes waiting to be saved, by id, which are saved
+# when Python exits
+_PENDING_SAVES = weakref.WeakValueDictionary()
+
+
+@atexit.register
+def _save_pending_configs():
+    """Save the configurations with changes waiting to be saved."""
+    for config in list(_PENDING_SAVES.values()):
+        config.flush()
+
+
 # ============================================================================
 # Defaults class
 # ============================================================================
@@ -56,6 +72,9 @@ def __init__(self, name, path):
         self._name = name
         self._path = path
 
+        # Lock to save the config from a thread while it's changed
+        self._lock = threading.RLock()
+
         if not osp.isdir(osp.dirname(self._path)):
             os.makedirs(osp.dirname(self._path))
 
@@ -100,24 +119,41 @@ def _set(self, section, option, value, verbose):
             text = '[{}][{}] = {}'.format(section, option, value)
             print(text)  # spyder: test-skip
 
-        super(DefaultsConfig, self).set(section, option, value)
+        with self._lock:
+            super(DefaultsConfig, self).set(section, option, value)
 
     def _save(self):
         """Save config into the associated .ini file."""
         fpath = self.get_config_fpath()
 
+        with self._lock:
+            contents = io.StringIO()
+            if PY2:
+                self._write(contents)
+            else:
+                self.write(contents)
+            contents = contents.getvalue()
+
         def _write_file(fpath):
-            with io.open(fpath, 'w', encoding='utf-8') as configfile:
-                if PY2:
-                    self._write(configfile)
-                else:
-                    self.write(configfile)
+            # Write to a temporary file that replaces the config one, so that
+            # the latter is never left half written
+            fd, temp_fpath = tempfile.mkstemp(
+                dir=osp.dirname(fpath), prefix=osp.basename(fpath),
+                suffix='.tmp')
+            try:
+                with io.open(fd, 'w', encoding='utf-8') as configfile:
+                    configfile.write(contents)
+                os.replace(temp_fpath, fpath)
+            except BaseException:
+                os.remove(temp_fpath)
+                raise
 
         # See spyder-ide/spyder#1086 and spyder-ide/spyder#1242 for background
         # on why this method contains all the exception handling.
         try:
             # The "easy" way
-            _write_file(fpath)
+            with self._lock:
+                _write_file(fpath)
         except EnvironmentError:
             try:
                 # The "delete and sleep" way
@@ -173,6 +209,10 @@ class UserConfig(DefaultsConfig):
     remove_obsolete: bool
         If `True`, values that were removed from the configuration on version
         change, are removed from the saved configuration file.
+    save_interval: float
+        If not `None`, changes are saved in the background at most once
+        every `save_interval` seconds, and when Python exits or `flush` is
+        called. Otherwise they are saved right away.
 
     Notes
     -----
@@ -183,10 +223,20 @@ class UserConfig(DefaultsConfig):
 
     def __init__(self, name, path, defaults=None, load=True, version=None,
                  backup=False, raw_mode=False, remove_obsolete=False,
-                 external_plugin=False):
+                 external_plugin=False, save_interval=None):
         """UserConfig class, based on ConfigParser."""
         super(UserConfig, self).__init__(name=name, path=path)
 
+        # Values returned by `get`, by section and option
+        self._values = {}
+
+        # Options of the defaults by section
+        self._defaults_index = {}
+
+        self._save_interval = save_interval
+        self._save_timer = None
+        self._save_pending = False
+
         self._load = load
         self._version = self._check_version(version)
         self._backup = backup
@@ -236,6 +286,19 @@ def __init__(self, name, path, defaults=None, load=True, version=None,
                 # If no defaults are defined set .ini file settings as default
                 self.set_as_defaults()
 
+    @property
+    def defaults(self):
+        """List of (section, options) with the default values."""
+        return self._defaults_list
+
+    @defaults.setter
+    def defaults(self, defaults):
+        self._defaults_list = defaults
+        self._defaults_index = {}
+        for section, options in defaults or []:
+            self._defaults_index.setdefault(section, []).append(options)
+        self._values.clear()
+
     # --- Helpers and checkers
     # ------------------------------------------------------------------------
     @staticmethod
@@ -318,6 +381,12 @@ def _make_backup(self, version=None, old_version=None):
 
     def _load_from_ini(self, fpath):
         """Load config from the associated .ini file found at `fpath`."""
+        with self._lock:
+            self._values.clear()
+            self._read_ini(fpath)
+
+    def _read_ini(self, fpath):
+        """Read the .ini file found at `fpath`."""
         try:
             if PY2:
                 # Python 2
@@ -364,6 +433,27 @@ def _update_defaults(self, defaults, old_version, verbose=False):
                 if old_val is None or to_text_string(new_value) != old_val:
                     self._set(section, option, new_value, verbose)
 
+    def _set(self, section, option, value, verbose):
+        """Set method that forgets the previous value returned by `get`."""
+        with self._lock:
+            self._values.pop((section, self.optionxform(option)), None)
+            super(UserConfig, self)._set(section, option, value, verbose)
+
+    def _save(self):
+        """Save config now or schedule it, depending on `save_interval`."""
+        if self._save_interval is None:
+            super(UserConfig, self)._save()
+            return
+
+        with self._lock:
+            self._save_pending = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self._save_interval,
+                                                   self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+                _PENDING_SAVES[id(self)] = self
+
     def _remove_deprecated_options(self, old_version):
         """
         Remove options which are present in the .ini file but not in defaults.
@@ -462,7 +552,7 @@ def reset_to_defaults(self, save=True, verbose=False, section=None):
 
     def set_as_defaults(self):
         """Set defaults from the current config."""
-        self.defaults = []
+        defaults = []
         for section in self.sections():
             secdict = {}
             for option, value in self.items(section, raw=self._raw):
@@ -471,7 +561,8 @@ def set_as_defaults(self):
                 except (SyntaxError, ValueError):
                     pass
                 secdict[option] = value
-            self.defaults.append((section, secdict))
+            defaults.append((section, secdict))
+        self.defaults = defaults
 
     def get_default(self, section, option):
         """
@@ -480,15 +571,11 @@ def get_default(self, section, option):
         This is useful for type checking in `get` method.
         """
         section = self._check_section_option(section, option)
-        for sec, options in self.defaults:
-            if sec == section:
-                if option in options:
-                    value = options[option]
-                    break
-        else:
-            value = NoDefault
+        for options in self._defaults_index.get(section, []):
+            if option in options:
+                return options[option]
 
-        return value
+        return NoDefault
 
     def get(self, section, option, default=NoDefault):
         """
@@ -506,11 +593,20 @@ def get(self, section, option, default=NoDefault):
         """
         section = self._check_section_option(section, option)
 
+        # Values are parsed once and copied, because callers could change
+        # lists or dicts
+        key = (section, self.optionxform(option))
+        try:
+            return copy.deepcopy(self._values[key])
+        except KeyError:
+            pass
+
         if not self.has_section(section):
             if default is NoDefault:
                 raise cp.NoSectionError(section)
             else:
-                self.add_section(section)
+                with self._lock:
+                    self.add_section(section)
 
         if not self.has_option(section, option):
             if default is NoDefault:
@@ -549,7 +645,8 @@ def get(self, section, option, default=NoDefault):
             except (SyntaxError, ValueError):
                 pass
 
-        return value
+        self._values[key] = value
+        return copy.deepcopy(value)
 
     def set_default(self, section, option, default_value):
         """
@@ -560,9 +657,9 @@ def set_default(self, section, option, default_value):
         based on current values.
         """
         section = self._check_section_option(section, option)
-        for sec, options in self.defaults:
-            if sec == section:
-                options[option] = default_value
+        for options in self._defaults_index.get(section, []):
+            options[option] = default_value
+        self._values.clear()
 
     def set(self, section, option, value, verbose=False, save=True):
         """
@@ -598,16 +695,34 @@ def set(self, section, option, value, verbose=False, save=True):
 
     def remove_section(self, section):
         """Remove `section` and all options within it."""
-        super(UserConfig, self).remove_section(section)
+        with self._lock:
+            self._values.clear()
+            super(UserConfig, self).remove_section(section)
         self._save()
 
     def remove_option(self, section, option):
         """Remove `option` from `section`."""
-        super(UserConfig, self).remove_option(section, option)
+        with self._lock:
+            self._values.clear()
+            super(UserConfig, self).remove_option(section, option)
         self._save()
 
+    def flush(self):
+        """Save the changes that are waiting to be saved."""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            _PENDING_SAVES.pop(id(self), None)
+            if self._save_pending:
+                self._save_pending = False
+                super(UserConfig, self)._save()
+
     def cleanup(self):
         """Remove .ini file associated to config."""
+        with self._lock:
+            self._save_pending = False
+        self.flush()
         os.remove(self.get_config_fpath())
 
     def to_list(self):
@@ -748,9 +863,10 @@ class MultiUserConfig(object):
 
     def __init__(self, name_map, path, defaults=None, load=True, version=None,
                  backup=False, raw_mode=False, remove_obsolete=False,
-                 external_plugin=False):
+                 external_plugin=False, save_interval=None):
         """Multi user config class based on UserConfig class."""
         self._name_map = self._check_name_map(name_map)
+        self._names = {}
         self._path = path
         self._defaults = defaults
         self._load = load
@@ -771,7 +887,8 @@ def __init__(self, name_map, path, defaults=None, load=True, version=None,
             'backup': backup,
             'raw_mode': raw_mode,
             'remove_obsolete': False,  # This will be handled later on if True
-            'external_plugin': external_plugin
+            'external_plugin': external_plugin,
+            'save_interval': save_interval,
         }
 
         for name in name_map:
@@ -799,7 +916,11 @@ def __init__(self, name_map, path, defaults=None, load=True, version=None,
     def _get_config(self, section, option):
         """Get the correct configuration based on section and option."""
         # Check the filemap first
-        name = self._get_name_from_map(section, option)
+        try:
+            name = self._names[(section, option)]
+        except KeyError:
+            name = self._get_name_from_map(section, option)
+            self._names[(section, option)] = name
         config_value = self._configs_map.get(name, None)
 
         if config_value is None:
@@ -1004,10 +1125,15 @@ def remove_option(self, section, option):
         config = self._get_config(section, option)
         config.remove_option(section, option)
 
+    def flush(self):
+        """Save the changes that are waiting to be saved."""
+        for _, config in self._configs_map.items():
+            config.flush()
+
     def cleanup(self):
         """Remove .ini files associated to configurations."""
         for _, config in self._configs_map.items():
-            os.remove(config.get_config_fpath())
+            config.cleanup()
 
 
 class PluginConfig(UserConfig):
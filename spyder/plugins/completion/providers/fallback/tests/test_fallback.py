@@ -150,11 +150,15 @@ def test_token_update(qtbot_module, fallback_fixture):
     initial_tokens = {token['insertText'] for token in initial_tokens}
     assert 'args' not in initial_tokens
 
-    diff = diff_match.patch_make(TEST_FILE, TEST_FILE_UPDATE)
+    position = {'line': 3, 'character': 0}
     update_request = {
         'file': 'test.py',
-        'diff': diff,
-        'offset': len(diff),
+        'text': None,
+        'content_changes': [{
+            'range': {'start': position, 'end': position},
+            'text': TEST_FILE_UPDATE[len(TEST_FILE):],
+        }],
+        'offset': len(TEST_FILE_UPDATE),
     }
     fallback.send_request(
         'python', CompletionRequestTypes.DOCUMENT_DID_CHANGE, update_request)
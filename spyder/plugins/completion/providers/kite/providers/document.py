@@ -18,6 +18,7 @@
     send_request, handles)
 from spyder.plugins.completion.api import (
     CompletionRequestTypes, CompletionItemKind)
+from spyder.plugins.editor.utils.contentchanges import apply_content_changes
 
 
 # Kite can return e.g. "int | str", so we make the default hint VALUE.
@@ -88,10 +89,16 @@ def document_did_open(self, params):
 
     @send_request(method=CompletionRequestTypes.DOCUMENT_DID_CHANGE)
     def document_did_change(self, params):
+        text = params['text']
+        if text is None:
+            with QMutexLocker(self.mutex):
+                text = apply_content_changes(
+                    self.opened_files.get(params['file'], ''),
+                    params['content_changes'])
         request = {
             'source': 'spyder',
             'filename': osp.realpath(params['file']),
-            'text': params['text'],
+            'text': text,
             'action': 'edit',
             'selections': [{
                 'start': params['selection_start'],
@@ -100,7 +107,7 @@ def document_did_change(self, params):
             }],
         }
         with QMutexLocker(self.mutex):
-            self.opened_files[params['file']] = params['text']
+            self.opened_files[params['file']] = text
         return request
 
     @send_request(method=CompletionRequestTypes.DOCUMENT_CURSOR_EVENT)
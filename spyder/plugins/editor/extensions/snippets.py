@@ -13,7 +13,6 @@
 # Third party imports
 from qtpy.QtGui import QTextCursor, QColor
 from qtpy.QtCore import Qt, QMutex, QMutexLocker
-from diff_match_patch import diff_match_patch
 
 try:
     from rtree import index
@@ -28,7 +27,6 @@
 
 
 MERGE_ALLOWED = {'int', 'name', 'whitespace'}
-VALID_UPDATES = {diff_match_patch.DIFF_DELETE, diff_match_patch.DIFF_INSERT}
 
 
 def no_undo(f):
@@ -134,18 +132,20 @@ def update_undo_stack(self):
         info = (ast_copy, self.starting_position, self.active_snippet)
         self.undo_stack.insert(0, info)
 
+    def _get_num_changed_chars(self):
+        """Get the number of chars inserted and removed in the last change."""
+        num_chars = 0
+        for change in self.editor.content_changes:
+            num_chars += len(change['text']) + change.get('rangeLength', 0)
+        return num_chars
+
     @lock
     @no_undo
     def _undo(self):
         if len(self.undo_stack) == 0:
             self.reset()
         if self.is_snippet_active:
-            num_pops = 0
-            patch = self.editor.patch
-            for diffs in patch:
-                for (op, data) in diffs.diffs:
-                    if op in VALID_UPDATES:
-                        num_pops += len(data)
+            num_pops = self._get_num_changed_chars()
             if len(self.undo_stack) > 0:
                 for _ in range(num_pops):
                     if len(self.undo_stack) == 0:
@@ -165,12 +165,7 @@ def _undo(self):
     @no_undo
     def _redo(self):
         if self.is_snippet_active:
-            num_pops = 0
-            patch = self.editor.patch
-            for diffs in patch:
-                for (op, data) in diffs.diffs:
-                    if op in VALID_UPDATES:
-                        num_pops += len(data)
+            num_pops = self._get_num_changed_chars()
             if len(self.redo_stack) > 0:
                 for _ in range(num_pops):
                     if len(self.redo_stack) == 0:
@@ -88,12 +88,20 @@ def paintEvent(self, event):
         painter = QPainter(self)
         painter.fillRect(event.rect(), self.editor.sideareas_color)
 
-        for top, line_number, block in self.editor.visible_blocks:
+        visible_blocks = self.editor.visible_blocks
+        if visible_blocks:
+            breakpoint_lines = set(self.editor.markers.get_blocks(
+                'breakpoint', visible_blocks[0][1] - 1,
+                visible_blocks[-1][1] - 1))
+        for top, line_number, block in visible_blocks:
             if self.line_number_hint == line_number:
                 self._draw_breakpoint_icon(top, painter, 'transparent')
             if self._current_line_arrow == line_number and not self.stop:
                 self._draw_breakpoint_icon(top, painter, 'arrow')
 
+            if line_number - 1 not in breakpoint_lines:
+                continue
+
             data = block.userData()
             if data is None or not data.breakpoint:
                 continue
@@ -95,9 +95,25 @@ def draw_pixmap(xleft, ytop, pixmap):
                 # must be drawn independently.
                 self.draw_linenumbers_slow(painter)
 
-        for top, line_number, block in self.editor.visible_blocks:
+        visible_blocks = self.editor.visible_blocks
+        if self._markers_margin and visible_blocks:
+            # Get the lines with markers from the index of the editor, so
+            # that only their data is looked at
+            first = visible_blocks[0][1] - 1
+            last = visible_blocks[-1][1] - 1
+            markers = self.editor.markers
+            marker_lines = set(
+                markers.get_blocks('error', first, last) +
+                markers.get_blocks('warning', first, last) +
+                markers.get_blocks('todo', first, last))
+        else:
+            marker_lines = set()
+
+        for top, line_number, block in visible_blocks:
+            if line_number - 1 not in marker_lines:
+                continue
             data = block.userData()
-            if self._markers_margin and data:
+            if data:
                 if data.code_analysis:
                     errors = 0
                     warnings = 0
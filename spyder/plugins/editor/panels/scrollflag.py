@@ -19,7 +19,6 @@
 
 # Local imports
 from spyder.api.panel import Panel
-from spyder.plugins.completion.api import DiagnosticSeverity
 
 
 REFRESH_RATE = 1000
@@ -120,42 +119,23 @@ def update_flags(self):
         """
         Update flags list.
 
-        This parses the entire file, which can take a lot of time for
-        large files. Save all the flags in lists for painting during
-        paint events.
+        This gets the blocks with flags from the markers index of the editor
+        and saves them in lists for painting during paint events.
         """
-        self._dict_flag_list = {
-            'error': [],
-            'warning': [],
-            'todo': [],
-            'breakpoint': [],
-        }
+        self._dict_flag_list = {}
 
         editor = self.editor
-        block = editor.document().firstBlock()
-        while block.isValid():
-            # Parse all lines in the file looking for something to flag.
-            data = block.userData()
-            if data:
-                if data.code_analysis:
-                    # Paint the errors and warnings
-                    for _, _, severity, _ in data.code_analysis:
-                        if severity == DiagnosticSeverity.ERROR:
-                            flag_type = 'error'
-                            break
-                    else:
-                        flag_type = 'warning'
-                elif data.todo:
-                    flag_type = 'todo'
-                elif data.breakpoint:
-                    flag_type = 'breakpoint'
-                else:
-                    flag_type = None
-
-                if flag_type is not None:
-                    self._dict_flag_list[flag_type].append(block)
-
-            block = block.next()
+        document = editor.document()
+        flagged = set()
+
+        # A block only gets the flag with the highest priority, in this order
+        for flag_type in ('error', 'warning', 'todo', 'breakpoint'):
+            blocks = []
+            for block_number in editor.markers.get_blocks(flag_type):
+                if block_number not in flagged:
+                    flagged.add(block_number)
+                    blocks.append(document.findBlockByNumber(block_number))
+            self._dict_flag_list[flag_type] = blocks
 
         self.update()
 
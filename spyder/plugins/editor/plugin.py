@@ -26,6 +26,7 @@
 from qtpy.QtWidgets import (QAction, QActionGroup, QApplication, QDialog,
                             QFileDialog, QInputDialog, QMenu, QSplitter,
                             QToolBar, QVBoxLayout, QWidget)
+from spyder_kernels.utils.misc import code_hash
 
 # Local imports
 from spyder.api.config.decorators import on_conf_change
@@ -2849,9 +2850,12 @@ def _get_editor(self, filename):
 
         return editorstack.data[index].editor
 
-    def handle_run_cell(self, cell_name, filename):
+    def handle_run_cell(self, cell_name, filename, known_hashes=None):
         """
         Get cell code from cell name and file name.
+
+        If the hash of the code is in `known_hashes`, only the hash is
+        returned because the kernel already has the code.
         """
         editorstack = self._get_editorstack()
         editor = self._get_editor(filename)
@@ -2863,7 +2867,8 @@ def handle_run_cell(self, cell_name, filename):
         editorstack.last_cell_call = (filename, cell_name)
 
         # The file is open, load code from editor
-        return editor.get_cell_code(cell_name)
+        return self._code_or_hash(
+            editor.get_cell_code(cell_name), known_hashes)
 
     def handle_cell_count(self, filename):
         """Get number of cells in file to loop."""
@@ -2880,11 +2885,14 @@ def handle_current_filename(self, filename):
         """Get the current filename."""
         return self._get_editorstack().get_current_finfo().filename
 
-    def handle_get_file_code(self, filename, save_all=True):
+    def handle_get_file_code(self, filename, save_all=True,
+                             known_hashes=None):
         """
         Return the bytes that compose the file.
 
         Bytes are returned instead of str to support non utf-8 files.
+        If the hash of the code is in `known_hashes`, only the hash is
+        returned because the kernel already has the code.
         """
         editorstack = self._get_editorstack()
         if save_all and CONF.get(
@@ -2895,9 +2903,17 @@ def handle_get_file_code(self, filename, save_all=True):
         if editor is None:
             # Load it from file instead
             text, _enc = encoding.read(filename)
-            return text
+            return self._code_or_hash(text, known_hashes)
+
+        return self._code_or_hash(editor.toPlainText(), known_hashes)
 
-        return editor.toPlainText()
+    def _code_or_hash(self, code, known_hashes):
+        """Return the hash of code instead of code if the kernel has it."""
+        if known_hashes:
+            hash_ = code_hash(code)
+            if hash_ in known_hashes:
+                return {'hash': hash_}
+        return code
 
     #------ Run Python script
     @Slot()
@@ -16,6 +16,7 @@
 # Third party imports
 from qtpy.QtCore import Qt
 import pytest
+from spyder_kernels.utils.misc import code_hash
 
 # Local imports
 from spyder.plugins.editor.utils.autosave import AutosaveForPlugin
@@ -419,5 +420,34 @@ def test_save_with_os_eol_chars(editor_plugin, mocker, qtbot, tmpdir):
     assert get_eol_chars(text) == os.linesep
 
 
+def test_get_code_known_hashes(editor_plugin, python_files, qtbot):
+    """
+    Check that only the hash of the code is returned to the kernel if it
+    already has that code.
+    """
+    filenames, tmpdir = python_files
+    fname = filenames[0]
+    editor_plugin.load(fname)
+    qtbot.wait(500)
+    codeeditor = editor_plugin.get_current_editor()
+    text = codeeditor.toPlainText()
+    cell_code = codeeditor.get_cell_code(0)
+
+    # The code is returned if the kernel doesn't have it
+    assert editor_plugin.handle_get_file_code(fname, save_all=False) == text
+    assert editor_plugin.handle_get_file_code(
+        fname, save_all=False, known_hashes=[code_hash('a = 1')]) == text
+    assert editor_plugin.handle_run_cell(
+        0, fname, known_hashes=[code_hash('a = 1')]) == cell_code
+
+    # Only the hash is returned if the kernel has it
+    assert editor_plugin.handle_get_file_code(
+        fname, save_all=False, known_hashes=[code_hash(text)]
+    ) == {'hash': code_hash(text)}
+    assert editor_plugin.handle_run_cell(
+        0, fname, known_hashes=[code_hash(cell_code)]
+    ) == {'hash': code_hash(cell_code)}
+
+
 if __name__ == "__main__":
     pytest.main(['-x', osp.basename(__file__), '-vv', '-rw'])
@@ -18,7 +18,11 @@
 
 File contents are compared using their hash. The variable `file_hashes`
 contains the hash of all files currently open in the editor and all autosave
-files.
+files. To avoid computing the hash of files which did not change, the revision
+of their document at the last autosave is stored in `file_revisions`.
+
+Autosave files are written in a background thread, so that autosaving large
+files does not block the interface.
 
 On startup, the contents of the autosave directory is checked and if autosave
 files are found, the user is asked whether to recover them;
@@ -31,6 +35,7 @@
 import os
 import os.path as osp
 import re
+import threading
 
 # Third party imports
 from qtpy.QtCore import QTimer
@@ -39,8 +44,10 @@
 from spyder.config.base import _, get_conf_path, running_under_pytest
 from spyder.plugins.editor.widgets.autosaveerror import AutosaveErrorDialog
 from spyder.plugins.editor.widgets.recover import RecoveryDialog
-from spyder.py3compat import PY2
+from spyder.py3compat import PY2, to_text_string
+from spyder.utils import encoding
 from spyder.utils.programs import is_spyder_process
+from spyder.utils.workers import WorkerManager
 
 
 logger = logging.getLogger(__name__)
@@ -236,6 +243,9 @@ class AutosaveForStack(object):
         file_hashes (dict): map between file names and hash of their contents.
             This is used for both files opened in the editor and their
             corresponding autosave files.
+        file_revisions (dict): map between file names and the document,
+            revision and end-of-line characters of their editor when they
+            were last checked for autosave.
     """
 
     def __init__(self, editorstack):
@@ -248,6 +258,19 @@ def __init__(self, editorstack):
         self.stack = editorstack
         self.name_mapping = {}
         self.file_hashes = {}
+        self.file_revisions = {}
+
+        # Autosave files are written one after the other in a thread.
+        # The lock prevents writing an autosave file while it's removed,
+        # and `_write_ids` is used to discard writes that are outdated.
+        self._worker_manager = WorkerManager(max_threads=1)
+        self._write_lock = threading.Lock()
+        self._write_ids = {}
+        self._last_write_id = 0
+
+        # Reading the umask is not thread safe, so the permissions of new
+        # autosave files are computed here
+        self._new_file_mode = encoding.get_new_file_mode()
 
     def create_unique_autosave_filename(self, filename, autosave_dir):
         """
@@ -285,11 +308,12 @@ def save_autosave_mapping(self):
         my_pid = os.getpid()
         pidfile_name = osp.join(autosave_dir, 'pid{}.txt'.format(my_pid))
         if self.name_mapping:
-            with open(pidfile_name, 'w') as pidfile:
-                if PY2:
-                    pidfile.write(repr(self.name_mapping))
-                else:
-                    pidfile.write(ascii(self.name_mapping))
+            if PY2:
+                mapping = repr(self.name_mapping)
+            else:
+                mapping = ascii(self.name_mapping)
+            # Write atomically so that the pid file is never left corrupted
+            encoding.write(mapping, pidfile_name)
         else:
             try:
                 os.remove(pidfile_name)
@@ -304,16 +328,21 @@ def remove_autosave_file(self, filename):
         If there is no autosave file, then the function returns without doing
         anything.
         """
+        self.file_revisions.pop(filename, None)
         if filename not in self.name_mapping:
             return
         autosave_filename = self.name_mapping[filename]
-        try:
-            os.remove(autosave_filename)
-        except EnvironmentError as error:
-            action = (_('Error while removing autosave file {}')
-                      .format(autosave_filename))
-            msgbox = AutosaveErrorDialog(action, error)
-            msgbox.exec_if_enabled()
+        with self._write_lock:
+            # Discard pending writes of the autosave file
+            pending_write = self._write_ids.pop(autosave_filename, None)
+            try:
+                os.remove(autosave_filename)
+            except EnvironmentError as error:
+                if pending_write is None or osp.exists(autosave_filename):
+                    action = (_('Error while removing autosave file {}')
+                              .format(autosave_filename))
+                    msgbox = AutosaveErrorDialog(action, error)
+                    msgbox.exec_if_enabled()
         del self.name_mapping[filename]
         del self.file_hashes[autosave_filename]
         self.save_autosave_mapping()
@@ -366,6 +395,15 @@ def maybe_autosave(self, index):
         if finfo.newly_created:
             return
         orig_filename = finfo.filename
+
+        # Nothing to do if the document didn't change since the last check
+        document = finfo.editor.document()
+        revision = (id(document), document.revision(),
+                    finfo.editor.get_line_separator())
+        if self.file_revisions.get(orig_filename) == revision:
+            return
+        self.file_revisions[orig_filename] = revision
+
         try:
             orig_hash = self.file_hashes[orig_filename]
         except KeyError:
@@ -375,7 +413,8 @@ def maybe_autosave(self, index):
             # original file.
             logger.error('KeyError when retrieving hash of %s', orig_filename)
             orig_hash = None
-        new_hash = self.stack.compute_hash(finfo)
+        text = to_text_string(finfo.editor.get_text_with_eol())
+        new_hash = hash(text)
         if orig_filename in self.name_mapping:
             autosave_filename = self.name_mapping[orig_filename]
             autosave_hash = self.file_hashes[autosave_filename]
@@ -383,33 +422,76 @@ def maybe_autosave(self, index):
                 if new_hash == orig_hash:
                     self.remove_autosave_file(orig_filename)
                 else:
-                    self.autosave(finfo)
+                    self.autosave(finfo, text)
         else:
             if new_hash != orig_hash:
-                self.autosave(finfo)
+                self.autosave(finfo, text)
 
-    def autosave(self, finfo):
+    def autosave(self, finfo, text=None):
         """
         Autosave a file.
 
         Save a copy in a file with name `self.get_autosave_filename()` and
-        update the cached hash of the autosave file. An error dialog notifies
-        the user of any errors raised when saving.
+        update the cached hash of the autosave file. The file is written in a
+        thread and an error dialog notifies the user of any errors raised
+        when saving.
 
         Args:
             fileinfo (FileInfo): file that is to be autosaved.
+            text (str): contents of the file. If None, they are taken from
+                the editor.
         """
-        autosave_filename = self.get_autosave_filename(finfo.filename)
-        logger.debug('Autosaving %s to %s', finfo.filename, autosave_filename)
-        try:
-            self.stack._write_to_file(finfo, autosave_filename)
-            autosave_hash = self.stack.compute_hash(finfo)
-            self.file_hashes[autosave_filename] = autosave_hash
-        except EnvironmentError as error:
-            action = (_('Error while autosaving {} to {}')
-                      .format(finfo.filename, autosave_filename))
-            msgbox = AutosaveErrorDialog(action, error)
-            msgbox.exec_if_enabled()
+        if text is None:
+            text = to_text_string(finfo.editor.get_text_with_eol())
+        filename = finfo.filename
+        autosave_filename = self.get_autosave_filename(filename)
+        logger.debug('Autosaving %s to %s', filename, autosave_filename)
+        self.file_hashes[autosave_filename] = hash(text)
+
+        self._last_write_id += 1
+        self._write_ids[autosave_filename] = self._last_write_id
+        worker = self._worker_manager.create_python_worker(
+            self._write_autosave_file, finfo, autosave_filename, text,
+            self._last_write_id)
+        worker.sig_finished.connect(
+            lambda worker, output, error: self._autosave_finished(
+                filename, autosave_filename, error))
+        worker.start()
+
+    def _write_autosave_file(self, finfo, autosave_filename, text, write_id):
+        """
+        Write an autosave file, unless the write is outdated.
+
+        Return the encoding used to write it, or None if it wasn't written.
+        """
+        with self._write_lock:
+            if self._write_ids.get(autosave_filename) != write_id:
+                return None
+            return self.stack._write_to_file(
+                finfo, autosave_filename, text,
+                new_file_mode=self._new_file_mode)
+
+    def _autosave_finished(self, filename, autosave_filename, error):
+        """Notify the user of errors raised when writing an autosave file."""
+        if error is None:
+            return
+        # Write the file again in the next autosave
+        if autosave_filename in self.file_hashes:
+            self.file_hashes[autosave_filename] = None
+        self.file_revisions.pop(filename, None)
+        action = (_('Error while autosaving {} to {}')
+                  .format(filename, autosave_filename))
+        msgbox = AutosaveErrorDialog(action, error)
+        msgbox.exec_if_enabled()
+
+    def close(self):
+        """
+        Stop writing autosave files when the editor stack is closed.
+
+        This waits for the file being written, if any. Pending writes are
+        discarded.
+        """
+        self._worker_manager.terminate_all()
 
     def autosave_all(self):
         """Autosave all opened files where necessary."""
@@ -432,6 +514,7 @@ def file_renamed(self, old_name, new_name):
                          old_name, new_name)
             old_hash = None
         self.remove_autosave_file(old_name)
+        self.file_revisions.pop(new_name, None)
         if old_hash is not None:
             del self.file_hashes[old_name]
             self.file_hashes[new_name] = old_hash
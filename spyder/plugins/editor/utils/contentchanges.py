@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Tracking of the changes of a document to synchronize it incrementally with
+language servers.
+"""
+
+# Standard library imports
+import re
+
+# Third party imports
+from qtpy.QtGui import QTextCursor
+
+# Local imports
+from spyder.utils.qstringhelpers import qstring_length
+
+
+# Line breaks recognized by QPlainTextEdit when setting its text
+LINE_BREAK = re.compile(r'\r\n|\r|\n')
+
+
+class ContentChangesTracker(object):
+    """
+    Track the changes of a QTextDocument as LSP content change events.
+
+    The tracker keeps a copy of the lines of the document to compute the
+    range that each change replaced, since QTextDocument.contentsChange only
+    reports the position of the change and how many characters were removed
+    and added.
+
+    Positions are given in UTF-16 code units, as the LSP specification
+    requires and Qt uses.
+    """
+
+    def __init__(self, document):
+        self.document = document
+        self._lines = []
+        self._length = 0
+        self._changes = []
+        self._valid = True
+        document.contentsChange.connect(self._on_contents_change)
+        self.reset()
+
+    def reset(self):
+        """Track changes from the current contents of the document."""
+        text = self.document.toPlainText()
+        self._lines = text.split('\n')
+        self._length = qstring_length(text)
+        self._changes = []
+        self._valid = True
+
+    def take_changes(self):
+        """
+        Return the changes since the last call to this method.
+
+        Return None if the changes could not be tracked, in which case the
+        whole text needs to be sent to the server. Tracking starts again from
+        the current contents of the document in that case.
+        """
+        changes = self._changes if self._valid else None
+        if self._valid:
+            self._changes = []
+        else:
+            self.reset()
+        return changes
+
+    def _on_contents_change(self, position, chars_removed, chars_added):
+        """Compute the LSP content change event of a document change."""
+        if not self._valid:
+            return
+
+        document = self.document
+        start_block = document.findBlock(position)
+        start_line = start_block.blockNumber()
+        start_column = position - start_block.position()
+
+        # Qt can report changes that don't match the previous contents, e.g.
+        # when a one-line document is cleared, so they can't be tracked. The
+        # paragraph separator at the end of the document can be counted as
+        # removed too.
+        if (start_line < 0 or start_line >= len(self._lines) or
+                chars_removed > self._length + 1):
+            self._valid = False
+            return
+
+        # Find where the removed text ended in the previous contents.
+        # Qt counts the paragraph separator at the end of the document in
+        # chars_removed and chars_added when the whole document is changed,
+        # so stop at the end of the last line.
+        end_line = start_line
+        end_column = start_column
+        range_length = chars_removed
+        remaining = chars_removed
+        while True:
+            line_length = qstring_length(self._lines[end_line])
+            if remaining <= line_length - end_column:
+                end_column += remaining
+                break
+            if end_line == len(self._lines) - 1:
+                range_length -= remaining - (line_length - end_column)
+                end_column = line_length
+                break
+            remaining -= line_length - end_column + 1
+            end_line += 1
+            end_column = 0
+
+        # Get the lines that replaced the changed ones
+        end_position = min(position + chars_added,
+                           document.characterCount() - 1)
+        end_block = document.findBlock(end_position)
+        new_lines = []
+        block = start_block
+        while block.isValid():
+            new_lines.append(block.text())
+            if block == end_block:
+                break
+            block = block.next()
+
+        old_lines = self._lines[start_line:end_line + 1]
+        if new_lines == old_lines:
+            # Only the format of the text changed (e.g. the syntax
+            # highlighter updated it)
+            return
+        self._lines[start_line:end_line + 1] = new_lines
+
+        cursor = QTextCursor(document)
+        cursor.setPosition(position)
+        cursor.setPosition(end_position, QTextCursor.KeepAnchor)
+        text = cursor.selectedText().replace(u'\u2029', '\n')
+
+        # Check that applying the change gives the current contents
+        self._length += qstring_length(text) - range_length
+        if (len(self._lines) != document.blockCount() or
+                self._length != document.characterCount() - 1):
+            self._valid = False
+            return
+
+        self._changes.append({
+            'range': {
+                'start': {'line': start_line, 'character': start_column},
+                'end': {'line': end_line, 'character': end_column},
+            },
+            'rangeLength': range_length,
+            'text': text,
+        })
+
+
+def position_to_offset(text, position):
+    """
+    Convert a LSP position (line and UTF-16 character) to an offset in text.
+    """
+    line_start = 0
+    for __ in range(position['line']):
+        match = LINE_BREAK.search(text, line_start)
+        if match is None:
+            return len(text)
+        line_start = match.end()
+
+    match = LINE_BREAK.search(text, line_start)
+    line_end = len(text) if match is None else match.start()
+
+    offset = line_start
+    units = 0
+    while offset < line_end and units < position['character']:
+        units += 2 if ord(text[offset]) > 0xFFFF else 1
+        offset += 1
+    return offset
+
+
+def apply_content_changes(text, content_changes):
+    """Apply a list of LSP content change events to text."""
+    for change in content_changes:
+        if 'range' not in change:
+            text = change['text']
+            continue
+        start = position_to_offset(text, change['range']['start'])
+        end = position_to_offset(text, change['range']['end'])
+        text = text[:start] + change['text'] + text[end:]
+    return text
@@ -117,6 +117,7 @@ def toogle_breakpoint(self, line_number=None, condition=None,
             else:
                 self._breakpoint_blocks[id(block)] = block
         block.setUserData(data)
+        self.editor.markers.update_blocks([block])
         self.editor.sig_flags_changed.emit()
         self.editor.sig_breakpoints_changed.emit()
 
@@ -139,9 +140,11 @@ def get_breakpoints(self):
     def clear_breakpoints(self):
         """Clear breakpoints"""
         self.breakpoints = []
-        for data in self.editor.blockuserdata_list():
-            data.breakpoint = False
-            # data.breakpoint_condition = None  # not necessary, but logical
+        for block in self.editor.markers.clear('breakpoint'):
+            data = block.userData()
+            if data:
+                data.breakpoint = False
+                # data.breakpoint_condition = None  # not necessary
         self._breakpoint_blocks = {}
         # Inform the editor that the breakpoints are changed
         self.editor.sig_breakpoints_changed.emit()
@@ -16,6 +16,10 @@
 <https://github.com/pyQode/pyqode.core/blob/master/pyqode/core/managers/decorations.py>
 """
 
+# Standard library imports
+import bisect
+import itertools
+
 # Third party imports
 from qtpy.QtCore import QObject, QTimer, Slot
 from qtpy.QtGui import QTextCharFormat
@@ -29,15 +33,59 @@
 UPDATE_TIMEOUT = 15  # milliseconds
 
 
+def _selection_start(decoration):
+    return decoration.cursor.selectionStart()
+
+
+def _selection_end(decoration):
+    return decoration.cursor.selectionEnd()
+
+
+def _bisect(decorations, position, get_position, right=False):
+    """
+    Return the index where `position` would be inserted in `decorations`,
+    which are sorted by `get_position`.
+    """
+    low, high = 0, len(decorations)
+    while low < high:
+        middle = (low + high) // 2
+        value = get_position(decorations[middle])
+        if value < position or (right and value == position):
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
 class TextDecorationsManager(Manager, QObject):
     """
     Manages the collection of TextDecoration that have been set on the editor
     widget.
+
+    Decorations are indexed by the start and end positions of their
+    selections, to get the visible ones without going through all of them.
+    The positions of the cursors of decorations change when the text is
+    edited, but their order doesn't, so the indexes stay sorted.
     """
     def __init__(self, editor):
         super(TextDecorationsManager, self).__init__(editor)
         QObject.__init__(self, None)
+
+        # Decorations in draw order and their sort keys
         self._decorations = []
+        self._keys = {}
+        self._sorted_keys = []
+        self._counter = itertools.count()
+
+        # Decorations sorted by the start and end of their selections, and
+        # the ones that are always visible
+        self._by_start = []
+        self._by_end = []
+        self._always_visible = set()
+
+        # Decorations set as extra selections of the editor and their font
+        self._visible_decorations = []
+        self._font = None
 
         # Timer to not constantly update decorations.
         self.update_timer = QTimer(self)
@@ -58,17 +106,16 @@ def add(self, decorations):
         Returns:
             int: Amount of decorations added.
         """
+        if not isinstance(decorations, list):
+            decorations = [decorations]
+
         added = 0
-        if isinstance(decorations, list):
-            not_repeated = set(decorations) - set(self._decorations)
-            self._decorations.extend(list(not_repeated))
-            added = len(not_repeated)
-        elif decorations not in self._decorations:
-            self._decorations.append(decorations)
-            added = 1
+        for decoration in decorations:
+            if decoration not in self._keys:
+                self._insert(decoration)
+                added += 1
 
         if added > 0:
-            self._order_decorations()
             self.update()
         return added
 
@@ -82,16 +129,27 @@ def remove(self, decoration):
             Set to False to avoid updating several times while removing
             several decorations
         """
-        try:
-            self._decorations.remove(decoration)
-            self.update()
-            return True
-        except ValueError:
+        key = self._keys.pop(decoration, None)
+        if key is None:
             return False
 
+        index = bisect.bisect_left(self._sorted_keys, key)
+        del self._sorted_keys[index]
+        del self._decorations[index]
+        self._remove_sorted(self._by_start, decoration, _selection_start)
+        self._remove_sorted(self._by_end, decoration, _selection_end)
+        self._always_visible.discard(decoration)
+        self.update()
+        return True
+
     def clear(self):
         """Removes all text decoration from the editor."""
         self._decorations[:] = []
+        self._keys = {}
+        self._sorted_keys = []
+        self._by_start = []
+        self._by_end = []
+        self._always_visible = set()
         self.update()
 
     def update(self):
@@ -113,36 +171,26 @@ def _update(self):
         """
         try:
             font = self.editor.font()
+            visible_decorations = self._get_visible_decorations()
+            if (font == self._font and
+                    len(visible_decorations) ==
+                    len(self._visible_decorations) and
+                    all(new is old for new, old in
+                        zip(visible_decorations, self._visible_decorations))):
+                # Nothing to update
+                return
 
-            # Get the current visible block numbers
-            first, last = self.editor.get_buffer_block_numbers()
-
-            # Update visible decorations
-            visible_decorations = []
-            for decoration in self._decorations:
-                need_update_sel = False
-                cursor = decoration.cursor
-                sel_start = cursor.selectionStart()
-                # This is required to update extra selections from the point
-                # an initial selection was made.
-                # Fixes spyder-ide/spyder#14282
-                if sel_start is not None:
-                    doc = cursor.document()
-                    block_nb_start = doc.findBlock(sel_start).blockNumber()
-                    need_update_sel = first <= block_nb_start <= last
-
-                block_nb = decoration.cursor.block().blockNumber()
-                if (first <= block_nb <= last or need_update_sel or
-                        decoration.kind == 'current_cell'):
-                    visible_decorations.append(decoration)
-                    try:
-                        decoration.format.setFont(
-                            font, QTextCharFormat.FontPropertiesSpecifiedOnly)
-                    except (TypeError, AttributeError):  # Qt < 5.3
-                        decoration.format.setFontFamily(font.family())
-                        decoration.format.setFontPointSize(font.pointSize())
+            for decoration in visible_decorations:
+                try:
+                    decoration.format.setFont(
+                        font, QTextCharFormat.FontPropertiesSpecifiedOnly)
+                except (TypeError, AttributeError):  # Qt < 5.3
+                    decoration.format.setFontFamily(font.family())
+                    decoration.format.setFontPointSize(font.pointSize())
 
             self.editor.setExtraSelections(visible_decorations)
+            self._visible_decorations = visible_decorations
+            self._font = font
         except RuntimeError:
             # This is needed to fix spyder-ide/spyder#9173.
             return
@@ -153,18 +201,66 @@ def __iter__(self):
     def __len__(self):
         return len(self._decorations)
 
-    def _order_decorations(self):
-        """Order decorations according draw_order and size of selection.
+    def _get_visible_decorations(self):
+        """
+        Return the decorations that start or end in the visible blocks (plus
+        a buffer around them), in draw order.
+        """
+        # Get the current visible block numbers
+        first, last = self.editor.get_buffer_block_numbers()
+        document = self.editor.document()
+        first_position = document.findBlockByNumber(first).position()
+        last_block = document.findBlockByNumber(last)
+        if last_block.isValid():
+            last_position = last_block.position() + last_block.length() - 1
+        else:
+            last_position = document.characterCount()
+
+        visible = set(self._always_visible)
+        for decorations, get_position in ((self._by_start, _selection_start),
+                                          (self._by_end, _selection_end)):
+            start = _bisect(decorations, first_position, get_position)
+            end = _bisect(decorations, last_position, get_position,
+                          right=True)
+            visible.update(decorations[start:end])
 
-        Highest draw_order will appear on top of the lowest values.
+        return sorted(visible, key=self._keys.__getitem__)
 
-        If draw_order is equal,smaller selections are draw in top of
-        bigger selections.
-        """
-        def order_function(sel):
-            end = sel.cursor.selectionEnd()
-            start = sel.cursor.selectionStart()
-            return sel.draw_order, -(end - start)
+    def _insert(self, decoration):
+        """Add a decoration to the draw order and the position indexes."""
+        # Highest draw_order will appear on top of the lowest values. If
+        # draw_order is equal, smaller selections are drawn on top of bigger
+        # selections, and then the last ones added.
+        cursor = decoration.cursor
+        key = (decoration.draw_order,
+               cursor.selectionStart() - cursor.selectionEnd(),
+               next(self._counter))
+        self._keys[decoration] = key
+        index = bisect.bisect_right(self._sorted_keys, key)
+        self._sorted_keys.insert(index, key)
+        self._decorations.insert(index, decoration)
+
+        for decorations, get_position in ((self._by_start, _selection_start),
+                                          (self._by_end, _selection_end)):
+            index = _bisect(decorations, get_position(decoration),
+                            get_position, right=True)
+            decorations.insert(index, decoration)
+
+        # This is required to always show the current cell, even when it
+        # starts and ends out of the visible blocks
+        if decoration.kind == 'current_cell':
+            self._always_visible.add(decoration)
+
+    def _remove_sorted(self, decorations, decoration, get_position):
+        """Remove a decoration from a list sorted by `get_position`."""
+        position = get_position(decoration)
+        for index in range(_bisect(decorations, position, get_position),
+                           len(decorations)):
+            if decorations[index] is decoration:
+                del decorations[index]
+                return
+            if get_position(decorations[index]) != position:
+                break
 
-        self._decorations = sorted(self._decorations,
-                                   key=order_function)
+        # The cursor of the decoration was moved after adding it
+        decorations.remove(decoration)
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Index of the blocks of a document with markers (errors, warnings, todos and
+breakpoints).
+"""
+
+# Standard library imports
+import bisect
+
+# Local imports
+from spyder.plugins.completion.api import DiagnosticSeverity
+
+
+# Types of markers. Blocks with code analysis results have an 'error' marker
+# if one of them is an error and a 'warning' one otherwise.
+MARKER_TYPES = ('error', 'warning', 'todo', 'breakpoint')
+
+
+def get_marker_types(data):
+    """Return the types of markers of the user data of a block."""
+    types = set()
+    if data:
+        if data.code_analysis:
+            for __, __, severity, __ in data.code_analysis:
+                if severity == DiagnosticSeverity.ERROR:
+                    types.add('error')
+                    break
+            else:
+                types.add('warning')
+        if data.todo:
+            types.add('todo')
+        if data.breakpoint:
+            types.add('breakpoint')
+    return types
+
+
+class MarkersIndex(object):
+    """
+    Sorted lists of the numbers of the blocks of a QTextDocument with
+    markers of each type.
+
+    Markers are stored in the user data of blocks, so code that changes them
+    has to call `update_blocks` afterwards. When blocks are added or removed,
+    the numbers of the blocks after them are shifted and only the blocks that
+    changed are looked at again, so panels can get markers without going
+    through all the blocks of the document.
+    """
+
+    def __init__(self, document):
+        self.document = document
+        self._markers = {marker_type: [] for marker_type in MARKER_TYPES}
+        self._block_count = document.blockCount()
+        document.contentsChange.connect(self._on_contents_change)
+        self.reset()
+
+    def reset(self):
+        """Index the markers of all the blocks of the document."""
+        self._markers = {marker_type: [] for marker_type in MARKER_TYPES}
+        self._block_count = self.document.blockCount()
+        block = self.document.firstBlock()
+        while block.isValid():
+            for marker_type in get_marker_types(block.userData()):
+                self._markers[marker_type].append(block.blockNumber())
+            block = block.next()
+
+    def get_blocks(self, marker_type, first=0, last=None):
+        """
+        Return the sorted numbers of the blocks with a marker of
+        `marker_type`, between blocks `first` and `last` (included).
+        """
+        numbers = self._markers[marker_type]
+        start = bisect.bisect_left(numbers, first)
+        if last is None:
+            return numbers[start:]
+        return numbers[start:bisect.bisect_right(numbers, last)]
+
+    def has_markers(self, marker_type):
+        """Return whether there are blocks with a marker of `marker_type`."""
+        return bool(self._markers[marker_type])
+
+    def update_blocks(self, blocks):
+        """Index again the markers of some blocks."""
+        for block in blocks:
+            if block.isValid():
+                self._update_block(block.blockNumber(), block.userData())
+
+    def clear(self, marker_type):
+        """
+        Return the blocks with a marker of `marker_type` and remove them from
+        the index.
+        """
+        blocks = [self.document.findBlockByNumber(number)
+                  for number in self._markers[marker_type]]
+        self._markers[marker_type] = []
+        return blocks
+
+    def _update_block(self, number, data):
+        """Index again the markers of the block `number`."""
+        types = get_marker_types(data)
+        for marker_type, numbers in self._markers.items():
+            index = bisect.bisect_left(numbers, number)
+            present = index < len(numbers) and numbers[index] == number
+            if marker_type in types and not present:
+                numbers.insert(index, number)
+            elif present and marker_type not in types:
+                del numbers[index]
+
+    def _on_contents_change(self, position, chars_removed, chars_added):
+        """Shift the markers after the blocks that changed."""
+        document = self.document
+        count = document.blockCount()
+        first = document.findBlock(position).blockNumber()
+        end_position = min(position + chars_added,
+                           document.characterCount() - 1)
+        last = document.findBlock(end_position).blockNumber()
+        added = last - first + 1
+        removed = added - (count - self._block_count)
+        self._block_count = count
+        if first < 0 or removed < 1:
+            self.reset()
+            return
+
+        # Remove the markers of the blocks that changed and shift the ones
+        # after them
+        shift = added - removed
+        for marker_type, numbers in self._markers.items():
+            start = bisect.bisect_left(numbers, first)
+            end = bisect.bisect_left(numbers, first + removed)
+            if shift:
+                numbers[start:] = [number + shift for number in numbers[end:]]
+            else:
+                del numbers[start:end]
+
+        block = document.findBlockByNumber(first)
+        for number in range(first, last + 1):
+            self._update_block(number, block.userData())
+            block = block.next()
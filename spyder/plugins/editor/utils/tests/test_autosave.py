@@ -176,13 +176,15 @@ def new_exists(path):
 
 
 @pytest.mark.parametrize('have_hash', [True, False])
-def test_autosave(mocker, have_hash):
+def test_autosave(qtbot, mocker, have_hash):
     """Test that AutosaveForStack.maybe_autosave writes the contents to the
-    autosave file and updates the file_hashes."""
+    autosave file in a thread and updates the file_hashes."""
     mock_editor = mocker.Mock()
+    mock_editor.get_text_with_eol.return_value = 'spam'
     mock_fileinfo = mocker.Mock(editor=mock_editor, filename='orig',
                                 newly_created=False)
     mock_document = mocker.Mock()
+    mock_document.revision.return_value = 1
     mock_fileinfo.editor.document.return_value = mock_document
     mock_stack = mocker.Mock(data=[mock_fileinfo])
     addon = AutosaveForStack(mock_stack)
@@ -190,16 +192,75 @@ def test_autosave(mocker, have_hash):
     addon.file_hashes = {'autosave': 2}
     if have_hash:
         addon.file_hashes['orig'] = 1
-    mock_stack.compute_hash.return_value = 3
 
     addon.maybe_autosave(0)
 
-    mock_stack._write_to_file.assert_called_with(mock_fileinfo, 'autosave')
-    mock_stack.compute_hash.assert_called_with(mock_fileinfo)
+    qtbot.waitUntil(lambda: mock_stack._write_to_file.called)
+    mock_stack._write_to_file.assert_called_with(
+        mock_fileinfo, 'autosave', 'spam',
+        new_file_mode=addon._new_file_mode)
     if have_hash:
-        assert addon.file_hashes == {'orig': 1, 'autosave': 3}
+        assert addon.file_hashes == {'orig': 1, 'autosave': hash('spam')}
     else:
-        assert addon.file_hashes == {'autosave': 3}
+        assert addon.file_hashes == {'autosave': hash('spam')}
+
+
+def test_autosave_unchanged_document(qtbot, mocker):
+    """Test that AutosaveForStack.maybe_autosave doesn't get the contents of
+    documents whose revision didn't change since the last check."""
+    mock_editor = mocker.Mock()
+    mock_editor.get_text_with_eol.return_value = 'spam'
+    mock_fileinfo = mocker.Mock(editor=mock_editor, filename='orig',
+                                newly_created=False)
+    mock_document = mocker.Mock()
+    mock_document.revision.return_value = 1
+    mock_fileinfo.editor.document.return_value = mock_document
+    mock_stack = mocker.Mock(data=[mock_fileinfo])
+    addon = AutosaveForStack(mock_stack)
+    addon.name_mapping = {'orig': 'autosave'}
+    addon.file_hashes = {'orig': 1, 'autosave': 2}
+
+    addon.maybe_autosave(0)
+    addon.maybe_autosave(0)
+    qtbot.waitUntil(lambda: mock_stack._write_to_file.called)
+    assert mock_editor.get_text_with_eol.call_count == 1
+
+    # A new revision is checked again
+    mock_document.revision.return_value = 2
+    mock_editor.get_text_with_eol.return_value = 'eggs'
+    addon.maybe_autosave(0)
+    qtbot.waitUntil(lambda: mock_stack._write_to_file.call_count == 2)
+    mock_stack._write_to_file.assert_called_with(
+        mock_fileinfo, 'autosave', 'eggs',
+        new_file_mode=addon._new_file_mode)
+
+
+def test_autosave_removed_before_write(mocker):
+    """Test that an autosave file removed before it's written in the thread
+    is not written."""
+    mocker.patch('os.remove', side_effect=OSError())
+    mock_dialog = mocker.patch(
+        'spyder.plugins.editor.utils.autosave.AutosaveErrorDialog')
+    mock_stack = mocker.Mock()
+    addon = AutosaveForStack(mock_stack)
+    addon.name_mapping = {'orig': 'autosave'}
+    addon.file_hashes = {'autosave': 42}
+    addon._write_ids = {'autosave': 1}
+
+    addon.remove_autosave_file('orig')
+    addon._write_autosave_file(mocker.Mock(), 'autosave', 'spam', 1)
+
+    assert not mock_stack._write_to_file.called
+    assert not mock_dialog.called
+
+
+def test_autosave_close(mocker):
+    """Test that closing AutosaveForStack stops its autosave thread."""
+    addon = AutosaveForStack(mocker.Mock())
+    terminate_all = mocker.patch.object(addon._worker_manager,
+                                        'terminate_all')
+    addon.close()
+    assert terminate_all.called
 
 
 @pytest.mark.parametrize('latin', [True, False])
@@ -282,20 +343,20 @@ def test_get_autosave_filename(mocker, tmpdir):
 
 
 @pytest.mark.parametrize('have_hash', [True, False])
-def test_autosave_file_renamed(mocker, tmpdir, have_hash):
+def test_autosave_file_renamed(qtbot, mocker, tmpdir, have_hash):
     """Test that AutosaveForStack.file_renamed removes the old autosave file,
     creates a new one, and updates `name_mapping` and `file_hashes`."""
     mock_remove = mocker.patch('os.remove')
     mocker.patch('spyder.plugins.editor.utils.autosave.get_conf_path',
                  return_value=str(tmpdir))
     mock_editor = mocker.Mock()
+    mock_editor.get_text_with_eol.return_value = 'spam'
     mock_fileinfo = mocker.Mock(editor=mock_editor, filename='new_foo.py',
                                 newly_created=False)
     mock_document = mocker.Mock()
     mock_fileinfo.editor.document.return_value = mock_document
     mock_stack = mocker.Mock(data=[mock_fileinfo])
     mock_stack.has_filename.return_value = 0
-    mock_stack.compute_hash.return_value = 3
     addon = AutosaveForStack(mock_stack)
     old_autosavefile = str(tmpdir.join('old_foo.py'))
     new_autosavefile = str(tmpdir.join('new_foo.py'))
@@ -309,13 +370,16 @@ def test_autosave_file_renamed(mocker, tmpdir, have_hash):
     addon.file_renamed('old_foo.py', 'new_foo.py')
 
     mock_remove.assert_any_call(old_autosavefile)
+    qtbot.waitUntil(lambda: mock_stack._write_to_file.called)
     mock_stack._write_to_file.assert_called_with(
-        mock_fileinfo, new_autosavefile)
+        mock_fileinfo, new_autosavefile, 'spam',
+        new_file_mode=addon._new_file_mode)
     assert addon.name_mapping == {'new_foo.py': new_autosavefile}
     if have_hash:
-        assert addon.file_hashes == {'new_foo.py': 1, new_autosavefile: 3}
+        assert addon.file_hashes == {'new_foo.py': 1,
+                                     new_autosavefile: hash('spam')}
     else:
-        assert addon.file_hashes == {new_autosavefile: 3}
+        assert addon.file_hashes == {new_autosavefile: hash('spam')}
 
 
 if __name__ == "__main__":
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+"""Tests for contentchanges.py"""
+
+# Third party imports
+import pytest
+from qtpy.QtGui import QTextCursor
+from qtpy.QtWidgets import QPlainTextEdit
+
+# Local imports
+from spyder.plugins.editor.utils.contentchanges import (
+    apply_content_changes, ContentChangesTracker)
+
+
+@pytest.fixture
+def editor(qtbot):
+    editor = QPlainTextEdit()
+    editor.setPlainText('first line\nsecond line\n\U0001F600 third line')
+    qtbot.addWidget(editor)
+    return editor
+
+
+def select(editor, start, end):
+    cursor = QTextCursor(editor.document())
+    cursor.setPosition(start)
+    cursor.setPosition(end, QTextCursor.KeepAnchor)
+    return cursor
+
+
+def test_tracked_changes(editor):
+    """Test that tracked changes have the ranges they replaced."""
+    tracker = ContentChangesTracker(editor.document())
+    text = editor.toPlainText()
+
+    select(editor, 6, 6).insertText('new\n')
+    select(editor, 14, 26).removeSelectedText()
+    select(editor, 18, 23).insertText('3rd')
+
+    changes = tracker.take_changes()
+    assert changes == [
+        {'range': {'start': {'line': 0, 'character': 6},
+                   'end': {'line': 0, 'character': 6}},
+         'rangeLength': 0,
+         'text': 'new\n'},
+        {'range': {'start': {'line': 1, 'character': 4},
+                   'end': {'line': 2, 'character': 11}},
+         'rangeLength': 12,
+         'text': ''},
+        {'range': {'start': {'line': 2, 'character': 3},
+                   'end': {'line': 2, 'character': 8}},
+         'rangeLength': 5,
+         'text': '3rd'},
+    ]
+    assert apply_content_changes(text, changes) == editor.toPlainText()
+    assert tracker.take_changes() == []
+
+
+def test_tracked_changes_undo_and_set_text(editor):
+    """Test tracking undo/redo and replacing the whole text."""
+    tracker = ContentChangesTracker(editor.document())
+    text = editor.toPlainText()
+
+    editor.moveCursor(QTextCursor.End)
+    editor.insertPlainText('\nlast line')
+    editor.undo()
+    editor.redo()
+    changes = tracker.take_changes()
+    text = apply_content_changes(text, changes)
+    assert text == editor.toPlainText()
+
+    editor.setPlainText('new text\n')
+    changes = tracker.take_changes()
+    assert apply_content_changes(text, changes) == editor.toPlainText()
+
+
+@pytest.mark.parametrize('clear', [
+    lambda editor: editor.setPlainText(''),
+    lambda editor: editor.clear(),
+])
+def test_tracked_changes_clear_one_line(qtbot, clear):
+    """
+    Test that clearing a one-line document falls back to sending the whole
+    text, since Qt reports an insertion before the removal in that case.
+    """
+    editor = QPlainTextEdit()
+    editor.setPlainText('abc')
+    qtbot.addWidget(editor)
+    tracker = ContentChangesTracker(editor.document())
+
+    clear(editor)
+    assert tracker.take_changes() is None
+
+    # Tracking starts again from the current contents
+    editor.insertPlainText('def')
+    changes = tracker.take_changes()
+    assert apply_content_changes('', changes) == 'def'
+
+
+def test_apply_content_changes_eol():
+    """Test applying changes to text with Windows line endings."""
+    text = 'a = 1\r\nb = 2\r\n'
+    changes = [
+        {'range': {'start': {'line': 1, 'character': 4},
+                   'end': {'line': 1, 'character': 5}},
+         'text': '3\r\nc = 4'},
+        {'text': 'full text'},
+    ]
+    assert apply_content_changes(text, changes[:1]) == (
+        'a = 1\r\nb = 3\r\nc = 4\r\n')
+    assert apply_content_changes(text, changes) == 'full text'
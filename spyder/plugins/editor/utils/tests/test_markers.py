@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+"""Tests for markers.py"""
+
+# Standard library imports
+import random
+
+# Third party imports
+import pytest
+from qtpy.QtGui import QTextCursor
+from qtpy.QtWidgets import QPlainTextEdit
+
+# Local imports
+from spyder.plugins.completion.api import DiagnosticSeverity
+from spyder.plugins.editor.utils.editor import BlockUserData
+from spyder.plugins.editor.utils.markers import MarkersIndex, MARKER_TYPES
+
+
+@pytest.fixture
+def editor(qtbot):
+    editor = QPlainTextEdit()
+    editor.setPlainText('\n'.join('line {}'.format(i) for i in range(20)))
+    qtbot.addWidget(editor)
+    return editor
+
+
+def set_markers(editor, line_number, **kwargs):
+    block = editor.document().findBlockByNumber(line_number)
+    data = block.userData() or BlockUserData(editor)
+    for name, value in kwargs.items():
+        setattr(data, name, value)
+    block.setUserData(data)
+    return block
+
+
+def indexed_markers(document):
+    """Return the markers of a document by going through all its blocks."""
+    return {marker_type: MarkersIndex(document).get_blocks(marker_type)
+            for marker_type in MARKER_TYPES}
+
+
+def test_markers_index(editor):
+    """Test that markers are indexed by type."""
+    document = editor.document()
+    set_markers(editor, 2, todo='TODO')
+    set_markers(editor, 5, breakpoint=True)
+    markers = MarkersIndex(document)
+
+    error = ('source', 'E', DiagnosticSeverity.ERROR, 'message')
+    warning = ('source', 'W', DiagnosticSeverity.WARNING, 'message')
+    blocks = [set_markers(editor, 2, code_analysis=[warning, error]),
+              set_markers(editor, 8, code_analysis=[warning]),
+              set_markers(editor, 12, breakpoint=True)]
+    markers.update_blocks(blocks)
+
+    assert markers.get_blocks('error') == [2]
+    assert markers.get_blocks('warning') == [8]
+    assert markers.get_blocks('todo') == [2]
+    assert markers.get_blocks('breakpoint') == [5, 12]
+    assert markers.get_blocks('breakpoint', 6, 12) == [12]
+    assert markers.get_blocks('breakpoint', 6, 11) == []
+
+    cleared = markers.clear('breakpoint')
+    assert [block.blockNumber() for block in cleared] == [5, 12]
+    assert not markers.has_markers('breakpoint')
+
+
+def test_markers_index_edits(editor):
+    """Test that markers follow their blocks when the text is edited."""
+    document = editor.document()
+    for line_number in range(0, 20, 3):
+        set_markers(editor, line_number, todo='TODO',
+                    breakpoint=line_number % 2 == 0)
+    markers = MarkersIndex(document)
+
+    random.seed(0)
+    for __ in range(200):
+        cursor = QTextCursor(document)
+        start = random.randint(0, document.characterCount() - 1)
+        end = min(start + random.choice([0, 1, 5, 30]),
+                  document.characterCount() - 1)
+        cursor.setPosition(start)
+        cursor.setPosition(end, QTextCursor.KeepAnchor)
+        cursor.insertText(random.choice(['', 'x', '\n', 'a\nb\n']))
+        if random.random() < 0.2:
+            block = set_markers(
+                editor, random.randint(0, document.blockCount() - 1),
+                todo=random.choice(['', 'TODO']))
+            markers.update_blocks([block])
+
+        assert {marker_type: markers.get_blocks(marker_type)
+                for marker_type in MARKER_TYPES} == indexed_markers(document)
+
+    editor.setPlainText('new text')
+    assert not any(markers.has_markers(marker_type)
+                   for marker_type in MARKER_TYPES)
@@ -21,6 +21,7 @@
 import logging
 import functools
 import os
+import bisect
 import os.path as osp
 import re
 import sre_constants
@@ -29,7 +30,6 @@
 from pkg_resources import parse_version
 
 # Third party imports
-from diff_match_patch import diff_match_patch
 from IPython.core.inputtransformer2 import TransformerManager
 from qtpy import QT_VERSION
 from qtpy.compat import to_qvariant
@@ -65,11 +65,13 @@
                                           FoldingPanel, IndentationGuide,
                                           LineNumberArea, PanelsManager,
                                           ScrollFlagArea)
+from spyder.plugins.editor.utils.contentchanges import ContentChangesTracker
 from spyder.plugins.editor.utils.editor import (TextHelper, BlockUserData,
                                                 get_file_language)
 from spyder.plugins.editor.utils.debugger import DebuggerManager
 from spyder.plugins.editor.utils.kill_ring import QtKillRing
 from spyder.plugins.editor.utils.languages import ALL_LANGUAGES, CELL_LANGUAGES
+from spyder.plugins.editor.utils.markers import MarkersIndex
 from spyder.plugins.editor.panels.utils import (
     merge_folding, collect_folding_regions)
 from spyder.plugins.completion.decorators import (
@@ -582,6 +584,7 @@ def __init__(self, parent=None):
         self.update_diagnostics_thread.finished.connect(
             self.finish_code_analysis)
         self._diagnostics = []
+        self._code_analysis_blocks = []
 
         # Editor Extensions
         self.editor_extensions = EditorExtensionsManager(self)
@@ -589,12 +592,14 @@ def __init__(self, parent=None):
         self.editor_extensions.add(SnippetsExtension())
         self.editor_extensions.add(CloseBracketsExtension())
 
-        # Text diffs across versions
-        self.differ = diff_match_patch()
-        self.previous_text = ''
-        self.patch = []
+        # Text changes across versions
+        self.content_changes_tracker = ContentChangesTracker(self.document())
+        self.content_changes = []
         self.leading_whitespaces = {}
 
+        # Blocks with errors, warnings, todos and breakpoints
+        self.markers = MarkersIndex(self.document())
+
         # re-use parent of completion_widget (usually the main window)
         completion_parent = self.completion_widget.parent()
         self.kite_call_to_action = KiteCallToAction(self, completion_parent)
@@ -613,11 +618,20 @@ def __init__(self, parent=None):
     # ------------------------------------------------------------------------
     def process_server_requests(self):
         """Process server requests."""
+        # Open the document before sending changes to it, because they are
+        # relative to the text sent when opening it.
+        pending_requests = []
+        for method, params, requires_response in self._pending_server_requests:
+            if method == CompletionRequestTypes.DOCUMENT_DID_OPEN:
+                self.emit_request(method, params, requires_response)
+            else:
+                pending_requests.append((method, params, requires_response))
+
         # Check if document needs to be updated:
         if self._document_server_needs_update:
             self.document_did_change()
             self._document_server_needs_update = False
-        for method, params, requires_response in self._pending_server_requests:
+        for method, params, requires_response in pending_requests:
             self.emit_request(method, params, requires_response)
         self._pending_server_requests = []
 
@@ -779,6 +793,8 @@ def get_document_id(self):
     def set_as_clone(self, editor):
         """Set as clone editor"""
         self.setDocument(editor.document())
+        self.content_changes_tracker = editor.content_changes_tracker
+        self.markers = editor.markers
         self.document_id = editor.get_document_id()
         self.highlighter = editor.highlighter
         self._rehighlight_timer.timeout.connect(
@@ -982,7 +998,7 @@ def setup_editor(self,
             self.setFont(font)  # this is required for line numbers area
             # Needed to show indent guides for splited editor panels
             # See spyder-ide/spyder#10900
-            self.patch = cloned_from.patch
+            self.content_changes = cloned_from.content_changes
             self.is_cloned = True
         self.toggle_line_numbers(linenumbers, markers)
 
@@ -1164,6 +1180,8 @@ def document_did_open(self):
         if self.is_ipython():
             # Send valid python text to LSP as it doesn't support IPython
             text = self.ipython_to_python(text)
+        # Later changes are relative to this text
+        self.content_changes_tracker.reset()
         params = {
             'file': self.filename,
             'language': self.language,
@@ -1214,23 +1232,41 @@ def schedule_document_did_change(self):
         requires_response=False)
     def document_did_change(self):
         """Send textDocument/didChange request to the server."""
+        # Clones share the document and its changes tracker with the editor
+        # they were cloned from, which is the one that sends its changes.
+        if self.is_cloned:
+            return
+
         # Cancel formatting
         self.formatting_in_progress = False
-        text = self.get_text_with_eol()
-        if self.is_ipython():
-            # Send valid python text to LSP
-            text = self.ipython_to_python(text)
-
         self.text_version += 1
 
-        self.patch = self.differ.patch_make(self.previous_text, text)
-        self.previous_text = text
+        # Send only the changes to the text if the server supports it, which
+        # avoids serializing the whole text after every change.
+        content_changes = self.content_changes_tracker.take_changes()
+        text = None
+        if (content_changes is None or self.is_ipython() or
+                self.sync_mode != TextDocumentSyncKind.INCREMENTAL):
+            text = self.get_text_with_eol()
+            if self.is_ipython():
+                # Send valid python text to LSP
+                text = self.ipython_to_python(text)
+
+        if content_changes is None:
+            content_changes = [{'text': text}]
+        else:
+            linesep = self.get_line_separator()
+            if linesep != '\n':
+                for change in content_changes:
+                    change['text'] = change['text'].replace('\n', linesep)
+        self.content_changes = content_changes
+
         cursor = self.textCursor()
         params = {
             'file': self.filename,
             'version': self.text_version,
             'text': text,
-            'diff': self.patch,
+            'content_changes': content_changes,
             'offset': cursor.position(),
             'selection_start': cursor.selectionStart(),
             'selection_end': cursor.selectionEnd(),
@@ -1282,6 +1318,7 @@ def process_code_analysis(self, diagnostics):
         """Process code analysis results in a thread."""
         self.cleanup_code_analysis()
         self._diagnostics = diagnostics
+        self._code_analysis_blocks = []
 
         # Process diagnostics in a thread to improve performance.
         self.update_diagnostics_thread.start()
@@ -1291,8 +1328,11 @@ def cleanup_code_analysis(self):
         self.setUpdatesEnabled(False)
         self.clear_extra_selections('code_analysis_highlight')
         self.clear_extra_selections('code_analysis_underline')
-        for data in self.blockuserdata_list():
-            data.code_analysis = []
+        for block in (self.markers.clear('error') +
+                      self.markers.clear('warning')):
+            data = block.userData()
+            if data:
+                data.code_analysis = []
 
         self.setUpdatesEnabled(True)
         # When the new code analysis results are empty, it is necessary
@@ -1331,6 +1371,8 @@ def underline_errors(self):
 
     def finish_code_analysis(self):
         """Finish processing code analysis results."""
+        self.markers.update_blocks(self._code_analysis_blocks)
+        self._code_analysis_blocks = []
         self.linenumberarea.update()
         if self.underline_errors_enabled:
             self.underline_errors()
@@ -1418,6 +1460,7 @@ def _process_code_analysis(self, underline):
                         (source, code, severity, message)
                     )
                 block.setUserData(data)
+                self._code_analysis_blocks.append(block)
 
     # ------------- LSP: Completion ---------------------------------------
     @schedule_request(method=CompletionRequestTypes.DOCUMENT_COMPLETION)
@@ -2007,7 +2050,7 @@ def finish_code_folding(self):
         folding_panel.update_folding(self._folding_info)
 
         # Update indent guides, which depend on folding
-        if self.indent_guides._enabled and len(self.patch) > 0:
+        if self.indent_guides._enabled and len(self.content_changes) > 0:
             line, column = self.get_cursor_line_column()
             self.update_whitespace_count(line, column)
 
@@ -3233,59 +3276,48 @@ def get_current_warnings(self):
         Get all warnings for the current editor and return
         a list with the message and line number.
         """
-        block = self.document().firstBlock()
-        line_count = self.document().blockCount()
+        document = self.document()
         warnings = []
-        while True:
-            data = block.userData()
-            if data and data.code_analysis:
-                for warning in data.code_analysis:
-                    warnings.append([warning[-1], block.blockNumber() + 1])
-            # See spyder-ide/spyder#9924
-            if block.blockNumber() + 1 == line_count:
-                break
-            block = block.next()
+        for block_number in self._get_code_analysis_block_numbers():
+            data = document.findBlockByNumber(block_number).userData()
+            for warning in data.code_analysis:
+                warnings.append([warning[-1], block_number + 1])
         return warnings
 
+    def _get_code_analysis_block_numbers(self):
+        """Return the sorted numbers of the blocks with code analysis."""
+        return sorted(self.markers.get_blocks('error') +
+                      self.markers.get_blocks('warning'))
+
     def go_to_next_warning(self):
         """
         Go to next code warning message and return new cursor position.
         """
-        block = self.textCursor().block()
-        line_count = self.document().blockCount()
-        for __ in range(line_count):
-            line_number = block.blockNumber() + 1
-            if line_number < line_count:
-                block = block.next()
-            else:
-                block = self.document().firstBlock()
-
-            data = block.userData()
-            if data and data.code_analysis:
-                line_number = block.blockNumber() + 1
-                self.go_to_line(line_number)
-                self.show_code_analysis_results(line_number, data)
-                return self.get_position('cursor')
+        block_numbers = self._get_code_analysis_block_numbers()
+        if not block_numbers:
+            return
+        index = bisect.bisect_right(block_numbers,
+                                    self.textCursor().blockNumber())
+        return self._go_to_warning(block_numbers[index % len(block_numbers)])
 
     def go_to_previous_warning(self):
         """
         Go to previous code warning message and return new cursor position.
         """
-        block = self.textCursor().block()
-        line_count = self.document().blockCount()
-        for __ in range(line_count):
-            line_number = block.blockNumber() + 1
-            if line_number > 1:
-                block = block.previous()
-            else:
-                block = self.document().lastBlock()
-
-            data = block.userData()
-            if data and data.code_analysis:
-                line_number = block.blockNumber() + 1
-                self.go_to_line(line_number)
-                self.show_code_analysis_results(line_number, data)
-                return self.get_position('cursor')
+        block_numbers = self._get_code_analysis_block_numbers()
+        if not block_numbers:
+            return
+        index = bisect.bisect_left(block_numbers,
+                                   self.textCursor().blockNumber())
+        return self._go_to_warning(block_numbers[index - 1])
+
+    def _go_to_warning(self, block_number):
+        """Go to the code warning message of a block."""
+        data = self.document().findBlockByNumber(block_number).userData()
+        line_number = block_number + 1
+        self.go_to_line(line_number)
+        self.show_code_analysis_results(line_number, data)
+        return self.get_position('cursor')
 
     def cell_list(self):
         """Get the outline explorer data for all cells."""
@@ -3327,17 +3359,14 @@ def get_cell_count(self):
     #------Tasks management
     def go_to_next_todo(self):
         """Go to next todo and return new cursor position"""
-        block = self.textCursor().block()
-        line_count = self.document().blockCount()
-        while True:
-            if block.blockNumber()+1 < line_count:
-                block = block.next()
-            else:
-                block = self.document().firstBlock()
-            data = block.userData()
-            if data and data.todo:
-                break
-        line_number = block.blockNumber()+1
+        block_numbers = self.markers.get_blocks('todo')
+        if not block_numbers:
+            return
+        index = bisect.bisect_right(block_numbers,
+                                    self.textCursor().blockNumber())
+        block_number = block_numbers[index % len(block_numbers)]
+        data = self.document().findBlockByNumber(block_number).userData()
+        line_number = block_number + 1
         self.go_to_line(line_number)
         self.show_tooltip(
             title=_("To do"),
@@ -3350,9 +3379,12 @@ def go_to_next_todo(self):
 
     def process_todo(self, todo_results):
         """Process todo finder results"""
-        for data in self.blockuserdata_list():
-            data.todo = ''
+        for block in self.markers.clear('todo'):
+            data = block.userData()
+            if data:
+                data.todo = ''
 
+        blocks = []
         for message, line_number in todo_results:
             block = self.document().findBlockByNumber(line_number - 1)
             data = block.userData()
@@ -3360,6 +3392,8 @@ def process_todo(self, todo_results):
                 data = BlockUserData(self)
             data.todo = message
             block.setUserData(data)
+            blocks.append(block)
+        self.markers.update_blocks(blocks)
         self.sig_flags_changed.emit()
 
     #------Comments/Indentation
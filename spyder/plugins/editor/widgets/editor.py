@@ -777,6 +777,7 @@ def close_split(self):
     def closeEvent(self, event):
         """Overrides QWidget closeEvent()."""
         self.threadmanager.close_all_threads()
+        self.autosave.close()
         self.analysis_timer.timeout.disconnect(self.analyze_script)
 
         # Remove editor references from the outline explorer settings
@@ -1662,6 +1663,7 @@ def close_file(self, index=None, force=False):
 
             if finfo.filename in self.autosave.file_hashes:
                 del self.autosave.file_hashes[finfo.filename]
+            self.autosave.file_revisions.pop(finfo.filename, None)
 
         if self.get_stack_count() == 0 and self.create_new_file_if_empty:
             self.sig_new_file[()].emit()
@@ -1834,18 +1836,34 @@ def compute_hash(self, fileinfo):
         txt = to_text_string(fileinfo.editor.get_text_with_eol())
         return hash(txt)
 
-    def _write_to_file(self, fileinfo, filename):
+    def _write_to_file(self, fileinfo, filename, txt=None,
+                       new_file_mode=None):
         """Low-level function for writing text of editor to file.
 
         Args:
             fileinfo: FileInfo object associated to editor to be saved
             filename: str with filename to save to
+            txt: str with the text to save. If None, the text of the editor
+                is saved. When given, this can be called from any thread.
+            new_file_mode: int with the permissions of the file if it's
+                created. It must be given when called from another thread,
+                see `encoding.write`.
+
+        Returns:
+            str with the encoding used to write the file. The encoding of
+            `fileinfo` is only updated when the text of the editor is saved,
+            so writing a given text from another thread doesn't change it.
 
         This is a low-level function that only saves the text to file in the
         correct encoding without doing any error handling.
         """
-        txt = to_text_string(fileinfo.editor.get_text_with_eol())
-        fileinfo.encoding = encoding.write(txt, filename, fileinfo.encoding)
+        if txt is None:
+            txt = to_text_string(fileinfo.editor.get_text_with_eol())
+            fileinfo.encoding = encoding.write(txt, filename,
+                                               fileinfo.encoding)
+            return fileinfo.encoding
+        return encoding.write(txt, filename, fileinfo.encoding,
+                              new_file_mode=new_file_mode)
 
     def save(self, index=None, force=False, save_new_files=True):
         """Write text of editor to a file.
@@ -17,6 +17,7 @@
 from qtpy.QtGui import QFont, QTextCursor
 
 # Local imports
+from spyder.plugins.editor.api.decoration import TextDecoration
 from spyder.plugins.editor.widgets.codeeditor import CodeEditor
 
 
@@ -183,5 +184,67 @@ def test_update_decorations_when_scrolling(qtbot):
         assert _update.call_count == 5
 
 
+def test_visible_decorations(codeeditor, qtbot):
+    """
+    Test that only decorations on the visible part of the editor are set as
+    extra selections, also after editing text, and that they are only set
+    when they change.
+    """
+    editor = codeeditor
+    editor.resize(640, 480)
+    editor.set_text('some_variable = 1\n' * 2000)
+    manager = editor.decorations
+    manager.clear()
+
+    document = editor.document()
+    decorations = []
+    for line in range(0, 2000, 2):
+        block = document.findBlockByNumber(line)
+        decoration = TextDecoration(editor.textCursor(),
+                                    start_pos=block.position(),
+                                    end_pos=block.position() + 13)
+        decorations.append(decoration)
+    assert manager.add(decorations) == len(decorations)
+    assert manager.add(decorations[0]) == 0
+
+    def expected_decorations():
+        first, last = editor.get_buffer_block_numbers()
+        return [decoration for decoration in decorations
+                if first <= decoration.cursor.block().blockNumber() <= last]
+
+    def visible_decorations():
+        # Leave out the decorations added by the editor itself (e.g. the
+        # current line)
+        return [decoration for decoration in manager._visible_decorations
+                if decoration.kind is None]
+
+    manager._update()
+    assert 0 < len(editor.extraSelections()) < len(decorations)
+    assert visible_decorations() == expected_decorations()
+
+    # Add and remove lines before the visible ones
+    cursor = editor.textCursor()
+    cursor.setPosition(0)
+    cursor.insertText('new_line = 1\n' * 3)
+    cursor.setPosition(document.findBlockByNumber(1).position())
+    cursor.setPosition(document.findBlockByNumber(2).position(),
+                       QTextCursor.KeepAnchor)
+    cursor.removeSelectedText()
+    manager.remove(decorations.pop(1))
+    manager._update()
+    assert visible_decorations() == expected_decorations()
+
+    # Nothing changed, so extra selections are not set again
+    with patch.object(editor, 'setExtraSelections') as set_selections:
+        manager._update()
+        assert set_selections.call_count == 0
+
+    # Scroll to the end
+    editor.go_to_line(2000)
+    manager._update()
+    assert visible_decorations() == expected_decorations()
+    assert decorations[-1] in visible_decorations()
+
+
 if __name__ == "__main__":
     pytest.main()
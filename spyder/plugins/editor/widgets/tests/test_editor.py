@@ -673,7 +673,7 @@ def test_autosave_all(editor_bot, mocker):
     assert actual_calls == expected_calls
 
 
-def test_maybe_autosave(editor_bot):
+def test_maybe_autosave(editor_bot, qtbot):
     """
     Test that maybe_autosave() saves text to correct autosave file if contents
     are changed.
@@ -682,11 +682,12 @@ def test_maybe_autosave(editor_bot):
     editor.set_text('spam\n')
     editor_stack.autosave.maybe_autosave(0)
     autosave_filename = os.path.join(get_conf_path('autosave'), 'foo.py')
+    qtbot.waitUntil(lambda: os.path.isfile(autosave_filename))
     assert open(autosave_filename).read() == 'spam\n'
     os.remove(autosave_filename)
 
 
-def test_maybe_autosave_saves_only_if_changed(editor_bot, mocker):
+def test_maybe_autosave_saves_only_if_changed(editor_bot, mocker, qtbot):
     """
     Test that maybe_autosave() only saves text if text has changed.
 
@@ -701,8 +702,9 @@ def test_maybe_autosave_saves_only_if_changed(editor_bot, mocker):
     assert editor_stack._write_to_file.call_count == 0
     editor.set_text('ham\n')
     editor_stack.autosave.maybe_autosave(0)  # call #2, should write
-    assert editor_stack._write_to_file.call_count == 1
+    qtbot.waitUntil(lambda: editor_stack._write_to_file.call_count == 1)
     editor_stack.autosave.maybe_autosave(0)  # call #3, should not write
+    qtbot.wait(100)
     assert editor_stack._write_to_file.call_count == 1
 
 
@@ -800,7 +802,27 @@ def test_autosave_updates_name_mapping(editor_bot, mocker, qtbot):
     assert editor_stack.autosave.name_mapping == expected
 
 
-def test_maybe_autosave_handles_error(editor_bot, mocker):
+def test_write_to_file_encoding(editor_bot, tmp_path):
+    """
+    Test that writing a given text, as autosave does from its thread,
+    returns the encoding used without changing the one of the file.
+    """
+    editor_stack, editor = editor_bot
+    finfo = editor_stack.data[0]
+    finfo.encoding = 'ascii'
+    editor.set_text(u'spam = "\u00e9"\n')
+    filename = str(tmp_path / 'foo.py')
+
+    text = editor.get_text_with_eol()
+    assert editor_stack._write_to_file(finfo, filename, text) == 'utf-8'
+    assert finfo.encoding == 'ascii'
+
+    # Saving the text of the editor updates the encoding of the file
+    assert editor_stack._write_to_file(finfo, filename) == 'utf-8'
+    assert finfo.encoding == 'utf-8'
+
+
+def test_maybe_autosave_handles_error(editor_bot, mocker, qtbot):
     """Test that autosave() ignores errors when writing to file."""
     editor_stack, editor = editor_bot
     mock_write = mocker.patch.object(editor_stack, '_write_to_file')
@@ -812,7 +834,7 @@ def test_maybe_autosave_handles_error(editor_bot, mocker):
         mock_write.side_effect = IOError
     editor.set_text('spam\n')
     editor_stack.autosave.maybe_autosave(0)
-    assert mock_dialog.called
+    qtbot.waitUntil(lambda: mock_dialog.called)
 
 
 def test_remove_autosave_file(editor_bot, mocker, qtbot):
@@ -828,7 +850,7 @@ def test_remove_autosave_file(editor_bot, mocker, qtbot):
     autosave.maybe_autosave(0)
 
     autosave_filename = os.path.join(get_conf_path('autosave'), 'foo.py')
-    assert os.access(autosave_filename, os.R_OK)
+    qtbot.waitUntil(lambda: os.access(autosave_filename, os.R_OK))
     expected = {'foo.py': autosave_filename}
     assert autosave.name_mapping == expected
 
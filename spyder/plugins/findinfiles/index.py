@@ -0,0 +1,502 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Trigram index for Find in Files.
+
+The index maps every (lowercase) sequence of three bytes found in the text
+files of a project to the list of files that contain it. Literal texts and
+the literal parts of regular expressions can then be used to narrow a search
+down to a small set of candidate files before opening any of them.
+"""
+
+# Standard library imports
+from array import array
+import hashlib
+import logging
+import os
+import os.path as osp
+import pickle
+import re
+import threading
+import time
+
+try:
+    # Python 3.11+
+    from re import _constants as sre_constants
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_constants
+    import sre_parse
+
+# Local imports
+from spyder.config.base import get_conf_path
+from spyder.plugins.findinfiles.utils import (
+    is_excluded, iter_files, needs_text_check)
+from spyder.utils.encoding import is_text_file
+
+
+logger = logging.getLogger(__name__)
+
+
+# ---- Constants
+# ----------------------------------------------------------------------------
+# Files bigger than this (in bytes) are not indexed and always searched
+MAX_INDEXED_FILE_SIZE = 2 * 1024 * 1024
+
+# Regexp to extract all (overlapping) trigrams of a buffer
+TRIGRAMS_RE = re.compile(b'(?=(...))', re.DOTALL)
+
+# Fraction of stale ids in posting lists that triggers a compaction
+COMPACT_RATIO = 0.25
+
+
+# ---- Query helpers
+# ----------------------------------------------------------------------------
+def get_trigrams(data):
+    """Return the set of lowercase trigrams contained in `data`."""
+    return set(TRIGRAMS_RE.findall(data.lower()))
+
+
+def get_required_literals(pattern):
+    """
+    Return a list of literal bytes that must be present in a text for the
+    compiled bytes regexp `pattern` to match it.
+
+    An empty list means that no literal can be used to narrow a search.
+    """
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    except Exception:
+        return []
+
+    literals = []
+
+    def visit(nodes):
+        run = bytearray()
+        for op, av in nodes:
+            if op is sre_constants.LITERAL:
+                run.append(av)
+                continue
+
+            literals.append(bytes(run))
+            run = bytearray()
+            if op is sre_constants.SUBPATTERN:
+                visit(av[-1])
+            elif (op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT)
+                    and av[0] >= 1):
+                visit(av[2])
+        literals.append(bytes(run))
+
+    visit(parsed)
+    return [literal for literal in literals if len(literal) >= 3]
+
+
+def get_index_path(root_path):
+    """Return the path where the index of `root_path` is saved."""
+    digest = hashlib.sha1(root_path.encode('utf-8', 'replace')).hexdigest()
+    return osp.join(get_conf_path('findinfiles'), 'index-' + digest)
+
+
+# ---- Index
+# ----------------------------------------------------------------------------
+class TrigramIndex:
+    """
+    Persistent trigram index of the text files contained in a directory.
+
+    All public methods are thread safe, so the index can be updated in a
+    background thread while searches are being run.
+    """
+
+    VERSION = 1
+
+    def __init__(self, root_path, index_path=None):
+        self.root_path = osp.normpath(root_path)
+        self.index_path = index_path or get_index_path(self.root_path)
+        self._lock = threading.RLock()
+        self._clear()
+
+        # Paths reported as changed that haven't been indexed yet
+        self._dirty = set()
+
+        # Whether the index reflects the contents of root_path
+        self.ready = False
+
+    def _clear(self):
+        self._next_id = 0
+        # path -> (id, mtime, size)
+        self._files = {}
+        # trigram -> array of ids
+        self._postings = {}
+        # ids of removed or reindexed files still present in postings
+        self._stale_ids = set()
+        # Text files that are too big to be indexed
+        self._unindexed = set()
+        self._num_postings = 0
+        self.built_time = None
+        self.updated_time = None
+        self._modified = False
+
+    # ---- Persistence
+    def load(self):
+        """Load index from disk. Return True if successful."""
+        try:
+            with open(self.index_path, 'rb') as f:
+                data = pickle.load(f)
+            if (data['version'] != self.VERSION
+                    or data['root_path'] != self.root_path):
+                return False
+        except Exception:
+            return False
+
+        with self._lock:
+            self._next_id = data['next_id']
+            self._files = data['files']
+            self._postings = data['postings']
+            self._stale_ids = data['stale_ids']
+            self._unindexed = data['unindexed']
+            self._num_postings = data['num_postings']
+            self.built_time = data['built_time']
+            self.updated_time = data['updated_time']
+            self._modified = False
+        return True
+
+    def save(self):
+        """Save index to disk if it was modified."""
+        with self._lock:
+            if not self._modified:
+                return
+            if len(self._stale_ids) > COMPACT_RATIO * max(self._next_id, 1):
+                self._compact()
+            data = dict(
+                version=self.VERSION,
+                root_path=self.root_path,
+                next_id=self._next_id,
+                files=self._files,
+                postings=self._postings,
+                stale_ids=self._stale_ids,
+                unindexed=self._unindexed,
+                num_postings=self._num_postings,
+                built_time=self.built_time,
+                updated_time=self.updated_time,
+            )
+
+            os.makedirs(osp.dirname(self.index_path), exist_ok=True)
+            tmp_path = self.index_path + '.tmp'
+            try:
+                with open(tmp_path, 'wb') as f:
+                    pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, self.index_path)
+                self._modified = False
+            except OSError:
+                logger.debug("Could not save index %s", self.index_path,
+                             exc_info=True)
+
+    def delete(self):
+        """Remove the index from memory and disk."""
+        with self._lock:
+            self._clear()
+            self.ready = False
+        try:
+            os.remove(self.index_path)
+        except OSError:
+            pass
+
+    def _compact(self):
+        """Remove stale ids from posting lists."""
+        stale = self._stale_ids
+        num_postings = 0
+        postings = {}
+        for trigram, ids in self._postings.items():
+            ids = array('I', [i for i in ids if i not in stale])
+            if ids:
+                postings[trigram] = ids
+                num_postings += len(ids)
+        self._postings = postings
+        self._num_postings = num_postings
+        self._stale_ids = set()
+
+    # ---- Indexing
+    def _index_file(self, filename, st, check_text=False):
+        """Index or reindex a file."""
+        trigrams = None
+        if st.st_size <= MAX_INDEXED_FILE_SIZE:
+            if check_text and not is_text_file(filename):
+                return
+            try:
+                with open(filename, 'rb') as f:
+                    trigrams = get_trigrams(f.read())
+            except OSError:
+                return
+        elif check_text and not is_text_file(filename):
+            return
+
+        with self._lock:
+            self._remove_file(filename)
+            self._dirty.discard(filename)
+            self._modified = True
+
+            if trigrams is None:
+                self._unindexed.add(filename)
+                return
+
+            file_id = self._next_id
+            self._next_id += 1
+            self._files[filename] = (file_id, st.st_mtime, st.st_size)
+            postings = self._postings
+            for trigram in trigrams:
+                ids = postings.get(trigram)
+                if ids is None:
+                    postings[trigram] = array('I', [file_id])
+                else:
+                    ids.append(file_id)
+            self._num_postings += len(trigrams)
+
+    def _remove_file(self, filename):
+        """Remove a file from the index. Must be called with the lock held."""
+        entry = self._files.pop(filename, None)
+        if entry is not None:
+            self._stale_ids.add(entry[0])
+        self._unindexed.discard(filename)
+
+    def _is_up_to_date(self, filename, st):
+        entry = self._files.get(filename)
+        if entry is not None:
+            return entry[1] == st.st_mtime and entry[2] == st.st_size
+        return filename in self._unindexed
+
+    def _index_path(self, path, is_stopped=None):
+        """Index or reindex all files under `path` that changed."""
+        seen = set()
+        for filename, check_text in iter_files(path, is_stopped=is_stopped):
+            try:
+                st = os.stat(filename)
+            except OSError:
+                continue
+            seen.add(filename)
+
+            with self._lock:
+                if self._is_up_to_date(filename, st):
+                    continue
+
+            self._index_file(filename, st, check_text)
+
+        return seen
+
+    def refresh(self, is_stopped=None):
+        """
+        Bring the index up to date with the contents of `root_path`.
+
+        Only files whose modification time or size changed are read again.
+        """
+        start = time.time()
+        with self._lock:
+            if not self._files and not self._unindexed:
+                self.built_time = start
+
+        seen = self._index_path(self.root_path, is_stopped)
+        if is_stopped is not None and is_stopped():
+            return False
+
+        with self._lock:
+            indexed = set(self._files) | self._unindexed
+            for filename in indexed - seen:
+                self._remove_file(filename)
+                self._modified = True
+            self.updated_time = time.time()
+            self.ready = True
+
+        logger.debug("Index of %s refreshed in %.2f s", self.root_path,
+                     time.time() - start)
+        return True
+
+    def rebuild(self, is_stopped=None):
+        """Rebuild the index from scratch."""
+        with self._lock:
+            self._clear()
+            self.ready = False
+        return self.refresh(is_stopped)
+
+    def mark_dirty(self, path):
+        """
+        Mark `path` as changed.
+
+        Until `update_paths` is called, the path is always part of the
+        candidates returned by `get_candidates`.
+        """
+        with self._lock:
+            self._dirty.add(osp.normpath(path))
+
+    def update_paths(self, paths=None, is_stopped=None):
+        """
+        Update the index for a set of created, modified, moved or deleted
+        paths. If `paths` is None, all paths marked as dirty are updated.
+
+        Paths that are not updated because `is_stopped` returned True stay
+        marked as dirty.
+        """
+        with self._lock:
+            if paths is None:
+                paths = set(self._dirty)
+            paths = [osp.normpath(path) for path in paths]
+
+        root_prefix = osp.join(self.root_path, '')
+        for path in paths:
+            if is_stopped is not None and is_stopped():
+                return
+
+            if not (path == self.root_path or path.startswith(root_prefix)):
+                continue
+
+            if osp.isdir(path):
+                if not is_excluded(osp.join(path, ''), self.root_path):
+                    self._index_path(path, is_stopped)
+                    if is_stopped is not None and is_stopped():
+                        # The directory was not completely indexed
+                        return
+            elif osp.isfile(path):
+                if not is_excluded(path, self.root_path):
+                    try:
+                        self._index_file(
+                            path, os.stat(path), needs_text_check(path))
+                    except OSError:
+                        pass
+            else:
+                # Remove a deleted file or all files under a deleted
+                # directory
+                with self._lock:
+                    prefix = osp.join(path, '')
+                    removed = [
+                        f for f in list(self._files) + list(self._unindexed)
+                        if f == path or f.startswith(prefix)
+                    ]
+                    for filename in removed:
+                        self._remove_file(filename)
+                        self._modified = True
+
+            with self._lock:
+                self._dirty.discard(path)
+                self.updated_time = time.time()
+
+    # ---- Queries
+    def _lookup(self, literal):
+        """Return the set of file ids containing `literal`."""
+        result = None
+        trigrams = sorted(
+            get_trigrams(literal),
+            key=lambda t: len(self._postings.get(t, ()))
+        )
+        for trigram in trigrams:
+            ids = self._postings.get(trigram)
+            if not ids:
+                return set()
+            if result is None:
+                result = set(ids)
+            else:
+                result.intersection_update(ids)
+            if not result:
+                break
+        return result
+
+    def get_candidates(self, path, texts, text_re, exclude=None):
+        """
+        Return the files under `path` that could contain one of `texts`.
+
+        Parameters
+        ----------
+        path: str
+            Directory where the search is performed.
+        texts: list
+            List of (text, encoding) tuples, as used by the search thread.
+        text_re: bool
+            Whether `texts` are compiled regular expressions.
+        exclude: re.Pattern, optional
+            Files or directories to skip.
+
+        Returns
+        -------
+        list or None
+            A list of (filename, check_text) tuples or None if the index
+            can't be used for this search, e.g. because `path` is not
+            indexed.
+        """
+        path = osp.normpath(path)
+        if not self.ready or not (path == self.root_path
+                                  or path.startswith(
+                                      osp.join(self.root_path, ''))):
+            return None
+
+        # Directories skipped when indexing (e.g. dot-directories) can only
+        # be searched by scanning them
+        if (path != self.root_path
+                and is_excluded(osp.join(path, ''), self.root_path)):
+            return None
+
+        # Literals that must be present in a file for it to be a candidate.
+        # Each text (one per encoding) gives an alternative set of literals.
+        alternatives = []
+        for text, __ in texts:
+            if text_re:
+                literals = get_required_literals(text)
+            else:
+                literals = [text] if len(text) >= 3 else []
+            if not literals:
+                return None
+            alternatives.append(literals)
+
+        with self._lock:
+            ids = set()
+            for literals in alternatives:
+                found = None
+                for literal in literals:
+                    literal_ids = self._lookup(literal)
+                    found = (literal_ids if found is None
+                             else found & literal_ids)
+                ids |= found
+            ids -= self._stale_ids
+
+            files = {
+                filename: False for filename, entry in self._files.items()
+                if entry[0] in ids
+            }
+            files.update(dict.fromkeys(self._unindexed, False))
+            dirty = list(self._dirty)
+
+        # Changed paths that haven't been indexed yet are always searched
+        for filename in dirty:
+            if osp.isdir(filename):
+                files.update(iter_files(filename))
+            elif osp.isfile(filename):
+                check_text = needs_text_check(filename)
+                if check_text is not None:
+                    files[filename] = check_text
+
+        prefix = osp.join(path, '')
+        return sorted(
+            (filename, check_text) for filename, check_text in files.items()
+            if filename.startswith(prefix)
+            and not is_excluded(filename, path, exclude)
+        )
+
+    def get_stats(self):
+        """Return a dictionary with information about the index."""
+        with self._lock:
+            try:
+                disk_size = os.path.getsize(self.index_path)
+            except OSError:
+                disk_size = 0
+
+            return dict(
+                root_path=self.root_path,
+                ready=self.ready,
+                files=len(self._files),
+                unindexed_files=len(self._unindexed),
+                trigrams=len(self._postings),
+                postings=self._num_postings,
+                disk_size=disk_size,
+                built_time=self.built_time,
+                updated_time=self.updated_time,
+            )
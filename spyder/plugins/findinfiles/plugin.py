@@ -83,6 +83,8 @@ def on_projects_available(self):
         projects = self.get_plugin(Plugins.Projects)
         projects.sig_project_loaded.connect(self.set_project_path)
         projects.sig_project_closed.connect(self.unset_project_path)
+        projects.sig_project_file_changed.connect(
+            self.get_widget().update_project_index)
 
     @on_plugin_available(plugin=Plugins.MainMenu)
     def on_main_menu_available(self):
@@ -107,6 +109,8 @@ def on_projects_teardon_plugin_teardown(self):
         projects = self.get_plugin(Plugins.Projects)
         projects.sig_project_loaded.disconnect(self.set_project_path)
         projects.sig_project_closed.disconnect(self.unset_project_path)
+        projects.sig_project_file_changed.disconnect(
+            self.get_widget().update_project_index)
 
     @on_plugin_teardown(plugin=Plugins.MainMenu)
     def on_main_menu_teardown(self):
@@ -121,6 +125,7 @@ def on_close(self, cancelable=False):
         self.get_widget()._update_options()
         if self.get_widget().running:
             self.get_widget()._stop_and_reset_thread(ignore_results=True)
+        self.get_widget()._close_project_index()
         return True
 
     # --- Public API
@@ -165,6 +170,23 @@ def set_max_results(self, value=None):
         """
         self.get_widget().set_max_results(value)
 
+    def get_project_index_stats(self):
+        """
+        Get information about the index of the current project.
+
+        Returns
+        -------
+        dict or None
+            Dictionary with the number of indexed files and trigrams, the
+            index size on disk and its build and update times. None if
+            project indexing is disabled or there's no active project.
+        """
+        return self.get_widget().get_project_index_stats()
+
+    def rebuild_project_index(self):
+        """Rebuild the index of the current project from scratch."""
+        self.get_widget().rebuild_project_index()
+
     def unset_project_path(self):
         """
         Unset current project path.
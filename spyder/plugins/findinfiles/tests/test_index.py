@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright © Spyder Project Contributors
+#
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+# -----------------------------------------------------------------------------
+"""Tests for the Find in Files trigram index."""
+
+# Standard library imports
+import os
+import os.path as osp
+import re
+
+# 3rd party imports
+import pytest
+
+# Local imports
+from spyder.plugins.findinfiles.index import (
+    get_required_literals, TrigramIndex)
+
+
+@pytest.fixture
+def project(tmpdir):
+    """Create a small project and its index."""
+    tmpdir.join('spam.py').write('import spam\nspam.eggs()\n')
+    tmpdir.join('ham.txt').write('ham and eggs\n')
+    tmpdir.mkdir('sub').join('bacon.md').write('Bacon, Spam and ham\n')
+    tmpdir.mkdir('.hidden').join('spam.txt').write('spam\n')
+
+    index = TrigramIndex(str(tmpdir), str(tmpdir.join('..', 'index')))
+    index.refresh()
+    return index
+
+
+def candidates(index, text, text_re=False, path=None):
+    text = re.compile(text) if text_re else text
+    files = index.get_candidates(path or index.root_path, [(text, 'utf-8')],
+                                 text_re)
+    if files is None:
+        return None
+    return sorted(osp.basename(fname) for fname, __ in files)
+
+
+@pytest.mark.parametrize('pattern, literals', [
+    (b'spam', [b'spam']),
+    (b'def spam_\\w+\\(eggs', [b'def spam_', b'(eggs']),
+    (b'(?:spam)+ham', [b'spam', b'ham']),
+    (b'spam|eggs', []),
+    (b'sp?am', []),
+])
+def test_required_literals(pattern, literals):
+    """Test the extraction of literals from regular expressions."""
+    assert get_required_literals(re.compile(pattern)) == literals
+
+
+def test_candidates(project):
+    """Test that queries are narrowed to the files containing them."""
+    assert candidates(project, b'spam') == ['bacon.md', 'spam.py']
+    assert candidates(project, b'eggs') == ['ham.txt', 'spam.py']
+    assert candidates(project, b'sausage') == []
+    assert candidates(project, b'spam\\.eggs', text_re=True) == ['spam.py']
+
+    # Searches in subdirectories
+    path = osp.join(project.root_path, 'sub')
+    assert candidates(project, b'spam', path=path) == ['bacon.md']
+
+    # Queries that can't be narrowed
+    assert candidates(project, b'sp') is None
+    assert candidates(project, b'spam|ham', text_re=True) is None
+    assert candidates(project, b'spam', path=osp.dirname(
+        project.root_path)) is None
+
+    # Searches in directories that are not indexed
+    path = osp.join(project.root_path, '.hidden')
+    assert candidates(project, b'spam', path=path) is None
+    assert candidates(project, b'spam', path=osp.join(path, 'sub')) is None
+
+
+def test_update(project):
+    """Test that the index is updated after changing files."""
+    root_path = project.root_path
+
+    # Modify file
+    ham = osp.join(root_path, 'ham.txt')
+    with open(ham, 'w') as f:
+        f.write('ham and spam\n')
+    project.mark_dirty(ham)
+    assert candidates(project, b'spam') == ['bacon.md', 'ham.txt', 'spam.py']
+    project.update_paths()
+    assert candidates(project, b'spam') == ['bacon.md', 'ham.txt', 'spam.py']
+    assert candidates(project, b'eggs') == ['spam.py']
+
+    # Move and delete files
+    os.rename(ham, osp.join(root_path, 'sub', 'ham.txt'))
+    os.remove(osp.join(root_path, 'spam.py'))
+    project.update_paths([ham, osp.join(root_path, 'sub', 'ham.txt'),
+                          osp.join(root_path, 'spam.py')])
+    assert candidates(project, b'spam') == ['bacon.md', 'ham.txt']
+    assert project.get_stats()['files'] == 2
+
+    # Paths in sibling directories with the same prefix are ignored
+    sibling = project.root_path + '2'
+    os.mkdir(sibling)
+    with open(osp.join(sibling, 'spam.txt'), 'w') as f:
+        f.write('spam\n')
+    project.update_paths([sibling])
+    assert project.get_stats()['files'] == 2
+
+    # Stopped updates leave the remaining paths marked as dirty
+    project.mark_dirty(ham)
+    project.update_paths(is_stopped=lambda: True)
+    assert project._dirty == {ham}
+
+
+def test_save_load(project):
+    """Test that the index can be saved and loaded back."""
+    project.save()
+    assert project.get_stats()['disk_size'] > 0
+
+    index = TrigramIndex(project.root_path, project.index_path)
+    assert index.load()
+    index.refresh()
+    assert candidates(index, b'spam') == ['bacon.md', 'spam.py']
+
+    index.delete()
+    assert not osp.isfile(project.index_path)
+
+
+if __name__ == "__main__":
+    pytest.main()
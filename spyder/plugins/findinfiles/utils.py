@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Find in files scanning utilities.
+
+These functions don't depend on Qt so they can be run in worker processes
+by the search thread.
+"""
+
+# Standard library imports
+import mmap
+import os
+import os.path as osp
+import re
+
+# Local imports
+from spyder.utils.encoding import is_text_file
+
+
+# ---- Constants
+# ----------------------------------------------------------------------------
+PYTHON_EXTENSIONS = ['.py', '.pyw', '.pyx', '.ipy', '.pyi', '.pyt']
+
+USEFUL_EXTENSIONS = [
+    '.ipynb', '.md',  '.c', '.cpp', '.h', '.cxx', '.f', '.f03', '.f90',
+    '.json', '.dat', '.csv', '.tsv', '.txt', '.md', '.rst', '.yml',
+    '.yaml', '.ini', '.bat', '.sh', '.ui'
+]
+
+SKIPPED_EXTENSIONS = ['.svg']
+
+# Files bigger than this (in bytes) are memory-mapped instead of read
+MMAP_THRESHOLD = 4 * 1024 * 1024
+
+# Regexp anchors that have a different meaning when applied to a whole
+# buffer instead of a single line
+_BUFFER_ANCHORS_RE = re.compile(rb'\\[AZ]')
+
+
+# ---- Scanning
+# ----------------------------------------------------------------------------
+def needs_text_check(filename):
+    """
+    Return True if `filename` has to be checked to be a text file before
+    searching in it, or None if it must be skipped.
+    """
+    ext = osp.splitext(filename)[1]
+
+    # Don't search in plain text files with skipped extensions (e.g .svg)
+    if ext in SKIPPED_EXTENSIONS:
+        return None
+
+    # It's much faster to check for extension first before validating if
+    # the file is plain text.
+    return not (ext in PYTHON_EXTENSIONS or ext in USEFUL_EXTENSIONS)
+
+
+def iter_files(path, exclude=None, is_stopped=None):
+    """
+    Walk `path` once, yielding (filename, check_text) for the files where a
+    search needs to be performed.
+
+    Parameters
+    ----------
+    path: str
+        Directory to walk.
+    exclude: re.Pattern, optional
+        Directories and files matching this pattern are skipped.
+    is_stopped: callable, optional
+        Function that returns True if the walk has to be interrupted.
+    """
+    pending = [path]
+    while pending:
+        if is_stopped is not None and is_stopped():
+            return
+
+        dirpath = pending.pop()
+        try:
+            with os.scandir(dirpath) as entries:
+                entries = list(entries)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            try:
+                # Symlinks to directories are not followed, as it was the
+                # case with os.walk
+                if entry.is_dir(follow_symlinks=False):
+                    # Exclude all dot dirs and patterns defined by the user
+                    if entry.name.startswith('.'):
+                        continue
+                    if exclude and exclude.search(entry.path + os.sep):
+                        continue
+                    subdirs.append(entry.path)
+                    continue
+
+                # Only search in regular files (i.e. not pipes)
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+
+            filename = entry.path
+            if exclude and exclude.search(filename):
+                continue
+
+            check_text = needs_text_check(filename)
+            if check_text is not None:
+                yield filename, check_text
+
+        # Keep a top-down, alphabetical walking order
+        pending.extend(reversed(sorted(subdirs)))
+
+
+def is_excluded(filename, path, exclude=None):
+    """
+    Check if `filename`, contained in `path`, would be skipped by
+    `iter_files` because of its name or the name of its parent directories.
+    """
+    if needs_text_check(filename) is None:
+        return True
+
+    if exclude and exclude.search(filename):
+        return True
+
+    dirname = osp.dirname(filename)
+    while len(dirname) > len(path):
+        if osp.basename(dirname).startswith('.'):
+            return True
+        if exclude and exclude.search(dirname + os.sep):
+            return True
+        dirname = osp.dirname(dirname)
+
+    return False
+
+
+def _count_newlines(data, start, end):
+    """Count line breaks in data[start:end] (mmap has no count method)."""
+    if isinstance(data, bytes):
+        return data.count(b'\n', start, end)
+    return data[start:end].count(b'\n')
+
+
+def _line_bounds(data, pos):
+    """Return the start and end positions of the line containing `pos`."""
+    start = data.rfind(b'\n', 0, pos) + 1
+    end = data.find(b'\n', pos)
+    end = len(data) if end == -1 else end + 1
+    return start, end
+
+
+def _decode_span(line, bstart, bend, enc):
+    """Go from binary positions to decoded ones."""
+    try:
+        start = len(line[:bstart].decode(enc))
+        end = start + len(line[bstart:bend].decode(enc))
+    except UnicodeDecodeError:
+        start = bstart
+        end = bend
+    return start, end
+
+
+def _decode_line(line, enc):
+    try:
+        return line.decode(enc)
+    except UnicodeDecodeError:
+        return line
+
+
+def _search_literal(fname, raw, haystack, text, enc):
+    """Search all (possibly overlapping) occurrences of a literal text."""
+    results = []
+    lineno = 1
+    counted = line_start = line_end = 0
+    found = haystack.find(text)
+    while found > -1:
+        if found >= line_end:
+            lineno += _count_newlines(haystack, counted, found)
+            counted = found
+            line_start, line_end = _line_bounds(haystack, found)
+            line = raw[line_start:line_end]
+            line_dec = _decode_line(line, enc)
+
+        bstart = found - line_start
+        start, end = _decode_span(line, bstart, bstart + len(text), enc)
+        results.append((fname, lineno, start, end, line_dec))
+        found = haystack.find(text, found + 1)
+
+    return results
+
+
+def _search_regexp(fname, raw, haystack, pattern, enc):
+    """
+    Search all matches of a regular expression, line by line.
+
+    To avoid splitting the entire file, the whole buffer is first searched
+    with a multiline version of `pattern` to jump to the next line that
+    could contain a match.
+    """
+    results = []
+    if _BUFFER_ANCHORS_RE.search(pattern.pattern):
+        prefilter = None
+    else:
+        prefilter = re.compile(pattern.pattern, pattern.flags | re.MULTILINE)
+
+    lineno = 1
+    pos = 0
+    size = len(haystack)
+    while pos < size:
+        if prefilter is not None:
+            match = prefilter.search(haystack, pos)
+            if match is None:
+                break
+            line_start, line_end = _line_bounds(haystack, match.start())
+            if line_start >= size:
+                break
+            lineno += _count_newlines(haystack, pos, line_start)
+        else:
+            line_start, line_end = _line_bounds(haystack, pos)
+
+        line = haystack[line_start:line_end]
+        line_dec = None
+        for match in pattern.finditer(line):
+            if line_dec is None:
+                line_dec = _decode_line(raw[line_start:line_end], enc)
+            start, end = _decode_span(line, match.start(), match.end(), enc)
+            results.append((fname, lineno, start, end, line_dec))
+
+        lineno += 1
+        pos = line_end
+
+    return results
+
+
+def search_in_file(fname, texts, text_re, case_sensitive, check_text=False):
+    """
+    Search `texts` in a file, reading it as a single buffer.
+
+    Parameters
+    ----------
+    fname: str
+        Absolute path of the file to search in.
+    texts: list
+        List of (text, encoding) tuples, where text is a bytes object or a
+        compiled bytes regexp if `text_re` is True. Texts must be lowercase
+        if `case_sensitive` is False.
+    text_re: bool
+        Whether `texts` are regular expressions.
+    case_sensitive: bool
+        Whether the search is case sensitive.
+    check_text: bool, optional
+        Check that the file is a text one before searching in it.
+
+    Returns
+    -------
+    tuple
+        A list of (fname, lineno, start, end, line) results and an error
+        flag that is True if the file couldn't be read.
+    """
+    if check_text and not is_text_file(fname):
+        return [], False
+
+    try:
+        with open(fname, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return [], False
+
+            if size > MMAP_THRESHOLD and case_sensitive:
+                # This avoids loading big files in memory when possible
+                raw = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                raw = f.read()
+
+            try:
+                haystack = raw if case_sensitive else raw.lower()
+                for text, enc in texts:
+                    if text_re:
+                        results = _search_regexp(
+                            fname, raw, haystack, text, enc)
+                    else:
+                        results = _search_literal(
+                            fname, raw, haystack, text, enc)
+                    if results:
+                        return results, False
+            finally:
+                if isinstance(raw, mmap.mmap):
+                    raw.close()
+    except (IOError, OSError, ValueError):
+        return [], True
+
+    return [], False
+
+
+def search_in_files(files, texts, text_re, case_sensitive):
+    """
+    Search `texts` in several files.
+
+    This is the unit of work sent to worker processes. `files` is a list
+    of (fname, check_text) tuples and the return value is a list of
+    the values returned by `search_in_file` for each file.
+    """
+    return [
+        search_in_file(fname, texts, text_re, case_sensitive, check_text)
+        for fname, check_text in files
+    ]
@@ -8,20 +8,24 @@
 import fnmatch
 import os.path as osp
 import re
+import threading
+import time
 
 # Third party imports
-from qtpy.QtCore import Signal
-from qtpy.QtWidgets import QHBoxLayout, QInputDialog, QLabel
+from qtpy.QtCore import QTimer, Signal
+from qtpy.QtWidgets import QHBoxLayout, QInputDialog, QLabel, QMessageBox
 
 # Local imports
 from spyder.api.config.decorators import on_conf_change
 from spyder.api.translations import get_translation
 from spyder.api.widgets.main_widget import PluginMainWidget
+from spyder.plugins.findinfiles.index import TrigramIndex
 from spyder.plugins.findinfiles.widgets.results_browser import (
     ON, ResultsBrowser)
 from spyder.plugins.findinfiles.widgets.combobox import (
     MAX_PATH_HISTORY, SearchInComboBox)
-from spyder.plugins.findinfiles.widgets.search_thread import SearchThread
+from spyder.plugins.findinfiles.widgets.search_thread import (
+    IndexThread, SearchThread)
 from spyder.utils.misc import regexp_error_msg
 from spyder.utils.palette import QStylePalette, SpyderPalette
 from spyder.widgets.comboboxes import PatternComboBox
@@ -35,6 +39,9 @@
 # -----------------------------------------------------------------------------
 MAIN_TEXT_COLOR = QStylePalette.COLOR_TEXT_1
 
+# Time to wait (in ms) before indexing files reported as changed
+INDEX_UPDATE_DELAY = 2000
+
 
 # ---- Enums
 # -----------------------------------------------------------------------------
@@ -42,6 +49,8 @@ class FindInFilesWidgetActions:
     # Triggers
     Find = 'find_action'
     MaxResults = 'max_results_action'
+    RebuildIndex = 'rebuild_index_action'
+    ShowIndexStats = 'show_index_stats_action'
 
     # Toggles
     ToggleCase = 'toggle_case_action'
@@ -49,6 +58,7 @@ class FindInFilesWidgetActions:
     ToggleExcludeRegex = 'togle_use_regex_on_exlude_action'
     ToggleMoreOptions = 'toggle_more_options_action'
     ToggleSearchRegex = 'toggle_use_regex_on_search_action'
+    ToggleProjectIndex = 'toggle_project_index_action'
 
 
 class FindInFilesWidgetToolbars:
@@ -130,7 +140,12 @@ def __init__(self, name=None, plugin=None, parent=None):
         self.search_thread = None
         self.running = False
         self.more_options_action = None
+        self.rebuild_index_action = None
+        self.show_index_stats_action = None
         self.extras_toolbar = None
+        self.project_index = None
+        self.index_thread = None
+        self._pending_index_update = False
 
         search_text = self.get_conf('search_text', '')
         path_history = self.get_conf('path_history', [])
@@ -207,6 +222,13 @@ def __init__(self, name=None, plugin=None, parent=None):
             self._stop_and_reset_thread)
         self.search_text_edit.sig_resized.connect(self._update_size)
 
+        # Timer to group index updates
+        self._index_update_timer = QTimer(self)
+        self._index_update_timer.setSingleShot(True)
+        self._index_update_timer.setInterval(INDEX_UPDATE_DELAY)
+        self._index_update_timer.timeout.connect(
+            lambda: self._start_index_thread(IndexThread.Update))
+
     # --- PluginMainWidget API
     # ------------------------------------------------------------------------
     def get_title(self):
@@ -275,6 +297,26 @@ def setup(self):
             tip=_('Set maximum number of results'),
             triggered=lambda x=None: self.set_max_results(),
         )
+        self.project_index_action = self.create_action(
+            FindInFilesWidgetActions.ToggleProjectIndex,
+            text=_('Index project files'),
+            tip=_('Keep an index of project files to speed up searches'),
+            toggled=True,
+            initial=self.get_conf('use_project_index'),
+            option='use_project_index'
+        )
+        self.rebuild_index_action = self.create_action(
+            FindInFilesWidgetActions.RebuildIndex,
+            text=_('Rebuild project index'),
+            tip=_('Rebuild project index'),
+            triggered=self.rebuild_project_index,
+        )
+        self.show_index_stats_action = self.create_action(
+            FindInFilesWidgetActions.ShowIndexStats,
+            text=_('Show project index statistics'),
+            tip=_('Show project index statistics'),
+            triggered=self.show_project_index_stats,
+        )
 
         # Toolbar
         toolbar = self.get_main_toolbar()
@@ -312,10 +354,13 @@ def setup(self):
             )
 
         menu = self.get_options_menu()
-        self.add_item_to_menu(
-            self.set_max_results_action,
-            menu=menu,
-        )
+        for item in [self.set_max_results_action, self.project_index_action,
+                     self.rebuild_index_action,
+                     self.show_index_stats_action]:
+            self.add_item_to_menu(
+                item,
+                menu=menu,
+            )
 
     def update_actions(self):
         self.find_action.setIcon(self.create_icon(
@@ -325,6 +370,12 @@ def update_actions(self):
             self.extras_toolbar.setVisible(
                 self.more_options_action.isChecked())
 
+        index_available = self.project_index is not None
+        for action in [self.rebuild_index_action,
+                       self.show_index_stats_action]:
+            if action is not None:
+                action.setEnabled(index_available)
+
     @on_conf_change(option='more_options')
     def on_more_options_update(self, value):
         self.exclude_pattern_edit.setMinimumWidth(
@@ -348,6 +399,13 @@ def on_more_options_update(self, value):
     def on_max_results_update(self, value):
         self.result_browser.set_max_results(value)
 
+    @on_conf_change(option='use_project_index')
+    def on_use_project_index_update(self, value):
+        if value:
+            self._setup_project_index(self.project_path)
+        else:
+            self._close_project_index(delete=True)
+
     # --- Private API
     # ------------------------------------------------------------------------
     def _update_size(self, size, old_size):
@@ -477,6 +535,74 @@ def _stop_and_reset_thread(self, ignore_results=False):
         self.stop_spinner()
         self.update_actions()
 
+    def _setup_project_index(self, path):
+        """Load or build the index of the project located in `path`."""
+        self._close_project_index()
+        if path is None or not self.get_conf('use_project_index'):
+            return
+
+        self.project_index = TrigramIndex(path)
+        self._start_index_thread(IndexThread.Refresh)
+        self.update_actions()
+
+    def _close_project_index(self, delete=False):
+        """Stop indexing and save the current project index."""
+        self._index_update_timer.stop()
+        self._pending_index_update = False
+        self._stop_index_thread()
+
+        if self.project_index is not None:
+            if delete:
+                self.project_index.delete()
+            else:
+                # Save the progress of interrupted tasks without blocking
+                # the interface. Dirty paths don't need to be updated
+                # because their changes are found when the index is
+                # refreshed on load. The index is written to a temporary
+                # file first, so it's not corrupted if Spyder exits before
+                # saving finishes.
+                threading.Thread(target=self.project_index.save,
+                                 daemon=True).start()
+            self.project_index = None
+
+        self.update_actions()
+
+    def _start_index_thread(self, task):
+        """Run `task` on the project index in a separate thread."""
+        if self.project_index is None:
+            return
+
+        if self.index_thread is not None:
+            if task == IndexThread.Update:
+                # Run the update after the current task is done
+                self._pending_index_update = True
+                return
+            self._stop_index_thread()
+
+        self.index_thread = IndexThread(None, self.project_index, task)
+        self.index_thread.sig_finished.connect(self._handle_index_finished)
+        self.index_thread.start()
+
+    def _stop_index_thread(self):
+        if self.index_thread is not None:
+            self.index_thread.sig_finished.disconnect(
+                self._handle_index_finished)
+            self.index_thread.stop()
+            self.index_thread.wait()
+            self.index_thread.setParent(None)
+            self.index_thread = None
+
+    def _handle_index_finished(self):
+        # The signal is emitted at the end of run, so wait for the thread to
+        # return before releasing it
+        self.index_thread.wait()
+        self.index_thread.setParent(None)
+        self.index_thread = None
+
+        if self._pending_index_update:
+            self._pending_index_update = False
+            self._start_index_thread(IndexThread.Update)
+
     # --- Public API
     # ------------------------------------------------------------------------
     @property
@@ -515,10 +641,85 @@ def set_project_path(self, path):
             Project path string.
         """
         self.path_selection_combo.set_project_path(path)
+        self._setup_project_index(path)
 
     def disable_project_search(self):
         """Disable project search path in combobox."""
         self.path_selection_combo.set_project_path(None)
+        self._close_project_index()
+
+    def update_project_index(self, path):
+        """
+        Update the project index after a file or directory was created,
+        modified, moved or deleted.
+
+        Parameters
+        ----------
+        path: str
+            Changed path.
+        """
+        if self.project_index is not None:
+            # Searches done before the index is updated will look in this
+            # path
+            self.project_index.mark_dirty(path)
+            self._index_update_timer.start()
+
+    def rebuild_project_index(self):
+        """Rebuild the index of the current project from scratch."""
+        self._start_index_thread(IndexThread.Rebuild)
+
+    def get_project_index_stats(self):
+        """
+        Get information about the current project index.
+
+        Returns
+        -------
+        dict or None
+            Dictionary with the number of indexed files and trigrams, the
+            index size on disk and its build and update times. None if
+            there's no project index.
+        """
+        if self.project_index is None:
+            return None
+        return self.project_index.get_stats()
+
+    def show_project_index_stats(self):
+        """Show a dialog with information about the project index."""
+        stats = self.get_project_index_stats()
+        if stats is None:
+            return
+
+        def format_time(timestamp):
+            if timestamp is None:
+                return _('Never')
+            age = int(time.time() - timestamp) // 60
+            return _('{date} ({minutes} minutes ago)').format(
+                date=time.strftime('%Y-%m-%d %H:%M', time.localtime(
+                    timestamp)),
+                minutes=age
+            )
+
+        if stats['ready']:
+            status = _('Ready')
+        elif self.index_thread is not None:
+            status = _('Indexing...')
+        else:
+            status = _('Not available')
+
+        lines = [
+            (_('Project'), stats['root_path']),
+            (_('Status'), status),
+            (_('Indexed files'), stats['files']),
+            (_('Files too big to be indexed'), stats['unindexed_files']),
+            (_('Trigrams'), stats['trigrams']),
+            (_('Size on disk'), '{:.1f} MB'.format(
+                stats['disk_size'] / 1024**2)),
+            (_('Built'), format_time(stats['built_time'])),
+            (_('Last updated'), format_time(stats['updated_time'])),
+        ]
+        text = '<br>'.join(
+            '<b>{}</b>: {}'.format(name, value) for name, value in lines)
+        QMessageBox.information(self, _('Project index'), text)
 
     def set_file_path(self, path):
         """
@@ -597,6 +798,7 @@ def start(self):
         self.search_thread.sig_line_match.connect(
             self.result_browser.append_result
         )
+        self.search_thread.index = self.project_index
         self.result_browser.clear_title(search_text)
         self.search_thread.initialize(*self._get_options())
         self.search_thread.start()
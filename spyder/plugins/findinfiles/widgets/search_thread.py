@@ -7,10 +7,11 @@
 """Search thread."""
 
 # Standard library imports
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import multiprocessing
 import os
 import os.path as osp
 import re
-import stat
 import traceback
 
 # Third party imports
@@ -18,7 +19,9 @@
 
 # Local imports
 from spyder.api.translations import get_translation
-from spyder.utils.encoding import is_text_file
+from spyder.plugins.findinfiles.utils import (
+    iter_files, PYTHON_EXTENSIONS, search_in_file, search_in_files,
+    SKIPPED_EXTENSIONS, USEFUL_EXTENSIONS)
 from spyder.utils.palette import SpyderPalette
 
 
@@ -32,20 +35,27 @@
 MAX_RESULT_LENGTH = 80
 MAX_NUM_CHAR_FRAGMENT = 40
 
+# Number of files searched in the thread itself before starting to
+# distribute the remaining ones to a pool of processes. This avoids paying
+# the cost of starting the pool for small searches.
+PROCESS_POOL_THRESHOLD = 200
+
+# Number of files sent to a worker process at once
+FILES_PER_TASK = 64
+
+# Maximum number of worker processes
+MAX_WORKERS = 8
+
 
 # ---- Thread
 # ----------------------------------------------------------------------------
 class SearchThread(QThread):
     """Find in files search thread."""
-    PYTHON_EXTENSIONS = ['.py', '.pyw', '.pyx', '.ipy', '.pyi', '.pyt']
+    PYTHON_EXTENSIONS = PYTHON_EXTENSIONS
 
-    USEFUL_EXTENSIONS = [
-        '.ipynb', '.md',  '.c', '.cpp', '.h', '.cxx', '.f', '.f03', '.f90',
-        '.json', '.dat', '.csv', '.tsv', '.txt', '.md', '.rst', '.yml',
-        '.yaml', '.ini', '.bat', '.sh', '.ui'
-    ]
+    USEFUL_EXTENSIONS = USEFUL_EXTENSIONS
 
-    SKIPPED_EXTENSIONS = ['.svg']
+    SKIPPED_EXTENSIONS = SKIPPED_EXTENSIONS
 
     sig_finished = Signal(bool)
     sig_current_file = Signal(str)
@@ -78,9 +88,12 @@ def __init__(self, parent, search_text, text_color):
         self.results = {}
 
         self.num_files = 0
-        self.files = []
+        self.files = set()
         self.partial_results = []
 
+        # Project index used to narrow the set of files to search in
+        self.index = None
+
     def initialize(self, path, is_file, exclude,
                    texts, text_re, case_sensitive):
         self.rootpath = path
@@ -96,10 +109,12 @@ def initialize(self, path, is_file, exclude,
     def run(self):
         try:
             self.filenames = []
+            self.error_flag = False
             if self.is_file:
                 self.find_string_in_file(self.rootpath)
+                self.completed = True
             else:
-                self.find_files_in_path(self.rootpath)
+                self.completed = self.find_files_in_path(self.rootpath)
         except Exception:
             # Important note: we have to handle unexpected exceptions by
             # ourselves because they won't be catched by the main thread
@@ -113,163 +128,112 @@ def stop(self):
         with QMutexLocker(self.mutex):
             self.stopped = True
 
+    def is_stopped(self):
+        with QMutexLocker(self.mutex):
+            return self.stopped
+
     def find_files_in_path(self, path):
+        """
+        Search in all files contained in `path`.
+
+        The first files are searched in this thread. If there are more than
+        `PROCESS_POOL_THRESHOLD` of them, the rest are distributed to a pool
+        of processes, whose results are streamed back as they arrive.
+        """
         if self.pathlist is None:
             self.pathlist = []
         self.pathlist.append(path)
-        for path, dirs, files in os.walk(path):
-            with QMutexLocker(self.mutex):
-                if self.stopped:
-                    return False
-            try:
-                # For directories
-                for d in dirs[:]:
-                    with QMutexLocker(self.mutex):
-                        if self.stopped:
-                            return False
-
-                    dirname = os.path.join(path, d)
-
-                    # Only search in regular directories
-                    st_dir_mode = os.stat(dirname).st_mode
-                    if not stat.S_ISDIR(st_dir_mode):
-                        dirs.remove(d)
-
-                    if (self.exclude and
-                            re.search(self.exclude, dirname + os.sep)):
-                        # Exclude patterns defined by the user
-                        dirs.remove(d)
-                    elif d.startswith('.'):
-                        # Exclude all dot dirs.
-                        dirs.remove(d)
-
-                # For files
-                for f in files:
-                    with QMutexLocker(self.mutex):
-                        if self.stopped:
-                            return False
-
-                    filename = os.path.join(path, f)
-                    ext = osp.splitext(filename)[1]
-
-                    # Only search in regular files (i.e. not pipes)
-                    st_file_mode = os.stat(filename).st_mode
-                    if not stat.S_ISREG(st_file_mode):
-                        continue
-
-                    # Exclude patterns defined by the user
-                    if self.exclude and re.search(self.exclude, filename):
-                        continue
-
-                    # Don't search in plain text files with skipped extensions
-                    # (e.g .svg)
-                    if ext in self.SKIPPED_EXTENSIONS:
-                        continue
-
-                    # It's much faster to check for extension first before
-                    # validating if the file is plain text.
-                    if (ext in self.PYTHON_EXTENSIONS or
-                            ext in self.USEFUL_EXTENSIONS or
-                            is_text_file(filename)):
-                        self.find_string_in_file(filename)
-            except re.error:
-                self.error_flag = _("invalid regular expression")
-                return False
-            except FileNotFoundError:
+
+        files = None
+        if self.index is not None:
+            files = self.index.get_candidates(
+                path, self.texts, self.text_re, self.exclude)
+        if files is None:
+            files = iter_files(path, self.exclude, self.is_stopped)
+        files = iter(files)
+
+        for count, (filename, check_text) in enumerate(files, start=1):
+            if self.is_stopped():
                 return False
+            self.find_string_in_file(filename, check_text)
+            if count >= PROCESS_POOL_THRESHOLD:
+                if not self._find_in_process_pool(files):
+                    return False
+                break
 
         # Process any pending results
         if self.partial_results:
             self.process_results()
 
-        return True
+        return not self.is_stopped()
 
-    def find_string_in_file(self, fname):
-        self.error_flag = False
-        self.sig_current_file.emit(fname)
+    def _find_in_process_pool(self, files):
+        """Search in `files` using a pool of worker processes."""
+        num_workers = max(1, min(MAX_WORKERS, (os.cpu_count() or 2) - 1))
+        args = (self.texts, self.text_re, self.case_sensitive)
+
+        # Spawn is used because forking a process with running Qt threads
+        # is not safe
+        executor = ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+
+        futures = set()
+        exhausted = False
         try:
-            for lineno, line in enumerate(open(fname, 'rb')):
-                for text, enc in self.texts:
-                    with QMutexLocker(self.mutex):
-                        if self.stopped:
-                            return False
-                    line_search = line
-                    if not self.case_sensitive:
-                        line_search = line_search.lower()
-                    if self.text_re:
-                        found = re.search(text, line_search)
-                        if found is not None:
+            while futures or not exhausted:
+                if self.is_stopped():
+                    return False
+
+                # Keep a bounded number of tasks in flight so that stopping
+                # the search doesn't leave much work behind
+                while not exhausted and len(futures) < 2 * num_workers:
+                    chunk = []
+                    for item in files:
+                        chunk.append(item)
+                        if len(chunk) == FILES_PER_TASK:
                             break
                     else:
-                        found = line_search.find(text)
-                        if found > -1:
-                            break
-                try:
-                    line_dec = line.decode(enc)
-                except UnicodeDecodeError:
-                    line_dec = line
-
-                if not self.case_sensitive:
-                    line = line.lower()
-
-                if self.text_re:
-                    for match in re.finditer(text, line):
-                        with QMutexLocker(self.mutex):
-                            if self.stopped:
-                                return False
-                        self.total_matches += 1
-                        bstart, bend = match.start(), match.end()
-                        try:
-                            # Go from binary position to utf8 position
-                            start = len(line[:bstart].decode(enc))
-                            end = start + len(line[bstart:bend].decode(enc))
-                        except UnicodeDecodeError:
-                            start = bstart
-                            end = bend
-                        self.partial_results.append((osp.abspath(fname),
-                                                     lineno + 1,
-                                                     start,
-                                                     end,
-                                                     line_dec))
-                        if len(self.partial_results) > (2**self.power):
-                            self.process_results()
-                            if self.power < self.max_power:
-                                self.power += 1
-                else:
-                    found = line.find(text)
-                    while found > -1:
-                        with QMutexLocker(self.mutex):
-                            if self.stopped:
-                                return False
-                        self.total_matches += 1
-                        try:
-                            # Go from binary position to utf8 position
-                            start = len(line[:found].decode(enc))
-                            end = start + len(text.decode(enc))
-                        except UnicodeDecodeError:
-                            start = found
-                            end = found + len(text)
-
-                        self.partial_results.append((osp.abspath(fname),
-                                                     lineno + 1,
-                                                     start,
-                                                     end,
-                                                     line_dec))
-                        if len(self.partial_results) > (2**self.power):
-                            self.process_results()
-                            if self.power < self.max_power:
-                                self.power += 1
-
-                        for text, enc in self.texts:
-                            found = line.find(text, found + 1)
-                            if found > -1:
-                                break
-
-        except IOError as xxx_todo_changeme:
-            (_errno, _strerror) = xxx_todo_changeme.args
+                        exhausted = True
+                    if chunk:
+                        futures.add(
+                            executor.submit(search_in_files, chunk, *args))
+
+                done, futures = wait(
+                    futures, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for results, error in future.result():
+                        self._add_results(results, error)
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+        return True
+
+    def find_string_in_file(self, fname, check_text=False):
+        self.sig_current_file.emit(fname)
+        results, error = search_in_file(
+            fname, self.texts, self.text_re, self.case_sensitive, check_text)
+        self._add_results(results, error)
+
+    def _add_results(self, results, error):
+        """Add the results found in a file and emit them in batches."""
+        if error:
             self.error_flag = _("permission denied errors were encountered")
 
-        self.completed = True
+        for result in results:
+            if self.is_stopped():
+                return
+            fname, lineno, start, end, line_dec = result
+            self.total_matches += 1
+            self.partial_results.append(
+                (osp.abspath(fname), lineno, start, end, line_dec))
+            if len(self.partial_results) > (2**self.power):
+                self.process_results()
+                if self.power < self.max_power:
+                    self.power += 1
 
     def process_results(self):
         """
@@ -289,7 +253,7 @@ def process_results(self):
             filename, lineno, colno, match_end, line = result
 
             if filename not in self.files:
-                self.files.append(filename)
+                self.files.add(filename)
                 self.sig_file_match.emit(filename)
                 self.num_files += 1
 
@@ -390,3 +354,49 @@ def html_escape(text):
 
     def get_results(self):
         return self.results, self.pathlist, self.total_matches, self.error_flag
+
+
+class IndexThread(QThread):
+    """Thread to load, update or rebuild a project index."""
+
+    # Tasks
+    Refresh = 'refresh'
+    Rebuild = 'rebuild'
+    Update = 'update'
+
+    sig_finished = Signal()
+
+    def __init__(self, parent, index, task):
+        super().__init__(parent)
+        self.mutex = QMutex()
+        self.stopped = False
+        self.index = index
+        self.task = task
+
+    def run(self):
+        try:
+            if self.task == self.Update:
+                self.index.update_paths(is_stopped=self.is_stopped)
+            elif self.task == self.Rebuild:
+                self.index.rebuild(self.is_stopped)
+            else:
+                if not self.index.ready:
+                    self.index.load()
+                self.index.refresh(self.is_stopped)
+
+            # Interrupted tasks are saved by whoever stopped them, if needed,
+            # so stopping this thread doesn't have to wait for it
+            if not self.is_stopped():
+                self.index.save()
+        except Exception:
+            # See the comment in SearchThread.run
+            traceback.print_exc()
+        self.sig_finished.emit()
+
+    def stop(self):
+        with QMutexLocker(self.mutex):
+            self.stopped = True
+
+    def is_stopped(self):
+        with QMutexLocker(self.mutex):
+            return self.stopped
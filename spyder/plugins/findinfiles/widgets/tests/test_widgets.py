@@ -11,6 +11,7 @@
 # Test library imports
 import os
 import os.path as osp
+import re
 from unittest.mock import MagicMock
 
 # Third party imports
@@ -149,6 +150,77 @@ def test_find_in_files_search(findinfiles, qtbot):
     assert expected_results() == matches
 
 
+def test_find_in_files_search_process_pool(findinfiles, qtbot, monkeypatch):
+    """
+    Test that searching with a pool of processes gives the same results as
+    searching in the thread.
+    """
+    from spyder.plugins.findinfiles.widgets import search_thread
+    monkeypatch.setattr(search_thread, 'PROCESS_POOL_THRESHOLD', 1)
+    monkeypatch.setattr(search_thread, 'FILES_PER_TASK', 1)
+
+    findinfiles.set_search_text("spam")
+    findinfiles.set_directory(osp.join(LOCATION, "data"))
+    findinfiles.find()
+    blocker = qtbot.waitSignal(findinfiles.sig_finished, timeout=30000)
+    blocker.wait()
+    matches = process_search_results(findinfiles.result_browser.data)
+    assert expected_results() == matches
+
+
+@pytest.mark.parametrize('findinfiles',
+                         [{'use_project_index': True}],
+                         indirect=True)
+def test_find_in_files_search_project_index(findinfiles, qtbot):
+    """Test searching in a project with an index of its files."""
+    findinfiles.set_search_text("spam")
+    findinfiles.set_project_path(osp.join(LOCATION, "data"))
+    findinfiles.path_selection_combo.setCurrentIndex(PROJECT)
+    qtbot.waitUntil(lambda: findinfiles.project_index.ready)
+    assert findinfiles.get_project_index_stats()['files'] == 4
+
+    findinfiles.find()
+    blocker = qtbot.waitSignal(findinfiles.sig_finished)
+    blocker.wait()
+    matches = process_search_results(findinfiles.result_browser.data)
+    assert expected_results() == matches
+
+    findinfiles.disable_project_search()
+    assert findinfiles.project_index is None
+
+
+@pytest.mark.parametrize('text_re', [True, False])
+@pytest.mark.parametrize('mmap_threshold', [0, 4 * 1024 * 1024])
+def test_search_in_file(tmpdir, monkeypatch, text_re, mmap_threshold):
+    """
+    Test that searching in a file as a whole buffer gives the same results
+    as searching in it line by line.
+    """
+    from spyder.plugins.findinfiles import utils
+    monkeypatch.setattr(utils, 'MMAP_THRESHOLD', mmap_threshold)
+
+    lines = ['spam ñandú spam\n', '\n', 'eggs\n', 'ham spamspam']
+    fname = str(tmpdir.join('foo.txt'))
+    with open(fname, 'wb') as f:
+        f.write(''.join(lines).encode('utf-8'))
+
+    text = re.compile(b'spam') if text_re else b'spam'
+    results, error = utils.search_in_file(
+        fname, [(text, 'utf-8')], text_re, True)
+
+    assert not error
+    assert [result[1:4] for result in results] == [
+        (1, 0, 4), (1, 11, 15), (4, 4, 8), (4, 8, 12)]
+    assert results[0][4] == lines[0]
+    assert results[-1][4] == lines[-1]
+
+    # Regexp anchors are applied per line
+    if text_re:
+        results, error = utils.search_in_file(
+            fname, [(re.compile(b'^spam|^ham'), 'utf-8')], text_re, True)
+        assert [result[1:4] for result in results] == [(1, 0, 4), (4, 0, 3)]
+
+
 @pytest.mark.parametrize('findinfiles',
                          [{'exclude': r"\.py$", 'exclude_regexp': True}],
                          indirect=True)
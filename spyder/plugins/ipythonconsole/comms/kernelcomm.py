@@ -165,7 +165,8 @@ def open_comm(self, kernel_client):
             self._register_comm(
                 # Create new comm and send the highest protocol
                 kernel_client.comm_manager.new_comm(self._comm_name, data={
-                    'pickle_protocol': pickle.HIGHEST_PROTOCOL}))
+                    'pickle_protocol': pickle.HIGHEST_PROTOCOL,
+                    'out_of_band_buffers': True}))
         except AttributeError:
             logger.info(
                 "Unable to open comm due to unexistent comm manager: " +
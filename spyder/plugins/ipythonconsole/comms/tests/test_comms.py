@@ -13,11 +13,16 @@
 import os
 
 # Test imports
+from ipykernel.iostream import IOPubThread
+import numpy as np
 import pytest
+import zmq
 
 
 # Local imports
 from spyder_kernels.utils.test_utils import get_kernel
+from spyder_kernels.comms.commbase import (
+    dumps_to_buffers, loads_from_buffers, OUT_OF_BAND_MIN_SIZE)
 from spyder_kernels.comms.frontendcomm import FrontendComm
 from spyder.plugins.ipythonconsole.comms.kernelcomm import KernelComm
 
@@ -179,5 +184,117 @@ def handler(a, b):
     assert res == 'ab'
 
 
+def test_out_of_band_buffers():
+    """Test that large arrays are pickled with out-of-band buffers."""
+    small = np.arange(10)
+    large = np.arange(OUT_OF_BAND_MIN_SIZE, dtype=float)
+    data = {'small': small, 'large': large, 'list': [large[::2]]}
+
+    buffers = dumps_to_buffers(data, 5, out_of_band=True)
+
+    # Only the large contiguous array is out-of-band, and it's copied so it
+    # can be modified before the message is sent
+    assert len(buffers) == 2
+    assert buffers[1] == large.tobytes()
+    assert isinstance(buffers[1], bytes)
+
+    # It's shared if the array is not modified until then
+    shared_buffers = dumps_to_buffers(data, 5, out_of_band=True, copy=False)
+    assert len(shared_buffers) == 2
+    assert np.shares_memory(np.frombuffer(shared_buffers[1]), large)
+
+    # Read only buffers (e.g. received through zmq) are copied, so arrays
+    # can be edited
+    received = loads_from_buffers([bytes(b) for b in buffers])
+    assert np.array_equal(received['large'], large)
+    assert np.array_equal(received['list'][0], large[::2])
+    assert np.array_equal(received['small'], small)
+    assert received['large'].flags.writeable
+
+    # Without out-of-band support, everything goes in a single buffer
+    assert len(dumps_to_buffers(data, 5)) == 1
+    assert len(dumps_to_buffers(data, 4, out_of_band=True)) == 1
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="Hangs on Windows")
+def test_request_out_of_band(comms):
+    """Test that arrays are sent out-of-band when both sides support it."""
+    kernel_comm, frontend_comm = comms
+    sent_buffers = []
+    send = kernel_comm._comms[1]['comm'].send
+
+    def spy_send(msg_dict, buffers=None):
+        sent_buffers.append(buffers)
+        send(msg_dict, buffers)
+
+    kernel_comm._comms[1]['comm'].send = spy_send
+    kernel_comm.register_call_handler('test_request', np.ones,
+                                      returns_copy=True)
+
+    # The call announces that out-of-band buffers are supported, so the
+    # array in the reply is sent in its own buffer, without copying it
+    res = frontend_comm.remote_call(blocking=True).test_request(10 ** 6)
+    assert len(sent_buffers) == 1
+    assert len(sent_buffers[0]) == 2
+    assert isinstance(sent_buffers[0][1], memoryview)
+    assert res.sum() == 10 ** 6
+
+    # Buffers of data that can be referenced elsewhere are copied
+    kernel_comm.register_call_handler('test_request', np.ones)
+    res = frontend_comm.remote_call(blocking=True).test_request(10 ** 6)
+    assert isinstance(sent_buffers[1][1], bytes)
+    assert res.sum() == 10 ** 6
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="Hangs on Windows")
+def test_tracked_send_out_of_band(comms):
+    """
+    Test that the kernel sends shared buffers from the IOPub thread without
+    copying them, and waits until they are sent.
+    """
+    kernel_comm, frontend_comm = comms
+    kernel = frontend_comm.kernel
+    comm = frontend_comm._comms[1]['comm']
+    comm.topic = b'comm-1'
+    frontend_comm._comms[1]['out_of_band_buffers'] = True
+    frontend_comm._set_pickle_protocol(5)
+
+    context = zmq.Context.instance()
+    pub = context.socket(zmq.PUB)
+    port = pub.bind_to_random_port('tcp://127.0.0.1')
+    sub = context.socket(zmq.SUB)
+    sub.subscribe(b'')
+    sub.connect('tcp://127.0.0.1:{}'.format(port))
+    iopub_thread = IOPubThread(pub)
+    iopub_thread.start()
+    kernel.iopub_thread = iopub_thread
+    try:
+        # Wait for the subscription
+        while not sub.poll(10):
+            pub.send(b'')
+        sub.recv()
+
+        # The message doesn't go through comm.send, which copies the buffers
+        sent_buffers = []
+        comm.send = lambda msg_dict, buffers=None: sent_buffers.append(buffers)
+        data = np.ones(10 ** 6)
+        frontend_comm._send_message('test_message', data=data, comm_id=1)
+        assert sent_buffers == []
+
+        # The buffer was released by zmq, so data can be modified
+        data[:] = 0
+        __, msg = kernel.session.recv(sub)
+        while msg is None or msg['msg_type'] != 'comm_msg':
+            __, msg = kernel.session.recv(sub)
+        assert msg['content']['data']['spyder_msg_type'] == 'test_message'
+        assert len(msg['buffers']) == 2
+        assert loads_from_buffers(msg['buffers']).sum() == 10 ** 6
+    finally:
+        kernel.iopub_thread = None
+        iopub_thread.stop()
+        iopub_thread.close()
+        sub.close()
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -21,6 +21,12 @@
 from spyder.utils.programs import get_temp_dir
 
 
+# Maximum number of bytes read from a std file each time it's polled. If
+# more than this was written since the last poll, only the last part is read,
+# so that polling a file that grows a lot doesn't take longer and longer.
+MAX_POLL_SIZE = 1024 * 1024
+
+
 def std_filename(connection_file, extension, std_dir=None):
     """Filename to save kernel output."""
     json_file = osp.basename(connection_file)
@@ -42,9 +48,14 @@ def __init__(self, connection_file, extension=None, std_dir=None):
         else:
             self.filename = std_filename(connection_file, extension, std_dir)
         self._mtime = 0
-        self._cursor = 0
         self._handle = None
 
+        # Position up to which the file was read, identity of the file and
+        # decoder of its contents, to only read what was appended to it
+        self._offset = 0
+        self._file_id = None
+        self._decoder = None
+
     @property
     def handle(self):
         """Get handle to file."""
@@ -95,22 +106,63 @@ def get_contents(self):
             return None
 
     def poll_file_change(self):
-        """Check if the std kernel file just changed."""
+        """
+        Check if the std kernel file just changed and return the text
+        appended to it since the last time it was polled.
+        """
         if self._handle is not None and not self._handle.closed:
             self._handle.flush()
         try:
-            mtime = os.stat(self.filename).st_mtime
+            stat = os.stat(self.filename)
         except Exception:
             return
 
-        if mtime == self._mtime:
+        if stat.st_mtime == self._mtime and stat.st_size == self._offset:
+            return
+        self._mtime = stat.st_mtime
+
+        # Start again from the beginning if the file was replaced or
+        # truncated (e.g. when the kernel is restarted)
+        file_id = (stat.st_dev, stat.st_ino)
+        if file_id != self._file_id or stat.st_size < self._offset:
+            self._file_id = file_id
+            self._offset = 0
+            self._decoder = None
+
+        if stat.st_size == self._offset:
+            return
+
+        try:
+            with open(self.filename, 'rb') as f:
+                if stat.st_size - self._offset > MAX_POLL_SIZE:
+                    # Skip what can't be shown anyway. The decoder is reset
+                    # because its pending bytes don't go with the new ones.
+                    self._offset = stat.st_size - MAX_POLL_SIZE
+                    self._decoder = None
+                f.seek(self._offset)
+                data = f.read(MAX_POLL_SIZE)
+        except Exception:
             return
-        self._mtime = mtime
-        text = self.get_contents()
+        self._offset += len(data)
+
+        if self._decoder is None:
+            # This is needed since the file could be encoded in something
+            # different to utf-8. See spyder-ide/spyder#4191.
+            encoding = get_coding(data)
+            if encoding is None or encoding.lower() == 'ascii':
+                # Text that comes after could have non-ascii characters
+                encoding = 'utf-8'
+            try:
+                decoder_class = codecs.getincrementaldecoder(encoding)
+            except LookupError:
+                decoder_class = codecs.getincrementaldecoder('utf-8')
+            self._decoder = decoder_class(errors='replace')
+
+        # The incremental decoder keeps the bytes of a character that is
+        # split between two reads until the rest of them are read
+        text = self._decoder.decode(data)
         if text:
-            ret_text = text[self._cursor:]
-            self._cursor = len(text)
-            return ret_text
+            return text
 
     def copy(self):
         """Return a copy."""
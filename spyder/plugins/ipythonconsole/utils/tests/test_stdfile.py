@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Tests for the std files of kernels
+"""
+
+import pytest
+
+from spyder.plugins.ipythonconsole.utils import stdfile
+from spyder.plugins.ipythonconsole.utils.stdfile import StdFile
+
+
+@pytest.fixture
+def std_file(tmpdir):
+    std_file = StdFile(str(tmpdir.join('kernel-1234.json')), '.stderr',
+                       str(tmpdir))
+    yield std_file
+    std_file.remove()
+
+
+def write(std_file, data):
+    """Append bytes to a std file, as the kernel does."""
+    with open(std_file.filename, 'ab') as f:
+        f.write(data)
+
+
+def test_poll_appended_text(std_file):
+    """Test that polling a std file returns only the text appended to it."""
+    assert std_file.handle is not None
+    assert std_file.poll_file_change() is None
+
+    write(std_file, b'First line\n')
+    assert std_file.poll_file_change() == 'First line\n'
+    assert std_file.poll_file_change() is None
+
+    write(std_file, b'Second line\n')
+    assert std_file.poll_file_change() == 'Second line\n'
+    assert std_file.get_contents() == 'First line\nSecond line\n'
+
+
+def test_poll_split_characters(std_file):
+    """
+    Test that characters whose bytes are written in different polls are
+    decoded correctly.
+    """
+    std_file.handle
+    data = 'Error: ñandú €\n'.encode('utf-8')
+    index = data.index('€'.encode('utf-8')) + 1
+
+    write(std_file, b'Error\n')
+    assert std_file.poll_file_change() == 'Error\n'
+    write(std_file, data[:index])
+    assert std_file.poll_file_change() == 'Error: ñandú '
+    write(std_file, data[index:])
+    assert std_file.poll_file_change() == '€\n'
+
+
+def test_poll_truncated_file(std_file):
+    """Test that a std file is read from the start after it's truncated."""
+    std_file.handle
+    write(std_file, b'Old kernel output\n')
+    assert std_file.poll_file_change() == 'Old kernel output\n'
+
+    with open(std_file.filename, 'wb') as f:
+        f.write(b'New\n')
+    assert std_file.poll_file_change() == 'New\n'
+
+
+def test_poll_size_cap(std_file, monkeypatch):
+    """Test that only the last part of a std file that grew a lot is read."""
+    monkeypatch.setattr(stdfile, 'MAX_POLL_SIZE', 10)
+    std_file.handle
+    write(std_file, b'0123456789' * 100 + b'last line\n')
+    assert std_file.poll_file_change() == 'last line\n'
+
+    write(std_file, b'more\n')
+    assert std_file.poll_file_change() == 'more\n'
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -61,8 +61,8 @@ def refresh_namespacebrowser(self, interrupt=True):
         if self.namespacebrowser:
             self.call_kernel(
                 interrupt=interrupt,
-                callback=self.set_namespace_view
-            ).get_namespace_view()
+                callback=self.set_namespace_view_changes
+            ).get_namespace_view_changes()
             self.call_kernel(
                 interrupt=interrupt,
                 callback=self.set_var_properties
@@ -73,6 +73,11 @@ def set_namespace_view(self, view):
         if self.namespacebrowser is not None:
             self.namespacebrowser.process_remote_view(view)
 
+    def set_namespace_view_changes(self, changes):
+        """Apply the changes of the namespace view."""
+        if self.namespacebrowser is not None:
+            self.namespacebrowser.process_remote_view_changes(changes)
+
     def set_var_properties(self, properties):
         """Set var properties."""
         if self.namespacebrowser is not None:
@@ -90,6 +95,25 @@ def set_namespace_view_settings(self):
 
     def get_value(self, name):
         """Ask kernel for a value"""
+        return self._call_value_getter('get_value', name)
+
+    def get_value_window_info(self, name):
+        """
+        Ask kernel for the information needed to display a value by windows.
+
+        Returns None if the value can't be displayed that way.
+        """
+        return self._call_value_getter('get_value_window_info', name)
+
+    def get_value_window(self, name, row_start, row_stop, col_start=0,
+                         col_stop=1):
+        """Ask kernel for a window of the rows and columns of a value"""
+        return self._call_value_getter(
+            'get_value_window', name, row_start, row_stop, col_start,
+            col_stop)
+
+    def _call_value_getter(self, method, *args):
+        """Call a kernel method that returns a value or part of it."""
         reason_big = _("The variable is too big to be retrieved")
         reason_not_picklable = _("The variable is not picklable")
         reason_dead = _("The kernel is dead")
@@ -99,10 +123,11 @@ def get_value(self, name):
                 "Note: Please don't report this problem on Github, "
                 "there's nothing to do about it.")
         try:
-            return self.call_kernel(
+            kernel_call = self.call_kernel(
                 blocking=True,
                 display_error=True,
-                timeout=CALL_KERNEL_TIMEOUT).get_value(name)
+                timeout=CALL_KERNEL_TIMEOUT)
+            return getattr(kernel_call, method)(*args)
         except TimeoutError:
             raise ValueError(msg % reason_big)
         except (PicklingError, UnpicklingError, TypeError):
@@ -140,7 +165,7 @@ def copy_value(self, orig_name, new_name):
             display_error=True,
             ).copy_value(orig_name, new_name)
 
-    def load_data(self, filename, ext):
+    def load_data(self, filename, ext, names=None):
         """Load data from a file."""
         overwrite = False
         if self.namespacebrowser.editor.var_properties:
@@ -156,7 +181,7 @@ def load_data(self, filename, ext):
                 blocking=True,
                 display_error=True,
                 timeout=CALL_KERNEL_TIMEOUT).load_data(
-                    filename, ext, overwrite=overwrite)
+                    filename, ext, overwrite=overwrite, names=names)
         except ImportError as msg:
             module = str(msg).split("'")[1]
             msg = _("Spyder is unable to open the file "
@@ -125,7 +125,8 @@ class OutlineExplorerProxy(QObject):
     """
 
     sig_cursor_position_changed = Signal(int, int)
-    sig_outline_explorer_data_changed = Signal(list)
+    # Symbols are sent as an object to avoid converting them to Qt types
+    sig_outline_explorer_data_changed = Signal(object)
     sig_start_outline_spinner = Signal()
 
     def __init__(self):
@@ -203,6 +203,80 @@ def test_outline_explorer(case, create_outlineexplorer):
     assert root_tree == expected_tree
 
 
+def test_update_tree_incrementally(create_outlineexplorer):
+    """
+    Test that only the items of the symbols that changed are updated and
+    that the items of the children of a symbol are created when it's
+    expanded.
+    """
+    outlineexplorer, _ = create_outlineexplorer('text')
+    tree_widget = outlineexplorer.treewidget
+    editor = tree_widget.current_editor
+    root_ref = tree_widget.get_top_level_items()[0].ref
+
+    # The items of the children of collapsed symbols are not created
+    class1 = [ref for ref in root_ref.children if ref.name == 'Class1'][0]
+    assert len(class1.children) > 0
+    assert class1.node.childCount() == 0
+    tree_widget.expandItem(class1.node)
+    assert class1.node.childCount() == len(class1.children)
+
+    # Remove a function
+    items = {ref.name: ref.node for ref in root_ref.children}
+    symbol_info = json.load(open(CASES['text']['data'], 'r'))
+    editor.update_outline_info(
+        [symbol for symbol in symbol_info if symbol['name'] != 'a'])
+
+    # Only its item is removed
+    names = [ref.name for ref in root_ref.children]
+    assert 'a' not in names
+    assert root_ref.node.childCount() == len(names) == len(items) - 1
+    for ref in root_ref.children:
+        assert ref.node is items[ref.name]
+    assert class1.node.childCount() == len(class1.children)
+
+    # All items are created when expanding all of them
+    tree_widget.expandAll()
+    assert len(tree_widget.get_items()) == len(symbol_info) - 1
+
+
+def test_update_tree_shifted_lines(create_outlineexplorer):
+    """
+    Test that symbols keep their items and expanded state when only their
+    lines change, e.g. after adding a line above them.
+    """
+    outlineexplorer, _ = create_outlineexplorer('text')
+    tree_widget = outlineexplorer.treewidget
+    editor = tree_widget.current_editor
+    root_ref = tree_widget.get_top_level_items()[0].ref
+
+    class1 = [ref for ref in root_ref.children if ref.name == 'Class1'][0]
+    tree_widget.expandItem(class1.node)
+    class1_item = class1.node
+    child_items = [ref.node for ref in class1.children]
+    items = [ref.node for ref in root_ref.children]
+    line = class1.position[0]
+    assert len(child_items) > 0
+
+    # Add a line at the start of the file
+    symbol_info = json.load(open(CASES['text']['data'], 'r'))
+    for symbol in symbol_info:
+        symbol_range = symbol['location']['range']
+        symbol_range['start']['line'] += 1
+        symbol_range['end']['line'] += 1
+    editor.update_outline_info(symbol_info)
+
+    assert [ref.node for ref in root_ref.children] == items
+    assert class1.node is class1_item
+    assert class1_item.isExpanded()
+    assert class1_item.childCount() == len(child_items)
+    assert [ref.node for ref in class1.children] == child_items
+
+    # The line of its items is updated
+    assert class1.position[0] == line + 1
+    assert ' {}:'.format(line + 2) in class1_item.toolTip(0)
+
+
 @pytest.mark.skipif(sys.platform == 'darwin', reason="Fails on Mac")
 def test_go_to_cursor_position(create_outlineexplorer, qtbot):
     """
@@ -12,7 +12,6 @@
 import uuid
 
 # Third party imports
-from intervaltree import IntervalTree
 from pkg_resources import parse_version
 from qtpy import PYSIDE2
 from qtpy.compat import from_qvariant
@@ -81,78 +80,32 @@ def __init__(self, name, kind, position, path, node=None):
         self.status = False
         self.selected = False
         self.parent = None
+        # Whether the items of the children were created. That's done only
+        # when the node is expanded, to avoid creating items that are never
+        # shown.
+        self.loaded = False
 
     def delete(self):
-        for child in self.children:
-            child.parent = None
-
         self.children = []
-        self.node.takeChildren()
-
-        if self.parent is not None:
-            self.parent.remove_node(self)
-            self.parent = None
-
-        if self.node.parent is not None:
-            self.node.parent.remove_children(self.node)
+        self.parent = None
 
-    def add_node(self, node):
-        if node.position == self.position:
-            # The nodes should be at the same level
-            self.parent.add_node(node)
+    def set_child_indicator(self):
+        """Show the expand indicator of the node if it has children."""
+        if self.children and not self.loaded:
+            policy = QTreeWidgetItem.ShowIndicator
         else:
-            node.parent = self
-            node.path = self.path
-            this_node = self.node
-            children_ranges = [c.position[0] for c in self.children]
-            node_range = node.position[0]
-            new_index = bisect.bisect_left(children_ranges, node_range)
-            node.index = new_index
-            for child in self.children[new_index:]:
-                child.index += 1
-            this_node.append_children(new_index, node.node)
-            self.children.insert(new_index, node)
-            for idx, next_idx in zip(self.children, self.children[1:]):
-                assert idx.index < next_idx.index
-
-    def remove_node(self, node):
-        for child in self.children[node.index + 1:]:
-            child.index -= 1
-        self.children.pop(node.index)
-        for idx, next_idx in zip(self.children, self.children[1:]):
-            assert idx.index < next_idx.index
-
-    def clone_node(self, node):
-        self.id = node.id
-        self.index = node.index
-        self.path = node.path
-        self.children = node.children
-        self.status = node.status
-        self.selected = node.selected
-        self.node = node.node
-        self.parent = node.parent
-        self.node.update_info(self.name, self.kind, self.position[0] + 1,
-                              self.status, self.selected)
-        self.node.ref = self
-
-        for child in self.children:
-            child.parent = self
-
-        if self.parent is not None:
-            self.parent.replace_node(self.index, self)
-
-    def refresh(self):
-        self.node.update_info(self.name, self.kind, self.position[0] + 1,
-                              self.status, self.selected)
-
-    def replace_node(self, index, node):
-        self.children[index] = node
+            policy = QTreeWidgetItem.DontShowIndicatorWhenChildless
+        self.node.setChildIndicatorPolicy(policy)
 
     def create_node(self):
         self.node = SymbolItem(None, self, self.name, self.kind,
                                self.position[0] + 1, self.status,
                                self.selected)
 
+    def refresh(self):
+        self.node.update_info(self.name, self.kind, self.position[0] + 1,
+                              self.status, self.selected)
+
     def __repr__(self):
         return str(self)
 
@@ -167,14 +120,6 @@ class BaseTreeItem(QTreeWidgetItem):
     def clear(self):
         self.takeChildren()
 
-    def append_children(self, index, node):
-        self.insertChild(index, node)
-        node.parent = self
-
-    def remove_children(self, node):
-        self.removeChild(node)
-        node.parent = None
-
 
 class FileRootItem(BaseTreeItem):
     def __init__(self, path, ref, treewidget, is_python=True):
@@ -198,9 +143,7 @@ class SymbolItem(BaseTreeItem):
     """Generic symbol tree item."""
     def __init__(self, parent, ref, name, kind, position, status, selected):
         QTreeWidgetItem.__init__(self, parent, QTreeWidgetItem.Type)
-        self.parent = parent
         self.ref = ref
-        self.num_children = 0
         self.update_info(name, kind, position, status, selected)
 
     def update_info(self, name, kind, position, status, selected):
@@ -299,6 +242,7 @@ def __init__(self, parent):
         self.freeze = False  # Freezing widget to avoid any unwanted update
         self.editor_items = {}
         self.editor_tree_cache = {}
+        self.editor_symbol_keys = {}
         self.editor_ids = {}
         self.update_timers = {}
         self.editors_to_update = {}
@@ -396,28 +340,34 @@ def do_follow_cursor(self):
     def go_to_cursor_position(self):
         if self.current_editor is not None:
             editor_id = self.editor_ids[self.current_editor]
-            line = self.current_editor.get_cursor_line_number()
+            line = self.current_editor.get_cursor_line_number() - 1
             tree = self.editor_tree_cache[editor_id]
+            keys = self.editor_symbol_keys[editor_id]
             root = self.editor_items[editor_id]
-            overlap = tree[line - 1]
-            if len(overlap) == 0:
-                item = root.node
-                self.setCurrentItem(item)
-                self.scrollToItem(item)
-                self.expandItem(item)
-            else:
-                sorted_nodes = sorted(overlap)
-                # The last item of the sorted elements correspond to the
-                # current node if expanding, otherwise it is the first stopper
-                # found
-                idx = -1
-                self.switch_to_node(sorted_nodes, idx)
-
-    def switch_to_node(self, sorted_nodes, idx):
-        """Given a set of tree nodes, highlight the node on index `idx`."""
-        item_interval = sorted_nodes[idx]
-        item_ref = item_interval.data
-        item = item_ref.node
+
+            # Start from the last symbol that begins before the cursor and
+            # go up to the innermost one that contains it.
+            ref = root
+            index = bisect.bisect_left(keys, (line + 1,)) - 1
+            if index >= 0:
+                ref = tree[keys[index]]
+                while ref is not root and ref.position[1] < line:
+                    ref = ref.parent
+            self.switch_to_node(ref)
+
+    def switch_to_node(self, ref):
+        """Highlight the node of the symbol `ref`."""
+        # The items of its ancestors could have not been created yet
+        ancestors = []
+        parent = ref.parent
+        while parent is not None:
+            ancestors.append(parent)
+            parent = parent.parent
+        for ancestor in reversed(ancestors):
+            if not ancestor.loaded:
+                self.load_children(ancestor)
+
+        item = ref.node
         self.setCurrentItem(item)
         self.scrollToItem(item)
         self.expandItem(item)
@@ -492,6 +442,7 @@ def register_editor(self, editor):
         self.ordered_editor_ids.append(editor_id)
 
         this_root = SymbolStatus(editor.fname, None, None, editor.fname)
+        this_root.loaded = True
         self.editor_items[editor_id] = this_root
 
         root_item = FileRootItem(editor.fname, this_root,
@@ -502,8 +453,8 @@ def register_editor(self, editor):
         if not self.show_all_files:
             root_item.setHidden(True)
 
-        editor_tree = IntervalTree()
-        self.editor_tree_cache[editor_id] = editor_tree
+        self.editor_tree_cache[editor_id] = {}
+        self.editor_symbol_keys[editor_id] = []
 
         self.__sort_toplevel_items()
 
@@ -544,7 +495,7 @@ def update_all_editors(self, reset_info=False):
             self.set_editors_to_update(language, reset_info=reset_info)
             self.update_timers[language].start()
 
-    @Slot(list)
+    @Slot(object)
     def update_editor(self, items, editor=None):
         """
         Update the outline explorer for `editor` preserving the tree
@@ -570,31 +521,19 @@ def update_editor(self, items, editor=None):
             self.restore_expanded_state()
             self.do_follow_cursor()
 
-    def merge_interval(self, parent, node):
-        """Add node into an existing tree structure."""
-        match = False
-        start, end = node.position
-        while parent.parent is not None and not match:
-            parent_start, parent_end = parent.position
-            if parent_end <= start:
-                parent = parent.parent
-            else:
-                match = True
-
-        if node.parent is not None:
-            node.parent.remove_node(node)
-            node.parent = None
-            if node.node.parent is not None:
-                node.node.parent.remove_children(node.node)
-
-        parent.add_node(node)
-        node.refresh()
-        return node
-
     def update_tree(self, items, editor_id, language):
-        """Update tree with new items that come from the LSP."""
+        """
+        Update tree with new items that come from the LSP.
+
+        Symbols are identified by their name, kind and range, so that only
+        the items of symbols that were added, removed or moved to another
+        parent are updated. Symbols whose range changed (e.g. after adding
+        lines above them) are matched by their name, kind and parents, in
+        order, to keep their status and items.
+        """
         current_tree = self.editor_tree_cache[editor_id]
-        tree_info = []
+        keys = []
+        counts = {}
         for symbol in items:
             symbol_name = symbol['name']
             symbol_kind = symbol['kind']
@@ -611,74 +550,130 @@ def update_tree(self, items, editor_id, language):
             symbol_range = symbol['location']['range']
             symbol_start = symbol_range['start']['line']
             symbol_end = symbol_range['end']['line']
-            symbol_repr = SymbolStatus(symbol_name, symbol_kind,
-                                       (symbol_start, symbol_end), None)
-            tree_info.append((symbol_start, symbol_end + 1, symbol_repr))
-
-        tree = IntervalTree.from_tuples(tree_info)
-        changes = tree - current_tree
-        deleted = current_tree - tree
-
-        if len(changes) == 0 and len(deleted) == 0:
+            key = (symbol_start, symbol_end, symbol_name, symbol_kind)
+            # Tell apart symbols with the same name, kind and range
+            count = counts.get(key, 0)
+            counts[key] = count + 1
+            keys.append(key + (count,))
+        keys.sort()
+
+        if keys == self.editor_symbol_keys[editor_id]:
             self.sig_hide_spinner.emit()
             return False
 
-        adding_symbols = len(changes) > len(deleted)
-        deleted_iter = iter(sorted(deleted))
-        changes_iter = iter(sorted(changes))
-
-        deleted_entry = next(deleted_iter, None)
-        changed_entry = next(changes_iter, None)
-        non_merged = 0
-
-        while deleted_entry is not None and changed_entry is not None:
-            deleted_entry_i = deleted_entry.data
-            changed_entry_i = changed_entry.data
-
-            if deleted_entry_i.name == changed_entry_i.name:
-                # Copy symbol status
-                changed_entry_i.clone_node(deleted_entry_i)
-                deleted_entry = next(deleted_iter, None)
-                changed_entry = next(changes_iter, None)
-            else:
-                if adding_symbols:
-                    # New symbol added
-                    changed_entry_i.create_node()
-                    non_merged += 1
-                    changed_entry = next(changes_iter, None)
-                else:
-                    # Symbol removed
-                    deleted_entry_i.delete()
-                    non_merged += 1
-                    deleted_entry = next(deleted_iter, None)
-
-        if deleted_entry is not None:
-            while deleted_entry is not None:
-                # Symbol removed
-                deleted_entry_i = deleted_entry.data
-                deleted_entry_i.delete()
-                non_merged += 1
-                deleted_entry = next(deleted_iter, None)
-
+        # Nest symbols under the previous one that contains them
+        parents = []
+        stack = []
+        for index, key in enumerate(keys):
+            start, end = key[:2]
+            while stack and keys[stack[-1]][1] <= start:
+                stack.pop()
+            while stack and keys[stack[-1]][:2] == (start, end):
+                # Symbols with the same range are at the same level
+                stack.pop()
+            parents.append(stack[-1] if stack else None)
+            stack.append(index)
+
+        # Symbols that are not in the new ones, by their name, kind and the
+        # ones of their parents
         root = self.editor_items[editor_id]
-        # tree_merge
-        if changed_entry is not None:
-            while changed_entry is not None:
-                # New symbol added
-                changed_entry_i = changed_entry.data
-                changed_entry_i.create_node()
-                non_merged += 1
-                changed_entry = next(changes_iter, None)
-
-        tree_copy = IntervalTree(tree)
-        tree_copy.merge_overlaps(
-            data_reducer=self.merge_interval, data_initializer=root)
+        new_keys = set(keys)
+        identities = {root: ()}
+        removed = {}
+        for key in self.editor_symbol_keys[editor_id]:
+            symbol = current_tree[key]
+            identity = (identities[symbol.parent], symbol.name, symbol.kind)
+            identities[symbol] = identity
+            if key not in new_keys:
+                removed.setdefault(identity, []).append(symbol)
+        for symbols in removed.values():
+            symbols.reverse()
+
+        previous_children = {root: root.children}
+        for symbol in current_tree.values():
+            previous_children[symbol] = symbol.children
+            symbol.children = []
+        root.children = []
+
+        tree = {}
+        symbols = []
+        new_identities = []
+        for key, parent_index in zip(keys, parents):
+            start, end, name, kind, __ = key
+            if parent_index is None:
+                identity = ((), name, kind)
+            else:
+                identity = (new_identities[parent_index], name, kind)
+            new_identities.append(identity)
+
+            symbol = current_tree.get(key)
+            if symbol is None and removed.get(identity):
+                # The same symbol in another range
+                symbol = removed[identity].pop()
+                symbol.position = (start, end)
+                if symbol.node is not None:
+                    symbol.refresh()
+            elif symbol is None:
+                symbol = SymbolStatus(name, kind, (start, end), root.path)
+            tree[key] = symbol
+            symbols.append(symbol)
+
+        for removed_symbols in removed.values():
+            for symbol in removed_symbols:
+                symbol.delete()
+
+        for symbol, parent_index in zip(symbols, parents):
+            if parent_index is None:
+                parent = root
+            else:
+                parent = symbols[parent_index]
+            symbol.parent = parent
+            symbol.index = len(parent.children)
+            parent.children.append(symbol)
+
+        changed = [
+            symbol for symbol, children in previous_children.items()
+            if symbol.children != children
+        ]
+
+        # Take out the items of removed symbols and of the ones that changed
+        # their parent, before adding them to their new one.
+        for symbol in changed:
+            if symbol.node is not None and symbol.loaded:
+                item = symbol.node
+                for index in reversed(range(item.childCount())):
+                    if item.child(index).ref.parent is not symbol:
+                        item.takeChild(index)
+
+        for symbol in changed:
+            if symbol is not root and symbol.parent is None:
+                continue
+            if symbol.loaded:
+                self.load_children(symbol)
+            elif symbol.node is not None:
+                symbol.set_child_indicator()
 
         self.editor_tree_cache[editor_id] = tree
+        self.editor_symbol_keys[editor_id] = keys
         self.sig_tree_updated.emit()
         self.sig_hide_spinner.emit()
         return True
 
+    def load_children(self, symbol):
+        """Create the items of the children of `symbol` that are missing."""
+        item = symbol.node
+        symbol.loaded = True
+        for index, child in enumerate(symbol.children):
+            if child.node is None:
+                child.create_node()
+            if child.node.parent() is not item:
+                item.insertChild(index, child.node)
+                # The state of items is lost when taken out of the tree
+                child.set_child_indicator()
+                child.node.setExpanded(child.status)
+                child.node.setSelected(child.selected)
+        symbol.set_child_indicator()
+
     def remove_editor(self, editor):
         if editor in self.editor_ids:
             if self.current_editor is editor:
@@ -689,6 +684,7 @@ def remove_editor(self, editor):
             if editor_id not in list(self.editor_ids.values()):
                 root_item = self.editor_items.pop(editor_id)
                 self.editor_tree_cache.pop(editor_id)
+                self.editor_symbol_keys.pop(editor_id)
                 try:
                     self.takeTopLevelItem(
                         self.indexOfTopLevelItem(root_item.node))
@@ -772,6 +768,17 @@ def restore(self):
             editor_id = self.editor_ids[self.current_editor]
             self.root_item_selected(self.editor_items[editor_id].node)
 
+    @Slot()
+    def expandAll(self):
+        """Reimplemented Qt method to create all items before."""
+        symbols = list(self.editor_items.values())
+        while symbols:
+            symbol = symbols.pop()
+            if not symbol.loaded:
+                self.load_children(symbol)
+            symbols.extend(symbol.children)
+        super().expandAll()
+
     def get_root_item(self, item):
         """Return the root item of the specified item."""
         root_item = item
@@ -844,6 +851,8 @@ def tree_item_collapsed(self, item):
     def tree_item_expanded(self, item):
         ref = item.ref
         ref.status = True
+        if not ref.loaded:
+            self.load_children(ref)
 
     def set_editors_to_update(self, language, reset_info=False):
         """Set editors to update per language."""
@@ -28,6 +28,7 @@
 # Local library imports
 from spyder.api.translations import get_translation
 from spyder.api.widgets.mixins import SpyderWidgetMixin
+from spyder.plugins.plots.widgets.figurestore import FigureStore
 from spyder.utils.misc import getcwd_or_home
 from spyder.utils.palette import QStylePalette
 
@@ -152,9 +153,13 @@ def __init__(self, parent=None, background_color=None):
         self.mute_inline_plotting = None
         self.zoom_disp_value = None
 
+        # Setup the store of the figures.
+        self.figure_store = FigureStore(parent=self)
+
         # Setup the figure viewer.
         self.figviewer = FigureViewer(parent=self,
-                                      background_color=self.background_color)
+                                      background_color=self.background_color,
+                                      figure_store=self.figure_store)
         self.figviewer.sig_context_menu_requested.connect(
             self.sig_figure_menu_requested)
         self.figviewer.sig_figure_loaded.connect(self.sig_figure_loaded)
@@ -166,6 +171,7 @@ def __init__(self, parent=None, background_color=None):
             self.figviewer,
             parent=self,
             background_color=self.background_color,
+            figure_store=self.figure_store,
         )
         self.thumbnails_sb.sig_context_menu_requested.connect(
             self.sig_thumbnail_menu_requested)
@@ -206,6 +212,8 @@ def setup(self, options):
                 self.show_fig_outline_in_viewer(value)
             elif option == 'save_dir':
                 self.thumbnails_sb.save_dir = value
+            elif option == 'memory_budget':
+                self.figure_store.set_memory_budget(value)
 
     def update_splitter_widths(self, base_width):
         """
@@ -289,7 +297,8 @@ def close_all_figures(self):
 
     def copy_figure(self):
         """Copy figure from figviewer to clipboard."""
-        if self.figviewer and self.figviewer.figcanvas.fig:
+        if (self.figviewer and
+                self.figviewer.figcanvas.figure_key is not None):
             self.figviewer.figcanvas.copy_figure()
 
 
@@ -322,7 +331,7 @@ class FigureViewer(QScrollArea, SpyderWidgetMixin):
     sig_figure_loaded = Signal()
     """This signal is emitted when a new figure is loaded."""
 
-    def __init__(self, parent=None, background_color=None):
+    def __init__(self, parent=None, background_color=None, figure_store=None):
         if PYQT5:
             super().__init__(parent, class_parent=parent)
         else:
@@ -336,6 +345,7 @@ def __init__(self, parent=None, background_color=None):
         self.setFrameStyle(0)
 
         self.background_color = background_color
+        self.figure_store = figure_store
         self._scalefactor = 0
         self._scalestep = 1.2
         self._sfmax = 10
@@ -371,7 +381,8 @@ def auto_fit_plotting(self, value):
     def setup_figcanvas(self):
         """Setup the FigureCanvas."""
         self.figcanvas = FigureCanvas(parent=self,
-                                      background_color=self.background_color)
+                                      background_color=self.background_color,
+                                      figure_store=self.figure_store)
         self.figcanvas.installEventFilter(self)
         self.figcanvas.customContextMenuRequested.connect(
             self.show_context_menu)
@@ -379,14 +390,14 @@ def setup_figcanvas(self):
 
     def show_context_menu(self, qpoint):
         """Only emit context menu signal if there is a figure."""
-        if self.figcanvas and self.figcanvas.fig is not None:
+        if self.figcanvas and self.figcanvas.figure_key is not None:
             # Convert to global
             point = self.figcanvas.mapToGlobal(qpoint)
             self.sig_context_menu_requested.emit(point)
 
-    def load_figure(self, fig, fmt):
-        """Set a new figure in the figure canvas."""
-        self.figcanvas.load_figure(fig, fmt)
+    def load_figure(self, key):
+        """Set the figure saved with `key` in the figure canvas."""
+        self.figcanvas.load_figure(key)
         self.sig_figure_loaded.emit()
         self.scale_image()
         self.figcanvas.repaint()
@@ -487,7 +498,7 @@ def scale_image(self):
                     new_width = int(height / fheight * fwidth)
             except ZeroDivisionError:
                 icon = self.create_icon('broken_image')
-                self.figcanvas._qpix_orig = icon.pixmap(fwidth, fheight)
+                self.figcanvas._image = icon.pixmap(fwidth, fheight).toImage()
                 self.figcanvas.setToolTip(
                     _('The image is broken, please try to generate it again'))
                 new_width = fwidth
@@ -561,10 +572,14 @@ class ThumbnailScrollBar(QFrame):
         The QPoint in global coordinates where the menu was requested.
     """
 
-    def __init__(self, figure_viewer, parent=None, background_color=None):
+    def __init__(self, figure_viewer, parent=None, background_color=None,
+                 figure_store=None):
         super().__init__(parent)
         self._thumbnails = []
 
+        if figure_store is None:
+            figure_store = figure_viewer.figcanvas.figure_store
+        self.figure_store = figure_store
         self.background_color = background_color
         self.save_dir = getcwd_or_home()
         self.current_thumbnail = None
@@ -761,8 +776,9 @@ def add_thumbnail(self, fig, fmt):
         Add a new thumbnail to that thumbnail scrollbar.
         """
         thumbnail = FigureThumbnail(
-            parent=self, background_color=self.background_color)
-        thumbnail.canvas.load_figure(fig, fmt)
+            parent=self, background_color=self.background_color,
+            figure_store=self.figure_store)
+        thumbnail.canvas.load_figure(self.figure_store.add_figure(fig, fmt))
         thumbnail.sig_canvas_clicked.connect(self.set_current_thumbnail)
         thumbnail.sig_remove_figure_requested.connect(self.remove_thumbnail)
         thumbnail.sig_save_figure_requested.connect(self.save_figure_as)
@@ -798,6 +814,7 @@ def remove_all_thumbnails(self):
         self._thumbnails = []
         self.current_thumbnail = None
         self.figure_viewer.figcanvas.clear_canvas()
+        self.figure_store.clear()
 
     def remove_thumbnail(self, thumbnail):
         """Remove thumbnail."""
@@ -829,6 +846,7 @@ def remove_thumbnail(self, thumbnail):
         self.layout().removeWidget(thumbnail)
         thumbnail.hide()
         thumbnail.close()
+        self.figure_store.remove_figure(thumbnail.canvas.figure_key)
 
         # See: spyder-ide/spyder#12459
         QTimer.singleShot(
@@ -859,8 +877,7 @@ def set_current_thumbnail(self, thumbnail):
         if self.current_thumbnail is not None:
             self.current_thumbnail.highlight_canvas(False)
         self.current_thumbnail = thumbnail
-        self.figure_viewer.load_figure(
-            thumbnail.canvas.fig, thumbnail.canvas.fmt)
+        self.figure_viewer.load_figure(thumbnail.canvas.figure_key)
         self.current_thumbnail.highlight_canvas(True)
 
     def go_previous_thumbnail(self):
@@ -970,10 +987,11 @@ class FigureThumbnail(QWidget):
         The QPoint in global coordinates where the menu was requested.
     """
 
-    def __init__(self, parent=None, background_color=None):
+    def __init__(self, parent=None, background_color=None, figure_store=None):
         super().__init__(parent)
         self.canvas = FigureCanvas(parent=self,
-                                   background_color=background_color)
+                                   background_color=background_color,
+                                   figure_store=figure_store)
         self.canvas.sig_context_menu_requested.connect(
             self.sig_context_menu_requested)
         self.canvas.installEventFilter(self)
@@ -1043,7 +1061,7 @@ class FigureCanvas(QFrame):
         The QPoint in global coordinates where the menu was requested.
     """
 
-    def __init__(self, parent=None, background_color=None):
+    def __init__(self, parent=None, background_color=None, figure_store=None):
         super().__init__(parent)
         self.setLineWidth(2)
         self.setMidLineWidth(1)
@@ -1051,15 +1069,29 @@ def __init__(self, parent=None, background_color=None):
         self.setStyleSheet(
             "#figcanvas {background-color:" + str(background_color) + "}")
 
-        self.fig = None
+        if figure_store is None:
+            figure_store = FigureStore(parent=self)
+        self.figure_store = figure_store
+        self.figure_store.sig_image_rendered.connect(self._image_rendered)
+
+        self.figure_key = None
         self.fmt = None
         self.fwidth, self.fheight = 200, 200
         self._blink_flag = False
+        self._image = None
+        self._pending_size = None
 
         self.setContextMenuPolicy(Qt.CustomContextMenu)
         self.customContextMenuRequested.connect(
             self.sig_context_menu_requested)
 
+    @property
+    def fig(self):
+        """The data of the figure, or None if there's no figure."""
+        if self.figure_key is None:
+            return None
+        return self.figure_store.get_figure(self.figure_key)
+
     @Slot()
     def copy_figure(self):
         """Copy figure to clipboard."""
@@ -1076,7 +1108,7 @@ def copy_figure(self):
 
     def blink_figure(self):
         """Blink figure once."""
-        if self.fig:
+        if self.figure_key is not None:
             self._blink_flag = not self._blink_flag
             self.repaint()
             if self._blink_flag:
@@ -1085,28 +1117,40 @@ def blink_figure(self):
 
     def clear_canvas(self):
         """Clear the figure that was painted on the widget."""
-        self.fig = None
+        self._cancel_render()
+        self.figure_key = None
         self.fmt = None
-        self._qpix_scaled = None
+        self._image = None
         self.repaint()
 
-    def load_figure(self, fig, fmt):
-        """
-        Load the figure from a png, jpg, or svg image, convert it in
-        a QPixmap, and force a repaint of the widget.
+    def load_figure(self, key):
         """
-        self.fig = fig
-        self.fmt = fmt
+        Load the figure saved with `key` in the figure store and force a
+        repaint of the widget.
 
-        if fmt in ['image/png', 'image/jpeg']:
-            self._qpix_orig = QPixmap()
-            self._qpix_orig.loadFromData(fig, fmt.upper())
-        elif fmt == 'image/svg+xml':
-            self._qpix_orig = QPixmap(svg_to_image(fig))
-
-        self._qpix_scaled = self._qpix_orig
-        self.fwidth = self._qpix_orig.width()
-        self.fheight = self._qpix_orig.height()
+        The figure is rendered at the size of the widget when it's painted.
+        """
+        self._cancel_render()
+        self.figure_key = key
+        self.fmt = self.figure_store.get_format(key)
+        self._image = None
+
+        size = self.figure_store.get_size(key)
+        self.fwidth = size.width()
+        self.fheight = size.height()
+
+    def _cancel_render(self):
+        """Cancel the rendering of the image requested for this widget."""
+        if self._pending_size is not None:
+            self.figure_store.cancel_render(
+                self.figure_key, self._pending_size)
+            self._pending_size = None
+
+    def _image_rendered(self, key, size):
+        """Repaint the widget when its image has been rendered."""
+        if key == self.figure_key and size == self._pending_size:
+            self._pending_size = None
+            self.update()
 
     def paintEvent(self, event):
         """Qt method override to paint a custom image on the Widget."""
@@ -1117,22 +1161,25 @@ def paintEvent(self, event):
                      self.size().width() - 2 * fw,
                      self.size().height() - 2 * fw)
 
-        if self.fig is None or self._blink_flag:
+        if self.figure_key is None or self._blink_flag:
             return
 
-        # Prepare the scaled qpixmap to paint on the widget.
-        if (self._qpix_scaled is None or
-                self._qpix_scaled.size().width() != rect.width()):
-            if self.fmt in ['image/png', 'image/jpeg']:
-                self._qpix_scaled = self._qpix_orig.scaledToWidth(
-                    rect.width(), mode=Qt.SmoothTransformation)
-            elif self.fmt == 'image/svg+xml':
-                self._qpix_scaled = QPixmap(svg_to_image(
-                    self.fig, rect.size()))
-
-        if self._qpix_scaled is not None:
+        # Get the image at the size of the widget. While it's rendered, the
+        # previous one is scaled on the fly.
+        if (self._image is None or
+                self._image.size() != rect.size()):
+            if self._pending_size != rect.size():
+                self._cancel_render()
+                image = self.figure_store.get_image(
+                    self.figure_key, rect.size())
+                if image is not None:
+                    self._image = image
+                elif self.fmt == 'image/svg+xml':
+                    self._pending_size = rect.size()
+
+        if self._image is not None:
             # Paint the image on the widget.
             qp = QPainter()
             qp.begin(self)
-            qp.drawPixmap(rect, self._qpix_scaled)
+            qp.drawImage(rect, self._image)
             qp.end()
@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Figure store
+
+Keeps the figures of a figure browser and the images rendered from them
+within a memory budget.
+"""
+
+# Standard library imports
+from collections import OrderedDict
+import logging
+import os
+import os.path as osp
+import tempfile
+
+# Third library imports
+from qtconsole.svg import svg_to_image
+from qtpy.QtCore import QBuffer, QByteArray, QObject, QSize, Qt, Signal
+from qtpy.QtGui import QImage, QImageReader
+from qtpy.QtSvg import QSvgRenderer
+
+# Local imports
+from spyder.utils.workers import WorkerManager
+
+
+logger = logging.getLogger(__name__)
+
+# Default memory budget of a store, in MB
+MEMORY_BUDGET = 512
+
+
+def get_image_size(image):
+    """Return the memory used by `image`, in bytes."""
+    return image.bytesPerLine() * image.height()
+
+
+class FigureStore(QObject):
+    """
+    Store of the figures of a figure browser.
+
+    The data of figures and the images rendered from them at the sizes they
+    are displayed are kept in memory up to a budget. Past it, the data of the
+    least recently used figures is moved to files in a temporary directory
+    and then the least recently used images are discarded.
+
+    SVG figures are rendered in a thread, so `get_image` returns None for
+    them until `sig_image_rendered` is emitted.
+    """
+
+    sig_image_rendered = Signal(int, QSize)
+    """
+    This signal is emitted when an image of a figure has been rendered.
+
+    Parameters
+    ----------
+    key: int
+        The key of the figure.
+    size: QSize
+        The size of the image.
+    """
+
+    def __init__(self, parent=None, memory_budget=MEMORY_BUDGET):
+        super().__init__(parent)
+        self.memory_budget = memory_budget
+
+        self._last_key = 0
+        self._formats = {}
+        self._sizes = {}
+        self._broken = set()
+
+        # Data of the figures in memory and paths of the ones saved to disk.
+        self._data = OrderedDict()
+        self._paths = {}
+        self._tempdir = None
+
+        # Images by (key, width, height)
+        self._images = OrderedDict()
+        self._memory = 0
+
+        # Number of requests of the SVG images being rendered, by
+        # (key, width, height)
+        self._render_requests = {}
+        self._worker_manager = WorkerManager(max_threads=4)
+
+    # ---- Figures
+    def add_figure(self, fig, fmt):
+        """
+        Add a figure to the store.
+
+        Parameters
+        ----------
+        fig: bytes or str
+            The data of the figure.
+        fmt: str
+            The format of the figure. One of "image/png", "image/jpeg" and
+            "image/svg+xml".
+
+        Returns
+        -------
+        int
+            The key of the figure in the store.
+        """
+        if isinstance(fig, str):
+            fig = fig.encode('utf-8')
+
+        self._last_key += 1
+        key = self._last_key
+        self._formats[key] = fmt
+        self._sizes[key] = self._read_figure_size(fig, fmt)
+        self._data[key] = fig
+        self._memory += len(fig)
+        self._free_memory()
+        return key
+
+    def get_figure(self, key):
+        """Return the data of a figure, or None if it's not in the store."""
+        if key in self._data:
+            self._data.move_to_end(key)
+            return self._data[key]
+
+        path = self._paths.get(key)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                fig = f.read()
+        except OSError:
+            logger.debug("Failed to read figure %s", path, exc_info=True)
+            return None
+
+        self._data[key] = fig
+        self._memory += len(fig)
+        self._free_memory()
+        return fig
+
+    def get_format(self, key):
+        """Return the format of a figure."""
+        return self._formats.get(key)
+
+    def get_size(self, key):
+        """Return the original size of a figure, in pixels."""
+        return self._sizes.get(key, QSize(0, 0))
+
+    def remove_figure(self, key):
+        """Remove a figure and its images from the store."""
+        self._formats.pop(key, None)
+        self._sizes.pop(key, None)
+        self._broken.discard(key)
+
+        fig = self._data.pop(key, None)
+        if fig is not None:
+            self._memory -= len(fig)
+
+        path = self._paths.pop(key, None)
+        if path is not None:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+        for image_key in [k for k in self._images if k[0] == key]:
+            self._memory -= get_image_size(self._images.pop(image_key))
+
+    def clear(self):
+        """Remove all figures from the store."""
+        self._formats.clear()
+        self._sizes.clear()
+        self._broken.clear()
+        self._data.clear()
+        self._paths.clear()
+        self._images.clear()
+        self._render_requests.clear()
+        self._worker_manager.terminate_all()
+        self._memory = 0
+        if self._tempdir is not None:
+            self._tempdir.cleanup()
+            self._tempdir = None
+
+    def set_memory_budget(self, memory_budget):
+        """Set the memory budget of the store, in MB."""
+        self.memory_budget = memory_budget
+        self._free_memory()
+
+    # ---- Images
+    def get_image(self, key, size):
+        """
+        Return an image of a figure of the given size.
+
+        Returns None if the figure can't be rendered, or if it's being
+        rendered in a thread. `sig_image_rendered` is emitted when that's
+        finished.
+        """
+        if key not in self._formats or key in self._broken:
+            return None
+        if size.width() <= 0 or size.height() <= 0:
+            return None
+
+        image_key = (key, size.width(), size.height())
+        image = self._images.get(image_key)
+        if image is not None:
+            self._images.move_to_end(image_key)
+            return image
+
+        if self._formats[key] == 'image/svg+xml':
+            self._start_render(image_key)
+            return None
+
+        # Scale from the image at the original size if it was kept
+        original_size = self._sizes[key]
+        image = self._images.get(
+            (key, original_size.width(), original_size.height()))
+        if image is None:
+            fig = self.get_figure(key)
+            image = QImage.fromData(fig) if fig is not None else QImage()
+            if image.isNull():
+                self._broken.add(key)
+                return None
+
+        if image.size() != size:
+            image = image.scaled(
+                size, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        self._add_image(image_key, image)
+        return image
+
+    def cancel_render(self, key, size):
+        """Cancel a request of an image that is being rendered."""
+        image_key = (key, size.width(), size.height())
+        if self._render_requests.get(image_key, 0) > 0:
+            self._render_requests[image_key] -= 1
+
+    def _start_render(self, image_key):
+        """Render an SVG image in a thread, unless it's already rendering."""
+        if image_key in self._render_requests:
+            self._render_requests[image_key] += 1
+            return
+        self._render_requests[image_key] = 1
+
+        key, width, height = image_key
+        fig = self.get_figure(key)
+        if fig is None:
+            self._render_requests.pop(image_key)
+            return
+
+        worker = self._worker_manager.create_python_worker(
+            self._render_svg, image_key, fig)
+        worker.sig_finished.connect(self._render_finished)
+        worker.start()
+
+    def _render_svg(self, image_key, fig):
+        """Render an SVG image, unless all its requests were cancelled."""
+        if not self._render_requests.get(image_key):
+            return image_key, None
+
+        key, width, height = image_key
+        try:
+            image = svg_to_image(fig, QSize(width, height))
+        except Exception:
+            logger.debug("Failed to render figure %s", key, exc_info=True)
+            image = QImage()
+        return image_key, image
+
+    def _render_finished(self, worker, output, error):
+        """Save an image rendered in a thread."""
+        image_key, image = output
+        key = image_key[0]
+        self._render_requests.pop(image_key, None)
+        if key not in self._formats or image is None:
+            # The figure was removed or the image is no longer needed
+            return
+
+        if image.isNull():
+            self._broken.add(key)
+        else:
+            self._add_image(image_key, image)
+            self.sig_image_rendered.emit(key, image.size())
+
+    def _add_image(self, image_key, image):
+        self._images[image_key] = image
+        self._memory += get_image_size(image)
+        self._free_memory()
+
+    # ---- Memory
+    def _free_memory(self):
+        """
+        Save figures to disk and discard images until the memory used is
+        within the budget.
+        """
+        max_memory = self.memory_budget * 1024 ** 2
+
+        while self._memory > max_memory and self._data:
+            key, fig = self._data.popitem(last=False)
+            if key not in self._paths:
+                path = self._save_figure(key, fig)
+                if path is None:
+                    # Keep figures in memory if they can't be saved
+                    self._data[key] = fig
+                    break
+                self._paths[key] = path
+            self._memory -= len(fig)
+
+        # The last image is the one that was just requested
+        while self._memory > max_memory and len(self._images) > 1:
+            __, image = self._images.popitem(last=False)
+            self._memory -= get_image_size(image)
+
+    def _save_figure(self, key, fig):
+        """Save a figure to the temporary directory and return its path."""
+        try:
+            if self._tempdir is None:
+                self._tempdir = tempfile.TemporaryDirectory(
+                    prefix='spyder-plots-')
+            path = osp.join(self._tempdir.name, '{}.fig'.format(key))
+            with open(path, 'wb') as f:
+                f.write(fig)
+        except OSError:
+            logger.debug("Failed to save figure to disk", exc_info=True)
+            return None
+        return path
+
+    def _read_figure_size(self, fig, fmt):
+        """Read the size of a figure without rendering it."""
+        if fmt == 'image/svg+xml':
+            size = QSvgRenderer(QByteArray(fig)).defaultSize()
+        else:
+            buffer = QBuffer()
+            buffer.setData(fig)
+            size = QImageReader(buffer).size()
+        return QSize(max(size.width(), 0), max(size.height(), 0))
@@ -18,6 +18,7 @@
 from spyder.api.widgets.main_widget import PluginMainWidgetMenus
 from spyder.api.shellconnect.main_widget import ShellConnectMainWidget
 from spyder.plugins.plots.widgets.figurebrowser import FigureBrowser
+from spyder.plugins.plots.widgets.figurestore import MEMORY_BUDGET
 from spyder.utils.misc import getcwd_or_home
 from spyder.utils.palette import QStylePalette
 
@@ -103,7 +104,7 @@ def get_title(self):
     def get_focus_widget(self):
         widget = self.current_widget()
         if widget and widget.thumbnails_sb.current_thumbnail is not None:
-            if widget.figviewer.figcanvas.fig:
+            if widget.figviewer.figcanvas.figure_key is not None:
                 widget = widget.thumbnails_sb.scrollarea
 
         return widget
@@ -237,7 +238,7 @@ def update_actions(self):
         if widget:
             figviewer = widget.figviewer
             thumbnails_sb = widget.thumbnails_sb
-            value = figviewer.figcanvas.fig is not None
+            value = figviewer.figcanvas.figure_key is not None
 
         for __, action in self.get_actions().items():
             try:
@@ -276,7 +277,8 @@ def update_actions(self):
             self.zoom_disp.setEnabled(value)
 
     @on_conf_change(option=['auto_fit_plotting', 'mute_inline_plotting',
-                            'show_plot_outline', 'save_dir'])
+                            'show_plot_outline', 'save_dir',
+                            'memory_budget'])
     def on_section_conf_change(self, option, value):
         for index in range(self.count()):
             widget = self._stack.widget(index)
@@ -306,13 +308,15 @@ def create_new_widget(self, shellwidget):
         return fig_browser
 
     def close_widget(self, fig_browser):
+        fig_browser.figure_store.clear()
         fig_browser.close()
 
     def switch_widget(self, fig_browser, old_fig_browser):
         option_keys = [('auto_fit_plotting', True),
                        ('mute_inline_plotting', True),
                        ('show_plot_outline', True),
-                       ('save_dir', getcwd_or_home())]
+                       ('save_dir', getcwd_or_home()),
+                       ('memory_budget', MEMORY_BUDGET)]
 
         conf_values = {k: self.get_conf(k, d) for k, d in option_keys}
         fig_browser.setup(conf_values)
@@ -373,7 +377,8 @@ def copy_image(self):
         context menu in the thumbnails scrollbar into the clipboard.
         """
         widget = self.current_widget()
-        if widget and widget.figviewer and widget.figviewer.figcanvas.fig:
+        if (widget and widget.figviewer and
+                widget.figviewer.figcanvas.figure_key is not None):
             if self._right_clicked_thumbnail is None:
                 widget.figviewer.figcanvas.copy_figure()
             else:
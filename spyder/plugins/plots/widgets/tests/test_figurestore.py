@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright © Spyder Project Contributors
+#
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+# -----------------------------------------------------------------------------
+
+"""
+Tests for the store of figures of the Plots plugin.
+"""
+
+# Standard library imports
+import os.path as osp
+
+# Third party imports
+import pytest
+from qtpy.QtCore import QBuffer, QByteArray, QIODevice, QSize
+from qtpy.QtGui import QColor, QImage
+
+# Local imports
+from spyder.plugins.plots.widgets.figurestore import FigureStore
+
+
+SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="300" height="200">'
+    '<rect x="10" y="10" width="100" height="100" fill="red"/></svg>'
+)
+
+
+# =============================================================================
+# ---- Fixtures
+# =============================================================================
+@pytest.fixture
+def figure_store(qtbot):
+    """A figure store fixture."""
+    figure_store = FigureStore()
+    yield figure_store
+    figure_store.clear()
+
+
+def create_png(width=300, height=200):
+    """Return the data of a PNG image."""
+    image = QImage(width, height, QImage.Format_ARGB32)
+    image.fill(QColor('red'))
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, 'PNG')
+    return bytes(data)
+
+
+# =============================================================================
+# ---- Tests
+# =============================================================================
+def test_png_images(figure_store):
+    """Test that images of PNG figures are rendered and cached."""
+    fig = create_png()
+    key = figure_store.add_figure(fig, 'image/png')
+    assert figure_store.get_figure(key) == fig
+    assert figure_store.get_format(key) == 'image/png'
+    assert figure_store.get_size(key) == QSize(300, 200)
+
+    image = figure_store.get_image(key, QSize(150, 100))
+    assert image.size() == QSize(150, 100)
+    assert figure_store.get_image(key, QSize(150, 100)) is image
+
+    # Images of broken figures are not rendered
+    key = figure_store.add_figure(b'not a png', 'image/png')
+    assert figure_store.get_size(key) == QSize(0, 0)
+    assert figure_store.get_image(key, QSize(150, 100)) is None
+
+
+def test_svg_images(figure_store, qtbot):
+    """Test that images of SVG figures are rendered in a thread."""
+    key = figure_store.add_figure(SVG, 'image/svg+xml')
+    assert figure_store.get_figure(key) == SVG.encode('utf-8')
+    assert figure_store.get_size(key) == QSize(300, 200)
+
+    with qtbot.waitSignal(figure_store.sig_image_rendered) as blocker:
+        assert figure_store.get_image(key, QSize(150, 100)) is None
+    assert blocker.args == [key, QSize(150, 100)]
+
+    image = figure_store.get_image(key, QSize(150, 100))
+    assert image.size() == QSize(150, 100)
+
+
+def test_memory_budget(figure_store):
+    """
+    Test that figures are saved to disk and images discarded to stay within
+    the memory budget.
+    """
+    figs = [create_png(300 + i, 200) for i in range(3)]
+    keys = [figure_store.add_figure(fig, 'image/png') for fig in figs]
+    images = [figure_store.get_image(key, QSize(150, 100)) for key in keys]
+    assert all(image is not None for image in images)
+    assert figure_store._paths == {}
+
+    figure_store.set_memory_budget(0)
+
+    # All figures are saved to disk and only the last image is kept
+    paths = [figure_store._paths[key] for key in keys]
+    assert all(osp.isfile(path) for path in paths)
+    assert list(figure_store._images) == [(keys[-1], 150, 100)]
+
+    # Figures are read back from disk
+    for key, fig in zip(keys, figs):
+        assert figure_store.get_figure(key) == fig
+    assert figure_store.get_image(keys[0], QSize(150, 100)) is not None
+
+    # Files are removed with their figures
+    figure_store.remove_figure(keys[0])
+    assert not osp.isfile(paths[0])
+    assert figure_store.get_figure(keys[0]) is None
+
+    figure_store.clear()
+    assert not any(osp.isfile(path) for path in paths)
@@ -125,6 +125,18 @@ class Projects(SpyderDockablePlugin):
     This signal is emitted when the Python path has changed.
     """
 
+    sig_project_file_changed = Signal(str)
+    """
+    This signal is emitted when a file or directory of the active project is
+    created, modified, moved or deleted.
+
+    Parameters
+    ----------
+    path: str
+        Path of the changed file or directory. When moving, this signal is
+        emitted for both the source and destination paths.
+    """
+
     def __init__(self, parent=None, configuration=None):
         """Initialization."""
         super().__init__(parent, configuration)
@@ -135,6 +147,7 @@ def __init__(self, parent=None, configuration=None):
         self.completions_available = False
         self.get_widget().setup_project(self.get_active_project_path())
         self.watcher.connect_signals(self)
+        self._connect_file_changed_signals()
         self._project_types = OrderedDict()
 
     # ---- SpyderDockablePlugin API
@@ -1020,3 +1033,28 @@ def _run_file_in_ipyconsole(self, fname):
             fname, osp.dirname(fname), '', False, False, False, True,
             False
         )
+
+    def _connect_file_changed_signals(self):
+        """Forward watcher notifications to sig_project_file_changed."""
+        event_handler = self.watcher.event_handler
+        event_handler.sig_file_created.connect(self._on_project_file_changed)
+        event_handler.sig_file_deleted.connect(self._on_project_file_changed)
+        event_handler.sig_file_modified.connect(
+            self._on_project_file_modified)
+        event_handler.sig_file_moved.connect(self._on_project_file_moved)
+
+    @Slot(str, bool)
+    def _on_project_file_changed(self, path, is_dir):
+        self.sig_project_file_changed.emit(path)
+
+    @Slot(str, bool)
+    def _on_project_file_modified(self, path, is_dir):
+        # Directories are reported as modified every time one of their files
+        # changes, so only file modifications are of interest.
+        if not is_dir:
+            self.sig_project_file_changed.emit(path)
+
+    @Slot(str, str, bool)
+    def _on_project_file_moved(self, src_path, dest_path, is_dir):
+        self.sig_project_file_changed.emit(src_path)
+        self.sig_project_file_changed.emit(dest_path)
@@ -12,6 +12,7 @@
 # pylint: disable=R0201
 
 # Standard library imports
+from collections import deque
 import os
 import os.path as osp
 import pickle
@@ -22,8 +23,8 @@
 # Third party imports
 import pylint
 from qtpy.compat import getopenfilename
-from qtpy.QtCore import (QByteArray, QProcess, QProcessEnvironment, Signal,
-                         Slot)
+from qtpy.QtCore import (QByteArray, QProcess, QProcessEnvironment, QTimer,
+                         Signal, Slot)
 from qtpy.QtWidgets import (QInputDialog, QLabel, QMessageBox, QTreeWidgetItem,
                             QVBoxLayout)
 
@@ -32,13 +33,16 @@
 from spyder.api.translations import get_translation
 from spyder.api.widgets.main_widget import PluginMainWidget
 from spyder.config.base import get_conf_path, running_in_mac_app
-from spyder.plugins.pylint.utils import get_pylintrc_path
+from spyder.plugins.pylint.utils import (
+    get_file_digest, get_pylintrc_path, get_python_files_digests,
+    ResultsCache)
 from spyder.plugins.variableexplorer.widgets.texteditor import TextEditor
 from spyder.utils.icon_manager import ima
 from spyder.utils.misc import getcwd_or_home
 from spyder.utils.palette import QStylePalette, SpyderPalette
 from spyder.widgets.comboboxes import (PythonModulesComboBox,
                                        is_module_or_package)
+from spyder.utils.workers import WorkerManager
 from spyder.widgets.onecolumntree import OneColumnTree, OneColumnTreeActions
 
 # Localization
@@ -54,6 +58,25 @@
 WARNING_COLOR = SpyderPalette.COLOR_WARN_1
 SUCCESS_COLOR = SpyderPalette.COLOR_SUCCESS_1
 
+# Maximum number of Pylint processes run at the same time to analyze the
+# files of a directory
+MAX_WORKERS = 8
+
+# Maximum number of results of files kept in the cache
+MAX_CACHE_ENTRIES = 20000
+
+# Number of results taken from the cache and shown at once while analyzing
+# a directory, so the interface doesn't freeze for large directories
+CACHED_RESULTS_PER_STEP = 50
+
+# Categories of messages and their keys in results
+CATEGORIES = (
+    ("Convention", "C:"),
+    ("Refactor", "R:"),
+    ("Warning", "W:"),
+    ("Error", "E:"),
+)
+
 
 # TODO: There should be some palette from the appearance plugin so this
 # is easier to use
@@ -65,6 +88,7 @@
 class PylintWidgetActions:
     ChangeHistory = "change_history_depth_action"
     RunCodeAnalysis = "run_analysis_action"
+    RunProjectAnalysis = "run_project_analysis_action"
     BrowseFile = "browse_action"
     ShowLog = "log_action"
 
@@ -117,6 +141,16 @@ class CategoryItem(QTreeWidgetItem):
     }
 
     def __init__(self, parent, category, number_of_messages):
+        super().__init__(parent, [""], QTreeWidgetItem.Type)
+        self.category = category
+        self.set_number_of_messages(number_of_messages)
+
+        # Set icon
+        icon = self.CATEGORIES[category]['icon']
+        self.setIcon(0, icon)
+
+    def set_number_of_messages(self, number_of_messages):
+        """Show the number of messages of the category in its title."""
         # Messages string to append to category.
         if number_of_messages > 1 or number_of_messages == 0:
             messages = _('messages')
@@ -124,18 +158,31 @@ def __init__(self, parent, category, number_of_messages):
             messages = _('message')
 
         # Category title.
-        title = self.CATEGORIES[category]['translation_string']
+        title = self.CATEGORIES[self.category]['translation_string']
         title += f" ({number_of_messages} {messages})"
-
-        super().__init__(parent, [title], QTreeWidgetItem.Type)
-
-        # Set icon
-        icon = self.CATEGORIES[category]['icon']
-        self.setIcon(0, icon)
+        self.setText(0, title)
+        self.setDisabled(number_of_messages == 0)
 
 
 # ---- Widgets
 # ----------------------------------------------------------------------------
+def is_analyzable(path):
+    """Return True if path is a Python module, package or directory."""
+    return is_module_or_package(path) or osp.isdir(path)
+
+
+class PylintFileComboBox(PythonModulesComboBox):
+    """
+    Combobox of the Python modules, packages and directories to analyze.
+    """
+
+    def is_valid(self, qstr=None):
+        """Return True if string is valid"""
+        if qstr is None:
+            qstr = self.currentText()
+        return is_analyzable(str(qstr))
+
+
 # TODO: display results on 3 columns instead of 1: msg_id, lineno, message
 class ResultsTree(OneColumnTree):
 
@@ -159,6 +206,8 @@ def __init__(self, parent):
         self.filename = None
         self.results = None
         self.data = None
+        self.category_items = {}
+        self.module_items = {}
         self.set_title("")
 
     def activated(self, item):
@@ -187,52 +236,51 @@ def set_results(self, filename, results):
         self.results = results
         self.refresh()
 
+    def append_results(self, results):
+        """
+        Add `results` to the ones shown, e.g. when a file of a directory
+        finished being analyzed.
+        """
+        for __, key in CATEGORIES:
+            self.results[key].extend(results[key])
+        self.populate(results)
+
     def refresh(self):
         title = _("Results for ") + self.filename
         self.set_title(title)
         self.clear()
         self.data = {}
+        self.category_items = {}
+        self.module_items = {}
 
-        # Populating tree
-        results = (
-            ("Convention", self.results["C:"]),
-            ("Refactor", self.results["R:"]),
-            ("Warning", self.results["W:"]),
-            ("Error", self.results["E:"]),
-        )
+        for category, key in CATEGORIES:
+            self.category_items[key] = CategoryItem(self, category, 0)
 
-        for category, messages in results:
-            title_item = CategoryItem(self, category, len(messages))
-            if not messages:
-                title_item.setDisabled(True)
+        self.populate(self.results)
+
+    def populate(self, results):
+        """Add the items of `results` to the tree."""
+        for __, key in CATEGORIES:
+            messages = results[key]
+            title_item = self.category_items[key]
+            title_item.set_number_of_messages(len(self.results[key]))
+            modules = self.module_items.setdefault(key, {})
 
-            modules = {}
             for message_data in messages:
                 # If message data is legacy version without message_name
                 if len(message_data) == 4:
                     message_data = tuple(list(message_data) + [None])
 
-                module, lineno, message, msg_id, message_name = message_data
-
-                basename = osp.splitext(osp.basename(self.filename))[0]
-                if not module.startswith(basename):
-                    # Pylint bug
-                    i_base = module.find(basename)
-                    module = module[i_base:]
-
-                dirname = osp.dirname(self.filename)
-                if module.startswith(".") or module == basename:
-                    modname = osp.join(dirname, module)
+                if len(message_data) == 6:
+                    # Results of the files of a directory, which have the
+                    # path of their file
+                    (module, lineno, message, msg_id, message_name,
+                     modname) = message_data
+                    module = osp.relpath(modname, self.filename)
                 else:
-                    modname = osp.join(dirname, *module.split("."))
-
-                if osp.isdir(modname):
-                    modname = osp.join(modname, "__init__")
-
-                for ext in (".py", ".pyw"):
-                    if osp.isfile(modname+ext):
-                        modname = modname + ext
-                        break
+                    (module, lineno, message, msg_id,
+                     message_name) = message_data
+                    module, modname = self.resolve_module(module)
 
                 if osp.isdir(self.filename):
                     parent = modules.get(modname)
@@ -260,6 +308,30 @@ def refresh(self):
                 msg_item.setIcon(0, ima.icon("arrow"))
                 self.data[id(msg_item)] = (modname, lineno)
 
+    def resolve_module(self, module):
+        """Get the name and path of a module of the results of Pylint."""
+        basename = osp.splitext(osp.basename(self.filename))[0]
+        if not module.startswith(basename):
+            # Pylint bug
+            i_base = module.find(basename)
+            module = module[i_base:]
+
+        dirname = osp.dirname(self.filename)
+        if module.startswith(".") or module == basename:
+            modname = osp.join(dirname, module)
+        else:
+            modname = osp.join(dirname, *module.split("."))
+
+        if osp.isdir(modname):
+            modname = osp.join(modname, "__init__")
+
+        for ext in (".py", ".pyw"):
+            if osp.isfile(modname+ext):
+                modname = modname + ext
+                break
+
+        return module, modname
+
 
 class PylintWidget(PluginMainWidget):
     """
@@ -268,7 +340,9 @@ class PylintWidget(PluginMainWidget):
     ENABLE_SPINNER = True
 
     DATAPATH = get_conf_path("pylint.results")
-    VERSION = "1.1.0"
+    CACHEPATH = get_conf_path("pylint_cache")
+    HISTORYPATH = get_conf_path("pylint_history")
+    VERSION = "1.2.0"
 
     # --- Signals
     sig_edit_goto_requested = Signal(str, int, str)
@@ -293,6 +367,12 @@ class PylintWidget(PluginMainWidget):
     level.
     """
 
+    sig_start_project_analysis_requested = Signal()
+    """
+    This signal will request the plugin to start the analysis of the files
+    of the current project.
+    """
+
     def __init__(self, name=None, plugin=None, parent=None):
         super().__init__(name, plugin, parent)
 
@@ -304,10 +384,31 @@ def __init__(self, name=None, plugin=None, parent=None):
         self.rdata = []
         self.curr_filenames = self.get_conf("history_filenames")
         self.code_analysis_action = None
+        self.project_analysis_action = None
         self.browse_action = None
+        self.results_cache = ResultsCache(self.CACHEPATH)
+
+        # The results of the entries of the history are saved in their own
+        # files, so the history file only has to be rewritten with their
+        # dates and rates
+        self.history_cache = ResultsCache(self.HISTORYPATH)
+
+        # Attributes of the analysis of a directory, which is done by a pool
+        # of processes that analyze one file each
+        self._worker_manager = WorkerManager(max_threads=1)
+        self._files_worker = None
+        self._directory = None
+        self._workers = {}
+        self._pending_files = deque()
+        self._total_files = 0
+        self._analyzed_files = 0
+        self._statements = 0
+        self._weighted_rate = 0
+        self._pylintrc_digests = {}
+        self._directory_results = None
 
         # Widgets
-        self.filecombo = PythonModulesComboBox(
+        self.filecombo = PylintFileComboBox(
             self, id_=PylintWidgetToolbarItems.FileComboBox)
 
         self.ratelabel = QLabel(self)
@@ -324,7 +425,9 @@ def __init__(self, name=None, plugin=None, parent=None):
                     data = pickle.loads(fh.read())
 
                 if data[0] == self.VERSION:
-                    self.rdata = data[1:]
+                    # Results are loaded by get_data when they're needed
+                    self.rdata = [(filename, info + (None,))
+                                  for filename, info in data[1:]]
             except (EOFError, ImportError):
                 pass
 
@@ -351,20 +454,39 @@ def on_close(self):
     @Slot()
     def _start(self):
         """Start the code analysis."""
+        filename = self.get_filename()
+        if osp.isdir(filename):
+            self._start_directory(filename)
+            return
+
         self.start_spinner()
         self.output = ""
         self.error_output = ""
-        self._process = process = QProcess(self)
+        self._process = process = self._create_process()
 
-        process.setProcessChannelMode(QProcess.SeparateChannels)
-        process.setWorkingDirectory(getcwd_or_home())
         process.readyReadStandardOutput.connect(self._read_output)
         process.readyReadStandardError.connect(
             lambda: self._read_output(error=True))
         process.finished.connect(
             lambda ec, es=QProcess.ExitStatus: self._finished(ec, es))
 
-        command_args = self.get_command(self.get_filename())
+        command_args = self.get_command(filename)
+        process.start(sys.executable, command_args)
+        running = process.waitForStarted()
+        if not running:
+            self.stop_spinner()
+            QMessageBox.critical(
+                self,
+                _("Error"),
+                _("Process failed to start"),
+            )
+
+    def _create_process(self):
+        """Create a process to run Pylint."""
+        process = QProcess(self)
+        process.setProcessChannelMode(QProcess.SeparateChannels)
+        process.setWorkingDirectory(getcwd_or_home())
+
         processEnvironment = QProcessEnvironment()
         processEnvironment.insert("PYTHONIOENCODING", "utf8")
 
@@ -374,15 +496,189 @@ def _start(self):
             processEnvironment.insert("PYTHONHOME", pyhome)
 
         process.setProcessEnvironment(processEnvironment)
+        return process
+
+    def _start_directory(self, dirname):
+        """
+        Start the code analysis of the Python files of a directory.
+
+        Files are analyzed by a pool of processes and their results are
+        shown as soon as each of them is finished. Results of files that
+        didn't change since they were last analyzed are taken from the cache.
+        Files are listed and hashed in a thread to find them in the cache.
+        """
+        self.start_spinner()
+        self.output = ""
+        self.error_output = ""
+        self._directory = dirname
+        self._pending_files = deque()
+        self._total_files = 0
+        self._analyzed_files = 0
+        self._statements = 0
+        self._weighted_rate = 0
+        self._pylintrc_digests = {}
+        self._directory_results = {key: [] for __, key in CATEGORIES}
+
+        self.treewidget.set_results(
+            dirname, {key: [] for __, key in CATEGORIES})
+        self._show_progress()
+
+        self._files_worker = self._worker_manager.create_python_worker(
+            get_python_files_digests, dirname)
+        self._files_worker.sig_finished.connect(self._files_found)
+        self._files_worker.start()
+
+    def _files_found(self, worker, output, error):
+        """Start analyzing the files of the directory once they're hashed."""
+        if worker is not self._files_worker:
+            # The analysis was stopped
+            return
+        self._files_worker = None
+
+        self._pending_files = deque(output or [])
+        self._total_files = len(self._pending_files)
+        self._show_progress()
+        self._start_next_files()
+
+    def _start_next_files(self):
+        """Start analyzing the next files of the directory."""
+        if self._directory is None:
+            return
+
+        num_workers = max(1, min(MAX_WORKERS, (os.cpu_count() or 2) - 1))
+        num_cached = 0
+        while self._pending_files and len(self._workers) < num_workers:
+            filename, digest = self._pending_files.popleft()
+            key = self._get_cache_key(filename, digest)
+            data = self.results_cache.get(key) if key is not None else None
+            if data is None:
+                self._start_worker(filename, key)
+                continue
+
+            self._add_file_results(filename, *data)
+            num_cached += 1
+            if num_cached == CACHED_RESULTS_PER_STEP:
+                # Let the interface be updated before going on
+                QTimer.singleShot(0, self._start_next_files)
+                return
+
+        if not self._workers and not self._pending_files:
+            self._finish_directory()
+
+    def _start_worker(self, filename, key):
+        """Start a process to analyze a file of the directory."""
+        process = self._create_process()
+        process.finished.connect(
+            lambda ec, es, process=process: self._worker_finished(process))
+        process.errorOccurred.connect(
+            lambda error, process=process: self._worker_error(process, error))
+        self._workers[process] = (filename, key)
+
+        # Reports are needed to get the number of statements of the file
+        command_args = self.get_command(filename) + ["--reports=y"]
         process.start(sys.executable, command_args)
-        running = process.waitForStarted()
-        if not running:
-            self.stop_spinner()
-            QMessageBox.critical(
-                self,
-                _("Error"),
-                _("Process failed to start"),
-            )
+
+    def _worker_error(self, process, error):
+        """Handle a process that failed to start."""
+        if error == QProcess.FailedToStart:
+            self._worker_finished(process)
+
+    def _worker_finished(self, process):
+        """Show the results of a file of the directory and go on."""
+        if process not in self._workers:
+            # The analysis was stopped
+            return
+        filename, key = self._workers.pop(process)
+
+        output = str(process.readAllStandardOutput().data(), "utf-8",
+                     "replace")
+        error_output = str(process.readAllStandardError().data(), "utf-8",
+                           "replace")
+        process.deleteLater()
+
+        rate, __, results = self.parse_output(output)
+        statements = self.parse_statements(output)
+        data = (rate, statements, results, output)
+        if output and key is not None:
+            self.results_cache.set(key, data)
+
+        self.error_output += error_output
+        self._add_file_results(filename, *data)
+        self._start_next_files()
+
+    def _add_file_results(self, filename, rate, statements, results, output):
+        """Add the results of a file to the ones of the directory."""
+        # Messages are shown in the tree by the file they belong to
+        results = {
+            key: [tuple(message_data) + (filename,)
+                  for message_data in results[key]]
+            for __, key in CATEGORIES
+        }
+        for __, key in CATEGORIES:
+            self._directory_results[key].extend(results[key])
+        self.treewidget.append_results(results)
+
+        # The rate of Pylint is a linear function of the number of messages
+        # by statement, so the one of the directory is the mean of the ones
+        # of its files weighted by their number of statements
+        if rate is not None and statements:
+            self._statements += statements
+            self._weighted_rate += float(rate) * statements
+
+        self.output += output
+        self._analyzed_files += 1
+        self._show_progress()
+
+    def _finish_directory(self):
+        """Save and show the results of the directory."""
+        dirname = self._directory
+        self._directory = None
+
+        rate = None
+        if self._statements:
+            rate = "{:.2f}".format(self._weighted_rate / self._statements)
+
+        _index, data = self.get_data(dirname)
+        previous = ""
+        if data is not None and data[1] is not None:
+            previous = data[1]
+
+        self.results_cache.prune(MAX_CACHE_ENTRIES)
+        self._save_history()
+        self.set_data(
+            dirname,
+            (time.localtime(), rate, previous, self._directory_results))
+        self.output = self.error_output + self.output
+        self.show_data(justanalyzed=True)
+        self.update_actions()
+        self.stop_spinner()
+
+    def _get_cache_key(self, filename, digest):
+        """
+        Get the key of the results of a file in the cache, which depends on
+        its path, the hash of its contents, the pylintrc file used for it
+        and the version of Pylint.
+        """
+        if digest is None:
+            return None
+
+        dirname = osp.dirname(filename)
+        if dirname not in self._pylintrc_digests:
+            pylintrc_path = self.get_pylintrc_path(filename)
+            pylintrc_digest = None
+            if pylintrc_path is not None:
+                pylintrc_digest = get_file_digest(pylintrc_path)
+            self._pylintrc_digests[dirname] = (pylintrc_path, pylintrc_digest)
+
+        return ResultsCache.get_key(
+            PYLINT_VER, filename, digest, *self._pylintrc_digests[dirname])
+
+    def _show_progress(self):
+        """Show the number of files of the directory analyzed so far."""
+        self.ratelabel.setText(
+            _("Analyzed files: {} of {}").format(
+                self._analyzed_files, self._total_files))
+        self.datelabel.setText("")
 
     def _read_output(self, error=False):
         process = self._process
@@ -435,11 +731,20 @@ def _check_new_file(self):
 
     def _is_running(self):
         process = self._process
-        return process is not None and process.state() == QProcess.Running
+        return ((process is not None and process.state() == QProcess.Running)
+                or self._directory is not None)
 
     def _kill_process(self):
-        self._process.close()
-        self._process.waitForFinished(1000)
+        self._directory = None
+        self._files_worker = None
+        self._pending_files.clear()
+        processes, self._workers = list(self._workers), {}
+        if self._process is not None:
+            processes.append(self._process)
+
+        for process in processes:
+            process.close()
+            process.waitForFinished(1000)
         self.stop_spinner()
 
     def _update_combobox_history(self):
@@ -498,6 +803,13 @@ def setup(self):
             icon=self.create_icon("run"),
             triggered=lambda: self.sig_start_analysis_requested.emit(),
         )
+        self.project_analysis_action = self.create_action(
+            PylintWidgetActions.RunProjectAnalysis,
+            text=_("Run code analysis on project"),
+            tip=_("Run code analysis on the files of the current project"),
+            icon=self.create_icon("project"),
+            triggered=lambda: self.sig_start_project_analysis_requested.emit(),
+        )
         self.browse_action = self.create_action(
             PylintWidgetActions.BrowseFile,
             text=_("Select Python file"),
@@ -514,6 +826,11 @@ def setup(self):
         )
 
         options_menu = self.get_options_menu()
+        self.add_item_to_menu(
+            self.project_analysis_action,
+            menu=options_menu,
+            section=PylintWidgetOptionsMenuSections.Global,
+        )
         self.add_item_to_menu(
             self.treewidget.get_action(
                 OneColumnTreeActions.CollapseAllAction),
@@ -584,16 +901,22 @@ def setup(self):
         else:
             self.code_analysis_action.setEnabled(False)
 
+        self.project_analysis_action.setEnabled(
+            bool(self.get_conf("project_dir")))
+
         # Signals
         self.filecombo.valid.connect(self.code_analysis_action.setEnabled)
 
-    @on_conf_change(option=['max_entries', 'history_filenames'])
+    @on_conf_change(option=['max_entries', 'history_filenames', 'project_dir'])
     def on_conf_update(self, option, value):
         if option == "max_entries":
             self._update_combobox_history()
         elif option == "history_filenames":
             self.curr_filenames = value
             self._update_combobox_history()
+        elif option == "project_dir":
+            if self.project_analysis_action is not None:
+                self.project_analysis_action.setEnabled(bool(value))
 
     def update_actions(self):
         if self._is_running():
@@ -605,6 +928,7 @@ def update_actions(self):
 
     def on_close(self):
         self.stop_code_analysis()
+        self._worker_manager.terminate_all()
 
     # --- Public API
     # ------------------------------------------------------------------------
@@ -717,8 +1041,13 @@ def remove_obsolete_items(self):
         """
         Removing obsolete items.
         """
-        self.rdata = [(filename, data) for filename, data in self.rdata
-                      if is_module_or_package(filename)]
+        rdata = []
+        for filename, data in self.rdata:
+            if is_analyzable(filename):
+                rdata.append((filename, data))
+            else:
+                self.history_cache.remove(ResultsCache.get_key(filename))
+        self.rdata = rdata
 
     def get_filenames(self):
         """
@@ -733,10 +1062,20 @@ def get_data(self, filename):
         filename = osp.abspath(filename)
         for index, (fname, data) in enumerate(self.rdata):
             if fname == filename:
-                return index, data
+                break
         else:
             return None, None
 
+        if data[3] is None:
+            results = self.history_cache.get(ResultsCache.get_key(filename))
+            if results is None:
+                # They were removed
+                self.rdata.pop(index)
+                return None, None
+            data = data[:3] + (results,)
+            self.rdata[index] = (filename, data)
+        return index, data
+
     def set_data(self, filename, data):
         """
         Set and save code analysis `data` for given `filename`.
@@ -747,12 +1086,17 @@ def set_data(self, filename, data):
             self.rdata.pop(index)
 
         self.rdata.insert(0, (filename, data))
+        self.history_cache.set(ResultsCache.get_key(filename), data[3])
 
         while len(self.rdata) > self.get_conf("max_entries"):
-            self.rdata.pop(-1)
+            old_filename, __ = self.rdata.pop(-1)
+            self.history_cache.remove(ResultsCache.get_key(old_filename))
 
+        # Only the dates and rates are saved with the history
         with open(self.DATAPATH, "wb") as fh:
-            pickle.dump([self.VERSION] + self.rdata, fh, 2)
+            pickle.dump([self.VERSION] + [(fname, fdata[:3])
+                                          for fname, fdata in self.rdata],
+                        fh, 2)
 
     def show_data(self, justanalyzed=False):
         """
@@ -952,6 +1296,16 @@ def parse_output(self, output):
 
         return rate, previous, results
 
+    def parse_statements(self, output):
+        """
+        Parse the number of statements analyzed from the reports of the
+        output, or return None if they're not in it.
+        """
+        match = re.search(r"^(\d+) statements analysed", output, re.MULTILINE)
+        if match is None:
+            return None
+        return int(match.group(1))
+
 
 # =============================================================================
 # Tests
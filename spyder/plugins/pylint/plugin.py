@@ -81,6 +81,8 @@ def on_initialize(self):
             self.sig_redirect_stdio_requested)
         widget.sig_start_analysis_requested.connect(
             lambda: self.start_code_analysis())
+        widget.sig_start_project_analysis_requested.connect(
+            lambda: self.start_code_analysis(self.get_conf("project_dir")))
 
         # Add action to application menus
         pylint_act = self.create_action(
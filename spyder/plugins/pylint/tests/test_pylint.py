@@ -10,6 +10,7 @@
 # Standard library imports
 from io import open
 import os.path as osp
+import pickle
 from unittest.mock import Mock, MagicMock
 
 # Third party imports
@@ -30,7 +31,7 @@
 from spyder.api.plugin_registration.registry import PLUGIN_REGISTRY
 from spyder.config.manager import CONF
 from spyder.plugins.pylint.plugin import Pylint
-from spyder.plugins.pylint.utils import get_pylintrc_path
+from spyder.plugins.pylint.utils import get_pylintrc_path, ResultsCache
 
 # pylint: disable=redefined-outer-name
 
@@ -282,5 +283,72 @@ def test_pylint_max_history_conf(pylint_plugin, pylint_test_scripts):
     assert 'test_script_2.py' in pylint_widget.curr_filenames[0]
 
 
+def test_pylint_widget_directory(pylint_plugin, tmp_path, mocker, qtbot):
+    """
+    Test that the files of a directory are analyzed and that only the ones
+    that changed are analyzed again.
+    """
+    pylint_widget = pylint_plugin.get_widget()
+    pylint_widget.results_cache = ResultsCache(str(tmp_path / "cache"))
+    pylint_widget.history_cache = ResultsCache(str(tmp_path / "history"))
+    pylint_widget.DATAPATH = str(tmp_path / "pylint.results")
+
+    directory = tmp_path / "directory"
+    (directory / "subdir").mkdir(parents=True)
+    (directory / ".hidden").mkdir()
+    filenames = [str(directory / "script_1.py"),
+                 str(directory / "subdir" / "script_2.py")]
+    for filename in filenames + [str(directory / ".hidden" / "hidden.py")]:
+        with open(filename, mode="w", encoding="utf-8",
+                  newline="\n") as script_file:
+            script_file.write(PYLINT_TEST_SCRIPT)
+    dirname = str(directory)
+
+    def analyze():
+        pylint_data = pylint_widget.get_data(dirname)[1]
+        pylint_plugin.start_code_analysis(filename=dirname)
+        qtbot.waitUntil(
+            lambda: pylint_widget.get_data(dirname)[1] is not pylint_data,
+            timeout=20000)
+        return pylint_widget.get_data(dirname)[1]
+
+    start_worker = mocker.spy(pylint_widget, "_start_worker")
+    __, rate, __, results = analyze()
+    assert start_worker.call_count == 2
+    assert rate is not None
+
+    # Messages are shown for each file
+    warnings = results["W:"]
+    assert sorted({message[-1] for message in warnings}) == filenames
+    assert len(warnings) == 2 * 3
+    category_item = pylint_widget.treewidget.category_items["W:"]
+    assert category_item.childCount() == 2
+
+    # Results of files that didn't change are taken from the cache
+    start_worker.reset_mock()
+    __, cached_rate, previous_rate, cached_results = analyze()
+    assert start_worker.call_count == 0
+    assert cached_rate == rate
+    assert previous_rate == rate
+    assert cached_results == results
+
+    with open(filenames[0], mode="a", encoding="utf-8") as script_file:
+        script_file.write("import re\n")
+    __, __, __, results = analyze()
+    assert start_worker.call_count == 1
+    assert start_worker.call_args[0][0] == filenames[0]
+    assert len(results["W:"]) == 2 * 3 + 1
+
+    # Only the dates and rates are saved in the history file, and results
+    # are loaded from their own file when needed
+    with open(pylint_widget.DATAPATH, "rb") as history_file:
+        history = pickle.load(history_file)
+    assert history[0] == pylint_widget.VERSION
+    assert history[1][0] == dirname
+    assert all(len(data) == 3 for __, data in history[1:])
+    pylint_widget.rdata = [(dirname, history[1][1] + (None,))]
+    assert pylint_widget.get_data(dirname)[1][3] == results
+
+
 if __name__ == "__main__":
     pytest.main([osp.basename(__file__), '-vv', '-rw'])
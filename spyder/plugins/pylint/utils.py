@@ -9,8 +9,10 @@
 
 
 # Standard library imports
+import hashlib
 import os
 import os.path as osp
+import pickle
 
 # Third party imports
 import pylint.config
@@ -41,3 +43,112 @@ def get_pylintrc_path(search_paths=None, home_path=None):
         os.chdir(current_cwd)
 
     return pylintrc_path
+
+
+def get_python_files(dirname):
+    """
+    Get the Python files of a directory and its subdirectories, skipping
+    hidden ones.
+    """
+    filenames = []
+    for root, dirs, files in os.walk(dirname):
+        dirs[:] = sorted(d for d in dirs
+                         if not d.startswith('.') and d != '__pycache__')
+        filenames.extend(osp.join(root, f) for f in sorted(files)
+                         if osp.splitext(f)[1] in ('.py', '.pyw'))
+    return filenames
+
+
+def get_file_digest(filename):
+    """Get the hash of the contents of a file or None if it can't be read."""
+    try:
+        with open(filename, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def get_python_files_digests(dirname):
+    """
+    Get the Python files of a directory, as given by `get_python_files`,
+    with the hashes of their contents.
+
+    This reads all the files, so it's meant to be run in a thread.
+    """
+    return [(filename, get_file_digest(filename))
+            for filename in get_python_files(dirname)]
+
+
+class ResultsCache:
+    """
+    Results of Pylint for files saved on disk.
+
+    Each result is saved in its own file, named by its key, so results can
+    be looked up and added without reading or writing the rest of them.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    @staticmethod
+    def get_key(*parts):
+        """Get the key of a result from the strings it depends on."""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(str(part).encode('utf-8', 'surrogatepass'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Get the result saved for `key` or None if there is none."""
+        path = self._get_path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = pickle.load(f)
+            # Mark the result as recently used for prune
+            os.utime(path)
+        except Exception:
+            return None
+        return data
+
+    def set(self, key, data):
+        """Save the result for `key`."""
+        path = self._get_path(key)
+        temp_path = path + '.tmp'
+        try:
+            os.makedirs(osp.dirname(path), exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except OSError:
+            pass
+
+    def remove(self, key):
+        """Remove the result saved for `key`, if any."""
+        try:
+            os.remove(self._get_path(key))
+        except OSError:
+            pass
+
+    def prune(self, max_entries):
+        """Remove the least recently used results above `max_entries`."""
+        entries = []
+        for root, __, files in os.walk(self.path):
+            for name in files:
+                path = osp.join(root, name)
+                try:
+                    entries.append((os.stat(path).st_mtime, path))
+                except OSError:
+                    pass
+
+        entries.sort()
+        for __, path in entries[:max(0, len(entries) - max_entries)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _get_path(self, key):
+        # Results are spread in subdirectories so that none of them gets too
+        # many files
+        return osp.join(self.path, key[:2], key[2:])
@@ -41,6 +41,7 @@
 from spyder.utils.icon_manager import ima
 from spyder.utils.qthelpers import add_actions, create_action, keybinding
 from spyder.plugins.variableexplorer.widgets.basedialog import BaseDialog
+from spyder.plugins.variableexplorer.widgets.remotedata import RemoteArray
 
 # Note: string and unicode data types will be formatted with '%s' (see below)
 SUPPORTED_FORMATS = {
@@ -152,16 +153,24 @@ def __init__(self, data, format="%.6g", xlabels=None, ylabels=None,
         self.total_cols = self._data.shape[1]
         size = self.total_rows * self.total_cols
 
+        # Arrays that live in the kernel are only fetched by windows, so
+        # their min, max and inf values are computed by the kernel
+        is_remote = isinstance(data, RemoteArray)
+
         if not self._data.dtype.name == 'object':
             try:
-                self.vmin = np.nanmin(self.color_func(data))
-                self.vmax = np.nanmax(self.color_func(data))
+                if is_remote:
+                    # This is None if the array is not numeric
+                    self.vmin, self.vmax = data.info['minmax']
+                else:
+                    self.vmin = np.nanmin(self.color_func(data))
+                    self.vmax = np.nanmax(self.color_func(data))
                 if self.vmax == self.vmin:
                     self.vmin -= 1
                 self.hue0 = huerange[0]
                 self.dhue = huerange[1]-huerange[0]
                 self.bgcolor_enabled = True
-            except (AttributeError, TypeError, ValueError):
+            except (AttributeError, TypeError, ValueError, KeyError):
                 self.vmin = None
                 self.vmax = None
                 self.hue0 = None
@@ -172,9 +181,12 @@ def __init__(self, data, format="%.6g", xlabels=None, ylabels=None,
         # crashes. See: spyder-ide/spyder#8093
         self.has_inf = False
         if data.dtype.kind in ['f', 'c']:
-            self.has_inf = np.any(np.isinf(data))
+            if is_remote:
+                self.has_inf = data.info.get('has_inf', False)
+            else:
+                self.has_inf = np.any(np.isinf(data))
 
-        # Deactivate coloring for object arrays or arrays with inf values
+        # Deactivate coloring for object arrays and arrays with inf values
         if self._data.dtype.name == 'object' or self.has_inf:
             self.bgcolor_enabled = False
 
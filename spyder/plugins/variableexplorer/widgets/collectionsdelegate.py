@@ -15,7 +15,7 @@
 
 # Third party imports
 from qtpy.compat import to_qvariant
-from qtpy.QtCore import QDateTime, Qt, Signal
+from qtpy.QtCore import QDateTime, Qt, QTimer, Signal
 from qtpy.QtWidgets import (QAbstractItemDelegate, QDateEdit, QDateTimeEdit,
                             QItemDelegate, QLineEdit, QMessageBox, QTableView)
 from spyder_kernels.utils.lazymodules import (
@@ -31,6 +31,7 @@
 from spyder.plugins.variableexplorer.widgets.arrayeditor import ArrayEditor
 from spyder.plugins.variableexplorer.widgets.dataframeeditor import (
     DataFrameEditor)
+from spyder.plugins.variableexplorer.widgets.remotedata import RemoteArray
 from spyder.plugins.variableexplorer.widgets.texteditor import TextEditor
 
 
@@ -56,6 +57,13 @@ def set_value(self, index, value):
         if index.isValid():
             index.model().set_value(index, value)
 
+    def get_remote_data(self, index):
+        """
+        Return a RemoteData object to display the value associated to index
+        by windows, or None if that's not possible.
+        """
+        return None
+
     def show_warning(self, index):
         """
         Decide if showing a warning when the user is trying to view
@@ -96,12 +104,23 @@ def createEditor(self, parent, option, index, object_explorer=False):
         if index.column() < 3:
             return None
         if self.show_warning(index):
-            answer = QMessageBox.warning(
-                self.parent(), _("Warning"),
-                _("Opening this variable can be slow\n\n"
-                  "Do you want to continue anyway?"),
-                QMessageBox.Yes | QMessageBox.No)
-            if answer == QMessageBox.No:
+            # Large arrays and dataframes can be displayed by windows, which
+            # is not slow but read only
+            remote_data = (None if object_explorer
+                           else self.get_remote_data(index))
+            if remote_data is not None:
+                answer = self.ask_remote_data_display()
+                if answer == QMessageBox.Open:
+                    self.create_remote_data_editor(parent, index,
+                                                   remote_data)
+                    return None
+            else:
+                answer = QMessageBox.warning(
+                    self.parent(), _("Warning"),
+                    _("Opening this variable can be slow\n\n"
+                      "Do you want to continue anyway?"),
+                    QMessageBox.Yes | QMessageBox.No)
+            if answer != QMessageBox.Yes:
                 self.sig_editor_shown.emit()
                 return None
         try:
@@ -266,6 +285,77 @@ def createEditor(self, parent, option, index, object_explorer=False):
                                             key=key, readonly=readonly))
             return None
 
+    def ask_remote_data_display(self):
+        """
+        Ask if a large variable should be displayed by windows or be
+        transferred at once.
+
+        Returns QMessageBox.Open to display it by windows, QMessageBox.Yes
+        to transfer it and QMessageBox.Cancel to do nothing.
+        """
+        box = QMessageBox(
+            QMessageBox.Warning, _("Warning"),
+            _("Opening this variable can be slow\n\n"
+              "Do you want to open it by parts, in read only mode, or to "
+              "transfer all of it, so it can be edited and sorted?"),
+            parent=self.parent())
+        parts_button = box.addButton(_("Open by parts"),
+                                     QMessageBox.AcceptRole)
+        all_button = box.addButton(_("Transfer all"), QMessageBox.YesRole)
+        box.addButton(QMessageBox.Cancel)
+        box.setDefaultButton(parts_button)
+        box.exec_()
+
+        if box.clickedButton() == parts_button:
+            return QMessageBox.Open
+        elif box.clickedButton() == all_button:
+            return QMessageBox.Yes
+        return QMessageBox.Cancel
+
+    def create_remote_data_editor(self, parent, index, data):
+        """Create a read only editor for a RemoteData object."""
+        key = index.model().get_key(index)
+        if isinstance(data, RemoteArray):
+            editor = ArrayEditor(parent=parent)
+            if not editor.setup_and_check(data, title=key, readonly=True):
+                return
+        else:
+            editor = DataFrameEditor(parent=parent)
+            if not editor.setup_and_check(data, title=key):
+                return
+
+        data.error_handler = functools.partial(self.remote_data_error,
+                                               id(editor))
+        self.create_dialog(editor, dict(model=index.model(), editor=editor,
+                                        key=key, readonly=True,
+                                        remote=True))
+
+    def remote_data_error(self, editor_id, message):
+        """
+        Close the editor of a remote variable whose windows can't be
+        requested.
+        """
+        # Windows are requested while painting, so the editor is closed
+        # after that
+        QTimer.singleShot(0, functools.partial(
+            self._close_remote_editor, editor_id, message))
+
+    def _close_remote_editor(self, editor_id, message):
+        data = self._editors.get(editor_id)
+        if data is None:
+            return
+        data['editor'].reject()
+        QMessageBox.critical(self.parent(), _("Error"), message)
+
+    def close_remote_editors(self, keys):
+        """
+        Close the editors that display the variables in `keys` by windows,
+        because they changed or were removed.
+        """
+        for data in list(self._editors.values()):
+            if data.get('remote') and data['key'] in keys:
+                data['editor'].reject()
+
     def create_dialog(self, editor, data):
         self._editors[id(editor)] = data
         editor.accepted.connect(
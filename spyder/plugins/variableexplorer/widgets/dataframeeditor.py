@@ -58,6 +58,7 @@
                                     keybinding, qapplication)
 from spyder.plugins.variableexplorer.widgets.arrayeditor import get_idx_rect
 from spyder.plugins.variableexplorer.widgets.basedialog import BaseDialog
+from spyder.plugins.variableexplorer.widgets.remotedata import RemoteData
 
 # Supported Numbers and complex numbers
 REAL_NUMBER_TYPES = (float, int, np.int64, np.int32)
@@ -141,8 +142,14 @@ def __init__(self, dataFrame, format=DEFAULT_FORMAT, parent=None):
             self.bgcolor_enabled = False
             self.colum_avg(0)
 
-        # Use paging when the total size, number of rows or number of
-        # columns is too large
+        self.setup_paging()
+
+    def setup_paging(self):
+        """
+        Use paging when the total size, number of rows or number of
+        columns is too large.
+        """
+        size = self.total_rows * self.total_cols
         if size > LARGE_SIZE:
             self.rows_loaded = ROWS_TO_LOAD
             self.cols_loaded = COLS_TO_LOAD
@@ -463,6 +470,10 @@ def get_data(self):
         """Return data"""
         return self.df
 
+    def get_frame(self, rows, columns):
+        """Return the part of the DataFrame given by rows and columns."""
+        return self.df.iloc[rows, columns]
+
     def rowCount(self, index=QModelIndex()):
         """DataFrame row number"""
         # Avoid a "Qt exception in virtual methods" generated in our
@@ -514,6 +525,139 @@ def reset(self):
         self.endResetModel()
 
 
+class RemoteDataFrameModel(DataFrameModel):
+    """
+    Read only model for a DataFrame, Series or Index that lives in a kernel.
+
+    Data and labels are requested by windows, when the view needs them,
+    instead of transferring the whole object from the kernel.
+    """
+
+    def __init__(self, data, format=DEFAULT_FORMAT, parent=None):
+        QAbstractTableModel.__init__(self)
+        self.dialog = parent
+        self.df = None
+        self.remote_data = data
+        self._format = format
+        self.complex_intran = None
+        self.display_error_idxs = []
+
+        self.total_rows, self.total_cols = data.shape
+
+        # The min and max of each column are computed by the kernel, because
+        # they require all its data
+        self.max_min_col = data.info.get('columns_minmax')
+        if self.max_min_col is not None:
+            self.colum_avg_enabled = True
+            self.bgcolor_enabled = True
+            self.colum_avg(1)
+        else:
+            self.colum_avg_enabled = False
+            self.bgcolor_enabled = False
+            self.colum_avg(0)
+
+        self.setup_paging()
+
+    def setup_paging(self):
+        """
+        Always use paging, so windows are requested only when more rows or
+        columns are needed.
+        """
+        self.rows_loaded = min(self.total_rows, ROWS_TO_LOAD)
+        self.cols_loaded = min(self.total_cols, COLS_TO_LOAD)
+
+    @property
+    def shape(self):
+        """Return the shape of the dataframe."""
+        return self.remote_data.shape
+
+    @property
+    def header_shape(self):
+        """Return the levels for the columns and rows of the dataframe."""
+        info = self.remote_data.info
+        return (info['column_levels'], info['index_levels'])
+
+    def header(self, axis, x, level=0):
+        """
+        Return the values of the labels for the header of columns or rows.
+
+        The value corresponds to the header of column or row x in the
+        given level.
+        """
+        if axis == 0:
+            window, __, x = self.remote_data.locate(0, x)
+            ax = None if window is None else window.columns
+        else:
+            window, x, __ = self.remote_data.locate(x, 0)
+            ax = None if window is None else window.index
+        try:
+            if not hasattr(ax, 'levels'):
+                return ax[x]
+            else:
+                return ax.values[x][level]
+        except (TypeError, IndexError):
+            # The window couldn't be requested or the variable changed
+            return ''
+
+    def name(self, axis, level):
+        """Return the labels of the levels if any."""
+        info = self.remote_data.info
+        names = info['column_names'] if axis == 0 else info['index_names']
+        if len(names) > 1:
+            return names[level]
+        if names[0]:
+            return names[0]
+
+    def get_value(self, row, column):
+        """Return the value of the DataFrame."""
+        window, row, column = self.remote_data.locate(row, column)
+        if window is None or not (row < window.shape[0] and
+                                  column < window.shape[1]):
+            # The window couldn't be requested or the variable changed
+            return ''
+        try:
+            value = window.iat[row, column]
+        except pd._libs.tslib.OutOfBoundsDatetime:
+            value = window.iloc[:, column].astype(str).iat[row]
+        except:
+            value = window.iloc[row, column]
+        return value
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Overriding sort method"""
+        QMessageBox.information(
+            self.dialog, _("Sort"),
+            _("It is not possible to sort this variable because it is too "
+              "large to be displayed at once."))
+        return False
+
+    def flags(self, index):
+        """Set flags"""
+        return QAbstractTableModel.flags(self, index)
+
+    def setData(self, index, value, role=Qt.EditRole, change_type=None):
+        """Cell content change"""
+        return False
+
+    def get_data(self):
+        """Return data"""
+        return self.remote_data
+
+    def get_frame(self, rows, columns):
+        """Return the part of the DataFrame given by rows and columns."""
+        rows = slice(*rows.indices(self.total_rows))
+        columns = slice(*columns.indices(self.total_cols))
+        return self.remote_data.get_window(rows.start, rows.stop,
+                                           columns.start, columns.stop)
+
+    def columnCount(self, index=QModelIndex()):
+        """DataFrame column number"""
+        if self.total_cols <= self.cols_loaded:
+            return self.total_cols
+        else:
+            return self.cols_loaded
+
+
 class DataFrameView(QTableView, SpyderConfigurationAccessor):
     """
     Data Frame view class.
@@ -637,9 +781,8 @@ def copy(self):
         # Copy index and header too (equal True).
         # See spyder-ide/spyder#11096
         index = header = True
-        df = self.model().df
-        obj = df.iloc[slice(row_min, row_max + 1),
-                      slice(col_min, col_max + 1)]
+        obj = self.model().get_frame(slice(row_min, row_max + 1),
+                                     slice(col_min, col_max + 1))
         output = io.StringIO()
         try:
             obj.to_csv(output, sep='\t', index=index, header=header)
@@ -684,22 +827,10 @@ def __init__(self, model, axis, palette):
         self._palette = palette
         self.total_rows = self.model.shape[0]
         self.total_cols = self.model.shape[1]
-        size = self.total_rows * self.total_cols
 
-        # Use paging when the total size, number of rows or number of
-        # columns is too large
-        if size > LARGE_SIZE:
-            self.rows_loaded = ROWS_TO_LOAD
-            self.cols_loaded = COLS_TO_LOAD
-        else:
-            if self.total_cols > LARGE_COLS:
-                self.cols_loaded = COLS_TO_LOAD
-            else:
-                self.cols_loaded = self.total_cols
-            if self.total_rows > LARGE_NROWS:
-                self.rows_loaded = ROWS_TO_LOAD
-            else:
-                self.rows_loaded = self.total_rows
+        # Use the same paging as the data model
+        self.rows_loaded = self.model.rows_loaded
+        self.cols_loaded = self.model.cols_loaded
 
         if self.axis == 0:
             self.total_cols = self.model.shape[1]
@@ -909,7 +1040,9 @@ def setup_and_check(self, data, title=''):
         """
         Setup DataFrameEditor:
         return False if data is not supported, True otherwise.
-        Supported types for data are DataFrame, Series and Index.
+        Supported types for data are DataFrame, Series and Index, as well
+        as RemoteData for those that are displayed by windows, in read only
+        mode.
         """
         self._selection_rec = False
         self._model = None
@@ -918,11 +1051,17 @@ def setup_and_check(self, data, title=''):
         self.layout.setSpacing(0)
         self.layout.setContentsMargins(20, 20, 20, 0)
         self.setLayout(self.layout)
+        is_remote = isinstance(data, RemoteData)
+        type_name = (data.type_name if is_remote
+                     else data.__class__.__name__)
         if title:
-            title = to_text_string(title) + " - %s" % data.__class__.__name__
+            title = to_text_string(title) + " - %s" % type_name
         else:
-            title = _("%s editor") % data.__class__.__name__
-        if isinstance(data, pd.Series):
+            title = _("%s editor") % type_name
+        if is_remote:
+            self.is_series = type_name == 'Series'
+            title += ' (' + _('read only') + ')'
+        elif isinstance(data, pd.Series):
             self.is_series = True
             data = data.to_frame()
         elif isinstance(data, pd.Index):
@@ -943,7 +1082,10 @@ def setup_and_check(self, data, title=''):
         self.create_table_index()
 
         # Create the model and view of the data
-        self.dataModel = DataFrameModel(data, parent=self)
+        if is_remote:
+            self.dataModel = RemoteDataFrameModel(data, parent=self)
+        else:
+            self.dataModel = DataFrameModel(data, parent=self)
         self.dataModel.dataChanged.connect(self.save_and_close_enable)
         self.create_data_table()
 
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Dialog to select the variables to import from a file
+"""
+
+# Third party imports
+from qtpy.QtCore import Qt
+from qtpy.QtWidgets import (QCheckBox, QDialog, QDialogButtonBox, QLabel,
+                            QListWidget, QListWidgetItem, QVBoxLayout)
+
+# Local imports
+from spyder.api.translations import get_translation
+
+
+# Localization
+_ = get_translation('spyder')
+
+
+class ImportVariablesDialog(QDialog):
+    """Dialog to select the variables to import from a file."""
+
+    def __init__(self, parent, names, filename):
+        QDialog.__init__(self, parent)
+        self.setWindowTitle(_("Import data"))
+
+        label = QLabel(_("Select the variables to import from "
+                         "<b>{}</b>:").format(filename))
+        label.setWordWrap(True)
+
+        self.list_widget = QListWidget(self)
+        for name in names:
+            item = QListWidgetItem(name, self.list_widget)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked)
+
+        self.select_all = QCheckBox(_("Select all"), self)
+        self.select_all.setChecked(True)
+        self.select_all.toggled.connect(self.set_all_checked)
+
+        self.buttons = QDialogButtonBox(
+            QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        self.buttons.accepted.connect(self.accept)
+        self.buttons.rejected.connect(self.reject)
+        self.list_widget.itemChanged.connect(self.update_ok_button)
+
+        layout = QVBoxLayout()
+        layout.addWidget(label)
+        layout.addWidget(self.list_widget)
+        layout.addWidget(self.select_all)
+        layout.addWidget(self.buttons)
+        self.setLayout(layout)
+
+    def set_all_checked(self, checked):
+        """Check or uncheck all variables."""
+        state = Qt.Checked if checked else Qt.Unchecked
+        for row in range(self.list_widget.count()):
+            self.list_widget.item(row).setCheckState(state)
+
+    def update_ok_button(self):
+        """Only allow to accept the dialog if a variable is selected."""
+        self.buttons.button(QDialogButtonBox.Ok).setEnabled(
+            bool(self.get_selected_names()))
+
+    def get_selected_names(self):
+        """Return the names of the selected variables."""
+        items = [self.list_widget.item(row)
+                 for row in range(self.list_widget.count())]
+        return [item.text() for item in items
+                if item.checkState() == Qt.Checked]
@@ -21,7 +21,7 @@
 from qtpy.QtGui import QCursor
 from qtpy.QtWidgets import (QApplication, QHBoxLayout, QInputDialog,
                             QMessageBox, QVBoxLayout, QWidget)
-from spyder_kernels.utils.iofuncs import iofunctions
+from spyder_kernels.utils.iofuncs import get_dictionary_names, iofunctions
 from spyder_kernels.utils.misc import fix_reference_name
 from spyder_kernels.utils.nsview import REMOTE_SETTINGS
 
@@ -29,6 +29,8 @@
 from spyder.api.translations import get_translation
 from spyder.api.widgets.mixins import SpyderWidgetMixin
 from spyder.widgets.collectionseditor import RemoteCollectionsEditorTableView
+from spyder.plugins.variableexplorer.widgets.importvariables import (
+    ImportVariablesDialog)
 from spyder.plugins.variableexplorer.widgets.importwizard import ImportWizard
 from spyder.utils import encoding
 from spyder.utils.misc import getcwd_or_home, remove_backslashes
@@ -150,6 +152,17 @@ def process_remote_view(self, remote_view):
         if remote_view is not None:
             self.set_data(remote_view)
 
+    def process_remote_view_changes(self, changes):
+        """Process the changes of the remote view"""
+        if changes is None:
+            return
+
+        if changes['reset']:
+            self.process_remote_view(changes['changed'])
+        elif changes['changed'] or changes['removed']:
+            self.editor.update_data(changes['changed'], changes['removed'])
+            self.editor.adjust_columns()
+
     def set_var_properties(self, properties):
         """Set properties of variables"""
         if properties is not None:
@@ -165,6 +178,7 @@ def set_data(self, data):
     def import_data(self, filenames=None):
         """Import data from text file."""
         title = _("Import data")
+        select_names = filenames is None
         if filenames is None:
             if self.filename is None:
                 basedir = getcwd_or_home()
@@ -218,9 +232,27 @@ def import_data(self, filenames=None):
                 except Exception as error:
                     error_message = str(error)
             else:
+                names = None
+                if select_names and ext == '.spydata':
+                    # Let users select the variables to import
+                    try:
+                        names = get_dictionary_names(self.filename)
+                    except Exception:
+                        # Errors are reported when loading the file below
+                        names = None
+                    if names is not None and len(names) > 1:
+                        dialog = ImportVariablesDialog(
+                            self, names, osp.basename(self.filename))
+                        if not dialog.exec_():
+                            continue
+                        names = dialog.get_selected_names()
+                    else:
+                        names = None
+
                 QApplication.setOverrideCursor(QCursor(Qt.WaitCursor))
                 QApplication.processEvents()
-                error_message = self.shellwidget.load_data(self.filename, ext)
+                error_message = self.shellwidget.load_data(
+                    self.filename, ext, names=names)
                 QApplication.restoreOverrideCursor()
                 QApplication.processEvents()
     
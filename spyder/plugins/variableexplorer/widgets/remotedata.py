@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Windowed access to arrays and dataframes that live in a kernel
+"""
+
+# Standard library imports
+from collections import OrderedDict
+from types import SimpleNamespace
+
+# Third party imports
+from spyder_kernels.utils.lazymodules import numpy as np
+
+
+# Rows and columns requested to the kernel at once. They are the same
+# ones loaded by the array and dataframe editors when fetching more data.
+ROWS_PER_WINDOW = 500
+COLS_PER_WINDOW = 40
+
+# Max number of windows kept in memory
+MAX_WINDOWS = 64
+
+# Errors raised when a window can't be requested to the kernel, e.g. because
+# it's busy or the variable was removed or resized.
+WINDOW_ERRORS = (ValueError, KeyError, IndexError)
+
+
+class RemoteData(object):
+    """
+    DataFrame, Series or Index that lives in a kernel.
+
+    Windows of its data are requested on demand and cached, so that huge
+    objects don't have to be transferred at once to be displayed.
+    """
+
+    def __init__(self, name, info, get_window, max_windows=MAX_WINDOWS):
+        """
+        Parameters
+        ----------
+        name: str
+            Name of the variable in the kernel.
+        info: dict
+            Information about the variable, as returned by the kernel's
+            `get_value_window_info`.
+        get_window: callable
+            Function with signature
+            (name, row_start, row_stop, col_start, col_stop) that returns
+            a window of the variable.
+        max_windows: int, optional
+            Max number of windows to cache.
+        """
+        self.name = name
+        self.info = info
+        self.type_name = info['type']
+        self._shape = tuple(info['shape'])
+        self._get_window = get_window
+        self._max_windows = max_windows
+        self._windows = OrderedDict()
+
+        # Message of the error raised when requesting a window, if any.
+        # No more windows are requested after that, to avoid blocking
+        # the interface until the kernel times out again.
+        self.error = None
+
+        # Function called with the error message when a window can't be
+        # requested
+        self.error_handler = None
+
+    @property
+    def shape(self):
+        return self._shape
+
+    @property
+    def ndim(self):
+        return len(self._shape)
+
+    def get_window(self, row_start, row_stop, col_start=0, col_stop=1):
+        """Request a window to the kernel, without caching it."""
+        return self._get_window(self.name, row_start, row_stop, col_start,
+                                col_stop)
+
+    def locate(self, row, column):
+        """
+        Return the cached window that contains a cell, requesting it if
+        necessary, and the row and column of the cell in that window.
+
+        The window is None if it couldn't be requested to the kernel.
+        """
+        key = (row // ROWS_PER_WINDOW, column // COLS_PER_WINDOW)
+        row_start = key[0] * ROWS_PER_WINDOW
+        col_start = key[1] * COLS_PER_WINDOW
+
+        window = self._windows.get(key)
+        if window is None:
+            if self.error is not None:
+                return None, row - row_start, column - col_start
+            try:
+                window = self.get_window(
+                    row_start, row_start + ROWS_PER_WINDOW,
+                    col_start, col_start + COLS_PER_WINDOW)
+            except WINDOW_ERRORS as error:
+                self.set_error(str(error))
+                return None, row - row_start, column - col_start
+            self._windows[key] = window
+            if len(self._windows) > self._max_windows:
+                self._windows.popitem(last=False)
+        else:
+            self._windows.move_to_end(key)
+
+        return window, row - row_start, column - col_start
+
+    def set_error(self, message):
+        """Stop requesting windows after an error and report it."""
+        self.error = message
+        self._windows.clear()
+        if self.error_handler is not None:
+            self.error_handler(message)
+
+    def clear(self):
+        """Remove all cached windows."""
+        self._windows.clear()
+
+
+class RemoteArray(RemoteData):
+    """
+    NumPy array that lives in a kernel.
+
+    Only the attributes and indexing used by the ArrayEditor to display
+    1d and 2d arrays are supported. Remote arrays are always read only.
+    """
+
+    def __init__(self, name, info, get_window, max_windows=MAX_WINDOWS):
+        super().__init__(name, info, get_window, max_windows)
+        self.dtype = np.dtype(info['dtype'])
+        self.flags = SimpleNamespace(writeable=False)
+
+    @property
+    def shape(self):
+        return self._shape
+
+    @shape.setter
+    def shape(self, shape):
+        # The ArrayEditor displays 1d arrays as 2d ones with a single
+        # column, which is how the kernel sends them.
+        self._shape = tuple(shape)
+
+    @property
+    def size(self):
+        size = 1
+        for dim in self._shape:
+            size *= dim
+        return size
+
+    def __len__(self):
+        return self._shape[0]
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key, 0)
+        row, column = key
+
+        if isinstance(row, slice) or isinstance(column, slice):
+            rows = self._as_slice(row, 0)
+            columns = self._as_slice(column, 1)
+            return self.get_window(rows.start, rows.stop, columns.start,
+                                   columns.stop)
+
+        # Missing values are displayed as empty cells by the ArrayEditor
+        window, row, column = self.locate(row, column)
+        if window is None:
+            return np.ma.masked
+        try:
+            return window[row, column]
+        except IndexError:
+            # The variable changed since its info was requested
+            return np.ma.masked
+
+    def _as_slice(self, key, axis):
+        """Convert an index or slice in `axis` to a slice with bounds."""
+        size = self._shape[axis] if axis < len(self._shape) else 1
+        if not isinstance(key, slice):
+            return slice(key, key + 1)
+        start, stop, step = key.indices(size)
+        if step != 1:
+            raise IndexError("Only contiguous windows can be requested")
+        return slice(start, stop)
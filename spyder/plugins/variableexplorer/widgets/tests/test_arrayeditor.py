@@ -26,6 +26,8 @@
 # Local imports
 from spyder.plugins.variableexplorer.widgets.arrayeditor import (
     ArrayEditor, ArrayModel)
+from spyder.plugins.variableexplorer.widgets.remotedata import RemoteArray
+from spyder_kernels.utils.nsview import get_window, get_window_info
 
 
 # =============================================================================
@@ -358,5 +360,83 @@ def test_arrayeditor_edit_overflow(qtbot, monkeypatch):
                       dialog.get_value()) == len(expected_array)
 
 
+@pytest.mark.parametrize('shape', [(3000,), (1000, 100)])
+def test_arrayeditor_remote_array(qtbot, shape):
+    """
+    Test that arrays that live in the kernel are displayed by requesting
+    windows of their data.
+    """
+    arr = np.arange(np.prod(shape), dtype=float).reshape(shape)
+    windows = []
+
+    def get_value_window(name, *args):
+        windows.append(args)
+        return get_window(arr, *args)
+
+    remote_array = RemoteArray('arr', get_window_info(arr), get_value_window)
+    dlg = ArrayEditor()
+    assert dlg.setup_and_check(remote_array, 'arr')
+    qtbot.addWidget(dlg)
+    model = dlg.arraywidget.model
+
+    assert model.readonly
+    assert dlg.btn_save_and_close is None
+
+    # The background colors use the min and max computed by the kernel
+    assert model.bgcolor_enabled
+    assert (model.vmin, model.vmax) == (arr.min(), arr.max())
+    assert model.data(model.index(1, 0), Qt.BackgroundColorRole)
+    assert model.data(model.index(1, 0)) == '%.6g' % arr.reshape(
+        len(arr), -1)[1, 0]
+    assert windows == [(0, 500, 0, 40)]
+
+    # Only contiguous windows are requested to copy data
+    view = dlg.arraywidget.view
+    view.selectAll()
+    assert view._sel_to_text(view.selectedIndexes())
+    assert windows[-1] == (0, arr.shape[0], 0, remote_array.shape[1])
+
+
+def test_arrayeditor_remote_array_inf(qtbot):
+    """
+    Test that the background colors of arrays that live in the kernel are
+    disabled if they have inf values.
+    """
+    arr = np.arange(3000, dtype=float)
+    arr[-1] = np.inf
+    remote_array = RemoteArray('arr', get_window_info(arr),
+                               lambda name, *args: get_window(arr, *args))
+    dlg = ArrayEditor()
+    assert dlg.setup_and_check(remote_array, 'arr')
+    qtbot.addWidget(dlg)
+    assert not dlg.arraywidget.model.bgcolor_enabled
+
+
+def test_arrayeditor_remote_array_error(qtbot):
+    """
+    Test that cells are empty and no more windows are requested when the
+    kernel can't send them.
+    """
+    arr = np.zeros((1000, 100))
+    windows = []
+    errors = []
+
+    def get_value_window(name, *args):
+        windows.append(args)
+        raise ValueError('The kernel is busy')
+
+    remote_array = RemoteArray('arr', get_window_info(arr), get_value_window)
+    remote_array.error_handler = errors.append
+    dlg = ArrayEditor()
+    assert dlg.setup_and_check(remote_array, 'arr')
+    qtbot.addWidget(dlg)
+    model = dlg.arraywidget.model
+
+    assert model.data(model.index(1, 0)) == ''
+    assert model.data(model.index(2, 1)) == ''
+    assert windows == [(0, 500, 0, 40)]
+    assert errors == ['The kernel is busy']
+
+
 if __name__ == "__main__":
     pytest.main()
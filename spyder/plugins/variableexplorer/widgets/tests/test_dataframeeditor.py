@@ -33,6 +33,8 @@
 from spyder.plugins.variableexplorer.widgets import dataframeeditor
 from spyder.plugins.variableexplorer.widgets.dataframeeditor import (
     DataFrameEditor, DataFrameModel)
+from spyder.plugins.variableexplorer.widgets.remotedata import RemoteData
+from spyder_kernels.utils.nsview import get_window, get_window_info
 
 
 # =============================================================================
@@ -747,5 +749,59 @@ def test_no_convert_strings_to_unicode():
     assert data(dfm, 0, 0) != u'файла'
 
 
+def test_dataframeeditor_remote_data(qtbot):
+    """
+    Test that dataframes that live in the kernel are displayed by
+    requesting windows of their data.
+    """
+    index = MultiIndex.from_product([range(1000), ['a', 'b']],
+                                    names=['num', 'letter'])
+    df = DataFrame(numpy.arange(2000 * 50).reshape(2000, 50), index=index)
+    windows = []
+
+    def get_value_window(name, *args):
+        windows.append(args)
+        return get_window(df, *args)
+
+    remote_data = RemoteData('df', get_window_info(df), get_value_window)
+    editor = DataFrameEditor(None)
+    assert editor.setup_and_check(remote_data, title='df')
+    qtbot.addWidget(editor)
+    dfm = editor.dataModel
+
+    assert 'read only' in editor.windowTitle()
+    assert dfm.shape == (2000, 50)
+    assert dfm.header_shape == (1, 2)
+    assert dfm.rowCount() == 500
+    assert dfm.columnCount() == 40
+    assert data(dfm, 1, 2) == '52'
+    assert dfm.header(1, 1, 1) == 'b'
+    assert dfm.name(1, 0) == 'num'
+    assert not dfm.setData(dfm.createIndex(0, 0), '1')
+    assert df.iat[0, 0] == 0
+
+    # Only the displayed window was requested
+    assert windows == [(0, 500, 0, 40)]
+
+    # More windows are requested when scrolling
+    dfm.fetch_more(rows=True, columns=True)
+    assert data(dfm, 999, 45) == str(999 * 50 + 45)
+    assert windows[-1] == (500, 1000, 40, 80)
+    assert dfm.get_frame(slice(0, 2), slice(0, 2)).equals(df.iloc[:2, :2])
+
+    # Background colors use the min and max of each column computed by the
+    # kernel
+    assert dfm.bgcolor_enabled
+    assert dfm.colum_avg_enabled
+    assert dfm.max_min_col[2] == [1999 * 50 + 2, 2]
+    h0 = dataframeeditor.BACKGROUND_NUMBER_MINHUE
+    dh = dataframeeditor.BACKGROUND_NUMBER_HUERANGE
+    s = dataframeeditor.BACKGROUND_NUMBER_SATURATION
+    v = dataframeeditor.BACKGROUND_NUMBER_VALUE
+    a = dataframeeditor.BACKGROUND_NUMBER_ALPHA
+    assert colorclose(bgcolor(dfm, 0, 2), (h0 + dh, s, v, a))
+    assert colorclose(bgcolor(dfm, 1999, 2), (h0, s, v, a))
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -228,10 +228,28 @@ def to_unicode(string):
     return string
 
 
-def write(text, filename, encoding='utf-8', mode='wb'):
+def get_new_file_mode():
+    """
+    Return the permissions of the files created by this process, emulating
+    what os.open() does.
+
+    The umask of the process is changed for a moment to read it, so this
+    must not be called while another thread can create files.
+    """
+    umask = os.umask(0)
+    os.umask(umask)
+    # Set base permission of a file to standard permissions.
+    # See #spyder-ide/spyder#14112.
+    return 0o666 & ~umask
+
+
+def write(text, filename, encoding='utf-8', mode='wb', new_file_mode=None):
     """
     Write 'text' to file ('filename') assuming 'encoding' in an atomic way
     Return (eventually new) encoding
+
+    If the file is created, its permissions are 'new_file_mode'. If it's
+    None, they are given by `get_new_file_mode`, so threads must pass it.
     """
     text, encoding = encode(text, encoding)
 
@@ -259,12 +277,10 @@ def write(text, filename, encoding='utf-8', mode='wb'):
             original_mode = file_stat.st_mode
             creation = file_stat.st_atime
         except OSError:  # Change to FileNotFoundError for PY3
-            # Creating a new file, emulate what os.open() does
-            umask = os.umask(0)
-            os.umask(umask)
-            # Set base permission of a file to standard permissions.
-            # See #spyder-ide/spyder#14112.
-            original_mode = 0o666 & ~umask
+            # Creating a new file
+            if new_file_mode is None:
+                new_file_mode = get_new_file_mode()
+            original_mode = new_file_mode
             creation = time.time()
         try:
             # fixes issues with scripts in Dropbox leaving
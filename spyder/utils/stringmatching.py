@@ -8,6 +8,7 @@
 String search and match utilities useful when filtering a list of texts.
 """
 
+import heapq
 import re
 
 from spyder.py3compat import to_text_string
@@ -15,6 +16,11 @@
 NOT_FOUND_SCORE = -1
 NO_SCORE = 0
 
+# Characters used to compute the score of a match
+MATCH_CHAR = u'-'  # Matched characters are replaced by this character
+LETTER_CHAR = u'x'  # Non-matched characters (except spaces) by this one
+LETTERS_REGEX = re.compile(u'[^ {}]'.format(re.escape(MATCH_CHAR)))
+
 
 def get_search_regex(query, ignore_case=True):
     """Returns a compiled regex pattern to search for query letters in order.
@@ -107,78 +113,215 @@ def get_search_score(query, choice, ignore_case=True, apply_regex=True,
         r = re.search(pattern, choice)
         if r is None:
             return result
-    else:
-        sep = u'-'  # Matches will be replaced by this character
-        let = u'x'  # Nonmatches (except spaed) will be replaced by this
-        score = 0
-
-        exact_words = [query == to_text_string(word, encoding='utf-8')
-                       for word in choice.split(u' ')]
-        partial_words = [query in word for word in choice.split(u' ')]
-
-        if any(exact_words) or any(partial_words):
-            pos_start = choice.find(query)
-            pos_end = pos_start + len(query)
-            score += pos_start
-            text = choice.replace(query, sep*len(query), 1)
-
-            enriched_text = original_choice[:pos_start] +\
-                template.format(original_choice[pos_start:pos_end]) +\
-                original_choice[pos_end:]
-
-        if any(exact_words):
-            # Check if the query words exists in a word with exact match
-            score += 1
-        elif any(partial_words):
-            # Check if the query words exists in a word with partial match
-            score += 100
-        else:
-            # Check letter by letter
-            text = [l for l in original_choice]
-            if ignore_case:
-                temp_text = [l.lower() for l in original_choice]
-            else:
-                temp_text = text[:]
 
-            # Give points to start of string
-            score += temp_text.index(query[0])
+    enriched_text, score = _get_match_score(query, choice, original_choice,
+                                            template)
+    return original_choice, enriched_text, score
 
-            # Find the query letters and replace them by `sep`, also apply
-            # template as needed for enricching the letters in the text
-            enriched_text = text[:]
-            for char in query:
-                if char != u'' and char in temp_text:
-                    index = temp_text.index(char)
-                    enriched_text[index] = template.format(text[index])
-                    text[index] = sep
-                    temp_text = [u' ']*(index + 1) + temp_text[index+1:]
 
-        enriched_text = u''.join(enriched_text)
+def _get_match_score(query, text, choice, template, letters=None):
+    """
+    Return the enriched choice and the score of a match.
+
+    `query` (without spaces) must be found in order in `text`, which is
+    `choice` in lower case for case insensitive searches. `letters` is
+    `text` with all characters but spaces and MATCH_CHAR replaced by
+    LETTER_CHAR, which can be given to avoid computing it. See
+    get_search_score for the precedence of scores.
+    """
+    if letters is None:
+        letters = LETTERS_REGEX.sub(LETTER_CHAR, text)
 
+    score = 0
+    pos_start = text.find(query)
+
+    if pos_start != -1:
+        # The query is in a word. Check if it's an exact or partial match
+        pos_end = pos_start + len(query)
+        if query in text.split(u' '):
+            score += pos_start + 1
+        else:
+            score += pos_start + 100
+        patterns_text = (letters[:pos_start] + MATCH_CHAR*len(query) +
+                         letters[pos_end:])
+        enriched_text = (choice[:pos_start] +
+                         template.format(choice[pos_start:pos_end]) +
+                         choice[pos_end:])
+    else:
+        # Find the first occurrence of each letter after the previous one
+        if len(text) != len(choice):
+            # Lowering some characters changes their length, so compare
+            # them one by one to get indexes in choice
+            text = [char.lower() for char in choice]
+            letters = LETTERS_REGEX.sub(LETTER_CHAR, choice)
+
+        indexes = []
+        index = -1
+        for char in query:
+            try:
+                index = text.index(char, index + 1)
+            except ValueError:
+                continue
+            indexes.append(index)
+
+        # Give points to start of string
+        score += indexes[0]
+
+        enriched_text = []
         patterns_text = []
-        for i, char in enumerate(text):
-            if char != u' ' and char != sep:
-                new_char = let
-            else:
-                new_char = char
-            patterns_text.append(new_char)
+        start = 0
+        for index in indexes:
+            enriched_text.append(choice[start:index])
+            enriched_text.append(template.format(choice[index]))
+            patterns_text.append(letters[start:index])
+            patterns_text.append(MATCH_CHAR)
+            start = index + 1
+        enriched_text.append(choice[start:])
+        patterns_text.append(letters[start:])
+        enriched_text = u''.join(enriched_text)
         patterns_text = u''.join(patterns_text)
-        for i in reversed(range(1, len(query) + 1)):
-            score += (len(query) - patterns_text.count(sep*i))*100000
 
-        temp = patterns_text.split(sep)
-        while u'' in temp:
-            temp.remove(u'')
-        if not patterns_text.startswith(sep):
-            temp = temp[1:]
-        if not patterns_text.endswith(sep):
-            temp = temp[:-1]
+    for i in range(1, len(query) + 1):
+        score += (len(query) - patterns_text.count(MATCH_CHAR*i))*100000
 
-        for pat in temp:
-            score += pat.count(u' ')*10000
-            score += pat.count(let)*100
+    # Penalize the words and letters between matched letters
+    temp = [pat for pat in patterns_text.split(MATCH_CHAR) if pat]
+    if not patterns_text.startswith(MATCH_CHAR):
+        temp = temp[1:]
+    if not patterns_text.endswith(MATCH_CHAR):
+        temp = temp[:-1]
 
-    return original_choice, enriched_text, score
+    for pat in temp:
+        score += pat.count(u' ')*10000
+        score += pat.count(LETTER_CHAR)*100
+
+    return enriched_text, score
+
+
+class FuzzyMatcher(object):
+    """
+    Search for queries in order of character occurrence in a list of choices.
+
+    The choices are preprocessed once, so this is faster than calling
+    get_search_scores when the same choices are searched several times (e.g.
+    while the user types the query):
+
+    - Choices are first filtered by a bitmask of the characters they contain.
+    - When the query extends the previous one, only the choices that matched
+      the previous query are searched.
+    - Only the choices that matched are scored.
+    """
+
+    def __init__(self, choices, ignore_case=True):
+        self.choices = list(choices)
+        self.ignore_case = ignore_case
+
+        if ignore_case:
+            self._texts = [choice.lower() for choice in self.choices]
+        else:
+            self._texts = self.choices[:]
+
+        self._letters = [LETTERS_REGEX.sub(LETTER_CHAR, text)
+                         for text in self._texts]
+        self._char_bits = {}
+        self._masks = [self._get_mask(text, add=True) for text in self._texts]
+        self._last_query = None
+        self._last_matches = None
+
+    def _get_mask(self, text, add=False):
+        """
+        Return a bitmask of the characters in text.
+
+        Return None if a character is not in any choice and `add` is False.
+        """
+        mask = 0
+        char_bits = self._char_bits
+        for char in set(text):
+            bit = char_bits.get(char)
+            if bit is None:
+                if not add:
+                    return None
+                bit = char_bits[char] = 1 << len(char_bits)
+            mask |= bit
+        return mask
+
+    def match(self, query):
+        """
+        Return the indexes of the choices where the query letters are found
+        in order.
+
+        `query` must not contain spaces and be in lower case for case
+        insensitive searches.
+        """
+        last_query = self._last_query
+        if last_query is not None and query.startswith(last_query):
+            candidates = self._last_matches
+        else:
+            candidates = range(len(self._texts))
+
+        query_mask = self._get_mask(query)
+        if query_mask is None:
+            matches = []
+        else:
+            texts = self._texts
+            masks = self._masks
+            matches = [i for i in candidates
+                       if masks[i] & query_mask == query_mask and
+                       _is_subsequence(query, texts[i])]
+
+        self._last_query = query
+        self._last_matches = matches
+        return matches
+
+    def search(self, query, template='{}', valid_only=False, sort=False,
+               limit=None):
+        """
+        Search for query in the choices and return a list of tuples.
+
+        See get_search_scores for the meaning of the parameters and the
+        results. If `limit` is given, at most that number of results with
+        the lowest scores are returned.
+        """
+        query = to_text_string(query, encoding='utf-8').replace(' ', '')
+        choices = self.choices
+
+        if not query:
+            results = [(choice, choice, NO_SCORE) for choice in choices]
+        else:
+            key = query.lower() if self.ignore_case else query
+            texts = self._texts
+            letters = self._letters
+            scored = {}
+            for i in self.match(key):
+                enriched_text, score = _get_match_score(
+                    key, texts[i], choices[i], template, letters[i])
+                scored[i] = (choices[i], enriched_text, score)
+
+            if valid_only:
+                results = [scored[i] for i in sorted(scored)]
+            else:
+                results = [scored.get(i, (choice, choice, NOT_FOUND_SCORE))
+                           for i, choice in enumerate(choices)]
+
+        if sort or limit is not None:
+            # Both keep the order of the choices for equal scores
+            if limit is not None:
+                results = heapq.nsmallest(limit, results,
+                                          key=lambda row: row[-1])
+            else:
+                results = sorted(results, key=lambda row: row[-1])
+
+        return results
+
+
+def _is_subsequence(query, text):
+    """Return whether the query letters are found in order in text."""
+    index = -1
+    for char in query:
+        index = text.find(char, index + 1)
+        if index == -1:
+            return False
+    return True
 
 
 def get_search_scores(query, choices, ignore_case=True, template='{}',
@@ -207,32 +350,9 @@ def get_search_scores(query, choices, ignore_case=True, template='{}',
         List of tuples where the first item is the text (enriched if a
         template was used) and a search score. Lower scores means better match.
     """
-    # First remove spaces from query
-    query = query.replace(' ', '')
-    pattern = get_search_regex(query, ignore_case)
-    results = []
-
-    for choice in choices:
-        r = re.search(pattern, choice)
-        if query and r:
-            result = get_search_score(query, choice, ignore_case=ignore_case,
-                                      apply_regex=False, template=template)
-        else:
-            if query:
-                result = (choice, choice, NOT_FOUND_SCORE)
-            else:
-                result = (choice, choice, NO_SCORE)
-
-        if valid_only:
-            if result[-1] != NOT_FOUND_SCORE:
-                results.append(result)
-        else:
-            results.append(result)
-
-    if sort:
-        results = sorted(results, key=lambda row: row[-1])
-
-    return results
+    matcher = FuzzyMatcher(choices, ignore_case=ignore_case)
+    return matcher.search(query, template=template, valid_only=valid_only,
+                          sort=sort)
 
 
 def test():
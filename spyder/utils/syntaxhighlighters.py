@@ -17,13 +17,13 @@
 import weakref
 
 # Third party imports
-from pygments.lexer import RegexLexer, bygroups
+from pygments.lexer import ExtendedRegexLexer, RegexLexer, bygroups
 from pygments.lexers import get_lexer_by_name
-from pygments.token import (Text, Other, Keyword, Name, String, Number,
-                            Comment, Generic, Token)
+from pygments.token import (_TokenType, Text, Other, Keyword, Name, String,
+                            Number, Comment, Generic, Token)
 from qtpy.QtCore import Qt, QTimer, Signal
 from qtpy.QtGui import (QColor, QCursor, QFont, QSyntaxHighlighter,
-                        QTextCharFormat, QTextOption)
+                        QTextCharFormat, QTextCursor, QTextOption)
 from qtpy.QtWidgets import QApplication
 
 # Local imports
@@ -34,7 +34,6 @@
 from spyder.plugins.editor.utils.languages import CELL_LANGUAGES
 from spyder.plugins.editor.utils.editor import TextBlockHelper as tbh
 from spyder.plugins.editor.utils.editor import BlockUserData
-from spyder.utils.workers import WorkerManager
 from spyder.plugins.outlineexplorer.api import OutlineExplorerData
 from spyder.utils.qstringhelpers import qstring_length
 
@@ -1249,14 +1248,123 @@ def setup_formats(self, font=None):
 # highlighter based on PygmentsSH would be 2 to 3 times slower than the
 # current native PythonSH syntax highlighter.
 
+def _get_stack_state(tokens, index):
+    """
+    Return the state stack of a RegexLexer at the token it just yielded.
+
+    The stack is only known if lexing can be restarted at the token index,
+    i.e. if the lexer was about to match a rule at that index.
+    """
+    frame = tokens.gi_frame
+    if frame is None:
+        return None
+    local_vars = frame.f_locals
+    if local_vars.get('pos') != index or 'statestack' not in local_vars:
+        return None
+    return tuple(local_vars['statestack'])
+
+
+def _get_context_state(tokens, index):
+    """
+    Return the context of an ExtendedRegexLexer at the token it just yielded.
+
+    Rule callbacks can change the context before yielding their tokens, so
+    the context is only returned for tokens yielded by the lexer itself.
+    """
+    frame = tokens.gi_frame
+    if frame is None:
+        return None
+    local_vars = frame.f_locals
+    ctx = local_vars.get('ctx')
+    if (ctx is None or type(local_vars.get('action')) is not _TokenType
+            or ctx.pos != index):
+        return None
+
+    # Lexers can add attributes to their contexts (e.g. the indentation
+    # level of YAML), so save all of them
+    attributes = tuple(
+        (name, tuple(value) if isinstance(value, list) else value,
+         isinstance(value, list))
+        for name, value in sorted(vars(ctx).items())
+        if name not in ('text', 'pos', 'end', 'stack'))
+    return type(ctx), tuple(ctx.stack), attributes
+
+
+def _restore_context(state, text):
+    """Create the context of an ExtendedRegexLexer from a saved state."""
+    context_class, stack, attributes = state
+    ctx = context_class(text, 0)
+    ctx.stack = list(stack)
+    for name, value, is_list in attributes:
+        setattr(ctx, name, list(value) if is_list else value)
+    return ctx
+
+
+class _ProbeLexer(RegexLexer):
+    """Lexer to check that the state of a RegexLexer can be read."""
+    tokens = {'root': [(r'\w+', Text), (r'\s+', Text)]}
+
+
+class _ProbeExtendedLexer(ExtendedRegexLexer):
+    """Lexer to check that the context of an ExtendedRegexLexer can be read."""
+    tokens = _ProbeLexer.tokens
+
+
+# Whether the state of the lexers derived from each Pygments lexer class
+# can be read
+_LEXER_STATES = {}
+
+
+def _can_get_states(lexer_class):
+    """
+    Check that the state of lexers derived from `lexer_class` (RegexLexer or
+    ExtendedRegexLexer) can be read from their generator frames.
+
+    Pygments has no API for it, so this checks that its lexers still have
+    the local variables used to read their state.
+    """
+    supported = _LEXER_STATES.get(lexer_class)
+    if supported is None:
+        if lexer_class is ExtendedRegexLexer:
+            lexer, get_state = _ProbeExtendedLexer(), _get_context_state
+        else:
+            lexer, get_state = _ProbeLexer(), _get_stack_state
+
+        # Every token of the probe lexers is a restart point
+        try:
+            tokens = lexer.get_tokens_unprocessed(u'a b\nc\n')
+            states = [get_state(tokens, index) for index, __, __ in tokens]
+            supported = bool(states) and None not in states
+        except Exception:
+            supported = False
+        _LEXER_STATES[lexer_class] = supported
+    return supported
+
+
 class PygmentsSH(BaseSH):
-    """Generic Pygments syntax highlighter."""
+    """
+    Generic Pygments syntax highlighter.
+
+    The document is lexed incrementally: the lexer state is saved at the
+    start of each block where lexing can be restarted, so after a change the
+    document is lexed again from the last saved state before the change until
+    the state at the start of a block is the same as before. Right after a
+    change, the text is lexed in windows of blocks, so only the text near it
+    is copied and lexed, and make_charlist lexes the whole text again from
+    the start to fix the blocks that depend on text before or after them.
+    The format of each block is stored as runs of (start, length, format
+    name).
+    """
     # Store the language name and a ref to the lexer
     _lang_name = None
     _lexer = None
 
     # Syntax highlighting states (from one text block to another):
     NORMAL = 0
+
+    # Number of blocks to lex before returning to the event loop
+    LEX_CHUNK_BLOCKS = 500
+
     def __init__(self, parent, font=None, color_scheme=None):
         # Map Pygments tokens to Spyder tokens
         self._tokmap = {Text: "normal",
@@ -1275,90 +1383,392 @@ def __init__(self, parent, font=None, color_scheme=None):
 
         BaseSH.__init__(self, parent, font, color_scheme)
 
-        # This worker runs in a thread to avoid blocking when doing full file
-        # parsing
-        self._worker_manager = WorkerManager()
+        # Spyder format name of each Pygments token type
+        self._format_names = {}
+
+        # Lexer state at the start of each block, or None if lexing can't be
+        # restarted there, and format runs of each block, or None if the
+        # block hasn't been lexed yet
+        self._block_states = []
+        self._block_runs = []
+
+        # Range of blocks that changed since they were lexed, the generator
+        # that lexes them and whether it lexes the whole text or windows
+        self._dirty_first = None
+        self._dirty_last = None
+        self._lex_job = None
+        self._lex_whole_text = False
+
+        # Last block that changed or was lexed in windows since the whole
+        # text was lexed from the start
+        self._verify_last = None
 
-        # Store the format for all the tokens after Pygments parsing
-        self._charlist = []
+        # Lex long documents in chunks to avoid blocking the interface
+        self._lex_timer = QTimer(self)
+        self._lex_timer.setSingleShot(True)
+        self._lex_timer.setInterval(0)
+        self._lex_timer.timeout.connect(self._lex_chunk)
 
-        # Flag variable to avoid unnecessary highlights if the worker has not
-        # yet finished processing
-        self._allow_highlight = True
+        if self.document() is not None:
+            self.document().contentsChange.connect(self._on_contents_change)
+            self._reset_blocks()
 
     def stop(self):
-        self._worker_manager.terminate_all()
+        """Stop lexing the document."""
+        self._lex_timer.stop()
+        self._lex_job = None
 
     def make_charlist(self):
-        """Parses the complete text and stores format for each character."""
-
-        def worker_output(worker, output, error):
-            """Worker finished callback."""
-            self._charlist = output
-            if error is None and output:
-                self._allow_highlight = True
-                self.rehighlight()
-            self._allow_highlight = False
-
-        text = to_text_string(self.document().toPlainText())
-        tokens = self._lexer.get_tokens(text)
-
-        # Before starting a new worker process make sure to end previous
-        # incarnations
-        self._worker_manager.terminate_all()
-
-        worker = self._worker_manager.create_python_worker(
-            self._make_charlist,
-            tokens,
-            self._tokmap,
-            self.formats,
-        )
-        worker.sig_finished.connect(worker_output)
-        worker.start()
-
-    def _make_charlist(self, tokens, tokmap, formats):
         """
-        Parses the complete text and stores format for each character.
-
-        Uses the attached lexer to parse into a list of tokens and Pygments
-        token types.  Then breaks tokens into individual letters, each with a
-        Spyder token type attached.  Stores this list as self._charlist.
-
-        It's attached to the contentsChange signal of the parent QTextDocument
-        so that the charlist is updated whenever the document changes.
+        Lex the document again up to the last block lexed in windows.
+
+        After a change, the document is lexed again in windows from the last
+        block before it where the lexer state is known. However, tokens can
+        span many blocks (e.g. a comment closed far below its start) and
+        lexers can look ahead past the end of their tokens, so the change can
+        affect the blocks before it too, and windows can end in the middle
+        of a token. This lexes the whole text from the start, in chunks,
+        until the state is the same as before after the blocks that were
+        lexed in windows since this was last called.
+        """
+        if self._verify_last is not None:
+            last = self._verify_last
+            self._verify_last = None
+            self._lex_whole_text = True
+            self._set_dirty(0, last)
+        else:
+            self._lex_chunk()
+
+    def _reset_blocks(self):
+        """Lex the whole document again."""
+        count = self.document().blockCount()
+        self._block_states = [()] + [None] * (count - 1)
+        self._block_runs = [None] * count
+        self._verify_last = None
+        self._lex_whole_text = True
+        self._set_dirty(0, count - 1)
+
+    def _set_dirty(self, first, last):
+        """Add blocks to lex again and lex them."""
+        if self._dirty_first is not None:
+            # The blocks lexed so far haven't got to the same state as before
+            # yet, so keep lexing past them
+            first = min(first, self._dirty_first)
+            last = max(last, self._dirty_last, self._dirty_first - 1)
+        self._dirty_first = first
+        self._dirty_last = last
+        self._lex_job = None
+        self._lex_chunk()
+
+    def _on_contents_change(self, position, chars_removed, chars_added):
+        """Update the blocks to lex after a change in the document."""
+        document = self.document()
+        if document is None:
+            return
+
+        count = document.blockCount()
+        first = document.findBlock(position).blockNumber()
+        # Qt counts the paragraph separator at the end of the document when
+        # the whole document is changed
+        end_position = min(position + chars_added,
+                           document.characterCount() - 1)
+        last = document.findBlock(end_position).blockNumber()
+        added = last - first + 1
+        removed = added - (count - len(self._block_runs))
+        if first < 0 or removed < 1 or first + removed > len(self._block_runs):
+            self._reset_blocks()
+            return
+
+        self._block_states[first:first + removed] = [None] * added
+        self._block_runs[first:first + removed] = [None] * added
+        self._block_states[0] = ()
+
+        # Move the previous blocks to lex after the change
+        if self._dirty_first is not None:
+            if self._dirty_first >= first + removed:
+                self._dirty_first += added - removed
+            self._dirty_last = self._shift_block(self._dirty_last, first,
+                                                 removed, last)
+        self._verify_last = self._shift_block(self._verify_last, first,
+                                              removed, last)
+        self._set_dirty(first, last)
+
+    def _shift_block(self, number, first, removed, last):
         """
+        Return the number of the last block of a range after `removed`
+        blocks starting at `first` were replaced by blocks up to `last`.
+        """
+        if number is None:
+            return last
+        if number >= first + removed:
+            return number + last - first + 1 - removed
+        return max(number, last)
+
+    def _lex_chunk(self):
+        """Lex a chunk of the blocks that changed and schedule the rest."""
+        if not self._lex(self.LEX_CHUNK_BLOCKS):
+            self._lex_timer.start()
+
+    def _lex(self, max_blocks):
+        """
+        Lex up to `max_blocks` of the blocks that changed.
 
-        def _get_fmt(typ):
-            """Get the Spyder format code for the given Pygments token type."""
-            # Exact matches first
-            if typ in tokmap:
-                return tokmap[typ]
-            # Partial (parent-> child) matches
-            for key, val in tokmap.items():
-                if typ in key: # Checks if typ is a subtype of key.
-                    return val
+        Return True when there's nothing else to lex.
+        """
+        document = self.document()
+        if self._dirty_first is None or document is None:
+            return True
+
+        if self._lex_job is None:
+            # Start from the last block where lexing can be restarted
+            first = self._dirty_first
+            while self._block_states[first] is None:
+                first -= 1
+            self._lex_job = self._lex_blocks(first)
+
+        for number, state, runs in self._lex_job:
+            if (number > self._dirty_last and state is not None and
+                    state == self._block_states[number] and
+                    self._block_runs[number] is not None):
+                # The lexer state is the same as before from here on
+                break
 
-            return 'normal'
+            self._block_states[number] = state
+            if runs != self._block_runs[number]:
+                self._block_runs[number] = runs
+                self.rehighlightBlock(document.findBlockByNumber(number))
+            if not self._lex_whole_text and (self._verify_last is None or
+                                             number > self._verify_last):
+                self._verify_last = number
+
+            self._dirty_first = number + 1
+            max_blocks -= 1
+            if max_blocks == 0 and number < len(self._block_runs) - 1:
+                return False
+
+        self._dirty_first = None
+        self._dirty_last = None
+        self._lex_job = None
+        self._lex_whole_text = False
+        return True
+
+    def _lex_blocks(self, first):
+        """
+        Lex the document from block `first`.
+
+        Yield the number of each block, the lexer state at its start and its
+        format runs.
+
+        Unless the whole text is lexed, the document is lexed in windows of
+        blocks, which double in size, so lexing until the state converges
+        after a change only copies and lexes the text near it. Tokens at the
+        end of a window could be lexed differently with the text after it
+        (e.g. a code fence without its end), so only the blocks before the
+        last restart point in the first half of a window are yielded, and
+        the next window starts there.
+        """
+        count = self.document().blockCount()
+        state = self._block_states[first]
+        if self._lex_whole_text:
+            for block in self._lex_text(self._get_text(first, count - 1),
+                                        first, state):
+                yield block
+            return
+
+        size = self.LEX_CHUNK_BLOCKS
+        while True:
+            last = min(first + size, count) - 1
+            blocks = list(self._lex_text(self._get_text(first, last), first,
+                                         state))
+            if last == count - 1:
+                for block in blocks:
+                    yield block
+                return
+
+            restart = len(blocks) // 2
+            while restart > 0 and blocks[restart][1] is None:
+                restart -= 1
+            size *= 2
+            if restart == 0:
+                continue
+
+            for block in blocks[:restart]:
+                yield block
+            first, state = blocks[restart][:2]
+
+    def _get_text(self, first, last):
+        """Get the text from block `first` to block `last`."""
+        document = self.document()
+        cursor = QTextCursor(document)
+        cursor.setPosition(document.findBlockByNumber(first).position())
+        block = document.findBlockByNumber(last)
+        cursor.setPosition(block.position() + block.length() - 1,
+                           QTextCursor.KeepAnchor)
+        text = to_text_string(cursor.selectedText()).replace(u'\u2029', u'\n')
+        return text + u'\n'
+
+    def _lex_text(self, text, first, state):
+        """
+        Lex the text of the blocks starting at block `first` from a lexer
+        state.
 
-        charlist = []
-        for typ, token in tokens:
-            fmt = formats[_get_fmt(typ)]
-            for letter in token:
-                charlist.append((fmt, letter))
+        Yield the number of each block, the lexer state at its start and its
+        format runs.
+        """
+        tokens, get_state = self._get_tokens(text, state)
+        number = first
+        block_start = 0
+        block_end = text.find(u'\n')
+        runs = []
+
+        # Some lexers don't give the right index of tokens (e.g. the code
+        # blocks of Markdown), so compute it from their values, like
+        # Pygments does
+        end = 0
+        for __, ttype, value in tokens:
+            token_start = index = end
+            end = token_start + len(value)
+            name = self._get_format_name(ttype)
+            while index < end:
+                if index > block_end:
+                    # The token is in the next block
+                    yield number, state, tuple(runs)
+                    number += 1
+                    block_start = block_end + 1
+                    if block_start >= len(text):
+                        return
+                    block_end = text.find(u'\n', block_start)
+                    if token_start == block_start:
+                        state = get_state(token_start)
+                    else:
+                        state = None
+                    runs = []
+                    continue
+
+                run_end = min(end, block_end)
+                if run_end > index:
+                    if (runs and runs[-1][2] == name and
+                            sum(runs[-1][:2]) == index - block_start):
+                        start, length, __ = runs.pop()
+                        runs.append((start, length + run_end - index, name))
+                    else:
+                        runs.append((index - block_start, run_end - index,
+                                     name))
+                index = block_end + 1 if end > block_end else end
+
+        # Blocks after the last token
+        while True:
+            yield number, state, tuple(runs)
+            number += 1
+            block_start = block_end + 1
+            if block_start >= len(text):
+                return
+            block_end = text.find(u'\n', block_start)
+            state = None
+            runs = []
+
+    def _get_tokens(self, text, state):
+        """
+        Lex text from a lexer state.
 
-        return charlist
+        Return an iterator over the (index, token type, value) tuples of the
+        tokens and a function to get the lexer state at the index of the
+        token yielded last, which returns None if lexing can't be restarted
+        there.
+        """
+        lexer = self._lexer
+        if isinstance(lexer, ExtendedRegexLexer):
+            lexer_class = ExtendedRegexLexer
+        elif isinstance(lexer, RegexLexer):
+            lexer_class = RegexLexer
+        else:
+            lexer_class = None
+
+        if lexer_class is None or not _can_get_states(lexer_class):
+            # Lexing can only be restarted at the start of the document
+            return lexer.get_tokens_unprocessed(text), lambda index: None
+
+        if lexer_class is ExtendedRegexLexer:
+            if state:
+                tokens = lexer.get_tokens_unprocessed(
+                    context=_restore_context(state, text))
+            else:
+                tokens = lexer.get_tokens_unprocessed(text)
+            return tokens, lambda index: _get_context_state(tokens, index)
+
+        stack = state or ('root',)
+        base_tokens = RegexLexer.get_tokens_unprocessed(lexer, text, stack)
+        if (type(lexer).get_tokens_unprocessed is
+                RegexLexer.get_tokens_unprocessed):
+            return base_tokens, lambda index: _get_stack_state(
+                base_tokens, index)
+
+        # Lexers that change the tokens of RegexLexer (e.g. C ones). Get
+        # the state from the tokens of RegexLexer, lexing in parallel.
+        try:
+            tokens = lexer.get_tokens_unprocessed(text, stack)
+        except TypeError:
+            return lexer.get_tokens_unprocessed(text), lambda index: None
+
+        base_index = [-1]
+
+        def get_state(index):
+            while base_index[0] < index:
+                try:
+                    base_index[0] = next(base_tokens)[0]
+                except StopIteration:
+                    base_index[0] = len(text)
+            if base_index[0] == index:
+                return _get_stack_state(base_tokens, index)
+            return None
+
+        return tokens, get_state
+
+    def _get_format_name(self, ttype):
+        """Get the Spyder format name for the given Pygments token type."""
+        name = self._format_names.get(ttype)
+        if name is None:
+            name = 'normal'
+            if ttype in self._tokmap:
+                # Exact matches first
+                name = self._tokmap[ttype]
+            else:
+                # Partial (parent-> child) matches
+                for key, val in self._tokmap.items():
+                    if ttype in key:  # Checks if ttype is a subtype of key.
+                        name = val
+                        break
+            self._format_names[ttype] = name
+        return name
 
     def highlightBlock(self, text):
         """ Actually highlight the block"""
-        # Note that an undefined blockstate is equal to -1, so the first block
-        # will have the correct behaviour of starting at 0.
-        if self._allow_highlight:
-            start = self.previousBlockState() + 1
-            end = start + qstring_length(text)
-            for i, (fmt, letter) in enumerate(self._charlist[start:end]):
-                self.setFormat(i, 1, fmt)
-            self.setCurrentBlockState(end)
-            self.highlight_extras(text)
+        number = self.currentBlock().blockNumber()
+        runs = None
+        if number < len(self._block_runs):
+            runs = self._block_runs[number]
+
+        if runs:
+            text_length = len(text)
+            offsets = None
+            utf16 = text.encode('utf-16-le', 'surrogatepass')
+            if len(utf16) != 2 * text_length:
+                # Runs are in characters but formats are set in UTF-16 code
+                # units
+                offsets = [0]
+                for char in text:
+                    offsets.append(offsets[-1] + (ord(char) > 0xFFFF) + 1)
+
+            for start, length, name in runs:
+                end = min(start + length, text_length)
+                if start >= end:
+                    continue
+                if offsets is not None:
+                    start, end = offsets[start], offsets[end]
+                self.setFormat(start, end - start, self.formats[name])
+
+        self.setCurrentBlockState(self.NORMAL)
+        self.highlight_extras(text)
 
 
 class PythonLoggingLexer(RegexLexer):
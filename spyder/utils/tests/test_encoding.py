@@ -74,6 +74,19 @@ def test_permissions(tmpdir):
     assert old_mode == new_mode
 
 
+@pytest.mark.skipif(os.name == 'nt', reason="Unix permissions")
+def test_new_file_mode(tmpdir, mocker):
+    """
+    Check that new files get the given permissions without reading the
+    umask, which is not thread safe.
+    """
+    p_file = to_text_string(tmpdir.join("new_file.txt"))
+    umask = mocker.spy(os, 'umask')
+    write("Some text", p_file, new_file_mode=0o640)
+    assert not umask.called
+    assert stat.S_IMODE(os.stat(p_file).st_mode) == 0o640
+
+
 @flaky(max_runs=10)
 def test_timestamp(tmpdir):
     """Check that the modification timestamp is preserved."""
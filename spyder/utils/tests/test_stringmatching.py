@@ -15,7 +15,7 @@
 import pytest
 
 # Local imports
-from spyder.utils.stringmatching import get_search_scores
+from spyder.utils.stringmatching import FuzzyMatcher, get_search_scores
 
 TEST_FILE = os.path.join(os.path.dirname(__file__), 'data/example.py')
 
@@ -216,5 +216,29 @@ def test_stringmatching_order_filter():
                                      'use previous <b>lay</b>out', 400113)]
 
 
+def test_fuzzy_matcher():
+    """Test that the fuzzy matcher gives the same results while typing."""
+    template = '<b>{0}</b>'
+    names = ['close pane', 'debug continue', 'layout preferences', 'quit',
+             'save current layout', 'use next layout', 'Lay out', 'yank',
+             're-run last script', 'run selection', 'save as', 'Save file']
+    matcher = FuzzyMatcher(names)
+
+    # Narrow and widen the query, and use letters no choice has
+    for query in ['l', 'la', 'lay', 'lay o', 'layz', 'la', 's', 'sa', 'sf',
+                  'run', '']:
+        for kwargs in [{}, {'valid_only': True, 'sort': True}]:
+            assert matcher.search(query, template=template, **kwargs) == (
+                get_search_scores(query, names, template=template, **kwargs))
+
+    # Get only the best results
+    assert matcher.search('sa', limit=2) == (
+        get_search_scores('sa', names, sort=True)[:2])
+
+    case_matcher = FuzzyMatcher(names, ignore_case=False)
+    assert [row[0] for row in case_matcher.search('La', valid_only=True)] == [
+        'Lay out']
+
+
 if __name__ == "__main__":
     pytest.main()
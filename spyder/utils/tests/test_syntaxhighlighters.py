@@ -6,10 +6,12 @@
 """Tests for syntaxhighlighters.py"""
 
 import pytest
-from qtpy.QtWidgets import QApplication
-from qtpy.QtGui import QTextDocument
+from qtpy.QtWidgets import QApplication, QPlainTextDocumentLayout
+from qtpy.QtGui import QTextCursor, QTextDocument
 
-from spyder.utils.syntaxhighlighters import HtmlSH, PythonSH, MarkdownSH
+from spyder.utils import syntaxhighlighters
+from spyder.utils.syntaxhighlighters import (
+    HtmlSH, PythonSH, MarkdownSH, guess_pygments_highlighter)
 from spyder.py3compat import PY3
 
 def compare_formats(actualFormats, expectedFormats, sh):
@@ -107,5 +109,72 @@ def test_python_not_an_outline_explorer_comment(line):
     assert not PythonSH.OECOMMENT.match(line)
 
 
+def make_pygments_sh(filename, txt):
+    doc = QTextDocument()
+    doc.setDocumentLayout(QPlainTextDocumentLayout(doc))
+    doc.setPlainText(txt)
+    sh = guess_pygments_highlighter(filename)(doc, color_scheme='Spyder')
+    sh.make_charlist()
+    while sh._dirty_first is not None:
+        sh.make_charlist()
+    return doc, sh
+
+
+@pytest.mark.parametrize('filename,txt,edits', [
+    ('test.c', '/* multi\n line */\nint main() {\n  char *s = "str";\n}\n',
+     [(0, 2, ''), (3, 3, '/*'), (40, 40, '*/ "'), (5, 5, '\n\n')]),
+    ('test.md', '# Title\n\n```python\nx = 1\n```\n- item\n',
+     [(9, 12, ''), (17, 17, '\n```\n'), (0, 0, '`')]),
+    ('test.yaml', 'a: 1\nb:\n  - x: |\n      block\nc: [1, 2]\n',
+     [(16, 17, '"'), (9, 9, '  '), (30, 30, '\n# c')]),
+    # Tokens closed far below their start
+    ('test.js', '/* x\nb\n{\n', [(7, 8, '*/')]),
+    ('test.md', '# Title\n\n```python\nx = 1\n', [(1300, 1300, '```\n')]),
+])
+def test_pygments_incremental_lexing(qtbot, filename, txt, edits):
+    """Test that lexing only what changed gives the same as a full lex."""
+    doc, sh = make_pygments_sh(filename, txt * 50)
+    sh.LEX_CHUNK_BLOCKS = 7
+    for start, end, text in edits:
+        cursor = QTextCursor(doc)
+        cursor.setPosition(start)
+        cursor.setPosition(end, QTextCursor.KeepAnchor)
+        cursor.insertText(text)
+
+        sh.make_charlist()
+        while sh._dirty_first is not None:
+            sh.make_charlist()
+        expected_doc, expected_sh = make_pygments_sh(filename,
+                                                     doc.toPlainText())
+        assert sh._block_runs == expected_sh._block_runs
+        assert len(sh._block_runs) == doc.blockCount()
+
+
+def test_pygments_lexing_without_states(qtbot, monkeypatch):
+    """
+    Test that documents are lexed from the start when the state of the
+    lexer can't be read.
+    """
+    txt = '/* multi\n line */\nint main() {\n  char *s = "str";\n}\n' * 20
+    expected_doc, expected_sh = make_pygments_sh('test.c', txt)
+    assert any(state is not None for state in expected_sh._block_states[1:])
+
+    monkeypatch.setattr(syntaxhighlighters, '_LEXER_STATES',
+                        {syntaxhighlighters.RegexLexer: False})
+    doc, sh = make_pygments_sh('test.c', txt)
+    assert sh._block_states[1:] == [None] * (doc.blockCount() - 1)
+    assert sh._block_runs == expected_sh._block_runs
+
+    sh.LEX_CHUNK_BLOCKS = 7
+    cursor = QTextCursor(doc)
+    cursor.setPosition(40)
+    cursor.insertText('*/ "')
+    sh.make_charlist()
+    while sh._dirty_first is not None:
+        sh.make_charlist()
+    expected_doc, expected_sh = make_pygments_sh('test.c', doc.toPlainText())
+    assert sh._block_runs == expected_sh._block_runs
+
+
 if __name__ == '__main__':
     pytest.main()
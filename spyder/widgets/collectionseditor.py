@@ -58,6 +58,8 @@
 from spyder.plugins.variableexplorer.widgets.collectionsdelegate import (
     CollectionsDelegate)
 from spyder.plugins.variableexplorer.widgets.importwizard import ImportWizard
+from spyder.plugins.variableexplorer.widgets.remotedata import (
+    RemoteArray, RemoteData)
 from spyder.widgets.helperwidgets import CustomSortFilterProxy
 from spyder.plugins.variableexplorer.widgets.basedialog import BaseDialog
 from spyder.utils.palette import SpyderPalette
@@ -215,6 +217,68 @@ def set_data(self, data, coll_filter=None):
             self.update_search_letters()
         self.reset()
 
+    def update_data(self, changed, removed):
+        """
+        Update remote data in place.
+
+        `changed` is a dictionary with the added and changed values, and
+        `removed` a list with the keys of the removed ones.
+        """
+        if self.total_rows > self.rows_loaded:
+            # Sizes and types are only computed for the loaded rows, so
+            # it's simpler to set all data again
+            data = self._data.copy()
+            for key in removed:
+                data.pop(key, None)
+            data.update(changed)
+            self.set_data(data)
+            return
+
+        self.scores = list(self.scores)
+        rows = {key: row for row, key in enumerate(self.keys)}
+
+        # Remove values, starting from the last rows so the remaining ones
+        # keep their positions
+        for row in sorted((rows[key] for key in removed if key in rows),
+                          reverse=True):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            self._data.pop(self.keys[row])
+            for rows_list in (self.keys, self.sizes, self.types,
+                              self.scores):
+                if row < len(rows_list):
+                    del rows_list[row]
+            self.total_rows -= 1
+            self.rows_loaded -= 1
+            self.endRemoveRows()
+
+        if removed:
+            rows = {key: row for row, key in enumerate(self.keys)}
+
+        # Change and add values
+        letters = getattr(self, 'letters', '')
+        for key, value in changed.items():
+            row = rows.get(key)
+            if row is not None:
+                self._data[key] = value
+                self.sizes[row] = value['size']
+                self.types[row] = value['type']
+                self.dataChanged.emit(
+                    self.index(row, 0),
+                    self.index(row, self.columnCount() - 1))
+            else:
+                row = len(self.keys)
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._data[key] = value
+                self.keys.append(key)
+                self.sizes.append(value['size'])
+                self.types.append(value['type'])
+                results = get_search_scores(letters, [str(key)],
+                                            template='<b>{0}</b>')
+                self.scores.append(results[0][2] if results else -1)
+                self.total_rows += 1
+                self.rows_loaded += 1
+                self.endInsertRows()
+
     def set_size_and_type(self, start=None, stop=None):
         data = self._data
 
@@ -1457,6 +1521,12 @@ def set_value(self, index, value):
             name = source_index.model().keys[source_index.row()]
             self.parent().new_value(name, value)
 
+    def get_remote_data(self, index):
+        if index.isValid():
+            source_index = index.model().mapToSource(index)
+            name = source_index.model().keys[source_index.row()]
+            return self.parent().get_remote_data(name)
+
 
 class RemoteCollectionsEditorTableView(BaseTableView):
     """DictEditor table view"""
@@ -1510,6 +1580,36 @@ def get_value(self, name):
         value = self.shellwidget.get_value(name)
         return value
 
+    def set_data(self, data):
+        """Set table data"""
+        if data is not None:
+            # Variables displayed by windows can't be shown anymore if they
+            # changed
+            old_data = self.source_model.get_data()
+            self.delegate.close_remote_editors(
+                [name for name in old_data
+                 if data.get(name) != old_data[name]])
+        BaseTableView.set_data(self, data)
+
+    def update_data(self, changed, removed):
+        """Update table data with the changes of the namespace"""
+        self.delegate.close_remote_editors(list(changed) + list(removed))
+        self.source_model.update_data(changed, removed)
+
+    def get_remote_data(self, name):
+        """
+        Get a RemoteData object to display a variable by windows, or None
+        if that's not possible.
+        """
+        try:
+            info = self.shellwidget.get_value_window_info(name)
+        except ValueError:
+            return None
+        if info is None:
+            return None
+        data_class = RemoteArray if 'dtype' in info else RemoteData
+        return data_class(name, info, self.shellwidget.get_value_window)
+
     def new_value(self, name, value):
         """Create new value in data"""
         try:
@@ -26,7 +26,7 @@
 from spyder.config.utils import is_ubuntu
 from spyder.py3compat import TEXT_TYPES, to_text_string
 from spyder.utils.icon_manager import ima
-from spyder.utils.stringmatching import get_search_scores
+from spyder.utils.stringmatching import FuzzyMatcher
 from spyder.widgets.helperwidgets import HTMLDelegate
 
 # Style dict constants
@@ -154,6 +154,8 @@ def get_score(self):
 
     def set_score(self, value):
         """Set the search text fuzzy match score."""
+        if value == self._score:
+            return
         self._score = value
         self._set_rendered_text()
 
@@ -410,6 +412,8 @@ def get_title(self):
 
     def set_rich_title(self, value):
         """Set the rich title version (filter highlight) of the item."""
+        if value == self._rich_title:
+            return
         self._rich_title = value
         self._set_rendered_text()
 
@@ -556,6 +560,7 @@ def __init__(self, parent, help_text=None, item_styles=ITEM_STYLES,
         self._mode_on = ''
         self._item_styles = item_styles
         self._item_separator_styles = item_separator_styles
+        self._matcher = None
 
         # Widgets
         self.edit = QLineEdit(self)
@@ -704,16 +709,25 @@ def setup(self):
                 title = ''
             titles.append(title)
 
+        # Reuse the matcher while the items don't change, so only the items
+        # that matched the previous text are searched when more is typed
+        if self._matcher is None or self._matcher.choices != titles:
+            self._matcher = FuzzyMatcher(titles)
+
         search_text = clean_string(search_text)
-        scores = get_search_scores(to_text_string(search_text),
-                                   titles, template=u"<b>{0}</b>")
+        scores = self._matcher.search(to_text_string(search_text),
+                                      template=u"<b>{0}</b>")
 
+        # Don't sort the items after each one is updated. They are sorted
+        # in setup_sections.
+        self.proxy.setDynamicSortFilter(False)
         for idx, (title, rich_title, score_value) in enumerate(scores):
             item = self.model.item(idx)
             if not self._is_separator(item) and not item.is_action_item():
                 rich_title = rich_title.replace(" ", "&nbsp;")
                 item.set_rich_title(rich_title)
             item.set_score(score_value)
+        self.proxy.setDynamicSortFilter(True)
         self.proxy.set_filter_by_score(True)
 
         self.setup_sections()
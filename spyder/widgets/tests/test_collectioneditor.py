@@ -24,7 +24,7 @@
 import pytest
 from flaky import flaky
 from qtpy.QtCore import Qt, QPoint
-from qtpy.QtWidgets import QWidget, QDateEdit
+from qtpy.QtWidgets import QDateEdit, QMessageBox, QWidget
 
 # Local imports
 from spyder.config.manager import CONF
@@ -36,7 +36,7 @@
 from spyder.plugins.variableexplorer.widgets.tests.test_dataframeeditor import \
     generate_pandas_indexes
 from spyder.py3compat import PY2, to_text_string
-from spyder_kernels.utils.nsview import get_size
+from spyder_kernels.utils.nsview import get_size, get_window_info
 
 
 # =============================================================================
@@ -252,6 +252,48 @@ def test_filter_rows(qtbot):
     assert editor.model.rowCount() == 0
 
 
+def test_remote_large_data_shown_by_windows(qtbot, monkeypatch):
+    """
+    Test that large remote arrays and dataframes are displayed by windows,
+    without getting their whole value.
+    """
+    df = pandas.DataFrame(numpy.zeros((1000000, 6)))
+    data = {'df': {'type': 'DataFrame', 'size': (1000000, 6),
+                   'color': '#00ff00', 'view': 'Column names: 0'}}
+    shellwidget = Mock()
+    shellwidget.get_value_window_info.return_value = get_window_info(df)
+    editor = RemoteCollectionsEditorTableView(None, data,
+                                              shellwidget=shellwidget)
+    qtbot.addWidget(editor)
+
+    MockDataFrameEditor = Mock()
+    monkeypatch.setattr('spyder.plugins.variableexplorer.widgets.'
+                        'collectionsdelegate.DataFrameEditor',
+                        MockDataFrameEditor)
+    monkeypatch.setattr(editor.delegate, 'ask_remote_data_display',
+                        lambda: QMessageBox.Open)
+    editor.delegate.createEditor(None, None, editor.model.index(0, 3))
+
+    shellwidget.get_value.assert_not_called()
+    remote_data = MockDataFrameEditor().setup_and_check.call_args[0][0]
+    assert remote_data.name == 'df'
+    assert remote_data.shape == (1000000, 6)
+    MockDataFrameEditor().show.assert_called_once_with()
+
+    # The editor is closed when the variable changes
+    MockDataFrameEditor().reject.assert_not_called()
+    editor.update_data({'df': dict(data['df'], size=(10, 6))}, [])
+    MockDataFrameEditor().reject.assert_called_once_with()
+
+    # The whole variable can still be transferred to edit it
+    shellwidget.get_value.return_value = df
+    monkeypatch.setattr(editor.delegate, 'ask_remote_data_display',
+                        lambda: QMessageBox.Yes)
+    editor.delegate.createEditor(None, None, editor.model.index(0, 3))
+    shellwidget.get_value.assert_called_once_with('df')
+    assert MockDataFrameEditor().setup_and_check.call_args[0][0] is df
+
+
 def test_create_dataframeeditor_with_correct_format(qtbot):
     df = pandas.DataFrame(['foo', 'bar'])
     editor = CollectionsEditorTableView(None, {'df': df})